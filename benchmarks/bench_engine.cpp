@@ -0,0 +1,267 @@
+/**
+ * Benchmark harness for the C++ engines
+ *
+ * Loads a columnar event store, builds the requested engine, runs a query
+ * workload and prints one JSON object with build time, index memory and
+ * latency percentiles (overall and per query class).
+ *
+ * Usage:
+ *   bench_engine <store> <queries> [--engine kdtree|scan|disk|temporal]
+ *                [--max-index-mb N] [--counts-out FILE] [--stats]
+ *                [--threads N[,N...]] [--block-events N] [--cold]
+ *
+ * --engine disk builds the out-of-core DiskIndex next to the store
+ * (<store>.disk.*) with an external sort and queries it through mmap;
+ * the events are never loaded into memory. Its result adds "disk_bytes"
+ * and "io" (blocks, summary reads and pages touched per query, plus the
+ * major page faults of the timed run). --cold drops the index files from
+ * the page cache before the timed run; --block-events sets the leaf size.
+ *
+ * --engine temporal builds the TemporalKDTree (sorted timestamps per
+ * node instead of a 1440-bucket Fenwick); its counts match kdtree.
+ *
+ * --threads additionally answers the whole workload as one batch on a
+ * ParallelQueryExecutor for each listed worker count (0 = all cores) and
+ * reports the batch throughput next to the sequential one.
+ *
+ * --stats re-runs the workload with query path instrumentation enabled
+ * (after timing, so latencies are unaffected) and adds the aggregated
+ * counters and histograms to the output.
+ *
+ * Query file: one query per line, "x1 y1 x2 y2 t1 t2 [class]" (see workload.h)
+ */
+
+#include <algorithm>
+#include <chrono>
+#include <fstream>
+#include <iostream>
+#include <map>
+#include <sstream>
+#include <string>
+#include <vector>
+#include "../src/cpp/kdtree.h"
+#include "../src/cpp/parallel_query.h"
+#include "../src/cpp/event_store.h"
+#include "../src/cpp/disk_index.h"
+#include "../src/cpp/temporal_kdtree.h"
+#include "../src/cpp/workload.h"
+#ifndef _WIN32
+#include <sys/resource.h>
+#endif
+
+using namespace std;
+using Clock = chrono::steady_clock;
+using workload::Query;
+using workload::latencyJson;
+
+/**
+ * Reference linear scan (same predicate as executeQuery in queryEngine.ts,
+ * without the midnight wrap which the KD-tree does not support)
+ */
+int scanQuery(const vector<Event>& events, const Query& q) {
+    double x1 = min(q.x1, q.x2), x2 = max(q.x1, q.x2);
+    double y1 = min(q.y1, q.y2), y2 = max(q.y1, q.y2);
+    int t1 = min(q.t1, q.t2), t2 = max(q.t1, q.t2);
+    int count = 0;
+    for (const Event& e : events) {
+        if (e.x >= x1 && e.x <= x2 && e.y >= y1 && e.y <= y2 &&
+            e.time >= t1 && e.time <= t2) {
+            count += e.weight;
+        }
+    }
+    return count;
+}
+
+long long majorFaults() {
+#ifndef _WIN32
+    struct rusage usage;
+    getrusage(RUSAGE_SELF, &usage);
+    return usage.ru_majflt;
+#else
+    return 0;
+#endif
+}
+
+int main(int argc, char* argv[]) {
+    if (argc < 3) {
+        cerr << "usage: bench_engine <store> <queries> [--engine kdtree|scan|disk|temporal] "
+                "[--max-index-mb N] [--counts-out FILE] [--stats] [--threads N[,N...]] "
+                "[--block-events N] [--cold]" << endl;
+        return 2;
+    }
+
+    string storePath = argv[1];
+    string queryPath = argv[2];
+    string engine = "kdtree";
+    double maxIndexMb = 2048;
+    string countsOut;
+    bool collectStats = false;
+    vector<int> threadCounts;  // Empty = no parallel run
+    bool cold = false;
+    DiskIndexOptions diskOptions;
+
+    for (int i = 3; i < argc; i++) {
+        string flag = argv[i];
+        if (flag == "--stats") collectStats = true;
+        else if (flag == "--cold") cold = true;
+        else if (i + 1 >= argc) break;
+        else if (flag == "--block-events") diskOptions.blockEvents = stoul(argv[++i]);
+        else if (flag == "--engine") engine = argv[++i];
+        else if (flag == "--max-index-mb") maxIndexMb = stod(argv[++i]);
+        else if (flag == "--counts-out") countsOut = argv[++i];
+        else if (flag == "--threads") {
+            stringstream list(argv[++i]);
+            string item;
+            while (getline(list, item, ',')) threadCounts.push_back(stoi(item));
+        }
+    }
+
+    auto loadStart = Clock::now();
+    vector<Event> events;
+    if (engine != "disk") events = event_store::loadEvents(storePath);
+    double loadMs = chrono::duration<double, milli>(Clock::now() - loadStart).count();
+    vector<Query> queries = workload::load(queryPath);
+
+    cout.precision(6);
+    cout << fixed;
+
+    KDTree tree(1440);
+    TemporalKDTree temporal;
+    DiskIndex disk;
+    double buildMs = 0;
+    size_t indexBytes = events.size() * sizeof(Event);
+    size_t eventCount = events.size();
+
+    if (engine == "disk") {
+        string indexPath = storePath + ".disk";
+        auto buildStart = Clock::now();
+        DiskIndex::build(storePath, indexPath, diskOptions);
+        buildMs = chrono::duration<double, milli>(Clock::now() - buildStart).count();
+
+        loadStart = Clock::now();
+        disk.open(indexPath);
+        loadMs = chrono::duration<double, milli>(Clock::now() - loadStart).count();
+        indexBytes = disk.memoryUsage();
+        eventCount = static_cast<size_t>(disk.size());
+        if (cold) disk.dropCache();
+    } else if (engine == "kdtree") {
+        size_t estimate = KDTree::estimateMemory(events.size());
+        if (estimate / (1024.0 * 1024.0) > maxIndexMb) {
+            cout << "{\"engine\":\"kdtree\",\"n\":" << events.size()
+                 << ",\"skipped\":\"estimated index size " << estimate / (1024 * 1024)
+                 << " MB exceeds --max-index-mb " << static_cast<long long>(maxIndexMb) << "\""
+                 << ",\"index_bytes\":" << estimate << "}" << endl;
+            return 0;
+        }
+        auto buildStart = Clock::now();
+        tree.build(events);
+        buildMs = chrono::duration<double, milli>(Clock::now() - buildStart).count();
+        indexBytes = tree.memoryUsage();
+    } else if (engine == "temporal") {
+        auto buildStart = Clock::now();
+        temporal.build(events);
+        buildMs = chrono::duration<double, milli>(Clock::now() - buildStart).count();
+        indexBytes = temporal.memoryUsage();
+    } else if (engine != "scan") {
+        cerr << "unknown engine: " << engine << endl;
+        return 2;
+    }
+
+    vector<double> latencies;
+    map<string, vector<double>> byClass;
+    vector<long long> counts;
+    latencies.reserve(queries.size());
+    counts.reserve(queries.size());
+
+    long long faultsBefore = majorFaults();
+    auto sequentialStart = Clock::now();
+    for (const Query& q : queries) {
+        auto start = Clock::now();
+        long long count = engine == "kdtree" ? tree.query(q.x1, q.y1, q.x2, q.y2, q.t1, q.t2)
+                        : engine == "disk"   ? disk.query(q.x1, q.y1, q.x2, q.y2, q.t1, q.t2)
+                        : engine == "temporal" ? temporal.query(q.x1, q.y1, q.x2, q.y2, q.t1, q.t2)
+                        : scanQuery(events, q);
+        double ms = chrono::duration<double, milli>(Clock::now() - start).count();
+
+        latencies.push_back(ms);
+        byClass[q.label].push_back(ms);
+        counts.push_back(count);
+    }
+    double sequentialMs = chrono::duration<double, milli>(Clock::now() - sequentialStart).count();
+    long long faults = majorFaults() - faultsBefore;
+
+    if (!countsOut.empty()) {
+        ofstream out(countsOut);
+        for (long long c : counts) out << c << "\n";
+    }
+
+    cout << "{\"engine\":\"" << engine << "\""
+         << ",\"n\":" << eventCount
+         << ",\"load_ms\":" << loadMs
+         << ",\"build_ms\":" << buildMs
+         << ",\"index_bytes\":" << indexBytes
+         << ",\"latency_ms\":" << latencyJson(latencies)
+         << ",\"by_class\":{";
+    bool first = true;
+    for (const auto& entry : byClass) {
+        if (!first) cout << ",";
+        cout << "\"" << entry.first << "\":" << latencyJson(entry.second);
+        first = false;
+    }
+    cout << "}";
+    cout << ",\"qps\":" << (sequentialMs > 0 ? queries.size() * 1000.0 / sequentialMs : 0);
+
+    if (!threadCounts.empty() && engine == "kdtree") {
+        vector<RangeQuery> batch;
+        batch.reserve(queries.size());
+        for (const Query& q : queries) {
+            batch.emplace_back(q.x1, q.y1, q.x2, q.y2, q.t1, q.t2);
+        }
+
+        cout << ",\"parallel\":[";
+        for (size_t r = 0; r < threadCounts.size(); r++) {
+            ParallelQueryExecutor pool(tree, static_cast<unsigned>(threadCounts[r]));
+            pool.run(batch);  // Warm-up: touch the index from every worker
+
+            auto batchStart = Clock::now();
+            vector<int> batchCounts = pool.run(batch);
+            double batchMs = chrono::duration<double, milli>(Clock::now() - batchStart).count();
+
+            size_t mismatches = 0;
+            for (size_t i = 0; i < counts.size(); i++) mismatches += batchCounts[i] != counts[i];
+
+            cout << (r ? "," : "") << "{\"threads\":" << pool.threadCount()
+                 << ",\"wall_ms\":" << batchMs
+                 << ",\"qps\":" << (batchMs > 0 ? batch.size() * 1000.0 / batchMs : 0)
+                 << ",\"mismatches\":" << mismatches << "}";
+        }
+        cout << "]";
+    }
+
+    if (engine == "disk") {
+        DiskIOStats io;
+        for (const Query& q : queries) disk.query(q.x1, q.y1, q.x2, q.y2, q.t1, q.t2, nullptr, &io);
+        double perQuery = queries.empty() ? 0 : 1.0 / queries.size();
+        cout << ",\"disk_bytes\":" << disk.diskBytes()
+             << ",\"io\":{\"total\":" << io.toJson()
+             << ",\"blocks_per_query\":" << io.blocksRead * perQuery
+             << ",\"summary_reads_per_query\":" << io.summaryReads * perQuery
+             << ",\"pages_per_query\":" << io.pagesTouched * perQuery
+             << ",\"major_faults\":" << faults
+             << ",\"cold\":" << (cold ? "true" : "false") << "}";
+    }
+
+    if (collectStats && engine != "scan") {
+        QueryStatsAggregator aggregate;
+        for (const Query& q : queries) {
+            QueryStats stats;
+            if (engine == "kdtree") tree.query(q.x1, q.y1, q.x2, q.y2, q.t1, q.t2, &stats);
+            else if (engine == "temporal") temporal.query(q.x1, q.y1, q.x2, q.y2, q.t1, q.t2, &stats);
+            else disk.query(q.x1, q.y1, q.x2, q.y2, q.t1, q.t2, &stats);
+            aggregate.add(stats);
+        }
+        cout << ",\"stats\":" << aggregate.toJson();
+    }
+    cout << "}" << endl;
+    return 0;
+}
@@ -0,0 +1,141 @@
+// Benchmark for the dashboard's brute-force scan (executeQuery in queryEngine.ts)
+// Usage: node bench_scan.js <store> <queries> [countsOut]
+// Builds the same array-of-objects the dashboards hold, then times every query.
+
+const fs = require('fs');
+
+const ARRAY_TYPES = {
+    float32: Float32Array,
+    float64: Float64Array,
+    uint8: Uint8Array,
+    uint16: Uint16Array,
+    uint32: Uint32Array
+};
+
+function loadEvents(basePath) {
+    const manifest = JSON.parse(fs.readFileSync(`${basePath}.json`, 'utf8'));
+    const raw = fs.readFileSync(`${basePath}.bin`);
+    const buffer = raw.buffer.slice(raw.byteOffset, raw.byteOffset + raw.length);
+
+    const columns = {};
+    Object.entries(manifest.columns).forEach(([name, info]) => {
+        columns[name] = new ARRAY_TYPES[info.dtype](buffer, info.offset, manifest.count);
+    });
+
+    const events = new Array(manifest.count);
+    for (let i = 0; i < manifest.count; i++) {
+        events[i] = {
+            x: columns.x[i],
+            y: columns.y[i],
+            time: columns.time[i],
+            weight: columns.weight ? columns.weight[i] : 1
+        };
+    }
+    return events;
+}
+
+// Same predicate as executeQuery() in next-level-design-main/src/utils/queryEngine.ts
+function executeQuery(events, params) {
+    let count = 0;
+
+    const { x1, y1, x2, y2, t1, t2 } = params;
+    const minX = Math.min(x1, x2);
+    const maxX = Math.max(x1, x2);
+    const minY = Math.min(y1, y2);
+    const maxY = Math.max(y1, y2);
+
+    events.forEach(event => {
+        const inSpatialRange = event.x >= minX &&
+            event.x <= maxX &&
+            event.y >= minY &&
+            event.y <= maxY;
+
+        let inTemporalRange;
+        if (t1 <= t2) {
+            inTemporalRange = event.time >= t1 && event.time <= t2;
+        } else {
+            inTemporalRange = event.time >= t1 || event.time <= t2;
+        }
+
+        if (inSpatialRange && inTemporalRange) {
+            count++;
+        }
+    });
+
+    return count;
+}
+
+function percentile(sorted, p) {
+    if (sorted.length === 0) return 0;
+    const idx = Math.min(sorted.length - 1, Math.round(p / 100 * (sorted.length - 1)));
+    return sorted[idx];
+}
+
+function latencySummary(ms) {
+    const sorted = [...ms].sort((a, b) => a - b);
+    const total = ms.reduce((a, b) => a + b, 0);
+    return {
+        count: ms.length,
+        mean: ms.length ? total / ms.length : 0,
+        p50: percentile(sorted, 50),
+        p95: percentile(sorted, 95),
+        p99: percentile(sorted, 99),
+        max: percentile(sorted, 100)
+    };
+}
+
+function main() {
+    const [storePath, queryPath, countsOut] = process.argv.slice(2);
+
+    const heapBefore = process.memoryUsage().heapUsed;
+    const loadStart = performance.now();
+    const events = loadEvents(storePath);
+    const loadMs = performance.now() - loadStart;
+    const heapBytes = process.memoryUsage().heapUsed - heapBefore;
+
+    const queries = fs.readFileSync(queryPath, 'utf8').split('\n')
+        .map(line => line.trim().split(/\s+/))
+        .filter(parts => parts.length >= 6)
+        .map(parts => ({
+            params: {
+                x1: +parts[0], y1: +parts[1], x2: +parts[2], y2: +parts[3],
+                t1: +parts[4], t2: +parts[5]
+            },
+            label: parts[6] || 'all'
+        }));
+
+    const latencies = [];
+    const byClass = {};
+    const counts = [];
+
+    queries.forEach(({ params, label }) => {
+        const start = performance.now();
+        const count = executeQuery(events, params);
+        const ms = performance.now() - start;
+
+        latencies.push(ms);
+        (byClass[label] = byClass[label] || []).push(ms);
+        counts.push(count);
+    });
+
+    if (countsOut) {
+        fs.writeFileSync(countsOut, counts.join('\n') + '\n');
+    }
+
+    const summary = {};
+    Object.entries(byClass).forEach(([label, ms]) => {
+        summary[label] = latencySummary(ms);
+    });
+
+    console.log(JSON.stringify({
+        engine: 'js_scan',
+        n: events.length,
+        load_ms: loadMs,
+        build_ms: 0,
+        index_bytes: heapBytes,
+        latency_ms: latencySummary(latencies),
+        by_class: summary
+    }));
+}
+
+main();
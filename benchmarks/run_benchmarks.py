@@ -0,0 +1,417 @@
+"""
+Scaling Benchmark Suite
+
+Generates hotspot datasets of increasing size, runs a mixed-selectivity
+query workload against every engine and saves the results as JSON so runs
+can be compared across commits.
+
+Engines:
+- kdtree      C++ KDTree + Fenwick (benchmarks/bench_engine.cpp)
+- scan        C++ linear scan
+- disk        C++ out-of-core DiskIndex (external sort build, mmap'd blocks)
+- temporal    C++ TemporalKDTree (sorted timestamps per node)
+- js_scan     executeQuery() logic from queryEngine.ts under Node
+- numpy_scan  vectorized NumPy scan
+- hilbert     Hilbert-sorted arrays + block time histograms (curve_index.py)
+- morton      the same over Morton (Z-order) keys
+- report      result-reporting KD-tree (report_index.py), counts from reported IDs
+(further Python engines register in PYTHON_ENGINES)
+
+Usage:
+    python benchmarks/run_benchmarks.py --sizes 10000 100000 1000000
+    python benchmarks/run_benchmarks.py --compare results/a.json results/b.json
+"""
+
+import argparse
+import functools
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import time
+from datetime import datetime
+
+import numpy as np
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, os.path.join(ROOT_DIR, 'src', 'python'))
+
+from event_store import read_event_store
+from curve_index import CurveIndex
+from report_index import ReportIndex
+from generator import EventGenerator, DEFAULT_CONFIG
+
+DATA_DIR = os.path.join(BENCH_DIR, 'data')
+BUILD_DIR = os.path.join(BENCH_DIR, 'build')
+RESULTS_DIR = os.path.join(BENCH_DIR, 'results')
+
+DEFAULT_SIZES = [10_000, 100_000, 1_000_000, 10_000_000]
+
+LAT_RANGE = DEFAULT_CONFIG['lat_range']
+LON_RANGE = DEFAULT_CONFIG['lon_range']
+
+# Query classes: (label, fraction of bbox side, time window in minutes)
+QUERY_CLASSES = [
+    ('point', 0.01, 60),
+    ('neighborhood', 0.05, 360),
+    ('district', 0.2, 720),
+    ('city', 0.8, 1440),
+]
+
+
+# ----------------------------------------------------------------------
+# Datasets and workloads
+# ----------------------------------------------------------------------
+
+def dataset_path(n, seed):
+    """Generate (once) and return the store path for a dataset size"""
+    path = os.path.join(DATA_DIR, f"hotspot_{n}_s{seed}")
+    if not os.path.exists(path + '.json'):
+        print(f"🎲 Generating {n:,} events...")
+        EventGenerator(seed=seed).write_store(path, n, coord_dtype=np.float64)
+    return path
+
+
+def write_workload(path, x, y, n_queries, seed):
+    """
+    Mixed-selectivity workload, equal share per query class.
+    Query centers are sampled from the events so queries hit data.
+    """
+    rng = np.random.default_rng(seed + 1)
+    lat_span = LAT_RANGE[1] - LAT_RANGE[0]
+    lon_span = LON_RANGE[1] - LON_RANGE[0]
+
+    with open(path, 'w') as f:
+        for i in range(n_queries):
+            label, side, window = QUERY_CLASSES[i % len(QUERY_CLASSES)]
+            c = rng.integers(0, len(x))
+            hx, hy = side * lat_span / 2, side * lon_span / 2
+            t1 = int(rng.integers(0, 1440 - window + 1))
+            f.write(f"{x[c] - hx:.6f} {y[c] - hy:.6f} {x[c] + hx:.6f} {y[c] + hy:.6f} "
+                    f"{t1} {t1 + window - 1} {label}\n")
+
+
+def read_workload(path):
+    queries = []
+    with open(path) as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) >= 6:
+                queries.append((*map(float, parts[:4]), int(parts[4]), int(parts[5]),
+                                parts[6] if len(parts) > 6 else 'all'))
+    return queries
+
+
+# ----------------------------------------------------------------------
+# Python engines
+# ----------------------------------------------------------------------
+
+class NumpyScanEngine:
+    """Vectorized brute-force scan over the store columns"""
+
+    def __init__(self, columns):
+        self.x = np.asarray(columns['x'])
+        self.y = np.asarray(columns['y'])
+        self.time = np.asarray(columns['time'])
+        self.weight = np.asarray(columns['weight'])
+
+    def count(self, x1, y1, x2, y2, t1, t2):
+        mask = ((self.x >= x1) & (self.x <= x2) & (self.y >= y1) & (self.y <= y2) &
+                (self.time >= t1) & (self.time <= t2))
+        return int(self.weight[mask].sum())
+
+    def memory_bytes(self):
+        return self.x.nbytes + self.y.nbytes + self.time.nbytes + self.weight.nbytes
+
+
+PYTHON_ENGINES = {
+    'numpy_scan': NumpyScanEngine,
+    'hilbert': CurveIndex.from_columns,
+    'morton': functools.partial(CurveIndex.from_columns, curve='morton'),
+    'report': ReportIndex.from_columns,
+}
+
+
+def latency_summary(ms):
+    ms = np.asarray(ms)
+    if len(ms) == 0:
+        return {'count': 0}
+    return {
+        'count': int(len(ms)),
+        'mean': float(ms.mean()),
+        'p50': float(np.percentile(ms, 50)),
+        'p95': float(np.percentile(ms, 95)),
+        'p99': float(np.percentile(ms, 99)),
+        'max': float(ms.max()),
+    }
+
+
+def run_python_engine(name, store, workload):
+    """Build + query a Python engine, returning (result, counts)"""
+    load_start = time.perf_counter()
+    columns, _ = read_event_store(store, mmap=False)
+    load_ms = (time.perf_counter() - load_start) * 1000
+
+    build_start = time.perf_counter()
+    engine = PYTHON_ENGINES[name](columns)
+    build_ms = (time.perf_counter() - build_start) * 1000
+
+    queries = read_workload(workload)
+    latencies, by_class, counts = [], {}, []
+    for x1, y1, x2, y2, t1, t2, label in queries:
+        start = time.perf_counter()
+        count = engine.count(x1, y1, x2, y2, t1, t2)
+        ms = (time.perf_counter() - start) * 1000
+        latencies.append(ms)
+        by_class.setdefault(label, []).append(ms)
+        counts.append(count)
+
+    result = {
+        'engine': name,
+        'n': len(columns['x']),
+        'load_ms': load_ms,
+        'build_ms': build_ms,
+        'index_bytes': int(engine.memory_bytes()),
+        'latency_ms': latency_summary(latencies),
+        'by_class': {k: latency_summary(v) for k, v in by_class.items()},
+    }
+    return result, counts
+
+
+# ----------------------------------------------------------------------
+# External engines (C++ / Node)
+# ----------------------------------------------------------------------
+
+def build_cpp_harness():
+    """Compile bench_engine.cpp if missing or older than its sources"""
+    exe = os.path.join(BUILD_DIR, 'bench_engine')
+    sources = [os.path.join(BENCH_DIR, 'bench_engine.cpp')] + [
+        os.path.join(ROOT_DIR, 'src', 'cpp', h) for h in os.listdir(os.path.join(ROOT_DIR, 'src', 'cpp'))
+        if h.endswith('.h')
+    ]
+    if os.path.exists(exe) and os.path.getmtime(exe) >= max(map(os.path.getmtime, sources)):
+        return exe
+
+    os.makedirs(BUILD_DIR, exist_ok=True)
+    print("🔨 Compiling bench_engine.cpp...")
+    subprocess.run(['g++', '-std=c++17', '-O2', '-pthread', sources[0], '-o', exe], check=True)
+    return exe
+
+
+def run_external(cmd, counts_path):
+    """Run a harness that prints one JSON line; returns (result, counts)"""
+    proc = subprocess.run(cmd, capture_output=True, text=True)
+    if proc.returncode != 0:
+        return {'error': proc.stderr.strip()[-500:] or f"exit code {proc.returncode}"}, None
+
+    result = json.loads(proc.stdout.strip().splitlines()[-1])
+    counts = None
+    if os.path.exists(counts_path):
+        with open(counts_path) as f:
+            counts = [int(line) for line in f if line.strip()]
+        os.remove(counts_path)
+    return result, counts
+
+
+def run_engine(name, store, workload, args):
+    counts_path = os.path.join(BUILD_DIR, f"counts_{name}.txt")
+    if name in PYTHON_ENGINES:
+        return run_python_engine(name, store, workload)
+    if name in ('kdtree', 'scan', 'disk', 'temporal'):
+        exe = build_cpp_harness()
+        cmd = [exe, store, workload, '--engine', name,
+               '--max-index-mb', str(args.max_index_mb), '--counts-out', counts_path]
+        if args.stats:
+            cmd.append('--stats')
+        if args.threads:
+            cmd += ['--threads', ','.join(str(t) for t in args.threads)]
+        if name == 'disk':
+            cmd += ['--block-events', str(args.block_events)] + (['--cold'] if args.cold else [])
+        return run_external(cmd, counts_path)
+    if name == 'js_scan':
+        if shutil.which('node') is None:
+            return {'skipped': 'node not found'}, None
+        return run_external(['node', f"--max-old-space-size={args.node_heap_mb}",
+                             os.path.join(BENCH_DIR, 'bench_scan.js'),
+                             store, workload, counts_path], counts_path)
+    return {'error': f"unknown engine {name}"}, None
+
+
+# ----------------------------------------------------------------------
+# Reporting
+# ----------------------------------------------------------------------
+
+def git_info():
+    def git(*cmd):
+        try:
+            return subprocess.run(['git', *cmd], cwd=ROOT_DIR, capture_output=True,
+                                  text=True).stdout.strip()
+        except OSError:
+            return ''
+    return {
+        'commit': git('rev-parse', '--short', 'HEAD'),
+        'dirty': bool(git('status', '--porcelain', '--untracked-files=no')),
+    }
+
+
+def print_row(r):
+    if 'latency_ms' not in r:
+        reason = r.get('skipped') or r.get('error', '')
+        print(f"  {r['engine']:12s} {r['n']:>11,}  -- {reason}")
+        return
+    lat = r['latency_ms']
+    print(f"  {r['engine']:12s} {r['n']:>11,} {r['build_ms']:10.1f} "
+          f"{r['index_bytes'] / 2**20:10.1f} {lat['p50']:9.3f} {lat['p95']:9.3f} "
+          f"{lat['p99']:9.3f}  {r.get('mismatches', 0)}")
+
+
+def compare(old_path, new_path):
+    """Print p50/p95/build ratios between two result files"""
+    with open(old_path) as f:
+        old = {(r['engine'], r['n']): r for r in json.load(f)['results']}
+    with open(new_path) as f:
+        new_data = json.load(f)
+
+    print(f"\n  {'engine':12s} {'n':>11s} {'build x':>9s} {'p50 x':>9s} {'p95 x':>9s}")
+    for r in new_data['results']:
+        base = old.get((r['engine'], r['n']))
+        if not base or 'latency_ms' not in r or 'latency_ms' not in base:
+            continue
+
+        def ratio(a, b):
+            return f"{a / b:9.2f}" if b else f"{'-':>9s}"
+
+        print(f"  {r['engine']:12s} {r['n']:>11,} "
+              f"{ratio(r['build_ms'], base['build_ms'])} "
+              f"{ratio(r['latency_ms']['p50'], base['latency_ms']['p50'])} "
+              f"{ratio(r['latency_ms']['p95'], base['latency_ms']['p95'])}")
+    print("\n  (ratios are new / old; < 1 is faster)\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Spatio-temporal engine scaling benchmarks")
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES)
+    parser.add_argument('--engines', nargs='+',
+                        default=['kdtree', 'scan', 'disk', 'temporal', 'js_scan'] + list(PYTHON_ENGINES))
+    parser.add_argument('--queries', type=int, default=400)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--max-index-mb', type=float, default=2048,
+                        help="Skip the KD-tree when its estimated index exceeds this")
+    parser.add_argument('--node-heap-mb', type=int, default=4096)
+    parser.add_argument('--stats', action='store_true',
+                        help="Collect KD-tree query path counters (nodes visited/pruned/covered)")
+    parser.add_argument('--threads', type=int, nargs='+', default=None,
+                        help="Also run the KD-tree workload as a parallel batch with these "
+                             "worker counts (0 = all cores)")
+    parser.add_argument('--block-events', type=int, default=2048,
+                        help="Events per leaf block of the disk engine")
+    parser.add_argument('--cold', action='store_true',
+                        help="Drop the disk index from the page cache before its timed run")
+    parser.add_argument('--output', default=None, help="Result JSON path")
+    parser.add_argument('--compare', nargs=2, metavar=('OLD', 'NEW'))
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    print("\n" + "="*60)
+    print("  SPATIO-TEMPORAL ENGINE BENCHMARKS")
+    print("="*60 + "\n")
+
+    os.makedirs(BUILD_DIR, exist_ok=True)
+    results = []
+
+    for n in args.sizes:
+        store = dataset_path(n, args.seed)
+        columns, _ = read_event_store(store)
+        workload = os.path.join(BUILD_DIR, f"queries_{n}_s{args.seed}.txt")
+        write_workload(workload, columns['x'], columns['y'], args.queries, args.seed)
+        del columns
+
+        reference = None
+        for engine in args.engines:
+            print(f"⏱  {engine} @ {n:,} events...")
+            result, counts = run_engine(engine, store, workload, args)
+            result.setdefault('engine', engine)
+            result.setdefault('n', n)
+
+            # Every engine must agree with the first one that produced counts
+            if counts is not None:
+                if reference is None:
+                    reference = counts
+                result['mismatches'] = int(sum(a != b for a, b in zip(reference, counts)))
+            results.append(result)
+
+    report = {
+        'meta': {
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'git': git_info(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'python': platform.python_version(),
+            'seed': args.seed,
+            'queries': args.queries,
+            'query_classes': [list(c) for c in QUERY_CLASSES],
+        },
+        'results': results,
+    }
+
+    output = args.output
+    if output is None:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        stamp = datetime.now().strftime('%Y%m%d-%H%M%S')
+        output = os.path.join(RESULTS_DIR, f"{stamp}-{report['meta']['git']['commit'] or 'nogit'}.json")
+    with open(output, 'w') as f:
+        json.dump(report, f, indent=2)
+
+    print("\n" + "="*60)
+    print("  RESULTS")
+    print("="*60)
+    print(f"  {'engine':12s} {'n':>11s} {'build ms':>10s} {'index MB':>10s} "
+          f"{'p50 ms':>9s} {'p95 ms':>9s} {'p99 ms':>9s}  mismatches")
+    for r in results:
+        print_row(r)
+    print("="*60)
+
+    stats_rows = [r for r in results if 'stats' in r]
+    if stats_rows:
+        print(f"  {'engine':12s} {'n':>11s} {'visited':>9s} {'pruned':>9s} "
+              f"{'covered':>9s} {'partial':>9s}   (per query)")
+        for r in stats_rows:
+            q = max(r['stats']['queries'], 1)
+            total = r['stats']['total']
+            print(f"  {r['engine']:12s} {r['n']:>11,} {total['visited'] / q:9.1f} "
+                  f"{total['pruned'] / q:9.1f} {total['covered'] / q:9.1f} "
+                  f"{total['partial'] / q:9.1f}")
+        print("="*60)
+
+    io_rows = [r for r in results if 'io' in r]
+    if io_rows:
+        print(f"  {'engine':12s} {'n':>11s} {'disk MB':>9s} {'blocks/q':>9s} "
+              f"{'sums/q':>9s} {'pages/q':>9s} {'maj faults':>11s}")
+        for r in io_rows:
+            io = r['io']
+            print(f"  {r['engine']:12s} {r['n']:>11,} {r['disk_bytes'] / 2**20:9.1f} "
+                  f"{io['blocks_per_query']:9.1f} {io['summary_reads_per_query']:9.1f} "
+                  f"{io['pages_per_query']:9.1f} {io['major_faults']:11,}")
+        print("="*60)
+
+    parallel_rows = [r for r in results if r.get('parallel')]
+    if parallel_rows:
+        print(f"  {'engine':12s} {'n':>11s} {'threads':>8s} {'qps':>12s} {'speedup':>8s}  mismatches")
+        for r in parallel_rows:
+            for p in r['parallel']:
+                speedup = p['qps'] / r['qps'] if r.get('qps') else 0
+                print(f"  {r['engine']:12s} {r['n']:>11,} {p['threads']:>8d} {p['qps']:12,.0f} "
+                      f"{speedup:7.2f}x  {p['mismatches']}")
+        print("="*60)
+
+    print(f"📁 Results saved to {output}\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Convert processed events CSV to the columnar binary store for the web dashboards
+Replaces the indented JSON / object-per-event TypeScript exports
+"""
+
+import os
+import sys
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src', 'python'))
+from event_store import write_event_store
+from crime_types import TypeDictionary
+
+
+def convert_csv_to_binary(csv_file, out_path, max_events=None, precision=32):
+    """
+    Convert CSV to a binary column store (out_path.bin + out_path.json)
+
+    Args:
+        csv_file: Path to events.csv or events_with_types.csv
+        out_path: Output path without extension
+        max_events: Optional row limit
+        precision: 32 or 64 bit float coordinates
+    """
+
+    print(f"\n🔄 Converting CSV to binary columns...")
+    print(f"📂 Input: {csv_file}")
+    print(f"📁 Output: {out_path}.bin / {out_path}.json")
+
+    df = pd.read_csv(csv_file, nrows=max_events)
+    print(f"✓ Loaded {len(df):,} events")
+
+    coord_dtype = 'float64' if precision == 64 else 'float32'
+    types = TypeDictionary.standard()
+    type_codes = types.encode(df['type'], normalize=False) if 'type' in df else None
+    size = write_event_store(
+        out_path,
+        df['x'].to_numpy(),
+        df['y'].to_numpy(),
+        df['time'].to_numpy(),
+        weight=df['weight'].to_numpy() if 'weight' in df else None,
+        types=type_codes,
+        type_dictionary=types if type_codes is not None else None,
+        descriptions=df['description'].fillna('').to_numpy() if 'description' in df else None,
+        coord_dtype=coord_dtype,
+    )
+
+    manifest_size = os.path.getsize(out_path + '.json')
+    print(f"✓ Wrote {size:,} bytes of columns + {manifest_size:,} byte manifest")
+    print(f"  ({(size + manifest_size) / max(len(df), 1):.1f} bytes per event)")
+    print(f"\n✅ Ready to use in web dashboard!\n")
+
+
+if __name__ == "__main__":
+    input_file = "data/processed/events_with_types.csv"
+    if len(sys.argv) > 1:
+        input_file = sys.argv[1]
+
+    # Legacy dashboard (src/web) and React dashboard share the same format
+    convert_csv_to_binary(input_file, "src/web/realdata")
+    convert_csv_to_binary(input_file, "next-level-design-main/public/data/realCrimeData")
@@ -1,8 +1,15 @@
-import { useState, useMemo } from 'react';
+import { useState, useMemo, useEffect } from 'react';
 import { motion, AnimatePresence } from 'framer-motion';
 import { Search, Filter, MapPin, Clock, AlertCircle, CheckCircle, XCircle } from 'lucide-react';
 import { Event, QueryParams, DatasetType } from '../types';
 import { minutesToTime } from '../utils/queryEngine';
+import { SearchIndex, loadSearchIndex } from '../utils/searchIndex';
+
+// Inverted indexes built by pipeline.py / process_indian_data.py
+const SEARCH_INDEX_PATHS: Record<DatasetType, string> = {
+    chicago: '/data/realCrimeIndex',
+    india: '/data/indianCrimeIndex',
+};
 
 type CaseStatusFilter = 'all' | 'open' | 'closed';
 
@@ -34,6 +41,19 @@ export function CrimeSearch({ events, currentParams, onResultsFound, activeDatas
     const [caseStatusFilter, setCaseStatusFilter] = useState<CaseStatusFilter>('all');
     const [results, setResults] = useState<Event[]>([]);
     const [isSearching, setIsSearching] = useState(false);
+    const [searchIndex, setSearchIndex] = useState<SearchIndex | null>(null);
+
+    // The index only applies when its event IDs line up with the loaded events
+    useEffect(() => {
+        let cancelled = false;
+        setSearchIndex(null);
+        loadSearchIndex(SEARCH_INDEX_PATHS[activeDataset])
+            .then(index => {
+                if (!cancelled && index.count === events.length) setSearchIndex(index);
+            })
+            .catch(() => { /* fall back to scanning */ });
+        return () => { cancelled = true; };
+    }, [activeDataset, events]);
 
 
     // Get all unique crime types from the dataset
@@ -64,6 +84,45 @@ export function CrimeSearch({ events, currentParams, onResultsFound, activeDatas
                 searchTerms = [...searchTerms, ...CRIME_SIMILARITY[queryUpper]];
             }
 
+            const minX = Math.min(currentParams.x1, currentParams.x2);
+            const maxX = Math.max(currentParams.x1, currentParams.x2);
+            const minY = Math.min(currentParams.y1, currentParams.y2);
+            const maxY = Math.max(currentParams.y1, currentParams.y2);
+            const minT = Math.min(currentParams.t1, currentParams.t2);
+            const maxT = Math.max(currentParams.t1, currentParams.t2);
+
+            if (searchIndex) {
+                // Type (+ similar types) and case status postings are intersected
+                // first; only the matching events are range-checked
+                const ids = searchIndex.search(queryUpper, {
+                    similarTerms: searchTerms.slice(1),
+                    caseStatus: activeDataset === 'india' && caseStatusFilter !== 'all'
+                        ? caseStatusFilter : undefined,
+                });
+                const matchingEvents: Event[] = [];
+                ids.forEach(id => {
+                    const event = events[id];
+                    if (event.x >= minX && event.x <= maxX && event.y >= minY &&
+                        event.y <= maxY && event.time >= minT && event.time <= maxT) {
+                        matchingEvents.push(event);
+                    }
+                });
+
+                setResults(matchingEvents);
+                onResultsFound(matchingEvents);
+                setIsSearching(false);
+                return;
+            }
+
+            // Match the terms against each distinct type once, then test
+            // events by set membership instead of string search per event
+            const matchingTypes = new Set(
+                availableTypes.filter(type => {
+                    const typeUpper = type.toUpperCase();
+                    return searchTerms.some(term => typeUpper.includes(term));
+                })
+            );
+
             // Filter events by:
             // 1. Crime type match
             // 2. Within current spatial bounds
@@ -71,23 +130,15 @@ export function CrimeSearch({ events, currentParams, onResultsFound, activeDatas
             // 4. Case status (for India dataset only)
             const matchingEvents = events.filter(event => {
                 // Check crime type
-                const typeMatch = event.type && searchTerms.some(term =>
-                    event.type!.toUpperCase().includes(term)
-                );
-
-                if (!typeMatch) return false;
+                if (!event.type || !matchingTypes.has(event.type)) return false;
 
                 // Check spatial bounds
                 const inSpatialRange =
-                    event.x >= Math.min(currentParams.x1, currentParams.x2) &&
-                    event.x <= Math.max(currentParams.x1, currentParams.x2) &&
-                    event.y >= Math.min(currentParams.y1, currentParams.y2) &&
-                    event.y <= Math.max(currentParams.y1, currentParams.y2);
+                    event.x >= minX && event.x <= maxX &&
+                    event.y >= minY && event.y <= maxY;
 
                 // Check temporal range
-                const inTemporalRange =
-                    event.time >= Math.min(currentParams.t1, currentParams.t2) &&
-                    event.time <= Math.max(currentParams.t1, currentParams.t2);
+                const inTemporalRange = event.time >= minT && event.time <= maxT;
 
                 // Check case status (only for India dataset when filter is not 'all')
                 let caseStatusMatch = true;
@@ -3,11 +3,14 @@ import L from 'leaflet';
 import 'leaflet/dist/leaflet.css';
 import { MousePointer2, Crop } from 'lucide-react';
 import { Event } from '../types';
+import { DeltaCounter, SlabIndex, frameThrottle } from '../utils/deltaQuery';
 
 interface InteractiveMapProps {
     events: Event[];
     searchResults: Event[];
     onRegionSelect?: (bounds: { x1: number, y1: number, x2: number, y2: number }) => void;
+    liveIndex?: SlabIndex;                    // Live match count while dragging a selection
+    timeWindow?: { t1: number, t2: number };  // Time window of the live count
 }
 
 interface MapBounds {
@@ -20,7 +23,9 @@ interface MapBounds {
 export const InteractiveMap: React.FC<InteractiveMapProps> = ({
     events,
     searchResults,
-    onRegionSelect
+    onRegionSelect,
+    liveIndex,
+    timeWindow
 }) => {
     const mapRef = useRef<HTMLDivElement>(null);
     const leafletMapRef = useRef<L.Map | null>(null);
@@ -33,6 +38,12 @@ export const InteractiveMap: React.FC<InteractiveMapProps> = ({
     const selectionStartRef = useRef<L.LatLng | null>(null);
     const selectionRectRef = useRef<L.Rectangle | null>(null);
 
+    // Live count of the rectangle being dragged, updated from strip deltas
+    const [liveCount, setLiveCount] = useState<number | null>(null);
+    const deltaCounter = useMemo(() => liveIndex ? new DeltaCounter(liveIndex) : null, [liveIndex]);
+    const timeWindowRef = useRef(timeWindow);
+    timeWindowRef.current = timeWindow;
+
     // Create search result lookup
     const searchResultSet = useMemo(() => {
         return new Set(searchResults.map(e => `${e.x}-${e.y}-${e.time}`));
@@ -125,6 +136,18 @@ export const InteractiveMap: React.FC<InteractiveMapProps> = ({
         const map = leafletMapRef.current;
         if (!map) return;
 
+        // One count per animation frame, however fast the mouse moves
+        const updateLiveCount = frameThrottle((bounds: L.LatLngBounds) => {
+            const range = timeWindowRef.current;
+            if (!deltaCounter || !range) return;
+            setLiveCount(deltaCounter.update({
+                x1: bounds.getSouth(),
+                y1: bounds.getWest(),
+                x2: bounds.getNorth(),
+                y2: bounds.getEast()
+            }, range.t1, range.t2));
+        });
+
         const onMouseDown = (e: L.LeafletMouseEvent) => {
             if (!isSelectionMode) return;
 
@@ -141,6 +164,8 @@ export const InteractiveMap: React.FC<InteractiveMapProps> = ({
             }).addTo(selectionLayerRef.current!);
 
             selectionRectRef.current = rect;
+            deltaCounter?.reset();
+            updateLiveCount(bounds);
         };
 
         const onMouseMove = (e: L.LeafletMouseEvent) => {
@@ -148,12 +173,15 @@ export const InteractiveMap: React.FC<InteractiveMapProps> = ({
 
             const bounds = L.latLngBounds(selectionStartRef.current, e.latlng);
             selectionRectRef.current.setBounds(bounds);
+            updateLiveCount(bounds);
         };
 
         const onMouseUp = (e: L.LeafletMouseEvent) => {
             if (!isSelectionMode || !selectionStartRef.current || !selectionRectRef.current) return;
 
             const finalBounds = selectionRectRef.current.getBounds();
+            updateLiveCount.cancel();
+            setLiveCount(null);
 
             // Call prop
             if (onRegionSelect) {
@@ -191,8 +219,9 @@ export const InteractiveMap: React.FC<InteractiveMapProps> = ({
             map.off('mousedown', onMouseDown);
             map.off('mousemove', onMouseMove);
             map.off('mouseup', onMouseUp);
+            updateLiveCount.cancel();
         };
-    }, [isSelectionMode, onRegionSelect]);
+    }, [isSelectionMode, onRegionSelect, deltaCounter]);
 
     // Update markers when events change
     useEffect(() => {
@@ -340,6 +369,12 @@ export const InteractiveMap: React.FC<InteractiveMapProps> = ({
                 </div>
             )}
 
+            {liveCount !== null && (
+                <div className="absolute top-16 left-1/2 -translate-x-1/2 z-[1000] bg-black/60 backdrop-blur-sm px-3 py-1 rounded-full text-xs font-mono text-cyan-300 border border-cyan-500/30">
+                    {liveCount.toLocaleString()} matches
+                </div>
+            )}
+
             {searchResults.length > 0 && (
                 <div className="absolute bottom-4 right-14 z-[1000] bg-amber-500/20 backdrop-blur-xl px-3 py-2 rounded-lg border border-amber-500/30">
                     <p className="text-xs text-amber-400 font-bold">
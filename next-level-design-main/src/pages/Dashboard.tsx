@@ -13,10 +13,12 @@ import {
 } from 'lucide-react';
 import { toast } from 'sonner';
 
-import { realCrimeData } from '../data/realCrimeData';
 import { indianCrimeData } from '../data/indianCrimeData';
 import { Event, QueryParams, QueryResult, Stats, DatasetType, MapConfig } from '../types';
 import { executeQuery, minutesToTime, findHotspots } from '../utils/queryEngine';
+import { SlabIndex } from '../utils/deltaQuery';
+import { loadBinaryEvents, columnsToEvents } from '../utils/binaryEvents';
+import { DensityTileLevel, loadTileLevel, densityCells, drawDensityCells } from '../utils/densityTiles';
 import { mapToPixel, drawBackground } from '../utils/rendering';
 
 // Components
@@ -31,6 +33,11 @@ import { DatasetTabs } from '../components/DatasetTabs';
 import { InteractiveMap } from '../components/InteractiveMap';
 import Footer from '../components/Footer';
 
+// Columnar Chicago event store (public/data/realCrimeData.bin + .json)
+const CHICAGO_STORE = '/data/realCrimeData';
+// Density tile pyramid of the same events (pipeline.py tiles stage)
+const CHICAGO_TILES = '/data/tiles';
+
 // Dataset configurations
 const DATASET_CONFIGS: Record<DatasetType, MapConfig> = {
     chicago: {
@@ -55,10 +62,36 @@ const Dashboard: React.FC = () => {
     // Dataset switching state
     const [activeDataset, setActiveDataset] = useState<DatasetType>('chicago');
 
+    // Chicago events arrive as typed-array columns; empty until the store is fetched
+    const [realCrimeData, setRealCrimeData] = useState<Event[]>([]);
+
+    useEffect(() => {
+        let cancelled = false;
+        loadBinaryEvents(CHICAGO_STORE)
+            .then(columns => {
+                if (!cancelled) setRealCrimeData(columnsToEvents(columns));
+            })
+            .catch(() => toast.error('Could not load the Chicago event store'));
+        return () => { cancelled = true; };
+    }, []);
+
+    // Chicago map density is drawn from the tiles; without them every point is drawn
+    const [chicagoTiles, setChicagoTiles] = useState<DensityTileLevel | null>(null);
+
+    useEffect(() => {
+        let cancelled = false;
+        loadTileLevel(CHICAGO_TILES)
+            .then(level => {
+                if (!cancelled) setChicagoTiles(level);
+            })
+            .catch(() => { /* fall back to points */ });
+        return () => { cancelled = true; };
+    }, []);
+
     // Get current events and config based on active dataset
     const events = useMemo(() =>
         activeDataset === 'chicago' ? realCrimeData : indianCrimeData,
-        [activeDataset]
+        [activeDataset, realCrimeData]
     );
 
     // Filter events for display (Sampling for India to maintain performance)
@@ -73,6 +106,9 @@ const Dashboard: React.FC = () => {
         return events.filter((_, i) => i % step === 0);
     }, [events, activeDataset]);
 
+    // Sorted slabs of the full dataset for live drag-selection counts
+    const liveIndex = useMemo(() => new SlabIndex(events), [events]);
+
     // Calculate generic India count for the tab (so it matches what would be shown)
     const indiaDisplayCount = useMemo(() => {
         const total = indianCrimeData.length;
@@ -105,6 +141,18 @@ const Dashboard: React.FC = () => {
         lastResult: null
     });
     const [history, setHistory] = useState<QueryResult[]>([]);
+
+    // Tile cells for the selected time window, summed once per window change
+    const mapDensity = useMemo(() =>
+        activeDataset === 'chicago' && chicagoTiles ? densityCells(chicagoTiles, params.t1, params.t2) : null,
+        [activeDataset, chicagoTiles, params.t1, params.t2]
+    );
+
+    // Keep the event total in step with the dataset once it has loaded
+    useEffect(() => {
+        setStats(prev => ({ ...prev, totalEvents: events.length }));
+    }, [events]);
+
     const [isQuerying, setIsQuerying] = useState(false);
     const [searchResults, setSearchResults] = useState<Event[]>([]);
 
@@ -136,7 +184,7 @@ const Dashboard: React.FC = () => {
         setSearchResults([]);
         setHistory([]);
         toast.success(`Switched to ${dataset === 'chicago' ? '🇺🇸 Chicago' : '🇮🇳 India'} dataset`);
-    }, []);
+    }, [realCrimeData]);
 
     // Execute Query
     const handleQuery = useCallback(() => {
@@ -183,14 +231,19 @@ const Dashboard: React.FC = () => {
             ? 'rgba(34, 211, 238, 0.45)'
             : 'rgba(34, 211, 238, 0.35)'; // Slightly softer for high-density India
 
-        events.forEach(event => {
-            const px = mapToPixel(event.y, mapBounds.minY, mapBounds.maxY, 0, width);
-            const py = mapToPixel(event.x, mapBounds.minX, mapBounds.maxX, height, 0);
+        if (mapDensity) {
+            // One rectangle per non-empty tile cell, not one dot per event
+            drawDensityCells(ctx, mapDensity, mapBounds, width, height);
+        } else {
+            events.forEach(event => {
+                const px = mapToPixel(event.y, mapBounds.minY, mapBounds.maxY, 0, width);
+                const py = mapToPixel(event.x, mapBounds.minX, mapBounds.maxX, height, 0);
 
-            // Smaller dots for that 'screen of data' feel
-            const size = activeDataset === 'india' ? 1.2 : 1.5;
-            ctx.fillRect(px, py, size, size);
-        });
+                // Smaller dots for that 'screen of data' feel
+                const size = activeDataset === 'india' ? 1.2 : 1.5;
+                ctx.fillRect(px, py, size, size);
+            });
+        }
 
         // Draw City Labels for India dataset (every 1000th point of a specific city for variety)
         if (activeDataset === 'india') {
@@ -289,7 +342,7 @@ const Dashboard: React.FC = () => {
             ctx.fillStyle = activeDataset === 'chicago' ? 'rgba(192, 132, 252, 0.05)' : 'rgba(251, 146, 60, 0.05)';
             ctx.fillRect(Math.min(px1, px2), Math.min(py1, py2), Math.abs(px2 - px1), Math.abs(py2 - py1));
         }
-    }, [events, params, dragState, mapBounds, searchResults]);
+    }, [events, params, dragState, mapBounds, searchResults, mapDensity]);
 
     // Optimized Animation Loop using RAF for zero lag
     useEffect(() => {
@@ -455,6 +508,8 @@ const Dashboard: React.FC = () => {
                             <InteractiveMap
                                 events={displayEvents}
                                 searchResults={searchResults}
+                                liveIndex={liveIndex}
+                                timeWindow={{ t1: params.t1, t2: params.t2 }}
                                 onRegionSelect={(bounds) => {
                                     setParams(prev => ({
                                         ...prev,
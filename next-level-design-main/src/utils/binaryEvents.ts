@@ -0,0 +1,132 @@
+import { Event } from '../types';
+
+type ColumnArray = Float32Array | Float64Array | Int32Array | Uint8Array | Uint16Array | Uint32Array;
+
+const COLUMN_ARRAY_TYPES: Record<string, { new(buffer: ArrayBuffer, offset: number, length: number): ColumnArray }> = {
+    float32: Float32Array,
+    float64: Float64Array,
+    int32: Int32Array,
+    uint8: Uint8Array,
+    uint16: Uint16Array,
+    uint32: Uint32Array,
+};
+
+interface StoreManifest {
+    format: string;
+    version: number;
+    count: number;
+    columns: Record<string, { dtype: string; offset: number }>;
+    types?: string[];
+    descriptions?: string[];
+    projection?: StoreProjection;
+}
+
+/**
+ * Local projection of a store with int32 fixed-point coordinates
+ * (src/python/projection.py): x = northing, y = easting, in `unit` metres
+ */
+export interface StoreProjection {
+    kind: 'tmerc-sphere';
+    lat0: number;
+    lon0: number;
+    unit: number;
+    radius: number;
+}
+
+/**
+ * Projected x / y columns -> lat / lon (spherical transverse Mercator inverse)
+ */
+export const unproject = (projection: StoreProjection, x: Int32Array, y: Int32Array) => {
+    const { lat0, lon0, unit, radius } = projection;
+    const phi0 = lat0 * Math.PI / 180;
+    const lat = new Float64Array(x.length);
+    const lon = new Float64Array(x.length);
+    for (let i = 0; i < x.length; i++) {
+        const d = x[i] * unit / radius + phi0;
+        const e = y[i] * unit / radius;
+        lat[i] = Math.asin(Math.sin(d) / Math.cosh(e)) * 180 / Math.PI;
+        lon[i] = lon0 + Math.atan2(Math.sinh(e), Math.cos(d)) * 180 / Math.PI;
+    }
+    return { lat, lon };
+};
+
+/**
+ * Columnar view of a dataset written by convert_to_binary.py
+ * Every column is a typed array over one shared ArrayBuffer, except x / y
+ * of projected stores, which are decoded to lat / lon (the int32 plane
+ * coordinates stay available as projected)
+ */
+export interface EventColumns {
+    count: number;
+    x: Float32Array | Float64Array;
+    y: Float32Array | Float64Array;
+    time: Uint16Array;
+    weight?: Uint8Array | Uint16Array | Uint32Array;
+    type?: Uint8Array | Uint16Array | Uint32Array;
+    description?: Uint8Array | Uint16Array | Uint32Array;
+    types: string[];         // type code -> name
+    descriptions: string[];  // description code -> text
+    projected?: { x: Int32Array; y: Int32Array; projection: StoreProjection };
+}
+
+/**
+ * Fetch `<basePath>.json` + `<basePath>.bin` and wrap the columns without copying
+ */
+export const loadBinaryEvents = async (basePath: string): Promise<EventColumns> => {
+    const [manifestResponse, bufferResponse] = await Promise.all([
+        fetch(`${basePath}.json`),
+        fetch(`${basePath}.bin`),
+    ]);
+    if (!manifestResponse.ok || !bufferResponse.ok) {
+        throw new Error(`Binary event store not found at ${basePath}`);
+    }
+
+    const manifest: StoreManifest = await manifestResponse.json();
+    const buffer = await bufferResponse.arrayBuffer();
+
+    const columns: Record<string, ColumnArray> = {};
+    Object.entries(manifest.columns).forEach(([name, info]) => {
+        columns[name] = new COLUMN_ARRAY_TYPES[info.dtype](buffer, info.offset, manifest.count);
+    });
+
+    let x = columns.x as Float32Array | Float64Array;
+    let y = columns.y as Float32Array | Float64Array;
+    let projected: EventColumns['projected'];
+    if (manifest.projection) {
+        projected = { x: columns.x as Int32Array, y: columns.y as Int32Array, projection: manifest.projection };
+        ({ lat: x, lon: y } = unproject(manifest.projection, projected.x, projected.y));
+    }
+
+    return {
+        count: manifest.count,
+        x,
+        y,
+        time: columns.time as Uint16Array,
+        weight: columns.weight as EventColumns['weight'],
+        type: columns.type as EventColumns['type'],
+        description: columns.description as EventColumns['description'],
+        types: manifest.types ?? [],
+        descriptions: manifest.descriptions ?? [],
+        projected,
+    };
+};
+
+/**
+ * Expand columns into Event objects for components that still expect Event[]
+ */
+export const columnsToEvents = (columns: EventColumns): Event[] => {
+    const events: Event[] = new Array(columns.count);
+
+    for (let i = 0; i < columns.count; i++) {
+        events[i] = {
+            x: columns.x[i],
+            y: columns.y[i],
+            time: columns.time[i],
+            weight: columns.weight ? columns.weight[i] : 1,
+            type: columns.type ? columns.types[columns.type[i]] : undefined,
+            description: columns.description ? columns.descriptions[columns.description[i]] : undefined,
+        };
+    }
+
+    return events;
+};
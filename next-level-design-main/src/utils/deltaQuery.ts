@@ -0,0 +1,257 @@
+import { Event } from '../types';
+
+/**
+ * Live counts for drag selection
+ *
+ * While a selection rectangle is dragged, consecutive rectangles share
+ * almost all of their area, so instead of rescanning every event per
+ * mouse move the count is updated with the strips that entered and left:
+ *
+ *   count(next) = count(prev) + count(next \ prev) - count(prev \ next)
+ *
+ * Strips are counted against a SlabIndex (events sorted by x and by y),
+ * and updates are coalesced to one per animation frame. Same semantics
+ * as executeQuery: closed box, time window wraps midnight when t1 > t2.
+ * Mirrors src/cpp/delta_query.h.
+ */
+
+export interface Box {
+    x1: number;
+    y1: number;
+    x2: number;
+    y2: number;
+}
+
+const normalize = ({ x1, y1, x2, y2 }: Box): Box => ({
+    x1: Math.min(x1, x2),
+    y1: Math.min(y1, y2),
+    x2: Math.max(x1, x2),
+    y2: Math.max(y1, y2),
+});
+
+const intersects = (a: Box, b: Box) =>
+    a.x1 <= b.x2 && b.x1 <= a.x2 && a.y1 <= b.y2 && b.y1 <= a.y2;
+
+const area = (b: Box) => (b.x2 - b.x1) * (b.y2 - b.y1);
+
+/**
+ * Largest double below / above v (one ulp), so strips never include
+ * points on the edge of the box being subtracted
+ */
+const ulpBuffer = new Float64Array(1);
+const ulpBits = new BigInt64Array(ulpBuffer.buffer);
+const nextDown = (v: number): number => {
+    if (v === 0) return -Number.MIN_VALUE;
+    ulpBuffer[0] = v;
+    ulpBits[0] += v > 0 ? -1n : 1n;
+    return ulpBuffer[0];
+};
+const nextUp = (v: number): number => -nextDown(-v);
+
+/**
+ * a \ b as up to four disjoint closed strips (both boxes normalized)
+ */
+export const subtractBox = (a: Box, b: Box): Box[] => {
+    if (!intersects(a, b)) return [a];
+
+    const ix1 = Math.max(a.x1, b.x1), ix2 = Math.min(a.x2, b.x2);
+    const iy1 = Math.max(a.y1, b.y1), iy2 = Math.min(a.y2, b.y2);
+    const strips: Box[] = [];
+    if (a.x1 < ix1) strips.push({ x1: a.x1, y1: a.y1, x2: nextDown(ix1), y2: a.y2 });
+    if (ix2 < a.x2) strips.push({ x1: nextUp(ix2), y1: a.y1, x2: a.x2, y2: a.y2 });
+    if (a.y1 < iy1) strips.push({ x1: ix1, y1: a.y1, x2: ix2, y2: nextDown(iy1) });
+    if (iy2 < a.y2) strips.push({ x1: ix1, y1: nextUp(iy2), x2: ix2, y2: a.y2 });
+    return strips;
+};
+
+interface Slab {
+    key: Float64Array;    // Sorted coordinate
+    other: Float64Array;  // The other coordinate
+    time: Uint16Array;
+}
+
+/**
+ * Events sorted by x and by y: a box count binary-searches both slabs
+ * and scans the smaller one, which is cheap for the thin strips of a drag
+ */
+export class SlabIndex {
+    private byX: Slab;
+    private byY: Slab;
+
+    constructor(events: Event[]) {
+        this.byX = SlabIndex.slab(events, e => e.x, e => e.y);
+        this.byY = SlabIndex.slab(events, e => e.y, e => e.x);
+    }
+
+    private static slab(events: Event[], key: (e: Event) => number, other: (e: Event) => number): Slab {
+        const order = Array.from(events.keys()).sort((a, b) => key(events[a]) - key(events[b]));
+        const slab: Slab = {
+            key: new Float64Array(events.length),
+            other: new Float64Array(events.length),
+            time: new Uint16Array(events.length),
+        };
+        order.forEach((id, i) => {
+            slab.key[i] = key(events[id]);
+            slab.other[i] = other(events[id]);
+            slab.time[i] = events[id].time;
+        });
+        return slab;
+    }
+
+    get size(): number {
+        return this.byX.key.length;
+    }
+
+    /**
+     * Number of events in the closed box and time window
+     */
+    count(box: Box, t1: number, t2: number): number {
+        const b = normalize(box);
+        const xLo = lowerBound(this.byX.key, b.x1), xHi = upperBound(this.byX.key, b.x2);
+        const yLo = lowerBound(this.byY.key, b.y1), yHi = upperBound(this.byY.key, b.y2);
+
+        return xHi - xLo <= yHi - yLo
+            ? scanSlab(this.byX, xLo, xHi, b.y1, b.y2, t1, t2)
+            : scanSlab(this.byY, yLo, yHi, b.x1, b.x2, t1, t2);
+    }
+}
+
+const lowerBound = (keys: Float64Array, value: number): number => {
+    let lo = 0, hi = keys.length;
+    while (lo < hi) {
+        const mid = (lo + hi) >>> 1;
+        if (keys[mid] < value) lo = mid + 1; else hi = mid;
+    }
+    return lo;
+};
+
+const upperBound = (keys: Float64Array, value: number): number => {
+    let lo = 0, hi = keys.length;
+    while (lo < hi) {
+        const mid = (lo + hi) >>> 1;
+        if (keys[mid] <= value) lo = mid + 1; else hi = mid;
+    }
+    return lo;
+};
+
+const scanSlab = (slab: Slab, from: number, to: number, lo: number, hi: number, t1: number, t2: number): number => {
+    const { other, time } = slab;
+    let count = 0;
+    if (t1 <= t2) {
+        for (let i = from; i < to; i++) {
+            if (other[i] >= lo && other[i] <= hi && time[i] >= t1 && time[i] <= t2) count++;
+        }
+    } else {
+        // Wraps around midnight
+        for (let i = from; i < to; i++) {
+            if (other[i] >= lo && other[i] <= hi && (time[i] >= t1 || time[i] <= t2)) count++;
+        }
+    }
+    return count;
+};
+
+/**
+ * Keeps the last selection and its count; update() recounts only the
+ * strips between the previous and the new rectangle. Falls back to a full
+ * count for the first rectangle, a new time window, or when the
+ * rectangles overlap by less than `minOverlap` of the new one.
+ */
+export class DeltaCounter {
+    private box: Box | null = null;
+    private t1 = 0;
+    private t2 = 0;
+    private current = 0;
+
+    updates = 0;
+    fullCounts = 0;
+    stripQueries = 0;
+
+    constructor(private index: SlabIndex, private minOverlap = 0.5) {}
+
+    update(selection: Box, t1: number, t2: number): number {
+        this.updates++;
+        const next = normalize(selection);
+        const prev = this.box;
+        const sameTime = prev !== null && t1 === this.t1 && t2 === this.t2;
+
+        let incremental = sameTime && intersects(next, prev!);
+        if (incremental) {
+            const overlap = {
+                x1: Math.max(next.x1, prev!.x1), y1: Math.max(next.y1, prev!.y1),
+                x2: Math.min(next.x2, prev!.x2), y2: Math.min(next.y2, prev!.y2),
+            };
+            incremental = area(overlap) >= this.minOverlap * area(next);
+        }
+
+        if (incremental) {
+            for (const strip of subtractBox(next, prev!)) {
+                this.current += this.index.count(strip, t1, t2);
+                this.stripQueries++;
+            }
+            for (const strip of subtractBox(prev!, next)) {
+                this.current -= this.index.count(strip, t1, t2);
+                this.stripQueries++;
+            }
+        } else {
+            this.current = this.index.count(next, t1, t2);
+            this.fullCounts++;
+        }
+
+        this.box = next;
+        this.t1 = t1;
+        this.t2 = t2;
+        return this.current;
+    }
+
+    reset() {
+        this.box = null;
+    }
+
+    get count(): number {
+        return this.current;
+    }
+}
+
+/**
+ * Coalesce bursts of calls (e.g. mousemove) into at most one call per
+ * animation frame and per `minIntervalMs`, always with the latest
+ * arguments. flush() runs a pending call now, cancel() drops it.
+ */
+export const frameThrottle = <A extends unknown[]>(fn: (...args: A) => void, minIntervalMs = 0) => {
+    let pending: A | null = null;
+    let frame: number | null = null;
+    let lastRun = -Infinity;
+
+    const run = (now: number) => {
+        frame = null;
+        if (!pending) return;
+        if (now - lastRun < minIntervalMs) {
+            frame = requestAnimationFrame(run);
+            return;
+        }
+        const args = pending;
+        pending = null;
+        lastRun = now;
+        fn(...args);
+    };
+
+    const throttled = (...args: A) => {
+        pending = args;
+        if (frame === null) frame = requestAnimationFrame(run);
+    };
+    throttled.flush = () => {
+        if (frame !== null) cancelAnimationFrame(frame);
+        frame = null;
+        if (!pending) return;
+        const args = pending;
+        pending = null;
+        lastRun = performance.now();
+        fn(...args);
+    };
+    throttled.cancel = () => {
+        if (frame !== null) cancelAnimationFrame(frame);
+        frame = null;
+        pending = null;
+    };
+    return throttled;
+};
@@ -0,0 +1,149 @@
+import { MapBounds } from '../types';
+import { mapToPixel } from './rendering';
+
+/**
+ * Density tiles written by pipeline.py (src/python/tile_pyramid.py):
+ * `<basePath>/tiles.json` lists the non-empty tiles per zoom, and each
+ * tile is a sparse `<basePath>/z/x/y.bin` of (cell, hour bucket) counts.
+ * Drawing from a level costs one rectangle per non-empty cell, however
+ * many events were aggregated into it.
+ */
+
+interface TileManifest {
+    format: string;
+    version: number;
+    bounds: [number, number, number, number];  // min_lat, max_lat, min_lon, max_lon
+    max_zoom: number;
+    tile_size: number;
+    hour_buckets: number;
+    tiles: Record<string, [number, number][]>;
+}
+
+interface DensityTile {
+    tx: number;
+    ty: number;
+    keys: Uint32Array;    // (row * tileSize + col) * hourBuckets + hour
+    counts: Uint32Array;
+}
+
+export interface DensityTileLevel {
+    bounds: [number, number, number, number];
+    zoom: number;
+    tileSize: number;
+    hourBuckets: number;
+    tiles: DensityTile[];
+}
+
+/**
+ * Non-empty cells of a level (row 0 is the northern edge)
+ */
+export interface DensityCells {
+    bounds: [number, number, number, number];
+    grid: number;          // Cells per side
+    cells: Uint32Array;    // row * grid + col
+    weights: Float64Array;
+    max: number;
+}
+
+const TILE_MAGIC = 'STT1';
+
+const parseTile = (buffer: ArrayBuffer, tx: number, ty: number): DensityTile => {
+    const magic = String.fromCharCode(...new Uint8Array(buffer, 0, 4));
+    if (magic !== TILE_MAGIC) throw new Error(`Not a density tile: ${tx}/${ty}`);
+    const n = new DataView(buffer).getUint32(4, true);
+    return {
+        tx,
+        ty,
+        keys: new Uint32Array(buffer, 8, n),
+        counts: new Uint32Array(buffer, 8 + 4 * n, n),
+    };
+};
+
+/**
+ * Fetch every tile of one zoom level (the finest one by default)
+ */
+export const loadTileLevel = async (basePath: string, zoom?: number): Promise<DensityTileLevel> => {
+    const response = await fetch(`${basePath}/tiles.json`);
+    if (!response.ok) throw new Error(`Density tiles not found at ${basePath}`);
+    const manifest: TileManifest = await response.json();
+
+    const level = Math.min(zoom ?? manifest.max_zoom, manifest.max_zoom);
+    const tiles = await Promise.all((manifest.tiles[String(level)] ?? []).map(async ([tx, ty]) => {
+        const tileResponse = await fetch(`${basePath}/${level}/${tx}/${ty}.bin`);
+        if (!tileResponse.ok) throw new Error(`Density tile ${level}/${tx}/${ty} not found`);
+        return parseTile(await tileResponse.arrayBuffer(), tx, ty);
+    }));
+
+    return {
+        bounds: manifest.bounds,
+        zoom: level,
+        tileSize: manifest.tile_size,
+        hourBuckets: manifest.hour_buckets,
+        tiles,
+    };
+};
+
+/**
+ * Sum a level over the hour buckets covering minutes [t1, t2]
+ * (wrapping past midnight when t1 > t2)
+ */
+export const densityCells = (level: DensityTileLevel, t1: number, t2: number): DensityCells => {
+    const { tileSize, hourBuckets } = level;
+    const tilesPerSide = 1 << level.zoom;
+    const grid = tilesPerSide * tileSize;
+    const h1 = Math.floor(t1 * hourBuckets / 1440);
+    const h2 = Math.floor(t2 * hourBuckets / 1440);
+
+    const sums = new Float64Array(grid * grid);
+    level.tiles.forEach(({ tx, ty, keys, counts }) => {
+        for (let i = 0; i < keys.length; i++) {
+            const hour = keys[i] % hourBuckets;
+            if (h1 <= h2 ? hour < h1 || hour > h2 : hour < h1 && hour > h2) continue;
+            const local = Math.floor(keys[i] / hourBuckets);
+            const row = ty * tileSize + Math.floor(local / tileSize);
+            const col = tx * tileSize + local % tileSize;
+            sums[row * grid + col] += counts[i];
+        }
+    });
+
+    let n = 0;
+    let max = 0;
+    const cells = new Uint32Array(grid * grid);
+    const weights = new Float64Array(grid * grid);
+    for (let cell = 0; cell < sums.length; cell++) {
+        if (sums[cell] === 0) continue;
+        cells[n] = cell;
+        weights[n++] = sums[cell];
+        max = Math.max(max, sums[cell]);
+    }
+
+    return { bounds: level.bounds, grid, cells: cells.slice(0, n), weights: weights.slice(0, n), max };
+};
+
+/**
+ * Fill every non-empty cell in the current fillStyle, opacity by log count
+ */
+export const drawDensityCells = (
+    ctx: CanvasRenderingContext2D,
+    density: DensityCells,
+    mapBounds: MapBounds,
+    width: number,
+    height: number
+) => {
+    const [minLat, maxLat, minLon, maxLon] = density.bounds;
+    const cellLat = (maxLat - minLat) / density.grid;
+    const cellLon = (maxLon - minLon) / density.grid;
+    const w = Math.max(1, width * cellLon / (mapBounds.maxY - mapBounds.minY));
+    const h = Math.max(1, height * cellLat / (mapBounds.maxX - mapBounds.minX));
+    const scale = Math.log1p(density.max) || 1;
+
+    for (let i = 0; i < density.cells.length; i++) {
+        const row = Math.floor(density.cells[i] / density.grid);
+        const col = density.cells[i] % density.grid;
+        const px = mapToPixel(minLon + col * cellLon, mapBounds.minY, mapBounds.maxY, 0, width);
+        const py = mapToPixel(maxLat - row * cellLat, mapBounds.minX, mapBounds.maxX, height, 0);
+        ctx.globalAlpha = 0.25 + 0.75 * Math.log1p(density.weights[i]) / scale;
+        ctx.fillRect(px, py, w, h);
+    }
+    ctx.globalAlpha = 1;
+};
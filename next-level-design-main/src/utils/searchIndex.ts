@@ -0,0 +1,155 @@
+/**
+ * Inverted search index written by pipeline.py
+ * (src/python/inverted_index.py). Postings are roaring-style bitmaps of
+ * event IDs; IDs are positions in the exported dataset.
+ */
+
+interface IndexManifest {
+    format: string;
+    version: number;
+    count: number;
+    // field -> token -> [byte offset, container count, cardinality]
+    fields: Record<string, Record<string, [number, number, number]>>;
+}
+
+const ARRAY_CONTAINER = 0;
+const BITSET_WORDS = 2048;  // 65536 bits as 32-bit words
+
+/**
+ * Decode one serialized bitmap into sorted event IDs
+ */
+const decodeBitmap = (buffer: ArrayBuffer, offset: number, containers: number, cardinality: number): Uint32Array => {
+    const ids = new Uint32Array(cardinality);
+    const view = new DataView(buffer);
+    let n = 0;
+
+    for (let c = 0; c < containers; c++) {
+        const high = view.getUint16(offset, true) << 16;
+        const kind = view.getUint16(offset + 2, true);
+        const card = view.getUint32(offset + 4, true);
+        offset += 8;
+
+        if (kind === ARRAY_CONTAINER) {
+            for (let i = 0; i < card; i++) {
+                ids[n++] = (high | view.getUint16(offset + 2 * i, true)) >>> 0;
+            }
+            offset += 2 * card + ((4 - ((2 * card) % 4)) % 4);
+        } else {
+            const words = new Uint32Array(buffer, offset, BITSET_WORDS);
+            for (let w = 0; w < BITSET_WORDS; w++) {
+                let word = words[w];
+                while (word !== 0) {
+                    const bit = 31 - Math.clz32(word & -word);
+                    ids[n++] = (high | (w * 32 + bit)) >>> 0;
+                    word &= word - 1;
+                }
+            }
+            offset += 4 * BITSET_WORDS;
+        }
+    }
+    return ids;
+};
+
+/**
+ * Union of sorted ID lists
+ */
+export const unionSorted = (lists: Uint32Array[]): Uint32Array => {
+    if (lists.length === 0) return new Uint32Array(0);
+    if (lists.length === 1) return lists[0];
+    const merged = new Uint32Array(lists.reduce((n, list) => n + list.length, 0));
+    let n = 0;
+    lists.forEach(list => { merged.set(list, n); n += list.length; });
+    merged.sort();
+
+    let unique = 0;
+    for (let i = 0; i < merged.length; i++) {
+        if (i === 0 || merged[i] !== merged[i - 1]) merged[unique++] = merged[i];
+    }
+    return merged.slice(0, unique);
+};
+
+/**
+ * Intersection of two sorted ID lists (galloping over the longer one)
+ */
+export const intersectSorted = (a: Uint32Array, b: Uint32Array): Uint32Array => {
+    if (a.length > b.length) [a, b] = [b, a];
+    const out = new Uint32Array(a.length);
+    let n = 0;
+    let lo = 0;
+    for (let i = 0; i < a.length && lo < b.length; i++) {
+        let step = 1;
+        let hi = lo;
+        while (hi < b.length && b[hi] < a[i]) { lo = hi + 1; hi += step; step *= 2; }
+        hi = Math.min(hi, b.length - 1);
+        while (lo < hi) {
+            const mid = (lo + hi) >> 1;
+            if (b[mid] < a[i]) lo = mid + 1; else hi = mid;
+        }
+        if (b[lo] === a[i]) out[n++] = a[i];
+    }
+    return out.slice(0, n);
+};
+
+export interface SearchOptions {
+    similarTerms?: string[];        // Extra type terms (similarity expansion)
+    caseStatus?: 'open' | 'closed'; // India data only
+    city?: string;                  // India data only
+}
+
+export class SearchIndex {
+    private cache = new Map<string, Uint32Array>();
+
+    constructor(private manifest: IndexManifest, private buffer: ArrayBuffer) {}
+
+    get count(): number {
+        return this.manifest.count;
+    }
+
+    /**
+     * Sorted event IDs of one token (decoded once, then cached)
+     */
+    lookup(field: string, token: string): Uint32Array {
+        const key = `${field}\u0000${token}`;
+        let ids = this.cache.get(key);
+        if (!ids) {
+            const entry = this.manifest.fields[field]?.[token];
+            ids = entry ? decodeBitmap(this.buffer, entry[0], entry[1], entry[2]) : new Uint32Array(0);
+            this.cache.set(key, ids);
+        }
+        return ids;
+    }
+
+    /**
+     * Events whose type contains one of the terms (substring match over the type vocabulary)
+     */
+    matchTypes(terms: string[]): Uint32Array {
+        const upper = terms.map(term => term.trim().toUpperCase()).filter(Boolean);
+        const names = Object.keys(this.manifest.fields.type ?? {})
+            .filter(name => upper.some(term => name.toUpperCase().includes(term)));
+        return unionSorted(names.map(name => this.lookup('type', name)));
+    }
+
+    /**
+     * Type search with optional similarity expansion, case status and city filters
+     */
+    search(query: string, options: SearchOptions = {}): Uint32Array {
+        let result = this.matchTypes([query, ...(options.similarTerms ?? [])]);
+        if (options.caseStatus) result = intersectSorted(result, this.lookup('status', options.caseStatus));
+        if (options.city) result = intersectSorted(result, this.lookup('city', options.city));
+        return result;
+    }
+}
+
+/**
+ * Fetch `<basePath>.json` + `<basePath>.bin`
+ */
+export const loadSearchIndex = async (basePath: string): Promise<SearchIndex> => {
+    const [manifestResponse, bufferResponse] = await Promise.all([
+        fetch(`${basePath}.json`),
+        fetch(`${basePath}.bin`),
+    ]);
+    if (!manifestResponse.ok || !bufferResponse.ok) {
+        throw new Error(`Search index not found at ${basePath}`);
+    }
+    return new SearchIndex(await manifestResponse.json(), await bufferResponse.arrayBuffer());
+};
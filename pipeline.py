@@ -0,0 +1,479 @@
+"""
+Chicago Crime Data Pipeline
+Reads the raw Chicago crime CSV once and produces every derived artifact
+
+Stages (each one only runs when the content hash of its inputs, including
+the src/python modules it uses, or its config changed since the last run):
+
+    ingest        raw CSV -> cached columnar event store (single parse)
+    events_csv    data/processed/events.csv              (x,y,time,weight)
+    typed_csv     data/processed/events_with_types.csv   (+ type, description)
+    binary        src/web/realdata + public/data/realCrimeData (.bin/.json)
+    web_js        src/web/realdata.js                    (legacy dashboard)
+    similarity    next-level-design-main/src/data/crimeSimilarity.ts
+    search_index  next-level-design-main/public/data/realCrimeIndex (.bin/.json)
+    density       next-level-design-main/public/data/density/ (KDE heatmap per
+                  time window: .png + float32 .f32, listed in density.json)
+    tiles         next-level-design-main/public/data/tiles/ (quadtree x hour
+                  count tiles z/x/y.bin, listed in tiles.json); new events are
+                  merged into the cached pyramid when the store only grew
+
+Usage:
+    python pipeline.py                   # run what is out of date
+    python pipeline.py --max-events 5000
+    python pipeline.py --force           # ignore the cache
+    python pipeline.py --only binary     # one stage (plus what it needs)
+    python pipeline.py --project chicago # int32 cm coordinates (projection.py)
+
+With a projection, ingest stores int32 fixed-point northing / easting
+around a fixed regional origin instead of float64 lat/lon; the binary
+stores then carry those coordinates (the engine's --store mode and the
+dashboards read the projection from the store manifest), while the
+text exports (CSVs, web data) and the density grids are decoded to
+lat/lon, since they have nowhere to record the projection.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time as timer
+import numpy as np
+import pandas as pd
+
+ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(ROOT_DIR, 'src', 'python'))
+from event_store import write_event_store, read_event_store, decode_column, decode_coordinates, \
+    store_projection
+from projection import LocalProjection, REGION_ORIGINS
+from crime_types import TypeDictionary, CRIME_SIMILARITY
+from inverted_index import InvertedIndex
+from density import DensityGrid
+from tile_pyramid import TilePyramid
+
+CACHE_DIR = os.path.join(ROOT_DIR, 'data', 'processed', '.pipeline')
+STATE_FILE = os.path.join(CACHE_DIR, 'state.json')
+INGESTED = os.path.join(CACHE_DIR, 'events')
+TILE_STATE = os.path.join(CACHE_DIR, 'tiles')   # Pyramid (.npz) + the events it holds (.json)
+
+DEFAULT_CONFIG = {
+    'raw_csv': 'Crimes_-_2001_to_Present_20251223.csv',
+    'max_events': 10000,                     # Rows read from the raw CSV
+    'bounds': [41.6, 42.1, -87.95, -87.5],   # Rough Chicago area (lat, lat, lon, lon)
+    'description_length': 100,
+    'projection': None,                      # None (lat/lon), a REGION_ORIGINS name or 'auto'
+    'density_shape': [256, 256],             # Heatmap grid (rows along lat, cols along lon)
+    'density_kernel': 'gaussian',
+    'density_bandwidth': 2.0,                # Kernel bandwidth in grid cells
+    'density_windows': [[h * 60, h * 60 + 179] for h in range(0, 24, 3)] + [[0, 1439]],
+    'tiles_max_zoom': 3,                     # 2^3 x 2^3 tiles of 64x64 cells at the finest level
+}
+
+# Date formats seen in the Chicago exports, tried in order
+DATE_FORMATS = [
+    '%m/%d/%Y %I:%M:%S %p',  # 12/15/2024 11:30:00 PM
+    '%m/%d/%Y %H:%M:%S',      # 12/15/2024 23:30:00
+    '%Y-%m-%d %H:%M:%S',      # 2024-12-15 23:30:00
+    '%m/%d/%Y %H:%M',         # 12/15/2024 23:30
+    '%m/%d/%Y',               # 12/15/2024 (midnight)
+]
+
+
+def path(rel):
+    return os.path.join(ROOT_DIR, rel)
+
+
+# ----------------------------------------------------------------------
+# Stages
+# ----------------------------------------------------------------------
+
+def parse_dates(dates):
+    """Vectorized date strings -> datetimes (NaT where no format matches)"""
+    dates = pd.Series(dates, dtype=object).fillna('').str.strip()
+    parsed = pd.Series(pd.NaT, index=dates.index, dtype='datetime64[ns]')
+    for fmt in DATE_FORMATS:
+        missing = parsed.isna()
+        if not missing.any():
+            break
+        parsed[missing] = pd.to_datetime(dates[missing], format=fmt, errors='coerce')
+    return parsed
+
+
+def ingest(config):
+    """Parse the raw CSV once into the cached columnar store"""
+    df = pd.read_csv(path(config['raw_csv']), nrows=config['max_events'], dtype=str,
+                     keep_default_na=False)
+    rows = len(df)
+
+    lat = pd.to_numeric(df.get('Latitude', pd.Series('', index=df.index)).str.strip(),
+                        errors='coerce').to_numpy()
+    lon = pd.to_numeric(df.get('Longitude', pd.Series('', index=df.index)).str.strip(),
+                        errors='coerce').to_numpy()
+    dates = parse_dates(df.get('Date', pd.Series('', index=df.index)))
+    minutes = (dates.dt.hour * 60 + dates.dt.minute).to_numpy()
+
+    min_lat, max_lat, min_lon, max_lon = config['bounds']
+    keep = (~np.isnan(lat) & ~np.isnan(lon) & ~np.isnan(minutes) &
+            (lat >= min_lat) & (lat <= max_lat) & (lon >= min_lon) & (lon <= max_lon))
+
+    kept = df[keep]
+    raw_types = kept['Primary Type'] if 'Primary Type' in kept else pd.Series('OTHER', index=kept.index)
+    types = TypeDictionary.standard()
+    type_codes = types.encode(raw_types)
+
+    descriptions = kept['Description'].str.strip() if 'Description' in kept \
+        else pd.Series('', index=kept.index)
+    descriptions = descriptions.str[:config['description_length']]
+    descriptions = descriptions.where(descriptions != '',
+                                      pd.Series(types.decode(type_codes), index=kept.index))
+
+    projection = LocalProjection.resolve(config['projection'], lat[keep], lon[keep])
+    write_event_store(INGESTED, lat[keep], lon[keep], minutes[keep].astype(np.int64),
+                      types=type_codes, type_dictionary=types,
+                      descriptions=descriptions.to_numpy(), coord_dtype=np.float64,
+                      timestamps=dates[keep].to_numpy(dtype='datetime64[m]'),
+                      projection=projection)
+    return f"{int(keep.sum()):,} events from {rows:,} rows ({rows - int(keep.sum()):,} skipped)"
+
+
+def load_ingested():
+    """
+    Ingested columns; x / y are always lat / lon, and for a projected
+    store 'projection' is set and px / py hold the int32 coordinates
+    """
+    columns, manifest = read_event_store(INGESTED, mmap=False)
+    lat, lon = decode_coordinates(columns, manifest)
+    projection = store_projection(manifest)
+    return {
+        'x': lat,
+        'y': lon,
+        'projection': projection,
+        'px': columns['x'] if projection else None,
+        'py': columns['y'] if projection else None,
+        'time': columns['time'].astype(np.int64),
+        'weight': columns['weight'].astype(np.int64),
+        'type': decode_column(columns, manifest, 'type'),
+        'description': decode_column(columns, manifest, 'description'),
+        'timestamp': columns['timestamp'].astype(np.int64),  # Minutes since 1970
+    }
+
+
+def fixed6(values):
+    """Coordinates formatted like the CSV exports ('%.6f')"""
+    return np.char.mod('%.6f', values)
+
+
+def write_events_csv(config):
+    e = load_ingested()
+    # Always lat/lon: the CSV has no manifest to carry a projection
+    lines = np.char.add(np.char.add(fixed6(e['x']), ','), fixed6(e['y']))
+    lines = [f"{xy},{t},{w}\n" for xy, t, w in zip(lines, e['time'], e['weight'])]
+    target = path('data/processed/events.csv')
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    with open(target, 'w', newline='') as f:
+        f.write('x,y,time,weight\n')
+        f.writelines(lines)
+    return f"{len(lines):,} rows"
+
+
+def write_typed_csv(config):
+    e = load_ingested()
+    xs, ys = fixed6(e['x']), fixed6(e['y'])
+    with open(path('data/processed/events_with_types.csv'), 'w', newline='', encoding='utf-8') as f:
+        f.write('x,y,time,weight,type,description\n')
+        f.writelines(f"{x},{y},{t},{w},\"{ty}\",\"{d}\"\n" for x, y, t, w, ty, d in
+                     zip(xs, ys, e['time'], e['weight'], e['type'], e['description']))
+    return f"{len(xs):,} rows"
+
+
+def write_binary(config):
+    e = load_ingested()
+    types = TypeDictionary.standard()
+    codes = types.encode(e['type'], normalize=False)
+    if e['projection']:
+        # Re-encoding the decoded lat/lon gives back the ingested integers
+        x, y = e['x'], e['y']
+    else:
+        # Round like the CSV the stores used to be converted from
+        x = fixed6(e['x']).astype(np.float64)
+        y = fixed6(e['y']).astype(np.float64)
+    sizes = []
+    for target in ('src/web/realdata', 'next-level-design-main/public/data/realCrimeData'):
+        sizes.append(write_event_store(path(target), x, y, e['time'], weight=e['weight'],
+                                       types=codes, type_dictionary=types,
+                                       descriptions=e['description'], projection=e['projection']))
+    return f"{sizes[0]:,} bytes of columns per store"
+
+
+def write_web_js(config):
+    e = load_ingested()
+    events = [{'x': float(x), 'y': float(y), 'time': int(t), 'weight': int(w)}
+              for x, y, t, w in zip(fixed6(e['x']), fixed6(e['y']), e['time'], e['weight'])]
+    with open(path('src/web/realdata.js'), 'w') as f:
+        f.write('// Real Chicago Crime Data - Auto-generated\n')
+        f.write('// Source: Chicago Police Department Open Data Portal\n')
+        f.write(f'// Total Events: {len(events):,}\n\n')
+        f.write('const realCrimeData = ')
+        f.write(json.dumps(events, indent=2))
+        f.write(';\n')
+    return f"{len(events):,} events"
+
+
+def write_similarity(config):
+    target = path('next-level-design-main/src/data/crimeSimilarity.ts')
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    with open(target, 'w', encoding='utf-8') as f:
+        f.write("// Crime type similarity mappings\n")
+        f.write("export const crimeSimilarity: Record<string, string[]> = ")
+        f.write(json.dumps(CRIME_SIMILARITY, indent=2))
+        f.write(";\n")
+    return f"{len(CRIME_SIMILARITY)} types"
+
+
+def write_search_index(config):
+    e = load_ingested()
+    index = InvertedIndex.build(types=e['type'], descriptions=e['description'])
+    size = index.save(path('next-level-design-main/public/data/realCrimeIndex'))
+    return f"{sum(len(t) for t in index.fields.values())} tokens, {size:,} bytes"
+
+
+def write_density(config):
+    e = load_ingested()
+    grid = DensityGrid(e['x'], e['y'], e['time'], e['weight'], bounds=config['bounds'],
+                       shape=config['density_shape'])
+    entries = grid.export(path(DENSITY_DIR), config['density_windows'],
+                          kernel=config['density_kernel'], bandwidth=config['density_bandwidth'])
+    with open(path(DENSITY_DIR + '/density.json'), 'w', encoding='utf-8') as f:
+        json.dump({'bounds': config['bounds'], 'shape': config['density_shape'],
+                   'kernel': config['density_kernel'], 'bandwidth': config['density_bandwidth'],
+                   'windows': entries}, f, separators=(',', ':'))
+    return f"{len(entries)} windows on a {config['density_shape'][0]}x{config['density_shape'][1]} grid"
+
+
+def _prefix_digest(e, n):
+    """Hash of the first n ingested events (the ones a cached pyramid holds)"""
+    digest = hashlib.sha256()
+    for name in ('x', 'y', 'time', 'weight'):
+        digest.update(np.ascontiguousarray(e[name][:n]).tobytes())
+    return digest.hexdigest()
+
+
+def write_tiles(config):
+    """
+    Density tile pyramid. The pyramid is cached with the count and hash of
+    the events it holds; when the ingested store still starts with those
+    events (e.g. --max-events was raised), only the rest go through
+    add_events, otherwise it is rebuilt.
+    """
+    e = load_ingested()
+    count = len(e['x'])
+    with open(path('src/python/tile_pyramid.py'), 'rb') as f:
+        code = hashlib.sha256(f.read()).hexdigest()
+    layout = {'bounds': config['bounds'], 'max_zoom': config['tiles_max_zoom'], 'code': code}
+
+    pyramid, start = None, 0
+    if os.path.exists(TILE_STATE + '.json') and os.path.exists(TILE_STATE + '.npz'):
+        with open(TILE_STATE + '.json', 'r', encoding='utf-8') as f:
+            state = json.load(f)
+        if state['layout'] == layout and state['events'] <= count and \
+                state['digest'] == _prefix_digest(e, state['events']):
+            pyramid, start = TilePyramid.load(TILE_STATE + '.npz'), state['events']
+    if pyramid is None:
+        pyramid = TilePyramid(config['bounds'], max_zoom=config['tiles_max_zoom'])
+
+    pyramid.add_events(e['x'][start:], e['y'][start:], e['time'][start:], e['weight'][start:])
+    pyramid.save(TILE_STATE + '.npz')
+    with open(TILE_STATE + '.json', 'w', encoding='utf-8') as f:
+        json.dump({'layout': layout, 'events': count, 'digest': _prefix_digest(e, count)}, f)
+
+    tiles = pyramid.export_tiles(path(TILES_DIR))
+    if not start:
+        mode = f"{count:,} events"
+    else:
+        mode = f"{count - start:,} new events merged" if count > start else "pyramid unchanged"
+    return f"{mode}, {tiles} tiles up to z{pyramid.max_zoom}"
+
+
+def _density_outputs(windows):
+    names = [f"{DENSITY_DIR}/{t1:04d}-{t2:04d}" for t1, t2 in windows]
+    return [DENSITY_DIR + '/density.json'] + [n + ext for n in names for ext in ('.png', '.f32')]
+
+
+def _store(rel):
+    return [rel + '.bin', rel + '.json']
+
+
+def _modules(*names):
+    """Sources of the src/python modules a stage's output depends on"""
+    return [f'src/python/{name}.py' for name in names]
+
+
+DENSITY_DIR = 'next-level-design-main/public/data/density'
+TILES_DIR = 'next-level-design-main/public/data/tiles'
+INGESTED_FILES = [os.path.relpath(p, ROOT_DIR) for p in _store(INGESTED)]
+# Stages reading the ingested store also depend on the code that decodes it
+INGESTED_INPUTS = INGESTED_FILES + _modules('event_store', 'projection')
+
+# name -> (function, input files, config keys, output files)
+STAGES = {
+    'ingest': (ingest, ['{raw_csv}'] + _modules('crime_types', 'projection', 'event_store'),
+               ['raw_csv', 'max_events', 'bounds', 'description_length', 'projection'],
+               INGESTED_FILES),
+    'events_csv': (write_events_csv, INGESTED_INPUTS, [], ['data/processed/events.csv']),
+    'typed_csv': (write_typed_csv, INGESTED_INPUTS, [], ['data/processed/events_with_types.csv']),
+    'binary': (write_binary, INGESTED_INPUTS + _modules('crime_types'), [],
+               _store('src/web/realdata') + _store('next-level-design-main/public/data/realCrimeData')),
+    'web_js': (write_web_js, INGESTED_INPUTS, [], ['src/web/realdata.js']),
+    'similarity': (write_similarity, _modules('crime_types'), [],
+                   ['next-level-design-main/src/data/crimeSimilarity.ts']),
+    'search_index': (write_search_index,
+                     INGESTED_INPUTS + _modules('inverted_index', 'bitmap', 'crime_types'), [],
+                     _store('next-level-design-main/public/data/realCrimeIndex')),
+    'density': (write_density, INGESTED_INPUTS + _modules('density'),
+                ['bounds', 'density_shape', 'density_kernel', 'density_bandwidth', 'density_windows'],
+                _density_outputs(DEFAULT_CONFIG['density_windows'])),
+    'tiles': (write_tiles, INGESTED_INPUTS + _modules('tile_pyramid'), ['bounds', 'tiles_max_zoom'],
+              [TILES_DIR + '/tiles.json']),
+}
+
+
+# ----------------------------------------------------------------------
+# Content-hash cache
+# ----------------------------------------------------------------------
+
+class Cache:
+    """
+    Remembers, per stage, the hash of its inputs + config and the hashes
+    of the outputs it produced. File hashes are memoized by size/mtime so
+    unchanged files are not re-read on every run.
+    """
+
+    def __init__(self, state_file=STATE_FILE):
+        self.state_file = state_file
+        self.state = {'files': {}, 'stages': {}}
+        if os.path.exists(state_file):
+            with open(state_file, 'r', encoding='utf-8') as f:
+                self.state = json.load(f)
+
+    def file_hash(self, rel):
+        full = path(rel)
+        if not os.path.exists(full):
+            return None
+        st = os.stat(full)
+        memo = self.state['files'].get(rel)
+        if memo and memo[0] == st.st_size and memo[1] == st.st_mtime_ns:
+            return memo[2]
+
+        digest = hashlib.sha256()
+        with open(full, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+        self.state['files'][rel] = [st.st_size, st.st_mtime_ns, digest.hexdigest()]
+        return digest.hexdigest()
+
+    def stage_key(self, name, inputs, config):
+        key = hashlib.sha256(name.encode())
+        key.update(json.dumps(config, sort_keys=True).encode())
+        for rel in inputs:
+            key.update(rel.encode())
+            key.update((self.file_hash(rel) or 'missing').encode())
+        # Changing the pipeline code invalidates every stage
+        key.update((self.file_hash(os.path.basename(__file__)) or '').encode())
+        return key.hexdigest()
+
+    def is_fresh(self, name, key, outputs):
+        entry = self.state['stages'].get(name)
+        if not entry or entry['key'] != key:
+            return False
+        return all(self.file_hash(rel) == entry['outputs'].get(rel) for rel in outputs)
+
+    def record(self, name, key, outputs):
+        self.state['stages'][name] = {
+            'key': key,
+            'outputs': {rel: self.file_hash(rel) for rel in outputs},
+        }
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.state_file), exist_ok=True)
+        with open(self.state_file, 'w', encoding='utf-8') as f:
+            json.dump(self.state, f, indent=1)
+
+
+def run_pipeline(config, only=None, force=False):
+    """Run (or skip) every stage in order; returns [(stage, status, seconds, note)]"""
+    cache = Cache()
+    selected = list(STAGES) if not only else ['ingest'] + [s for s in only if s != 'ingest']
+    report = []
+
+    for name in selected:
+        func, inputs, keys, outputs = STAGES[name]
+        inputs = [rel.format(**config) for rel in inputs]
+        stage_config = {k: config[k] for k in keys}
+
+        start = timer.perf_counter()
+        key = cache.stage_key(name, inputs, stage_config)
+        if not force and cache.is_fresh(name, key, outputs):
+            report.append((name, 'cached', timer.perf_counter() - start, ''))
+            continue
+
+        note = func(config)
+        cache.record(name, key, outputs)
+        cache.save()
+        report.append((name, 'ran', timer.perf_counter() - start, note))
+
+    cache.save()
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build all Chicago crime data artifacts")
+    parser.add_argument('max_events_pos', nargs='?', type=int, default=None,
+                        help=argparse.SUPPRESS)  # `python pipeline.py 5000` like the old scripts
+    parser.add_argument('--max-events', type=int, default=None,
+                        help=f"Rows read from the raw CSV (default {DEFAULT_CONFIG['max_events']:,})")
+    parser.add_argument('--input', default=None, help="Raw Chicago crime CSV")
+    parser.add_argument('--only', nargs='+', choices=list(STAGES), default=None)
+    parser.add_argument('--project', default=None, choices=list(REGION_ORIGINS) + ['auto'],
+                        help="Store int32 cm coordinates around a fixed origin instead of lat/lon")
+    parser.add_argument('--force', action='store_true', help="Re-run every stage")
+    parser.add_argument('--list', action='store_true', help="List stages and outputs")
+    args = parser.parse_args()
+
+    if args.list:
+        for name, (_, inputs, _, outputs) in STAGES.items():
+            print(f"  {name:13s} -> {', '.join(outputs)}")
+        return
+
+    config = dict(DEFAULT_CONFIG)
+    max_events = args.max_events or args.max_events_pos
+    if max_events:
+        config['max_events'] = max_events
+    if args.input:
+        config['raw_csv'] = os.path.relpath(os.path.abspath(args.input), ROOT_DIR)
+    if args.project:
+        config['projection'] = args.project
+
+    print(f"\n{'='*60}")
+    print(f"  CHICAGO CRIME DATA PIPELINE")
+    print(f"{'='*60}\n")
+    print(f"📂 Input: {config['raw_csv']}")
+    print(f"🔢 Max events: {config['max_events']:,}\n")
+
+    if not os.path.exists(path(config['raw_csv'])):
+        print(f"❌ ERROR: File not found: {config['raw_csv']}")
+        sys.exit(1)
+
+    total = timer.perf_counter()
+    report = run_pipeline(config, only=args.only, force=args.force)
+
+    print(f"  {'stage':13s} {'status':8s} {'time ms':>9s}   notes")
+    for name, status, seconds, note in report:
+        print(f"  {name:13s} {status:8s} {seconds * 1000:9.1f}   {note}")
+    print(f"\n✅ Done in {(timer.perf_counter() - total) * 1000:.0f} ms "
+          f"({sum(1 for r in report if r[1] == 'ran')} ran, "
+          f"{sum(1 for r in report if r[1] == 'cached')} cached)\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,12 +2,23 @@
 """
 Process Indian Crime Dataset and convert to TypeScript format.
 Maps city names to coordinates and formats data for the dashboard.
+
+The CSV is streamed in chunks: each chunk is geocoded, written to the
+updated CSV and appended to the TypeScript (and optional events CSV)
+output before the next one is read, so memory stays bounded by the
+chunk size. Coordinate jitter is derived from a hash of the record ID,
+so re-running the script reproduces the same coordinates.
 """
 
-import csv
-import json
-import random
-from datetime import datetime
+import os
+import shutil
+import sys
+import tempfile
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src', 'python'))
+from inverted_index import InvertedIndexBuilder
 
 # City coordinates mapping (latitude, longitude)
 CITY_COORDINATES = {
@@ -65,129 +76,214 @@ CITY_COORDINATES = {
     'Surat': (21.1702, 72.8311),
 }
 
-def parse_time(time_str):
-    """Extract time in minutes from datetime string"""
-    try:
-        dt = datetime.strptime(time_str, '%d-%m-%Y %H:%M')
-        return dt.hour * 60 + dt.minute
-    except:
-        return random.randint(0, 1439)
+# City lookup arrays (index -> name / coordinates), built once
+CITY_NAMES = pd.Index(list(CITY_COORDINATES))
+CITY_LATLON = np.array(list(CITY_COORDINATES.values()), dtype=np.float64)
+
+INDIA_CENTER = (20.5937, 78.9629)
+CITY_JITTER = 0.09     # ~10km (1 degree latitude ~= 111km)
+UNKNOWN_JITTER = 2.0   # Unknown cities are spread around the center of India
+
+TIME_FORMAT = '%d-%m-%Y %H:%M'
+ID_COLUMN = 'Report Number'
+
+
+def _mix(h):
+    """splitmix64 finalizer on a uint64 array"""
+    h = h ^ (h >> np.uint64(30))
+    h = h * np.uint64(0xBF58476D1CE4E5B9)
+    h = h ^ (h >> np.uint64(27))
+    h = h * np.uint64(0x94D049BB133111EB)
+    return h ^ (h >> np.uint64(31))
+
+
+def record_uniforms(ids, seed=42, streams=3):
+    """
+    Deterministic uniforms in [0, 1) per record ID.
+    Returns an array of shape (streams, len(ids)); stream k is independent
+    of the others and of the position of the record in the file.
+    """
+    keys = pd.util.hash_pandas_object(pd.Series(ids), index=False).to_numpy(np.uint64)
+    keys = keys ^ _mix(np.full(len(keys), seed, dtype=np.uint64))
+    out = np.empty((streams, len(keys)), dtype=np.float64)
+    for k in range(streams):
+        keys = _mix(keys + np.uint64(0x9E3779B97F4A7C15))
+        out[k] = (keys >> np.uint64(11)) * (1.0 / (1 << 53))
+    return out
+
 
-def generate_random_coords(city_name):
+def geocode(cities, u_lat, u_lon):
     """
-    Generate coordinates for a city within ~10km radius.
-    1 degree latitude ~= 111km
-    10km ~= 0.09 degrees
+    Vectorized city -> jittered (lat, lon).
+    u_lat / u_lon are uniforms in [0, 1) (see record_uniforms).
     """
-    if city_name in CITY_COORDINATES:
-        base_lat, base_lon = CITY_COORDINATES[city_name]
-        # Random spread approximately 10km (0.09 degrees)
-        lat = base_lat + random.uniform(-0.09, 0.09)
-        lon = base_lon + random.uniform(-0.09, 0.09)
-        return round(lat, 6), round(lon, 6)
-    else:
-        # Fallback for unknown cities (center of India)
-        return round(20.5937 + random.uniform(-2, 2), 6), round(78.9629 + random.uniform(-2, 2), 6)
-
-def process_csv(input_file, output_file, max_records=None):
+    codes = CITY_NAMES.get_indexer(cities)
+    known = codes >= 0
+    base = np.where(known[:, None], CITY_LATLON[np.maximum(codes, 0)], INDIA_CENTER)
+    spread = np.where(known, CITY_JITTER, UNKNOWN_JITTER)
+    lat = base[:, 0] + (2 * u_lat - 1) * spread
+    lon = base[:, 1] + (2 * u_lon - 1) * spread
+    return np.round(lat, 6), np.round(lon, 6)
+
+
+def parse_times(values, fallback):
+    """
+    Vectorized 'dd-mm-YYYY HH:MM' -> minute of day.
+    Unparseable values use the deterministic fallback minutes.
+    """
+    dt = pd.to_datetime(pd.Series(values), format=TIME_FORMAT, errors='coerce')
+    minutes = (dt.dt.hour * 60 + dt.dt.minute).to_numpy()
+    missing = np.isnan(minutes)
+    return np.where(missing, fallback, np.nan_to_num(minutes)).astype(np.int64)
+
+
+def process_chunk(chunk, offset, seed=42):
+    """
+    Geocode one chunk in place and build its events frame.
+    offset: position of the chunk's first row (ID fallback when the CSV
+    has no Report Number column)
+    """
+    ids = chunk[ID_COLUMN] if ID_COLUMN in chunk else np.arange(offset, offset + len(chunk))
+    u_lat, u_lon, u_time = record_uniforms(ids, seed)
+
+    city = chunk['City'].fillna('').astype(str).str.strip() if 'City' in chunk \
+        else pd.Series('', index=chunk.index)
+    lat, lon = geocode(city, u_lat, u_lon)
+
+    # Keep coordinates that are already present in the row
+    for column, generated in (('Latitude', lat), ('Longitude', lon)):
+        existing = pd.to_numeric(chunk[column], errors='coerce').to_numpy() \
+            if column in chunk else np.full(len(chunk), np.nan)
+        chunk[column] = np.where(np.isnan(existing), generated, existing)
+
+    times = chunk['Time of Occurrence'] if 'Time of Occurrence' in chunk \
+        else pd.Series([None] * len(chunk))
+    fallback = (u_time * 1440).astype(np.int64)
+
+    def text(column):
+        if column not in chunk:
+            return pd.Series('', index=chunk.index)
+        return chunk[column].fillna('').astype(str)
+
+    return pd.DataFrame({
+        'x': chunk['Latitude'].to_numpy(),
+        'y': chunk['Longitude'].to_numpy(),
+        'time': parse_times(times.to_numpy(), fallback),
+        'weight': 1,
+        'type': text('Crime Description').str.strip().str.upper().to_numpy(),
+        'description': text('Crime Domain').to_numpy(),
+        'caseClosed': (text('Case Closed').str.strip().str.lower() == 'yes').to_numpy(),
+        'city': city.to_numpy(),
+    })
+
+
+def process_csv(input_file, output_file, max_records=None, chunk_size=50_000,
+                seed=42, events_csv=None, output_index=None):
     """
     1. Update CSV with Latitude and Longitude columns.
     2. Convert to TypeScript data format.
+
+    Single pass over the input; only one chunk is held in memory.
+    Rows past max_records are still geocoded into the updated CSV, but
+    not exported as events.
+    events_csv: optional x,y,time,weight,type,city CSV (shards.py input)
+    output_index: optional inverted search index (type, description,
+                  case status and city postings) over the exported events
     """
-    
-    events = []
-    updated_rows = []
-    fieldnames = []
-    
-    # READ and MODIFY data
-    print("Reading and updating CSV with coordinates (10km radius)...")
-    with open(input_file, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        fieldnames = reader.fieldnames
-        if 'Latitude' not in fieldnames:
-            fieldnames.extend(['Latitude', 'Longitude'])
-            
-        all_rows = list(reader)
-        
-        for i, row in enumerate(all_rows):
-            if max_records and len(events) >= max_records:
-                break
-            
-            try:
-                city = row.get('City', '').strip()
-                
-                # Check if we already have coords in row, else generate
-                if 'Latitude' in row and row['Latitude'] and 'Longitude' in row and row['Longitude']:
-                    lat = float(row['Latitude'])
-                    lon = float(row['Longitude'])
-                else:
-                    lat, lon = generate_random_coords(city)
-                    row['Latitude'] = lat
-                    row['Longitude'] = lon
-                
-                updated_rows.append(row)
-                
-                # Process for TS file
-                time_minutes = parse_time(row.get('Time of Occurrence', ''))
-                case_closed = row.get('Case Closed', '').strip().lower() == 'yes'
-                crime_type = row.get('Crime Description', '').strip().upper()
-                
-                event = {
-                    'x': lat,
-                    'y': lon,
-                    'time': time_minutes,
-                    'weight': 1,
-                    'type': crime_type,
-                    'description': row.get('Crime Domain', ''),
-                    'caseClosed': case_closed,
-                    'city': city
-                }
-                
-                events.append(event)
-            except Exception as e:
-                # Keep row even if error processing for TS, but maybe skip event
-                updated_rows.append(row)
-                continue
-
-    # WRITE UPDATED CSV back to file
-    print(f"Updating source CSV file: {input_file}")
-    with open(input_file, 'w', encoding='utf-8', newline='') as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        writer.writeheader()
-        writer.writerows(updated_rows)
-
-    # GENERATE TYPESCRIPT FILE
-    city_count = len(set(e['city'] for e in events))
-    json_data = json.dumps(events, indent=2)
-    
-    ts_content = f"""import {{ Event }} from '../types';
+    print(f"Streaming {input_file} in chunks of {chunk_size:,} rows...")
+
+    out_dir = os.path.dirname(os.path.abspath(input_file))
+    csv_tmp = tempfile.NamedTemporaryFile('w', encoding='utf-8', newline='',
+                                          dir=out_dir, suffix='.csv', delete=False)
+    body_tmp = tempfile.TemporaryFile('w+', encoding='utf-8')
+    events_out = open(events_csv, 'w', encoding='utf-8', newline='') if events_csv else None
+    index = InvertedIndexBuilder() if output_index else None
+
+    total = 0
+    exported = 0
+    cities = set()
+    try:
+        for chunk in pd.read_csv(input_file, chunksize=chunk_size, dtype=str,
+                                 keep_default_na=False, na_values=['']):
+            events = process_chunk(chunk, total, seed)
+            chunk.to_csv(csv_tmp, index=False, header=(total == 0))
+            total += len(chunk)
+
+            if max_records is not None:
+                events = events.iloc[:max(max_records - exported, 0)]
+            if len(events):
+                records = events.to_json(orient='records', lines=True,
+                                         double_precision=6).strip()
+                body_tmp.write((",\n" if exported else "") + records.replace("\n", ",\n"))
+                if events_out:
+                    events[['x', 'y', 'time', 'weight', 'type', 'city']].to_csv(
+                        events_out, index=False, header=(exported == 0), float_format='%.6f')
+                if index:
+                    index.add_chunk(types=events['type'].to_numpy(),
+                                    descriptions=events['description'].to_numpy(),
+                                    case_closed=events['caseClosed'].to_numpy(),
+                                    cities=events['city'].to_numpy())
+                cities.update(events['city'].unique())
+                exported += len(events)
+
+        csv_tmp.close()
+        os.replace(csv_tmp.name, input_file)
+        if index:
+            index.finish().save(output_index)
+
+        # GENERATE TYPESCRIPT FILE (header needs the final counts)
+        with open(output_file, 'w', encoding='utf-8') as f:
+            f.write(f"""import {{ Event }} from '../types';
 
 // Indian Crime Dataset - Generated from crime_dataset_india.csv
-// Total Events: {len(events)}
-// Cities: {city_count}
+// Total Events: {exported}
+// Cities: {len(cities)}
 
-export const indianCrimeData: Event[] = {json_data};
-"""
-    
-    with open(output_file, 'w', encoding='utf-8') as f:
-        f.write(ts_content)
-    
-    print(f"✅ Processed {len(events)} events")
-    print(f"📍 Cities found: {city_count}")
+export const indianCrimeData: Event[] = [
+""")
+            body_tmp.seek(0)
+            shutil.copyfileobj(body_tmp, f)
+            f.write("\n];\n")
+    finally:
+        body_tmp.close()
+        if events_out:
+            events_out.close()
+        if not csv_tmp.closed:
+            csv_tmp.close()
+        if os.path.exists(csv_tmp.name):
+            os.remove(csv_tmp.name)
+
+    print(f"✅ Processed {exported} events ({total} rows)")
+    print(f"📍 Cities found: {len(cities)}")
     print(f"📁 Source CSV updated with Latitude/Longitude")
     print(f"📁 Output TS written to: {output_file}")
-    
-    return len(events)
+    if events_csv:
+        print(f"📁 Events CSV written to: {events_csv}")
+    if output_index:
+        print(f"📁 Search index written to: {output_index}.bin/.json")
+
+    return exported
 
 if __name__ == '__main__':
-    import os
-    
+    import argparse
+
     # Paths
     script_dir = os.path.dirname(os.path.abspath(__file__))
-    input_file = os.path.join(script_dir, 'data', 'processed', 'crime_dataset_india.csv')
-    output_file = os.path.join(script_dir, 'next-level-design-main', 'src', 'data', 'indianCrimeData.ts')
-    
+    parser = argparse.ArgumentParser(description="Process the Indian crime dataset")
+    parser.add_argument('--input', default=os.path.join(script_dir, 'data', 'processed', 'crime_dataset_india.csv'))
+    parser.add_argument('--output', default=os.path.join(script_dir, 'next-level-design-main', 'src', 'data', 'indianCrimeData.ts'))
+    parser.add_argument('--events-csv', default=None,
+                        help="Also write x,y,time,weight,type,city rows (input for src/python/shards.py)")
+    parser.add_argument('--index', default=os.path.join(script_dir, 'next-level-design-main', 'public', 'data', 'indianCrimeIndex'),
+                        help="Inverted search index output (path without extension, '' to skip)")
+    parser.add_argument('--max-records', type=int, default=None)
+    parser.add_argument('--chunk-size', type=int, default=50_000)
+    parser.add_argument('--seed', type=int, default=42, help="Seed of the per-record coordinate jitter")
+    args = parser.parse_args()
+
     # Process all records
-    count = process_csv(input_file, output_file, max_records=None)
+    count = process_csv(args.input, args.output, max_records=args.max_records,
+                        chunk_size=args.chunk_size, seed=args.seed, events_csv=args.events_csv,
+                        output_index=args.index or None)
     
-    print(f"\\n🎉 Done! Updated CSV and generated indianCrimeData.ts with {count} events")
+    print(f"\n🎉 Done! Updated CSV and generated indianCrimeData.ts with {count} events")
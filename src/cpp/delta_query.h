@@ -0,0 +1,153 @@
+#ifndef DELTA_QUERY_H
+#define DELTA_QUERY_H
+
+#include <algorithm>
+#include <cmath>
+#include <functional>
+#include <limits>
+#include <vector>
+#include "kdtree.h"
+
+/**
+ * Closed axis-aligned rectangle [x1, x2] x [y1, y2] (normalized: x1 <= x2, y1 <= y2)
+ */
+struct Box {
+    double x1, y1, x2, y2;
+
+    Box(double _x1 = 0, double _y1 = 0, double _x2 = 0, double _y2 = 0)
+        : x1(std::min(_x1, _x2)), y1(std::min(_y1, _y2)),
+          x2(std::max(_x1, _x2)), y2(std::max(_y1, _y2)) {}
+
+    double area() const {
+        return (x2 - x1) * (y2 - y1);
+    }
+
+    bool intersects(const Box& other) const {
+        return x1 <= other.x2 && other.x1 <= x2 && y1 <= other.y2 && other.y1 <= y2;
+    }
+
+    bool operator==(const Box& other) const {
+        return x1 == other.x1 && y1 == other.y1 && x2 == other.x2 && y2 == other.y2;
+    }
+};
+
+/**
+ * a \ b as up to four disjoint closed strips (left, right, bottom, top).
+ * Strip edges next to b are moved by one ulp (nextafter), so a point on
+ * b's boundary is in b and in no strip: together with a ∩ b the strips
+ * partition a exactly.
+ */
+inline std::vector<Box> subtractBox(const Box& a, const Box& b) {
+    if (!a.intersects(b)) return {a};
+
+    const double inf = std::numeric_limits<double>::infinity();
+    double ix1 = std::max(a.x1, b.x1), ix2 = std::min(a.x2, b.x2);
+    double iy1 = std::max(a.y1, b.y1), iy2 = std::min(a.y2, b.y2);
+
+    std::vector<Box> strips;
+    if (a.x1 < ix1) strips.emplace_back(a.x1, a.y1, std::nextafter(ix1, -inf), a.y2);
+    if (ix2 < a.x2) strips.emplace_back(std::nextafter(ix2, inf), a.y1, a.x2, a.y2);
+    if (a.y1 < iy1) strips.emplace_back(ix1, a.y1, ix2, std::nextafter(iy1, -inf));
+    if (iy2 < a.y2) strips.emplace_back(ix1, std::nextafter(iy2, inf), ix2, a.y2);
+    return strips;
+}
+
+/**
+ * Incremental counts for a selection rectangle that moves in small steps
+ *
+ * While a selection is dragged, consecutive rectangles share almost all
+ * of their area. Instead of recounting the whole rectangle,
+ *
+ *   count(next) = count(prev) + count(next \ prev) - count(prev \ next)
+ *
+ * where both differences are thin strips (subtractBox), so an update
+ * costs a few small range queries against the index. A full count is
+ * used for the first rectangle, when the time range changes, and when
+ * the rectangles overlap too little for strips to pay off.
+ *
+ * Works with any engine through a count callback:
+ *   DeltaCounter live([&](const Box& b, int t1, int t2) {
+ *       return tree.query(b.x1, b.y1, b.x2, b.y2, t1, t2);
+ *   });
+ *   live.update(box, t1, t2);   // on every mouse move
+ */
+class DeltaCounter {
+public:
+    using CountFn = std::function<long long(const Box&, int, int)>;
+
+    struct Stats {
+        long long updates = 0;
+        long long fullCounts = 0;    // Updates answered with one full query
+        long long stripQueries = 0;  // Strip queries of incremental updates
+    };
+
+private:
+    CountFn countFn;
+    double minOverlap;
+    bool valid = false;
+    Box box;
+    int t1 = 0, t2 = 0;
+    long long current = 0;
+    Stats stats;
+
+public:
+    /**
+     * @param _countFn Weighted count of a closed box and time range
+     * @param _minOverlap Fraction of the new box that must be covered by
+     *                    the previous one for a delta update (else full count)
+     */
+    explicit DeltaCounter(CountFn _countFn, double _minOverlap = 0.5)
+        : countFn(std::move(_countFn)), minOverlap(_minOverlap) {}
+
+    /**
+     * Count of the new selection, incrementally when possible
+     */
+    long long update(const Box& next, int _t1, int _t2) {
+        stats.updates++;
+        if (valid && next == box && _t1 == t1 && _t2 == t2) return current;
+
+        bool incremental = valid && _t1 == t1 && _t2 == t2 && next.intersects(box);
+        if (incremental) {
+            Box overlap(std::max(next.x1, box.x1), std::max(next.y1, box.y1),
+                        std::min(next.x2, box.x2), std::min(next.y2, box.y2));
+            incremental = overlap.area() >= minOverlap * next.area();
+        }
+
+        if (incremental) {
+            for (const Box& strip : subtractBox(next, box)) {
+                current += countFn(strip, t1, t2);
+                stats.stripQueries++;
+            }
+            for (const Box& strip : subtractBox(box, next)) {
+                current -= countFn(strip, t1, t2);
+                stats.stripQueries++;
+            }
+        } else {
+            current = countFn(next, _t1, _t2);
+            stats.fullCounts++;
+        }
+
+        valid = true;
+        box = next;
+        t1 = _t1;
+        t2 = _t2;
+        return current;
+    }
+
+    /**
+     * Forget the previous selection (e.g. after the dataset changed)
+     */
+    void reset() {
+        valid = false;
+    }
+
+    long long count() const {
+        return current;
+    }
+
+    const Stats& getStats() const {
+        return stats;
+    }
+};
+
+#endif // DELTA_QUERY_H
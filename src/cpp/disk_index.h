@@ -0,0 +1,680 @@
+#ifndef DISK_INDEX_H
+#define DISK_INDEX_H
+
+#include <algorithm>
+#include <cstdint>
+#include <cstdio>
+#include <cstring>
+#include <fstream>
+#include <memory>
+#include <queue>
+#include <sstream>
+#include <stdexcept>
+#include <string>
+#include <vector>
+#ifdef _WIN32
+#include <windows.h>
+#else
+#include <fcntl.h>
+#include <sys/mman.h>
+#include <sys/stat.h>
+#include <unistd.h>
+#endif
+#include "event_store.h"
+#include "query_stats.h"
+
+/**
+ * Read-only memory-mapped file
+ */
+class MappedFile {
+private:
+    const char* ptr = nullptr;
+    size_t length = 0;
+#ifdef _WIN32
+    HANDLE file = INVALID_HANDLE_VALUE;
+    HANDLE mapping = nullptr;
+#else
+    int fd = -1;
+#endif
+
+public:
+    MappedFile() {}
+    MappedFile(const MappedFile&) = delete;
+    MappedFile& operator=(const MappedFile&) = delete;
+
+    ~MappedFile() {
+        close();
+    }
+
+    void open(const std::string& path) {
+        close();
+#ifdef _WIN32
+        file = CreateFileA(path.c_str(), GENERIC_READ, FILE_SHARE_READ, nullptr,
+                           OPEN_EXISTING, FILE_ATTRIBUTE_NORMAL, nullptr);
+        if (file == INVALID_HANDLE_VALUE) throw std::runtime_error("could not open " + path);
+        LARGE_INTEGER size;
+        GetFileSizeEx(file, &size);
+        length = static_cast<size_t>(size.QuadPart);
+        if (length) {
+            mapping = CreateFileMappingA(file, nullptr, PAGE_READONLY, 0, 0, nullptr);
+            ptr = mapping ? static_cast<const char*>(MapViewOfFile(mapping, FILE_MAP_READ, 0, 0, 0)) : nullptr;
+            if (!ptr) throw std::runtime_error("could not map " + path);
+        }
+#else
+        fd = ::open(path.c_str(), O_RDONLY);
+        if (fd < 0) throw std::runtime_error("could not open " + path);
+        struct stat st;
+        fstat(fd, &st);
+        length = static_cast<size_t>(st.st_size);
+        if (length) {
+            void* p = mmap(nullptr, length, PROT_READ, MAP_SHARED, fd, 0);
+            if (p == MAP_FAILED) throw std::runtime_error("could not map " + path);
+            ptr = static_cast<const char*>(p);
+        }
+#endif
+    }
+
+    void close() {
+#ifdef _WIN32
+        if (ptr) UnmapViewOfFile(ptr);
+        if (mapping) CloseHandle(mapping);
+        if (file != INVALID_HANDLE_VALUE) CloseHandle(file);
+        mapping = nullptr;
+        file = INVALID_HANDLE_VALUE;
+#else
+        if (ptr) munmap(const_cast<char*>(ptr), length);
+        if (fd >= 0) ::close(fd);
+        fd = -1;
+#endif
+        ptr = nullptr;
+        length = 0;
+    }
+
+    /**
+     * Ask the OS to drop the file's cached pages (cold-cache benchmarks);
+     * a no-op where unsupported
+     */
+    void dropCache() {
+#ifndef _WIN32
+        if (ptr) madvise(const_cast<char*>(ptr), length, MADV_DONTNEED);
+#ifdef POSIX_FADV_DONTNEED
+        if (fd >= 0) posix_fadvise(fd, 0, 0, POSIX_FADV_DONTNEED);
+#endif
+#endif
+    }
+
+    const char* data() const {
+        return ptr;
+    }
+
+    size_t size() const {
+        return length;
+    }
+};
+
+/**
+ * Position of a point on a Hilbert curve over a 2^32 x 2^32 grid
+ */
+inline uint64_t hilbertKey(uint32_t x, uint32_t y) {
+    uint64_t d = 0;
+    for (uint32_t s = 1u << 31; s > 0; s >>= 1) {
+        uint32_t rx = (x & s) ? 1 : 0;
+        uint32_t ry = (y & s) ? 1 : 0;
+        d += static_cast<uint64_t>(s) * s * ((3 * rx) ^ ry);
+        if (ry == 0) {
+            if (rx == 1) {
+                x = ~x;
+                y = ~y;
+            }
+            std::swap(x, y);
+        }
+    }
+    return d;
+}
+
+/**
+ * I/O done by one or more DiskIndex queries
+ *
+ *   blocksRead    leaf blocks scanned (partial overlaps)
+ *   summaryReads  on-disk minute summaries read (covered nodes whose
+ *                 time range is not aligned to the in-memory buckets)
+ *   pagesTouched  4 KiB pages referenced in the mapped files
+ *   bytesRead     bytes referenced in the mapped files
+ */
+struct DiskIOStats {
+    long long blocksRead = 0;
+    long long summaryReads = 0;
+    long long pagesTouched = 0;
+    long long bytesRead = 0;
+
+    void merge(const DiskIOStats& other) {
+        blocksRead += other.blocksRead;
+        summaryReads += other.summaryReads;
+        pagesTouched += other.pagesTouched;
+        bytesRead += other.bytesRead;
+    }
+
+    std::string toJson() const {
+        std::stringstream ss;
+        ss << "{\"blocks_read\":" << blocksRead
+           << ",\"summary_reads\":" << summaryReads
+           << ",\"pages_touched\":" << pagesTouched
+           << ",\"bytes_read\":" << bytesRead << "}";
+        return ss.str();
+    }
+};
+
+struct DiskIndexOptions {
+    size_t blockEvents = 2048;     // Events per leaf block
+    size_t fanout = 16;            // Children per internal node
+    size_t runEvents = 1 << 22;    // Events sorted in memory per run (32 bytes each)
+    int timeBuckets = 1440;        // Times 0 .. timeBuckets - 1
+    int coarseWidth = 60;          // Minutes per in-memory summary bucket
+};
+
+struct DiskIndexBuildReport {
+    long long events = 0;
+    long long skipped = 0;  // Events with a time outside [0, timeBuckets)
+    size_t runs = 0;
+    size_t blocks = 0;
+    size_t nodes = 0;
+    size_t diskBytes = 0;
+};
+
+/**
+ * Out-of-core spatio-temporal index (packed Hilbert R-tree)
+ *
+ * Built from a binary event store with an external sort, so neither
+ * the events nor the index have to fit in memory:
+ *
+ *   1. stream the store once for its bounding box
+ *   2. stream it again in runs of runEvents, sort each run by Hilbert
+ *      key (time as tie-break) and spill it to disk
+ *   3. k-way merge the runs straight into fixed-size leaf blocks, then
+ *      pack fanout consecutive nodes per parent, level by level
+ *
+ * Files (<path> = index path):
+ *   <path>.blk  leaf blocks, page aligned, columnar inside a block
+ *               (x f64[B], y f64[B], weight i32[B], time u16[B])
+ *   <path>.sum  per node, cumulative weight per minute (u64[T + 1]);
+ *               siblings are adjacent, leaves first, root last
+ *   <path>.idx  header + node directory + coarse summaries (kept in RAM)
+ *
+ * Only the node directory lives in memory: bbox, time range, weight and
+ * an hourly cumulative histogram per node (~0.1 byte per event with the
+ * default block size). The .blk and .sum files are memory-mapped, and a
+ * query touches
+ *   - nothing on disk for nodes it prunes (bbox or time range miss),
+ *     for covered nodes whose whole time range is inside the query, and
+ *     for covered nodes when t1 / t2 + 1 fall on hour boundaries;
+ *   - one or two pages of .sum for other covered nodes;
+ *   - the leaf block for partial overlaps at the leaf level.
+ * Hilbert order keeps spatial neighbours in neighbouring blocks, so the
+ * blocks of one query are mostly contiguous in the file.
+ *
+ * Files are written in the machine's byte order (little-endian, like
+ * the event store). Queries are read-only and safe to run concurrently.
+ */
+class DiskIndex {
+private:
+    static constexpr uint32_t MAGIC = 0x58444B44;  // "DKDX"
+    static constexpr uint32_t VERSION = 1;
+    static constexpr size_t PAGE = 4096;
+
+    struct Header {
+        uint32_t magic, version;
+        uint32_t timeBuckets, coarseWidth;
+        uint64_t blockEvents, blockBytes, fanout;
+        uint64_t nodeCount, blockCount, eventCount;
+    };
+
+    struct Node {
+        double minX, maxX, minY, maxY;
+        uint64_t weight;
+        uint32_t first;     // Leaf: block index; internal: first child node
+        uint32_t count;     // Leaf: events; internal: children
+        uint16_t minTime, maxTime;
+        uint32_t level;     // 0 = leaf
+    };
+
+    struct SortRecord {
+        uint64_t key;
+        double x, y;
+        int32_t weight;
+        uint16_t time, pad;
+
+        bool operator<(const SortRecord& o) const {
+            return key != o.key ? key < o.key : time < o.time;
+        }
+        bool operator>(const SortRecord& o) const {
+            return o < *this;
+        }
+    };
+
+    std::vector<Node> nodes;
+    std::vector<uint64_t> coarse;  // nodes.size() x coarseStride
+    MappedFile blocks, summaries;
+    int timeBuckets = 1440, coarseWidth = 60;
+    size_t coarseStride = 25, blockEvents = 0, blockBytes = 0;
+    long long eventCount = 0;
+
+    static size_t pagesSpanned(size_t offset, size_t bytes) {
+        return bytes ? (offset + bytes - 1) / PAGE - offset / PAGE + 1 : 0;
+    }
+
+    static size_t blockSize(size_t blockEvents) {
+        size_t bytes = blockEvents * (2 * sizeof(double) + sizeof(int32_t) + sizeof(uint16_t));
+        return (bytes + PAGE - 1) / PAGE * PAGE;
+    }
+
+    /**
+     * Sorted run spilled to disk, read back through a small buffer
+     */
+    class RunReader {
+    private:
+        std::ifstream in;
+        std::vector<SortRecord> buffer;
+        size_t pos = 0, filled = 0;
+
+    public:
+        RunReader(const std::string& path, size_t bufferRecords)
+            : in(path, std::ios::binary), buffer(std::max<size_t>(bufferRecords, 1)) {
+            if (!in.is_open()) throw std::runtime_error("could not open run " + path);
+        }
+
+        bool next(SortRecord& record) {
+            if (pos == filled) {
+                in.read(reinterpret_cast<char*>(buffer.data()), buffer.size() * sizeof(SortRecord));
+                filled = static_cast<size_t>(in.gcount()) / sizeof(SortRecord);
+                pos = 0;
+                if (filled == 0) return false;
+            }
+            record = buffer[pos++];
+            return true;
+        }
+    };
+
+    long long timeCount(size_t idx, int t1, int t2, DiskIOStats* io) const {
+        size_t lo = t1, hi = static_cast<size_t>(t2) + 1;
+        size_t width = coarseWidth, buckets = timeBuckets;
+        if (lo % width == 0 && (hi % width == 0 || hi == buckets)) {
+            const uint64_t* c = &coarse[idx * coarseStride];
+            return static_cast<long long>(c[(hi + width - 1) / width] - c[lo / width]);
+        }
+
+        size_t base = idx * (buckets + 1) * sizeof(uint64_t);
+        uint64_t a, b;
+        std::memcpy(&a, summaries.data() + base + lo * sizeof(uint64_t), sizeof(uint64_t));
+        std::memcpy(&b, summaries.data() + base + hi * sizeof(uint64_t), sizeof(uint64_t));
+        if (io) {
+            io->summaryReads++;
+            io->bytesRead += 2 * sizeof(uint64_t);
+            size_t pa = (base + lo * sizeof(uint64_t)) / PAGE;
+            size_t pb = (base + hi * sizeof(uint64_t)) / PAGE;
+            io->pagesTouched += pa == pb ? 1 : 2;
+        }
+        return static_cast<long long>(b - a);
+    }
+
+    long long scanBlock(const Node& node, double x1, double y1, double x2, double y2,
+                        int t1, int t2, DiskIOStats* io) const {
+        size_t offset = static_cast<size_t>(node.first) * blockBytes;
+        const char* base = blocks.data() + offset;
+        const double* xs = reinterpret_cast<const double*>(base);
+        const double* ys = xs + blockEvents;
+        const int32_t* ws = reinterpret_cast<const int32_t*>(ys + blockEvents);
+        const uint16_t* ts = reinterpret_cast<const uint16_t*>(ws + blockEvents);
+
+        long long total = 0;
+        for (uint32_t i = 0; i < node.count; i++) {
+            if (xs[i] >= x1 && xs[i] <= x2 && ys[i] >= y1 && ys[i] <= y2 &&
+                ts[i] >= t1 && ts[i] <= t2) {
+                total += ws[i];
+            }
+        }
+
+        if (io) {
+            io->blocksRead++;
+            size_t columnOffset = offset;
+            for (size_t width : {sizeof(double), sizeof(double), sizeof(int32_t), sizeof(uint16_t)}) {
+                io->pagesTouched += pagesSpanned(columnOffset, node.count * width);
+                io->bytesRead += node.count * width;
+                columnOffset += blockEvents * width;
+            }
+        }
+        return total;
+    }
+
+    long long queryNode(size_t idx, double x1, double y1, double x2, double y2,
+                        int t1, int t2, QueryStats* stats, DiskIOStats* io, int depth) const {
+        const Node& node = nodes[idx];
+        if (stats) stats->visit(depth);
+
+        if (node.maxX < x1 || node.minX > x2 || node.maxY < y1 || node.minY > y2 ||
+            node.maxTime < t1 || node.minTime > t2) {
+            if (stats) stats->pruned++;
+            return 0;
+        }
+
+        if (node.minX >= x1 && node.maxX <= x2 && node.minY >= y1 && node.maxY <= y2) {
+            if (stats) stats->covered++;
+            if (t1 <= node.minTime && t2 >= node.maxTime) return static_cast<long long>(node.weight);
+            return timeCount(idx, t1, t2, io);
+        }
+
+        if (stats) stats->partial++;
+        if (node.level == 0) return scanBlock(node, x1, y1, x2, y2, t1, t2, io);
+
+        long long total = 0;
+        for (uint32_t c = 0; c < node.count; c++) {
+            total += queryNode(node.first + c, x1, y1, x2, y2, t1, t2, stats, io, depth + 1);
+        }
+        return total;
+    }
+
+public:
+    DiskIndex() {}
+
+    /**
+     * Build the index files for a binary event store
+     * @param storePath Event store (without .json/.bin)
+     * @param indexPath Output path (without extension); run files are
+     *                  written next to it and removed afterwards
+     */
+    static DiskIndexBuildReport build(const std::string& storePath, const std::string& indexPath,
+                                      const DiskIndexOptions& options = DiskIndexOptions()) {
+        DiskIndexBuildReport report;
+        const size_t T = options.timeBuckets;
+        const size_t W = options.coarseWidth;
+        const size_t stride = (T + W - 1) / W + 1;
+        const size_t B = std::max<size_t>(options.blockEvents, 1);
+        const size_t F = std::max<size_t>(options.fanout, 2);
+        const size_t bytesPerBlock = blockSize(B);
+        const size_t runEvents = std::max<size_t>(options.runEvents, 1);
+
+        // 1. Bounding box (quantization range of the Hilbert key)
+        double minX = 0, maxX = 0, minY = 0, maxY = 0;
+        bool any = false;
+        event_store::forEachChunk(storePath, runEvents, [&](const std::vector<Event>& chunk, long long) {
+            for (const Event& e : chunk) {
+                if (!any) { minX = maxX = e.x; minY = maxY = e.y; any = true; }
+                minX = std::min(minX, e.x); maxX = std::max(maxX, e.x);
+                minY = std::min(minY, e.y); maxY = std::max(maxY, e.y);
+            }
+        });
+        double scaleX = maxX > minX ? 4294967295.0 / (maxX - minX) : 0;
+        double scaleY = maxY > minY ? 4294967295.0 / (maxY - minY) : 0;
+        auto quantize = [](double v, double lo, double scale) {
+            return static_cast<uint32_t>(std::min(std::max((v - lo) * scale, 0.0), 4294967295.0));
+        };
+
+        // 2. Sorted runs
+        std::vector<SortRecord> run;
+        std::vector<std::string> runPaths;
+        report.events = event_store::forEachChunk(storePath, runEvents,
+                                                  [&](const std::vector<Event>& chunk, long long) {
+            run.clear();
+            run.reserve(chunk.size());
+            for (const Event& e : chunk) {
+                if (e.time < 0 || e.time >= static_cast<int>(T)) {
+                    report.skipped++;
+                    continue;
+                }
+                SortRecord r;
+                r.key = hilbertKey(quantize(e.x, minX, scaleX), quantize(e.y, minY, scaleY));
+                r.x = e.x;
+                r.y = e.y;
+                r.weight = e.weight;
+                r.time = static_cast<uint16_t>(e.time);
+                r.pad = 0;
+                run.push_back(r);
+            }
+            std::sort(run.begin(), run.end());
+
+            std::string path = indexPath + ".run" + std::to_string(runPaths.size());
+            std::ofstream out(path, std::ios::binary);
+            out.write(reinterpret_cast<const char*>(run.data()), run.size() * sizeof(SortRecord));
+            if (!out) throw std::runtime_error("could not write " + path);
+            runPaths.push_back(path);
+        });
+        report.runs = runPaths.size();
+        if (runPaths.size() == 1) {
+            std::remove(runPaths[0].c_str());  // Still in memory, no merge needed
+            runPaths.clear();
+        }
+
+        // 3. Merge into leaf blocks
+        std::ofstream blk(indexPath + ".blk", std::ios::binary | std::ios::trunc);
+        std::fstream sum(indexPath + ".sum", std::ios::binary | std::ios::in | std::ios::out | std::ios::trunc);
+        if (!blk || !sum) throw std::runtime_error("could not create " + indexPath + ".blk/.sum");
+
+        std::vector<Node> nodes;
+        std::vector<uint64_t> coarse;
+        std::vector<SortRecord> pending;
+        std::vector<char> block(bytesPerBlock);
+        std::vector<uint64_t> cumulative(T + 1);
+        pending.reserve(B);
+
+        auto writeSummary = [&](size_t nodeIndex) {
+            for (size_t k = 0; k < stride; k++) coarse.push_back(cumulative[std::min(k * W, T)]);
+            sum.seekp(static_cast<std::streamoff>(nodeIndex * (T + 1) * sizeof(uint64_t)));
+            sum.write(reinterpret_cast<const char*>(cumulative.data()), cumulative.size() * sizeof(uint64_t));
+        };
+
+        auto flushBlock = [&]() {
+            if (pending.empty()) return;
+            std::fill(block.begin(), block.end(), 0);
+            double* xs = reinterpret_cast<double*>(block.data());
+            double* ys = xs + B;
+            int32_t* ws = reinterpret_cast<int32_t*>(ys + B);
+            uint16_t* ts = reinterpret_cast<uint16_t*>(ws + B);
+
+            Node node;
+            node.minX = node.maxX = pending[0].x;
+            node.minY = node.maxY = pending[0].y;
+            node.minTime = node.maxTime = pending[0].time;
+            node.weight = 0;
+            node.first = static_cast<uint32_t>(report.blocks);
+            node.count = static_cast<uint32_t>(pending.size());
+            node.level = 0;
+            std::fill(cumulative.begin(), cumulative.end(), 0);
+
+            for (size_t i = 0; i < pending.size(); i++) {
+                const SortRecord& r = pending[i];
+                xs[i] = r.x; ys[i] = r.y; ws[i] = r.weight; ts[i] = r.time;
+                node.minX = std::min(node.minX, r.x); node.maxX = std::max(node.maxX, r.x);
+                node.minY = std::min(node.minY, r.y); node.maxY = std::max(node.maxY, r.y);
+                node.minTime = std::min(node.minTime, r.time);
+                node.maxTime = std::max(node.maxTime, r.time);
+                node.weight += r.weight;
+                cumulative[r.time + 1] += r.weight;
+            }
+            for (size_t t = 1; t <= T; t++) cumulative[t] += cumulative[t - 1];
+
+            blk.write(block.data(), block.size());
+            writeSummary(nodes.size());
+            nodes.push_back(node);
+            report.blocks++;
+            pending.clear();
+        };
+
+        auto emit = [&](const SortRecord& r) {
+            pending.push_back(r);
+            if (pending.size() == B) flushBlock();
+        };
+
+        if (runPaths.empty()) {
+            for (const SortRecord& r : run) emit(r);
+        } else {
+            run.clear();
+            run.shrink_to_fit();
+            size_t bufferRecords = runEvents / (runPaths.size() + 1);
+            std::vector<std::unique_ptr<RunReader>> readers;
+            using Item = std::pair<SortRecord, size_t>;
+            auto later = [](const Item& a, const Item& b) { return a.first > b.first; };
+            std::priority_queue<Item, std::vector<Item>, decltype(later)> heap(later);
+            for (size_t i = 0; i < runPaths.size(); i++) {
+                readers.push_back(std::make_unique<RunReader>(runPaths[i], bufferRecords));
+                SortRecord r;
+                if (readers[i]->next(r)) heap.emplace(r, i);
+            }
+            while (!heap.empty()) {
+                Item top = heap.top();
+                heap.pop();
+                emit(top.first);
+                SortRecord r;
+                if (readers[top.second]->next(r)) heap.emplace(r, top.second);
+            }
+            readers.clear();
+            for (const std::string& path : runPaths) std::remove(path.c_str());
+        }
+        flushBlock();
+
+        // 4. Pack internal levels (children of a node are consecutive)
+        size_t levelStart = 0, levelCount = nodes.size();
+        uint32_t level = 0;
+        std::vector<uint64_t> child(T + 1);
+        while (levelCount > 1) {
+            size_t nextStart = nodes.size();
+            for (size_t g = 0; g < levelCount; g += F) {
+                size_t first = levelStart + g;
+                size_t count = std::min(F, levelCount - g);
+
+                Node parent = nodes[first];
+                parent.weight = 0;
+                parent.first = static_cast<uint32_t>(first);
+                parent.count = static_cast<uint32_t>(count);
+                parent.level = level + 1;
+                std::fill(cumulative.begin(), cumulative.end(), 0);
+
+                sum.seekg(static_cast<std::streamoff>(first * (T + 1) * sizeof(uint64_t)));
+                for (size_t c = first; c < first + count; c++) {
+                    const Node& n = nodes[c];
+                    parent.minX = std::min(parent.minX, n.minX); parent.maxX = std::max(parent.maxX, n.maxX);
+                    parent.minY = std::min(parent.minY, n.minY); parent.maxY = std::max(parent.maxY, n.maxY);
+                    parent.minTime = std::min(parent.minTime, n.minTime);
+                    parent.maxTime = std::max(parent.maxTime, n.maxTime);
+                    parent.weight += n.weight;
+
+                    sum.read(reinterpret_cast<char*>(child.data()), child.size() * sizeof(uint64_t));
+                    for (size_t t = 0; t <= T; t++) cumulative[t] += child[t];
+                }
+                writeSummary(nodes.size());
+                nodes.push_back(parent);
+            }
+            levelStart = nextStart;
+            levelCount = nodes.size() - nextStart;
+            level++;
+        }
+        if (!blk || !sum) throw std::runtime_error("could not write " + indexPath + ".blk/.sum");
+
+        // 5. Directory
+        Header header;
+        header.magic = MAGIC;
+        header.version = VERSION;
+        header.timeBuckets = static_cast<uint32_t>(T);
+        header.coarseWidth = static_cast<uint32_t>(W);
+        header.blockEvents = B;
+        header.blockBytes = bytesPerBlock;
+        header.fanout = F;
+        header.nodeCount = nodes.size();
+        header.blockCount = report.blocks;
+        header.eventCount = report.events - report.skipped;
+
+        std::ofstream idx(indexPath + ".idx", std::ios::binary | std::ios::trunc);
+        idx.write(reinterpret_cast<const char*>(&header), sizeof(header));
+        idx.write(reinterpret_cast<const char*>(nodes.data()), nodes.size() * sizeof(Node));
+        idx.write(reinterpret_cast<const char*>(coarse.data()), coarse.size() * sizeof(uint64_t));
+        if (!idx) throw std::runtime_error("could not write " + indexPath + ".idx");
+
+        report.nodes = nodes.size();
+        report.diskBytes = sizeof(header) + nodes.size() * sizeof(Node) + coarse.size() * sizeof(uint64_t) +
+                           report.blocks * bytesPerBlock + nodes.size() * (T + 1) * sizeof(uint64_t);
+        return report;
+    }
+
+    /**
+     * Load the directory into memory and map the block / summary files
+     */
+    void open(const std::string& indexPath) {
+        std::ifstream idx(indexPath + ".idx", std::ios::binary);
+        if (!idx.is_open()) throw std::runtime_error("could not open " + indexPath + ".idx");
+
+        Header header;
+        idx.read(reinterpret_cast<char*>(&header), sizeof(header));
+        if (!idx || header.magic != MAGIC || header.version != VERSION) {
+            throw std::runtime_error(indexPath + ".idx is not a disk index");
+        }
+        timeBuckets = static_cast<int>(header.timeBuckets);
+        coarseWidth = static_cast<int>(header.coarseWidth);
+        coarseStride = (header.timeBuckets + header.coarseWidth - 1) / header.coarseWidth + 1;
+        blockEvents = header.blockEvents;
+        blockBytes = header.blockBytes;
+        eventCount = static_cast<long long>(header.eventCount);
+
+        nodes.resize(header.nodeCount);
+        coarse.resize(header.nodeCount * coarseStride);
+        idx.read(reinterpret_cast<char*>(nodes.data()), nodes.size() * sizeof(Node));
+        idx.read(reinterpret_cast<char*>(coarse.data()), coarse.size() * sizeof(uint64_t));
+        if (!idx) throw std::runtime_error("truncated " + indexPath + ".idx");
+
+        blocks.open(indexPath + ".blk");
+        summaries.open(indexPath + ".sum");
+        if (blocks.size() < header.blockCount * blockBytes ||
+            summaries.size() < header.nodeCount * (header.timeBuckets + 1) * sizeof(uint64_t)) {
+            throw std::runtime_error("truncated " + indexPath + ".blk/.sum");
+        }
+    }
+
+    /**
+     * Weighted count of events in range
+     * @param stats Optional traversal counters (covered = answered from summaries)
+     * @param io Optional I/O counters
+     */
+    long long query(double x1, double y1, double x2, double y2, int t1, int t2,
+                    QueryStats* stats = nullptr, DiskIOStats* io = nullptr) const {
+        if (x1 > x2) std::swap(x1, x2);
+        if (y1 > y2) std::swap(y1, y2);
+        if (t1 > t2) std::swap(t1, t2);
+        t1 = std::max(t1, 0);
+        t2 = std::min(t2, timeBuckets - 1);
+        if (nodes.empty() || t1 > t2) return 0;
+        return queryNode(nodes.size() - 1, x1, y1, x2, y2, t1, t2, stats, io, 0);
+    }
+
+    /**
+     * Drop the mapped files from the OS page cache (cold-cache runs)
+     */
+    void dropCache() {
+        blocks.dropCache();
+        summaries.dropCache();
+    }
+
+    long long size() const {
+        return eventCount;
+    }
+
+    size_t nodeCount() const {
+        return nodes.size();
+    }
+
+    size_t height() const {
+        return nodes.empty() ? 0 : nodes.back().level + 1;
+    }
+
+    /**
+     * Heap memory of the in-RAM part (directory + coarse summaries)
+     */
+    size_t memoryUsage() const {
+        return nodes.size() * sizeof(Node) + coarse.size() * sizeof(uint64_t);
+    }
+
+    /**
+     * Size of the mapped files
+     */
+    size_t diskBytes() const {
+        return blocks.size() + summaries.size();
+    }
+};
+
+#endif // DISK_INDEX_H
@@ -0,0 +1,278 @@
+#ifndef EVENT_STORE_H
+#define EVENT_STORE_H
+
+#include <algorithm>
+#include <cstdint>
+#include <cstring>
+#include <fstream>
+#include <sstream>
+#include <stdexcept>
+#include <string>
+#include <vector>
+#include "kdtree.h"
+#include "projection.h"
+
+/**
+ * Reader for the columnar binary event store
+ * (written by src/python/event_store.py / convert_to_binary.py)
+ *
+ * Files:
+ *   <name>.json  manifest with count and per-column dtype + byte offset
+ *   <name>.bin   little-endian column buffers
+ *
+ * Only the fields the engine needs (x, y, time, weight, type code) are
+ * decoded; the type dictionary is available through loadTypes.
+ * Stores written with a projection keep x / y as int32 fixed-point
+ * northing / easting; loadProjection returns its parameters.
+ * Loading is O(N) with no text parsing, unlike loadEventsFromCSV.
+ */
+namespace event_store {
+
+struct ColumnInfo {
+    std::string dtype;
+    long long offset = -1;
+};
+
+/**
+ * Pull one column's dtype/offset out of the manifest.
+ * The manifest is produced by our own writer with compact separators,
+ * so a small string scan is enough here.
+ */
+inline ColumnInfo findColumn(const std::string& manifest, const std::string& name) {
+    ColumnInfo info;
+    size_t columns = manifest.find("\"columns\"");
+    if (columns == std::string::npos) return info;
+
+    size_t pos = manifest.find("\"" + name + "\":{", columns);
+    if (pos == std::string::npos) return info;
+
+    size_t dtypePos = manifest.find("\"dtype\":\"", pos);
+    size_t offsetPos = manifest.find("\"offset\":", pos);
+    if (dtypePos == std::string::npos || offsetPos == std::string::npos) return info;
+
+    dtypePos += 9;
+    info.dtype = manifest.substr(dtypePos, manifest.find('"', dtypePos) - dtypePos);
+    info.offset = std::stoll(manifest.substr(offsetPos + 9));
+    return info;
+}
+
+inline long long findCount(const std::string& manifest) {
+    size_t pos = manifest.find("\"count\":");
+    if (pos == std::string::npos) {
+        throw std::runtime_error("manifest has no count");
+    }
+    return std::stoll(manifest.substr(pos + 8));
+}
+
+/**
+ * Decode a whole column, calling set(i, value) for every element.
+ * The dtype dispatch happens once per column, not per element.
+ */
+template <typename T, typename Setter>
+inline void decodeAs(const char* base, long long count, Setter set) {
+    for (long long i = 0; i < count; i++) {
+        T v;
+        std::memcpy(&v, base + i * sizeof(T), sizeof(T));
+        set(i, v);
+    }
+}
+
+template <typename Setter>
+inline void decodeColumn(const char* base, const std::string& dtype,
+                         long long count, Setter set) {
+    if (dtype == "float64")      decodeAs<double>(base, count, set);
+    else if (dtype == "float32") decodeAs<float>(base, count, set);
+    else if (dtype == "int32")   decodeAs<int32_t>(base, count, set);
+    else if (dtype == "uint32")  decodeAs<uint32_t>(base, count, set);
+    else if (dtype == "uint16")  decodeAs<uint16_t>(base, count, set);
+    else if (dtype == "uint8")   decodeAs<uint8_t>(base, count, set);
+    else throw std::runtime_error("unsupported column dtype: " + dtype);
+}
+
+/**
+ * Parse a JSON string array such as "types":["THEFT","ASSAULT"]
+ * (empty if the key is missing)
+ */
+inline std::vector<std::string> findStrings(const std::string& manifest, const std::string& name) {
+    std::vector<std::string> values;
+    size_t pos = manifest.find("\"" + name + "\":[");
+    if (pos == std::string::npos) return values;
+    pos += name.size() + 4;
+
+    std::string current;
+    bool inString = false;
+    for (; pos < manifest.size(); pos++) {
+        char c = manifest[pos];
+        if (inString) {
+            if (c == '\\' && pos + 1 < manifest.size()) current += manifest[++pos];
+            else if (c == '"') { values.push_back(current); current.clear(); inString = false; }
+            else current += c;
+        } else if (c == '"') {
+            inString = true;
+        } else if (c == ']') {
+            break;
+        }
+    }
+    return values;
+}
+
+inline std::string readManifest(const std::string& basePath) {
+    std::ifstream manifestFile(basePath + ".json");
+    if (!manifestFile.is_open()) {
+        throw std::runtime_error("could not open " + basePath + ".json");
+    }
+    std::stringstream ss;
+    ss << manifestFile.rdbuf();
+    return ss.str();
+}
+
+/**
+ * Type dictionary of a store (type code -> name)
+ */
+inline std::vector<std::string> loadTypes(const std::string& basePath) {
+    return findStrings(readManifest(basePath), "types");
+}
+
+/**
+ * Projection of a store with projected coordinates
+ * (invalid LocalProjection for plain lat/lon stores)
+ */
+inline LocalProjection findProjection(const std::string& manifest) {
+    size_t pos = manifest.find("\"projection\":{");
+    if (pos == std::string::npos) return LocalProjection();
+    size_t end = manifest.find('}', pos);
+
+    auto number = [&](const std::string& key) {
+        size_t at = manifest.find("\"" + key + "\":", pos);
+        if (at == std::string::npos || at > end) {
+            throw std::runtime_error("projection has no " + key);
+        }
+        return std::stod(manifest.substr(at + key.size() + 3));
+    };
+    if (manifest.find("\"kind\":\"tmerc-sphere\"", pos) > end) {
+        throw std::runtime_error("unsupported projection kind");
+    }
+    return LocalProjection(number("lat0"), number("lon0"), number("unit"));
+}
+
+inline LocalProjection loadProjection(const std::string& basePath) {
+    return findProjection(readManifest(basePath));
+}
+
+/**
+ * Load events from <basePath>.json + <basePath>.bin
+ * @param timeColumn Column decoded into Event::time ("timestamp" for
+ *                   absolute minutes since 1970, see time_domain.h)
+ */
+inline std::vector<Event> loadEvents(const std::string& basePath, const std::string& timeColumn = "time") {
+    const std::string manifest = readManifest(basePath);
+
+    long long count = findCount(manifest);
+    ColumnInfo xs = findColumn(manifest, "x");
+    ColumnInfo ys = findColumn(manifest, "y");
+    ColumnInfo ts = findColumn(manifest, timeColumn);
+    ColumnInfo ws = findColumn(manifest, "weight");
+    ColumnInfo types = findColumn(manifest, "type");
+    if (xs.offset < 0 || ys.offset < 0 || ts.offset < 0) {
+        throw std::runtime_error("manifest is missing x/y/time columns");
+    }
+
+    std::ifstream bin(basePath + ".bin", std::ios::binary);
+    if (!bin.is_open()) {
+        throw std::runtime_error("could not open " + basePath + ".bin");
+    }
+    std::vector<char> raw((std::istreambuf_iterator<char>(bin)),
+                          std::istreambuf_iterator<char>());
+
+    std::vector<Event> events(count);
+    const char* base = raw.data();
+    decodeColumn(base + xs.offset, xs.dtype, count,
+                 [&](long long i, double v) { events[i].x = v; });
+    decodeColumn(base + ys.offset, ys.dtype, count,
+                 [&](long long i, double v) { events[i].y = v; });
+    decodeColumn(base + ts.offset, ts.dtype, count,
+                 [&](long long i, double v) { events[i].time = static_cast<int>(v); });
+    if (ws.offset >= 0) {
+        decodeColumn(base + ws.offset, ws.dtype, count,
+                     [&](long long i, double v) { events[i].weight = static_cast<int>(v); });
+    }
+    if (types.offset >= 0) {
+        decodeColumn(base + types.offset, types.dtype, count,
+                     [&](long long i, double v) { events[i].type = static_cast<int>(v); });
+    }
+    return events;
+}
+
+inline size_t dtypeSize(const std::string& dtype) {
+    if (dtype == "float64") return 8;
+    if (dtype == "float32" || dtype == "int32" || dtype == "uint32") return 4;
+    if (dtype == "uint16") return 2;
+    if (dtype == "uint8") return 1;
+    throw std::runtime_error("unsupported column dtype: " + dtype);
+}
+
+/**
+ * Stream a store in chunks of at most chunkSize events, calling
+ * fn(events, firstIndex) per chunk. Only one chunk is held in memory,
+ * so stores larger than RAM can be processed (see disk_index.h).
+ * @return Total number of events
+ */
+template <typename Fn>
+inline long long forEachChunk(const std::string& basePath, size_t chunkSize, Fn fn) {
+    const std::string manifest = readManifest(basePath);
+    long long count = findCount(manifest);
+
+    std::vector<std::pair<std::string, ColumnInfo>> columns;
+    for (const char* name : {"x", "y", "time", "weight", "type"}) {
+        ColumnInfo info = findColumn(manifest, name);
+        if (info.offset >= 0) columns.emplace_back(name, info);
+    }
+    if (columns.size() < 3 || columns[2].first != "time") {
+        throw std::runtime_error("manifest is missing x/y/time columns");
+    }
+
+    std::ifstream bin(basePath + ".bin", std::ios::binary);
+    if (!bin.is_open()) {
+        throw std::runtime_error("could not open " + basePath + ".bin");
+    }
+
+    std::vector<Event> events;
+    std::vector<char> buffer;
+    chunkSize = std::max<size_t>(chunkSize, 1);
+    for (long long start = 0; start < count; start += chunkSize) {
+        long long n = std::min<long long>(chunkSize, count - start);
+        events.assign(n, Event());
+
+        for (const auto& column : columns) {
+            const std::string& name = column.first;
+            const ColumnInfo& info = column.second;
+            size_t itemSize = dtypeSize(info.dtype);
+            buffer.resize(n * itemSize);
+            bin.seekg(info.offset + start * static_cast<long long>(itemSize));
+            if (!bin.read(buffer.data(), buffer.size())) {
+                throw std::runtime_error("truncated column " + name + " in " + basePath + ".bin");
+            }
+
+            if (name == "x") {
+                decodeColumn(buffer.data(), info.dtype, n, [&](long long i, double v) { events[i].x = v; });
+            } else if (name == "y") {
+                decodeColumn(buffer.data(), info.dtype, n, [&](long long i, double v) { events[i].y = v; });
+            } else if (name == "time") {
+                decodeColumn(buffer.data(), info.dtype, n,
+                             [&](long long i, double v) { events[i].time = static_cast<int>(v); });
+            } else if (name == "weight") {
+                decodeColumn(buffer.data(), info.dtype, n,
+                             [&](long long i, double v) { events[i].weight = static_cast<int>(v); });
+            } else {
+                decodeColumn(buffer.data(), info.dtype, n,
+                             [&](long long i, double v) { events[i].type = static_cast<int>(v); });
+            }
+        }
+        fn(events, start);
+    }
+    return count;
+}
+
+} // namespace event_store
+
+#endif // EVENT_STORE_H
@@ -16,6 +16,9 @@
  *   - range_sum(l, r): O(log n)
  * 
  * Space Complexity: O(n)
+ *
+ * Queries are const and touch no shared state, so any number of threads
+ * may call sum/range_sum concurrently as long as nobody calls add/clear.
  */
 class Fenwick {
 private:
@@ -63,7 +66,7 @@ public:
      * @param idx Position (1-indexed)
      * @return Sum of elements from 1 to idx
      */
-    int sum(int idx) {
+    int sum(int idx) const {
         if (idx <= 0) return 0;
         if (idx > n) idx = n;
         
@@ -80,7 +83,7 @@ public:
      * @param r Right bound (1-indexed)
      * @return Sum of elements from l to r
      */
-    int range_sum(int l, int r) {
+    int range_sum(int l, int r) const {
         if (l > r) return 0;
         if (l <= 0) l = 1;
         if (r > n) r = n;
@@ -95,6 +98,14 @@ public:
         return n;
     }
 
+    /**
+     * Heap memory used by the tree array
+     * @return Size in bytes
+     */
+    size_t memoryBytes() const {
+        return bit.capacity() * sizeof(int);
+    }
+
     /**
      * Clear the tree (reset all values to 0)
      */
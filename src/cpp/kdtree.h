@@ -6,19 +6,26 @@
 #include <memory>
 #include <limits>
 #include "fenwick.h"
+#include "query_stats.h"
 
 /**
  * Event structure representing a spatio-temporal point
  */
 struct Event {
     double x, y;    // Spatial coordinates
-    int time;       // Temporal coordinate (bucket index)
+    int time;       // Temporal coordinate (0-based bucket, Fenwick index time + 1)
     int weight;     // Event weight (usually 1)
+    int type;       // Crime type code (index into the store's type dictionary)
 
-    Event(double _x = 0, double _y = 0, int _t = 0, int _w = 1)
-        : x(_x), y(_y), time(_t), weight(_w) {}
+    Event(double _x = 0, double _y = 0, int _t = 0, int _w = 1, int _type = 0)
+        : x(_x), y(_y), time(_t), weight(_w), type(_type) {}
 };
 
+/**
+ * How a node's bounding box relates to a query region (see KDTree::queryRegion)
+ */
+enum class Overlap { Outside, Partial, Inside };
+
 /**
  * KD-Tree Node
  * Each node stores:
@@ -30,14 +37,15 @@ struct Event {
 class KDNode {
 public:
     double x, y;                          // Point at this node
+    int time, weight;                     // Time bucket / weight of the point
     double minX, maxX, minY, maxY;        // Bounding box
     bool splitByX;                         // Split dimension
     std::unique_ptr<KDNode> left, right;  // Children
     Fenwick fenwick;                       // Temporal index
 
     KDNode(double _x, double _y, bool _splitX, int timeSize)
-        : x(_x), y(_y), splitByX(_splitX),
-          minX(_x), maxX(_x), minY(_y), maxY(_y) {
+        : x(_x), y(_y), time(0), weight(0),
+          minX(_x), maxX(_x), minY(_y), maxY(_y), splitByX(_splitX) {
         fenwick.init(timeSize);
     }
 
@@ -72,7 +80,7 @@ public:
 class KDTree {
 private:
     std::unique_ptr<KDNode> root;
-    int maxTime;  // Maximum time bucket
+    int maxTime;  // Number of time buckets (times 0 .. maxTime - 1)
 
     /**
      * Recursively build KD-Tree
@@ -104,6 +112,13 @@ private:
         auto node = std::make_unique<KDNode>(
             points[mid].x, points[mid].y, splitByX, maxTime
         );
+        node->time = points[mid].time;
+        node->weight = points[mid].weight;
+
+        // Index every event of this subtree in the node's Fenwick tree
+        for (int i = start; i <= end; i++) {
+            node->fenwick.add(points[i].time + 1, points[i].weight);
+        }
 
         // Build left and right subtrees
         node->left = buildTree(points, start, mid - 1, depth + 1);
@@ -123,33 +138,32 @@ private:
     }
 
     /**
-     * Insert event into KD-Tree (updates Fenwick trees along path)
-     * @param node Current node
+     * Insert event into KD-Tree: updates the Fenwick trees and bounding
+     * boxes along the path and adds the event as a new leaf
+     * @param slot Current node (null: where the new leaf goes)
      * @param e Event to insert
+     * @param depth Depth of slot (determines split dimension of a new leaf)
      */
-    void insertEvent(KDNode* node, const Event& e) {
-        if (!node) return;
+    void insertEvent(std::unique_ptr<KDNode>& slot, const Event& e, int depth) {
+        if (!slot) {
+            slot = std::make_unique<KDNode>(e.x, e.y, depth % 2 == 0, maxTime);
+            slot->time = e.time;
+            slot->weight = e.weight;
+            slot->fenwick.add(e.time + 1, e.weight);
+            return;
+        }
+
+        KDNode* node = slot.get();
 
         // Update Fenwick tree at this node
-        node->fenwick.add(e.time, e.weight);
+        node->fenwick.add(e.time + 1, e.weight);
 
         // Update bounding box
         node->updateBounds(e.x, e.y);
 
         // Recurse to appropriate child
-        if (node->splitByX) {
-            if (e.x <= node->x) {
-                insertEvent(node->left.get(), e);
-            } else {
-                insertEvent(node->right.get(), e);
-            }
-        } else {
-            if (e.y <= node->y) {
-                insertEvent(node->left.get(), e);
-            } else {
-                insertEvent(node->right.get(), e);
-            }
-        }
+        bool goLeft = node->splitByX ? e.x <= node->x : e.y <= node->y;
+        insertEvent(goLeft ? node->left : node->right, e, depth + 1);
     }
 
     /**
@@ -157,37 +171,117 @@ private:
      * @param node Current node
      * @param x1, y1, x2, y2 Spatial rectangle
      * @param t1, t2 Temporal range
+     * @param stats Optional counters (nullptr = disabled)
+     * @param depth Depth of node
      * @return Count of events in range
      */
-    int queryRange(KDNode* node, double x1, double y1, double x2, double y2,
-                   int t1, int t2) const {
+    int queryRange(const KDNode* node, double x1, double y1, double x2, double y2,
+                   int t1, int t2, QueryStats* stats, int depth) const {
         if (!node) return 0;
+        if (stats) stats->visit(depth);
 
         // If bounding box doesn't intersect query rectangle → skip
         if (!node->intersects(x1, y1, x2, y2)) {
+            if (stats) stats->pruned++;
             return 0;
         }
 
         // If bounding box is completely inside query rectangle → use Fenwick
         if (node->isInside(x1, y1, x2, y2)) {
-            return node->fenwick.range_sum(t1, t2);
+            if (stats) stats->covered++;
+            return node->fenwick.range_sum(t1 + 1, t2 + 1);
         }
 
         // Partial overlap → recurse to children
+        if (stats) stats->partial++;
         int result = 0;
         
-        // Check if this node's point is in range
-        if (node->x >= x1 && node->x <= x2 && 
-            node->y >= y1 && node->y <= y2) {
-            result += node->fenwick.range_sum(t1, t2);
+        // Check if this node's own point is in range
+        // (the node's Fenwick covers the whole subtree, so it can't be used here)
+        if (node->x >= x1 && node->x <= x2 &&
+            node->y >= y1 && node->y <= y2 &&
+            node->time >= t1 && node->time <= t2) {
+            result += node->weight;
+            if (stats) stats->pointHits++;
         }
 
-        result += queryRange(node->left.get(), x1, y1, x2, y2, t1, t2);
-        result += queryRange(node->right.get(), x1, y1, x2, y2, t1, t2);
+        result += queryRange(node->left.get(), x1, y1, x2, y2, t1, t2, stats, depth + 1);
+        result += queryRange(node->right.get(), x1, y1, x2, y2, t1, t2, stats, depth + 1);
 
         return result;
     }
 
+    /**
+     * Count events within distance r of (cx, cy) (squared distances, so
+     * the tests are exact for integer coordinates)
+     */
+    int queryCircle(const KDNode* node, double cx, double cy, double r2,
+                    int t1, int t2, QueryStats* stats, int depth) const {
+        if (!node) return 0;
+        if (stats) stats->visit(depth);
+
+        // Nearest and farthest point of the bounding box from the center
+        double nx = std::max(node->minX - cx, std::max(0.0, cx - node->maxX));
+        double ny = std::max(node->minY - cy, std::max(0.0, cy - node->maxY));
+        if (nx * nx + ny * ny > r2) {
+            if (stats) stats->pruned++;
+            return 0;
+        }
+
+        double fx = std::max(cx - node->minX, node->maxX - cx);
+        double fy = std::max(cy - node->minY, node->maxY - cy);
+        if (fx * fx + fy * fy <= r2) {
+            if (stats) stats->covered++;
+            return node->fenwick.range_sum(t1 + 1, t2 + 1);
+        }
+
+        if (stats) stats->partial++;
+        int result = 0;
+        double dx = node->x - cx, dy = node->y - cy;
+        if (dx * dx + dy * dy <= r2 && node->time >= t1 && node->time <= t2) {
+            result += node->weight;
+            if (stats) stats->pointHits++;
+        }
+
+        result += queryCircle(node->left.get(), cx, cy, r2, t1, t2, stats, depth + 1);
+        result += queryCircle(node->right.get(), cx, cy, r2, t1, t2, stats, depth + 1);
+        return result;
+    }
+
+    template <typename Region>
+    int queryArea(const KDNode* node, const Region& region, int t1, int t2,
+                  QueryStats* stats, int depth) const {
+        if (!node) return 0;
+        if (stats) stats->visit(depth);
+
+        Overlap overlap = region.overlap(node->minX, node->maxX, node->minY, node->maxY);
+        if (overlap == Overlap::Outside) {
+            if (stats) stats->pruned++;
+            return 0;
+        }
+        if (overlap == Overlap::Inside) {
+            if (stats) stats->covered++;
+            return node->fenwick.range_sum(t1 + 1, t2 + 1);
+        }
+
+        if (stats) stats->partial++;
+        int result = 0;
+        if (node->time >= t1 && node->time <= t2 && region.contains(node->x, node->y)) {
+            result += node->weight;
+            if (stats) stats->pointHits++;
+        }
+
+        result += queryArea(node->left.get(), region, t1, t2, stats, depth + 1);
+        result += queryArea(node->right.get(), region, t1, t2, stats, depth + 1);
+        return result;
+    }
+
+    size_t nodeMemory(const KDNode* node) const {
+        if (!node) return 0;
+        return sizeof(KDNode) + node->fenwick.memoryBytes() +
+               nodeMemory(node->left.get()) + nodeMemory(node->right.get());
+    }
+
 public:
     KDTree(int _maxTime = 1440) : maxTime(_maxTime) {}
 
@@ -205,22 +299,78 @@ public:
      * @param e Event to insert
      */
     void insert(const Event& e) {
-        insertEvent(root.get(), e);
+        insertEvent(root, e, 0);
     }
 
     /**
      * Query events in spatio-temporal range
+     *
+     * Read-only: concurrent queries on a built tree are safe (give each
+     * thread its own stats), but must not overlap with insert().
      * @param x1, y1, x2, y2 Spatial rectangle (bottom-left to top-right)
      * @param t1, t2 Temporal range (inclusive)
+     * @param stats Optional counters for this query (accumulated, not reset)
      * @return Count of events in range
      */
-    int query(double x1, double y1, double x2, double y2, int t1, int t2) const {
+    int query(double x1, double y1, double x2, double y2, int t1, int t2,
+              QueryStats* stats = nullptr) const {
         // Ensure proper ordering
         if (x1 > x2) std::swap(x1, x2);
         if (y1 > y2) std::swap(y1, y2);
         if (t1 > t2) std::swap(t1, t2);
 
-        return queryRange(root.get(), x1, y1, x2, y2, t1, t2);
+        return queryRange(root.get(), x1, y1, x2, y2, t1, t2, stats, 0);
+    }
+
+    /**
+     * Query events within distance r of (cx, cy) in a time range
+     *
+     * Distance is Euclidean in coordinate units: meant for projected
+     * stores (projection.h), where units are metres / centimetres; on
+     * lat/lon coordinates it would be a distorted ellipse on the ground.
+     * @param cx, cy Center
+     * @param r Radius (inclusive)
+     * @param t1, t2 Temporal range (inclusive)
+     * @param stats Optional counters for this query (accumulated, not reset)
+     * @return Count of events in range
+     */
+    int queryRadius(double cx, double cy, double r, int t1, int t2,
+                    QueryStats* stats = nullptr) const {
+        if (t1 > t2) std::swap(t1, t2);
+        if (r < 0) return 0;
+        return queryCircle(root.get(), cx, cy, r * r, t1, t2, stats, 0);
+    }
+
+    /**
+     * Query events in an arbitrary spatial region in a time range
+     *
+     * The region classifies bounding boxes and tests points:
+     *   Overlap overlap(minX, maxX, minY, maxY)  Inside only if the whole
+     *                                            box is in the region
+     *   bool contains(x, y)
+     * e.g. a lat/lon rectangle on a projected store (projection.h).
+     * @return Count of events in range
+     */
+    template <typename Region>
+    int queryRegion(const Region& region, int t1, int t2, QueryStats* stats = nullptr) const {
+        if (t1 > t2) std::swap(t1, t2);
+        return queryArea(root.get(), region, t1, t2, stats, 0);
+    }
+
+    /**
+     * Approximate heap memory held by the index (nodes + Fenwick arrays)
+     * @return Size in bytes
+     */
+    size_t memoryUsage() const {
+        return nodeMemory(root.get());
+    }
+
+    /**
+     * Estimate index memory for n events before building
+     * (one node + one Fenwick of maxTime + 1 ints per event)
+     */
+    static size_t estimateMemory(size_t n, int maxTime = 1440) {
+        return n * (sizeof(KDNode) + (maxTime + 1) * sizeof(int));
     }
 
     /**
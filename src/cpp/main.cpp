@@ -4,15 +4,22 @@
 #include <vector>
 #include <chrono>
 #include <iomanip>
+#include <map>
 #include "kdtree.h"
+#include "event_store.h"
+#include "parallel_query.h"
+#include "workload.h"
 
 using namespace std;
 
+using Clock = chrono::steady_clock;
+
 /**
  * Parse CSV file and load events
  * Expected format: x,y,time,weight
+ * @param log Progress output (stderr in batch mode, which keeps stdout for JSON)
  */
-vector<Event> loadEventsFromCSV(const string& filename) {
+vector<Event> loadEventsFromCSV(const string& filename, ostream& log = cout) {
     vector<Event> events;
     ifstream file(filename);
     
@@ -43,7 +50,7 @@ vector<Event> loadEventsFromCSV(const string& filename) {
     }
     
     file.close();
-    cout << "✓ Loaded " << events.size() << " events from " << filename << endl;
+    log << "✓ Loaded " << events.size() << " events from " << filename << endl;
     return events;
 }
 
@@ -51,7 +58,8 @@ vector<Event> loadEventsFromCSV(const string& filename) {
  * Print query results
  */
 void printQueryResult(int count, double x1, double y1, double x2, double y2, 
-                     int t1, int t2, double queryTime) {
+                     int t1, int t2, double queryTime,
+                     const QueryStats* stats = nullptr) {
     cout << "\n┌─────────────────────────────────────────┐" << endl;
     cout << "│         QUERY RESULT                    │" << endl;
     cout << "└─────────────────────────────────────────┘" << endl;
@@ -60,87 +68,345 @@ void printQueryResult(int count, double x1, double y1, double x2, double y2,
     cout << "    Top-Right:    (" << x2 << ", " << y2 << ")" << endl;
     cout << "  Temporal Range:" << endl;
     cout << "    From: " << t1 << " → To: " << t2 << endl;
-    cout << "  " << string(39, '─') << endl;
+    cout << "  " << string(39, '-') << endl;
     cout << "  ✓ Events Found: " << count << endl;
     cout << "  ⏱  Query Time:   " << fixed << setprecision(3) << queryTime << " ms" << endl;
+    if (stats) {
+        cout << "  🔍 Nodes Visited: " << stats->visited
+             << " (pruned " << stats->pruned
+             << ", covered " << stats->covered
+             << ", partial " << stats->partial << ")" << endl;
+        cout << "     Fenwick Lookups: " << stats->fenwickLookups()
+             << ", Point Hits: " << stats->pointHits
+             << ", Max Depth: " << stats->maxDepth() << endl;
+    }
     cout << "└─────────────────────────────────────────┘\n" << endl;
 }
 
+/**
+ * Print a log2 histogram as text bars
+ */
+void printHistogram(const string& title, const vector<long long>& histogram) {
+    long long peak = 1;
+    for (long long v : histogram) peak = max(peak, v);
+
+    size_t first = 0;
+    while (first + 1 < histogram.size() && histogram[first] == 0) first++;
+
+    cout << "  " << title << endl;
+    for (size_t b = first; b < histogram.size(); b++) {
+        long long lo = b == 0 ? 0 : (1LL << (b - 1));
+        long long hi = b == 0 ? 0 : (1LL << b) - 1;
+        cout << "    " << setw(7) << lo << "-" << left << setw(7) << hi << right
+             << " │" << string(histogram[b] * 30 / peak, '#') << " " << histogram[b] << endl;
+    }
+}
+
+/**
+ * Print counters aggregated over all instrumented queries
+ */
+void printAggregateStats(const QueryStatsAggregator& aggregate) {
+    const QueryStats& total = aggregate.total;
+
+    cout << "\n" << string(50, '=') << endl;
+    cout << "  QUERY PATH STATISTICS (" << aggregate.queries << " queries)" << endl;
+    cout << string(50, '=') << endl;
+    cout << fixed << setprecision(1);
+    cout << "  Avg Nodes Visited:   " << aggregate.mean(total.visited) << endl;
+    cout << "  Avg Pruned:          " << aggregate.mean(total.pruned) << endl;
+    cout << "  Avg Fully Covered:   " << aggregate.mean(total.covered) << endl;
+    cout << "  Avg Partial Overlap: " << aggregate.mean(total.partial) << endl;
+    cout << "  Avg Point Hits:      " << aggregate.mean(total.pointHits) << endl;
+    cout << "  Max Depth Reached:   " << total.maxDepth() << endl;
+    printHistogram("Nodes visited per query:", aggregate.visitedHistogram);
+    printHistogram("Fenwick lookups per query:", aggregate.coveredHistogram);
+    cout << string(50, '=') << "\n" << endl;
+}
+
+/**
+ * How a lat/lon query is answered: tree.query on lat/lon data, the exact
+ * lat/lon region query (queryLatLon) on a projected store
+ */
+ParallelQueryExecutor::QueryFn engineQuery(const KDTree& tree, const LocalProjection& projection) {
+    if (!projection.valid) {
+        return [&tree](const RangeQuery& q, QueryStats* stats) {
+            return tree.query(q.x1, q.y1, q.x2, q.y2, q.t1, q.t2, stats);
+        };
+    }
+    return [&tree, &projection](const RangeQuery& q, QueryStats* stats) {
+        return queryLatLon(tree, projection, q.x1, q.y1, q.x2, q.y2, q.t1, q.t2, stats);
+    };
+}
+
+/**
+ * Time one query and print its result
+ * @param projection Valid for projected stores (see engineQuery)
+ * @param aggregate When non-null, collect query path statistics
+ */
+void runQuery(const KDTree& tree, const LocalProjection& projection,
+              double x1, double y1, double x2, double y2,
+              int t1, int t2, QueryStatsAggregator* aggregate) {
+    QueryStats stats;
+    QueryStats* statsPtr = aggregate ? &stats : nullptr;
+    auto query = engineQuery(tree, projection);
+
+    auto start = chrono::high_resolution_clock::now();
+    int count = query(RangeQuery(x1, y1, x2, y2, t1, t2), statsPtr);
+    auto end = chrono::high_resolution_clock::now();
+    double time = chrono::duration<double, milli>(end - start).count();
+
+    printQueryResult(count, x1, y1, x2, y2, t1, t2, time, statsPtr);
+    if (aggregate) aggregate->add(stats);
+}
+
+/**
+ * Time one radius query around a lat/lon point (projected stores only)
+ */
+void runRadiusQuery(const KDTree& tree, const LocalProjection& projection,
+                    double lat, double lon, double metres, int t1, int t2,
+                    QueryStatsAggregator* aggregate) {
+    QueryStats stats;
+    QueryStats* statsPtr = aggregate ? &stats : nullptr;
+    double cx, cy;
+    projection.forward(lat, lon, cx, cy);
+
+    auto start = chrono::high_resolution_clock::now();
+    int count = tree.queryRadius(cx, cy, projection.units(metres), t1, t2, statsPtr);
+    auto end = chrono::high_resolution_clock::now();
+    double time = chrono::duration<double, milli>(end - start).count();
+
+    cout << "\n  Within " << fixed << setprecision(1) << metres << " m of ("
+         << setprecision(6) << lat << ", " << lon << "), time " << t1 << " → " << t2 << endl;
+    cout << "  ✓ Events Found: " << count << endl;
+    cout << "  ⏱  Query Time:   " << fixed << setprecision(3) << time << " ms\n" << endl;
+    if (aggregate) aggregate->add(stats);
+}
+
 /**
  * Run demo queries
  */
-void runDemo(KDTree& tree) {
+void runDemo(KDTree& tree, const LocalProjection& projection, QueryStatsAggregator* aggregate) {
     cout << "\n" << string(50, '=') << endl;
     cout << "  DEMO QUERIES" << endl;
     cout << string(50, '=') << "\n" << endl;
 
     // Query 1: Large region, short time
-    {
-        auto start = chrono::high_resolution_clock::now();
-        int count = tree.query(41.75, -87.75, 41.95, -87.55, 600, 720);
-        auto end = chrono::high_resolution_clock::now();
-        double time = chrono::duration<double, milli>(end - start).count();
-        
-        cout << "\n[Query 1] Morning Rush Hour in Downtown" << endl;
-        printQueryResult(count, 41.75, -87.75, 41.95, -87.55, 600, 720, time);
-    }
+    cout << "\n[Query 1] Morning Rush Hour in Downtown" << endl;
+    runQuery(tree, projection, 41.75, -87.75, 41.95, -87.55, 600, 720, aggregate);
 
     // Query 2: Small region, long time
-    {
-        auto start = chrono::high_resolution_clock::now();
-        int count = tree.query(41.87, -87.65, 41.90, -87.62, 0, 1440);
-        auto end = chrono::high_resolution_clock::now();
-        double time = chrono::duration<double, milli>(end - start).count();
-        
-        cout << "\n[Query 2] Entire Day in Small Neighborhood" << endl;
-        printQueryResult(count, 41.87, -87.65, 41.90, -87.62, 0, 1440, time);
-    }
+    cout << "\n[Query 2] Entire Day in Small Neighborhood" << endl;
+    runQuery(tree, projection, 41.87, -87.65, 41.90, -87.62, 0, 1440, aggregate);
 
     // Query 3: Night time crime hotspot
-    {
-        auto start = chrono::high_resolution_clock::now();
-        int count = tree.query(41.80, -87.70, 41.92, -87.60, 1200, 300);
-        auto end = chrono::high_resolution_clock::now();
-        double time = chrono::duration<double, milli>(end - start).count();
-        
-        cout << "\n[Query 3] Night Crime Hotspot (8 PM - 5 AM)" << endl;
-        printQueryResult(count, 41.80, -87.70, 41.92, -87.60, 1200, 300, time);
-    }
+    cout << "\n[Query 3] Night Crime Hotspot (8 PM - 5 AM)" << endl;
+    runQuery(tree, projection, 41.80, -87.70, 41.92, -87.60, 1200, 300, aggregate);
 
     // Query 4: Precise location, specific hour
-    {
-        auto start = chrono::high_resolution_clock::now();
-        int count = tree.query(41.88, -87.63, 41.89, -87.62, 720, 780);
-        auto end = chrono::high_resolution_clock::now();
-        double time = chrono::duration<double, milli>(end - start).count();
-        
-        cout << "\n[Query 4] Precise Location During Noon Hour" << endl;
-        printQueryResult(count, 41.88, -87.63, 41.89, -87.62, 720, 780, time);
+    cout << "\n[Query 4] Precise Location During Noon Hour" << endl;
+    runQuery(tree, projection, 41.88, -87.63, 41.89, -87.62, 720, 780, aggregate);
+}
+
+/**
+ * Options of the non-interactive batch mode (--batch)
+ */
+struct BatchOptions {
+    string workloadPath;
+    string csvPath;      // Per-query results (optional)
+    string jsonPath;     // Summary; stdout when empty
+    unsigned threads = 1;  // 1 = sequential on the main thread, 0 = all cores
+    int warmupRuns = 1;    // Untimed passes over the workload before the timed one
+    bool collectStats = false;
+};
+
+/**
+ * Run a query workload without interaction and report throughput and
+ * latency percentiles as JSON:
+ *   {"n", "queries", "threads", "warmup_runs", "load_ms", "build_ms",
+ *    "index_bytes", "wall_ms", "qps", "latency_ms": {count, mean, p50,
+ *    p95, p99, max}, "by_class": {...}[, "stats"]}
+ * Latencies are measured per query on the thread that answered it; QPS
+ * is the timed pass's query count over its wall time.
+ */
+int runBatch(const KDTree& tree, const LocalProjection& projection, size_t eventCount,
+             double loadMs, double buildMs, const BatchOptions& options) {
+    vector<workload::Query> queries = workload::load(options.workloadPath);
+    if (queries.empty()) {
+        cerr << "❌ No queries in " << options.workloadPath << endl;
+        return 1;
+    }
+
+    vector<RangeQuery> batch;
+    batch.reserve(queries.size());
+    for (const workload::Query& q : queries) batch.emplace_back(q.x1, q.y1, q.x2, q.y2, q.t1, q.t2);
+    auto query = engineQuery(tree, projection);
+
+    vector<int> counts(queries.size());
+    vector<double> latencies(queries.size());
+    unique_ptr<ParallelQueryExecutor> pool;
+    if (options.threads != 1) pool = make_unique<ParallelQueryExecutor>(tree, options.threads, 64, query);
+    unsigned threads = pool ? pool->threadCount() : 1;
+
+    auto runPass = [&](bool timed) {
+        if (pool) {
+            counts = pool->run(batch, nullptr, timed ? &latencies : nullptr);
+            return;
+        }
+        for (size_t i = 0; i < batch.size(); i++) {
+            const RangeQuery& q = batch[i];
+            auto start = Clock::now();
+            counts[i] = query(q, nullptr);
+            if (timed) latencies[i] = chrono::duration<double, milli>(Clock::now() - start).count();
+        }
+    };
+
+    cerr << "🔥 Warm-up: " << options.warmupRuns << " pass(es) over " << queries.size() << " queries" << endl;
+    for (int r = 0; r < options.warmupRuns; r++) runPass(false);
+
+    cerr << "⏱  Timed pass on " << threads << " thread(s)..." << endl;
+    auto wallStart = Clock::now();
+    runPass(true);
+    double wallMs = chrono::duration<double, milli>(Clock::now() - wallStart).count();
+
+    if (!options.csvPath.empty()) {
+        ofstream csv(options.csvPath);
+        if (!csv.is_open()) {
+            cerr << "❌ Could not write " << options.csvPath << endl;
+            return 1;
+        }
+        csv << "index,class,x1,y1,x2,y2,t1,t2,count,latency_ms\n" << setprecision(10);
+        for (size_t i = 0; i < queries.size(); i++) {
+            const workload::Query& q = queries[i];
+            csv << i << "," << q.label << "," << q.x1 << "," << q.y1 << "," << q.x2 << "," << q.y2
+                << "," << q.t1 << "," << q.t2 << "," << counts[i] << "," << latencies[i] << "\n";
+        }
+        cerr << "📄 Per-query results: " << options.csvPath << endl;
+    }
+
+    map<string, vector<double>> byClass;
+    for (size_t i = 0; i < queries.size(); i++) byClass[queries[i].label].push_back(latencies[i]);
+
+    stringstream json;
+    json << fixed << setprecision(6);
+    json << "{\"mode\":\"batch\""
+         << ",\"n\":" << eventCount
+         << ",\"queries\":" << queries.size()
+         << ",\"threads\":" << threads
+         << ",\"warmup_runs\":" << options.warmupRuns
+         << ",\"load_ms\":" << loadMs
+         << ",\"build_ms\":" << buildMs
+         << ",\"index_bytes\":" << tree.memoryUsage()
+         << ",\"wall_ms\":" << wallMs
+         << ",\"qps\":" << (wallMs > 0 ? queries.size() * 1000.0 / wallMs : 0)
+         << ",\"latency_ms\":" << workload::latencyJson(latencies)
+         << ",\"by_class\":{";
+    bool first = true;
+    for (const auto& entry : byClass) {
+        json << (first ? "" : ",") << "\"" << entry.first << "\":" << workload::latencyJson(entry.second);
+        first = false;
+    }
+    json << "}";
+
+    if (options.collectStats) {
+        // Separate instrumented pass, so the timed latencies are unaffected
+        QueryStatsAggregator aggregate;
+        if (pool) {
+            pool->run(batch, &aggregate);
+        } else {
+            for (const RangeQuery& q : batch) {
+                QueryStats stats;
+                query(q, &stats);
+                aggregate.add(stats);
+            }
+        }
+        json << ",\"stats\":" << aggregate.toJson();
+    }
+    json << "}";
+
+    if (options.jsonPath.empty()) {
+        cout << json.str() << endl;
+    } else {
+        ofstream out(options.jsonPath);
+        if (!out.is_open()) {
+            cerr << "❌ Could not write " << options.jsonPath << endl;
+            return 1;
+        }
+        out << json.str() << endl;
+        cerr << "📊 Summary: " << options.jsonPath << endl;
     }
+    return 0;
 }
 
 /**
  * Main function
+ *
+ * Usage:
+ *   main [events.csv] [--store <base>] [--stats]
+ *   main [events.csv] [--store <base>] --batch <workload> [--threads N]
+ *        [--warmup N] [--csv results.csv] [--json summary.json] [--stats]
+ *
+ * Queries are always given in lat/lon; on a projected store (see
+ * projection.h) they are answered exactly against the metric plane.
  */
 int main(int argc, char* argv[]) {
-    cout << "\n";
-    cout << "╔═══════════════════════════════════════════════════════╗" << endl;
-    cout << "║   SPATIO-TEMPORAL EVENT ANALYTICS ENGINE              ║" << endl;
-    cout << "║   KD-Tree + Fenwick Tree Implementation               ║" << endl;
-    cout << "╚═══════════════════════════════════════════════════════╝" << endl;
-    cout << "\n";
-
-    // Determine input file
+    // Determine input file and options
     string filename = "../../data/processed/events.csv";
-    if (argc > 1) {
-        filename = argv[1];
+    string storePath;  // Binary event store (event_store.h) instead of the CSV
+    bool collectStats = false;
+    BatchOptions batch;
+    for (int i = 1; i < argc; i++) {
+        string arg = argv[i];
+        bool hasValue = i + 1 < argc;
+        if (arg == "--stats") {
+            collectStats = true;
+        } else if (arg == "--store" && hasValue) {
+            storePath = argv[++i];
+        } else if (arg == "--batch" && hasValue) {
+            batch.workloadPath = argv[++i];
+        } else if (arg == "--csv" && hasValue) {
+            batch.csvPath = argv[++i];
+        } else if (arg == "--json" && hasValue) {
+            batch.jsonPath = argv[++i];
+        } else if (arg == "--threads" && hasValue) {
+            batch.threads = static_cast<unsigned>(stoul(argv[++i]));
+        } else if (arg == "--warmup" && hasValue) {
+            batch.warmupRuns = stoi(argv[++i]);
+        } else {
+            filename = arg;
+        }
+    }
+    batch.collectStats = collectStats;
+    bool batchMode = !batch.workloadPath.empty();
+    ostream& log = batchMode ? cerr : cout;
+
+    if (!batchMode) {
+        cout << "\n";
+        cout << "╔═══════════════════════════════════════════════════════╗" << endl;
+        cout << "║   SPATIO-TEMPORAL EVENT ANALYTICS ENGINE              ║" << endl;
+        cout << "║   KD-Tree + Fenwick Tree Implementation               ║" << endl;
+        cout << "╚═══════════════════════════════════════════════════════╝" << endl;
+        cout << "\n";
     }
 
-    cout << "📂 Loading dataset: " << filename << endl;
+    QueryStatsAggregator aggregate;
+    QueryStatsAggregator* aggregatePtr = collectStats ? &aggregate : nullptr;
+
+    log << "📂 Loading dataset: " << (storePath.empty() ? filename : storePath) << endl;
     
     // Load events
     auto loadStart = chrono::high_resolution_clock::now();
-    vector<Event> events = loadEventsFromCSV(filename);
+    vector<Event> events;
+    LocalProjection projection;
+    if (storePath.empty()) {
+        events = loadEventsFromCSV(filename, log);
+    } else {
+        try {
+            events = event_store::loadEvents(storePath);
+            projection = event_store::loadProjection(storePath);
+        } catch (const exception& e) {
+            cerr << "Error: " << e.what() << endl;
+        }
+    }
     auto loadEnd = chrono::high_resolution_clock::now();
     
     if (events.empty()) {
@@ -149,22 +415,31 @@ int main(int argc, char* argv[]) {
     }
 
     double loadTime = chrono::duration<double, milli>(loadEnd - loadStart).count();
-    cout << "⏱  Load Time: " << fixed << setprecision(2) << loadTime << " ms\n" << endl;
+    log << "⏱  Load Time: " << fixed << setprecision(2) << loadTime << " ms\n" << endl;
+    if (projection.valid) {
+        log << "🌐 Projected coordinates: origin (" << setprecision(4) << projection.lat0 << ", "
+            << projection.lon0 << "), " << projection.unit << " m units\n" << endl;
+    }
 
     // Build KD-Tree
-    cout << "🔨 Building KD-Tree with Fenwick indices..." << endl;
+    log << "🔨 Building KD-Tree with Fenwick indices..." << endl;
     KDTree tree(1440);  // 1440 minutes in a day
+    size_t eventCount = events.size();
     
     auto buildStart = chrono::high_resolution_clock::now();
     tree.build(events);
     auto buildEnd = chrono::high_resolution_clock::now();
     
     double buildTime = chrono::duration<double, milli>(buildEnd - buildStart).count();
-    cout << "✓ KD-Tree built successfully!" << endl;
-    cout << "⏱  Build Time: " << fixed << setprecision(2) << buildTime << " ms\n" << endl;
+    log << "✓ KD-Tree built successfully!" << endl;
+    log << "⏱  Build Time: " << fixed << setprecision(2) << buildTime << " ms\n" << endl;
+
+    if (batchMode) {
+        return runBatch(tree, projection, eventCount, loadTime, buildTime, batch);
+    }
 
     // Run demo queries
-    runDemo(tree);
+    runDemo(tree, projection, aggregatePtr);
 
     // Interactive mode
     cout << "\n" << string(50, '=') << endl;
@@ -173,6 +448,12 @@ int main(int argc, char* argv[]) {
     cout << "Enter coordinates and time range for custom queries." << endl;
     cout << "Format: x1 y1 x2 y2 t1 t2" << endl;
     cout << "Example: 41.85 -87.68 41.92 -87.60 600 720" << endl;
+    if (projection.valid) {
+        cout << "Radius:  near lat lon metres t1 t2 (e.g. near 41.8781 -87.6298 500 0 1439)" << endl;
+    }
+    if (collectStats) {
+        cout << "Type 'stats' for aggregate query path statistics." << endl;
+    }
     cout << "Type 'exit' to quit.\n" << endl;
 
     string input;
@@ -184,22 +465,34 @@ int main(int argc, char* argv[]) {
             break;
         }
 
+        if (input == "stats" && collectStats) {
+            printAggregateStats(aggregate);
+            continue;
+        }
+
         stringstream ss(input);
         double x1, y1, x2, y2;
         int t1, t2;
         
-        if (ss >> x1 >> y1 >> x2 >> y2 >> t1 >> t2) {
-            auto start = chrono::high_resolution_clock::now();
-            int count = tree.query(x1, y1, x2, y2, t1, t2);
-            auto end = chrono::high_resolution_clock::now();
-            double time = chrono::duration<double, milli>(end - start).count();
-            
-            printQueryResult(count, x1, y1, x2, y2, t1, t2, time);
+        if (projection.valid && input.rfind("near ", 0) == 0) {
+            string word;
+            double lat, lon, metres;
+            if (ss >> word >> lat >> lon >> metres >> t1 >> t2) {
+                runRadiusQuery(tree, projection, lat, lon, metres, t1, t2, aggregatePtr);
+            } else {
+                cout << "❌ Format: near lat lon metres t1 t2\n" << endl;
+            }
+        } else if (ss >> x1 >> y1 >> x2 >> y2 >> t1 >> t2) {
+            runQuery(tree, projection, x1, y1, x2, y2, t1, t2, aggregatePtr);
         } else {
             cout << "❌ Invalid input format. Please try again.\n" << endl;
         }
     }
 
+    if (collectStats) {
+        printAggregateStats(aggregate);
+    }
+
     cout << "\n👋 Thank you for using the Event Analytics Engine!" << endl;
     return 0;
 }
@@ -0,0 +1,205 @@
+#ifndef PARALLEL_QUERY_H
+#define PARALLEL_QUERY_H
+
+#include <algorithm>
+#include <atomic>
+#include <chrono>
+#include <condition_variable>
+#include <functional>
+#include <mutex>
+#include <thread>
+#include <vector>
+#include "kdtree.h"
+
+/**
+ * One spatio-temporal range count
+ */
+struct RangeQuery {
+    double x1, y1, x2, y2;
+    int t1, t2;
+
+    RangeQuery(double _x1 = 0, double _y1 = 0, double _x2 = 0, double _y2 = 0,
+               int _t1 = 0, int _t2 = 0)
+        : x1(_x1), y1(_y1), x2(_x2), y2(_y2), t1(_t1), t2(_t2) {}
+};
+
+/**
+ * Parallel batch execution over one shared, read-only KDTree
+ *
+ * A fixed pool of worker threads is started once and reused for every
+ * batch. Workers claim chunks of queries from an atomic cursor, answer
+ * them into a private buffer and copy the chunk into its slot of the
+ * result vector, so threads never write to the same cache lines while
+ * querying. Per-query statistics (optional) are also gathered per
+ * worker and merged once the batch is done.
+ *
+ * The tree must not be modified (insert/build) while a batch runs.
+ *
+ * Usage:
+ *   ParallelQueryExecutor pool(tree, 8);
+ *   std::vector<int> counts = pool.run(queries);
+ */
+class ParallelQueryExecutor {
+public:
+    /**
+     * Answers one query (stats may be null); the default is tree.query
+     */
+    using QueryFn = std::function<int(const RangeQuery&, QueryStats*)>;
+
+private:
+    struct Worker {
+        std::vector<int> buffer;          // Counts of the chunk being answered
+        std::vector<double> timings;      // Latencies (ms) of the chunk, when requested
+        QueryStatsAggregator aggregate;   // Stats of this worker's queries
+    };
+
+    const KDTree& tree;
+    QueryFn queryFn;
+    size_t chunkSize;
+    std::vector<std::thread> threads;
+    std::vector<Worker> workers;
+
+    std::mutex runMutex;  // Serializes concurrent run() callers
+    std::mutex mutex;
+    std::condition_variable wake, done;
+    bool stopping = false;
+    unsigned long long generation = 0;  // Incremented per batch
+    unsigned active = 0;                // Workers still busy with the batch
+
+    // Current batch (valid while active > 0)
+    const std::vector<RangeQuery>* batch = nullptr;
+    std::vector<int>* results = nullptr;
+    std::vector<double>* latencies = nullptr;
+    bool collectStats = false;
+    std::atomic<size_t> cursor{0};
+
+    int ask(const RangeQuery& q, QueryStats* stats) const {
+        if (queryFn) return queryFn(q, stats);
+        return tree.query(q.x1, q.y1, q.x2, q.y2, q.t1, q.t2, stats);
+    }
+
+    void answer(Worker& worker) {
+        const std::vector<RangeQuery>& queries = *batch;
+        for (;;) {
+            size_t start = cursor.fetch_add(chunkSize);
+            if (start >= queries.size()) break;
+            size_t end = std::min(start + chunkSize, queries.size());
+
+            worker.buffer.clear();
+            worker.timings.clear();
+            for (size_t i = start; i < end; i++) {
+                const RangeQuery& q = queries[i];
+                auto began = latencies ? std::chrono::steady_clock::now()
+                                       : std::chrono::steady_clock::time_point();
+                if (collectStats) {
+                    QueryStats stats;
+                    worker.buffer.push_back(ask(q, &stats));
+                    worker.aggregate.add(stats);
+                } else {
+                    worker.buffer.push_back(ask(q, nullptr));
+                }
+                if (latencies) {
+                    worker.timings.push_back(std::chrono::duration<double, std::milli>(
+                        std::chrono::steady_clock::now() - began).count());
+                }
+            }
+            std::copy(worker.buffer.begin(), worker.buffer.end(), results->begin() + start);
+            if (latencies) {
+                std::copy(worker.timings.begin(), worker.timings.end(), latencies->begin() + start);
+            }
+        }
+    }
+
+    void loop(unsigned id) {
+        unsigned long long seen = 0;
+        for (;;) {
+            {
+                std::unique_lock<std::mutex> lock(mutex);
+                wake.wait(lock, [&] { return stopping || generation != seen; });
+                if (stopping) return;
+                seen = generation;
+            }
+
+            answer(workers[id]);
+
+            std::lock_guard<std::mutex> lock(mutex);
+            if (--active == 0) done.notify_one();
+        }
+    }
+
+public:
+    /**
+     * @param _tree Built tree shared by all workers
+     * @param threadCount Worker threads (0 = hardware concurrency)
+     * @param _chunkSize Queries claimed per cursor increment
+     * @param _queryFn Optional: how a query is answered (must be thread-safe)
+     */
+    ParallelQueryExecutor(const KDTree& _tree, unsigned threadCount = 0,
+                          size_t _chunkSize = 64, QueryFn _queryFn = nullptr)
+        : tree(_tree), queryFn(std::move(_queryFn)), chunkSize(std::max<size_t>(_chunkSize, 1)) {
+        if (threadCount == 0) threadCount = std::max(1u, std::thread::hardware_concurrency());
+        workers.resize(threadCount);
+        for (Worker& worker : workers) worker.buffer.reserve(chunkSize);
+        for (unsigned i = 0; i < threadCount; i++) {
+            threads.emplace_back(&ParallelQueryExecutor::loop, this, i);
+        }
+    }
+
+    ~ParallelQueryExecutor() {
+        {
+            std::lock_guard<std::mutex> lock(mutex);
+            stopping = true;
+        }
+        wake.notify_all();
+        for (std::thread& t : threads) t.join();
+    }
+
+    ParallelQueryExecutor(const ParallelQueryExecutor&) = delete;
+    ParallelQueryExecutor& operator=(const ParallelQueryExecutor&) = delete;
+
+    /**
+     * Answer a batch of queries in parallel (blocks until done)
+     * @param queries Batch to answer
+     * @param aggregate Optional: receives the merged per-query stats
+     * @param queryMs Optional: receives each query's latency in ms (in the
+     *                order of queries), measured on its worker
+     * @return Counts in the order of queries
+     */
+    std::vector<int> run(const std::vector<RangeQuery>& queries,
+                         QueryStatsAggregator* aggregate = nullptr,
+                         std::vector<double>* queryMs = nullptr) {
+        std::vector<int> counts(queries.size(), 0);
+        if (queryMs) queryMs->assign(queries.size(), 0.0);
+        if (queries.empty()) return counts;
+
+        std::lock_guard<std::mutex> serial(runMutex);
+        std::unique_lock<std::mutex> lock(mutex);
+        batch = &queries;
+        results = &counts;
+        latencies = queryMs;
+        collectStats = aggregate != nullptr;
+        for (Worker& worker : workers) worker.aggregate = QueryStatsAggregator();
+        cursor.store(0);
+        active = static_cast<unsigned>(workers.size());
+        generation++;
+        wake.notify_all();
+        done.wait(lock, [&] { return active == 0; });
+
+        if (aggregate) {
+            for (const Worker& worker : workers) aggregate->merge(worker.aggregate);
+        }
+        batch = nullptr;
+        results = nullptr;
+        latencies = nullptr;
+        return counts;
+    }
+
+    /**
+     * Number of worker threads
+     */
+    unsigned threadCount() const {
+        return static_cast<unsigned>(threads.size());
+    }
+};
+
+#endif // PARALLEL_QUERY_H
@@ -0,0 +1,174 @@
+#ifndef PROJECTION_H
+#define PROJECTION_H
+
+#include <algorithm>
+#include <cmath>
+#include <cstdint>
+#include <string>
+#include "kdtree.h"
+
+/**
+ * Local metric projection of a store with projected coordinates
+ * (the C++ side of src/python/projection.py)
+ *
+ * Spherical transverse Mercator around (lat0, lon0); coordinates are
+ * integer counts of `unit` metres (1 cm by default) stored as int32:
+ *   x = northing (follows latitude), y = easting (follows longitude)
+ * Decoded into Event::x / Event::y they stay whole numbers, so the
+ * engine's comparisons are exact and a radius test needs no cos(lat)
+ * correction: dx * dx + dy * dy is exact in doubles up to |d| < 2^26
+ * units (about 670 km in cm).
+ *
+ * Lat/lon rectangles are answered exactly with LatLonRegion /
+ * queryLatLon, not as their bounding box in the plane.
+ */
+struct LocalProjection {
+    static constexpr double EARTH_RADIUS = 6371008.8;  // Must match projection.py
+
+    double lat0 = 0, lon0 = 0;
+    double unit = 0.01;   // Metres per coordinate unit
+    bool valid = false;   // False for plain lat/lon stores
+
+    LocalProjection() {}
+    LocalProjection(double _lat0, double _lon0, double _unit = 0.01)
+        : lat0(_lat0), lon0(_lon0), unit(_unit), valid(true) {}
+
+    static double radians(double degrees) {
+        return degrees * M_PI / 180.0;
+    }
+
+    static double degrees(double radians) {
+        return radians * 180.0 / M_PI;
+    }
+
+    /**
+     * lat/lon in degrees -> (x, y) in units, rounded like the Python encoder
+     */
+    void forward(double lat, double lon, double& x, double& y) const {
+        double phi = radians(lat), dlam = radians(lon - lon0);
+        double b = std::cos(phi) * std::sin(dlam);
+        double easting = EARTH_RADIUS * std::atanh(b);
+        double northing = EARTH_RADIUS * (std::atan2(std::tan(phi), std::cos(dlam)) - radians(lat0));
+        x = std::nearbyint(northing / unit);
+        y = std::nearbyint(easting / unit);
+    }
+
+    /**
+     * (x, y) in units -> lat/lon in degrees
+     */
+    void inverse(double x, double y, double& lat, double& lon) const {
+        double d = x * unit / EARTH_RADIUS + radians(lat0);
+        double e = y * unit / EARTH_RADIUS;
+        lat = degrees(std::asin(std::sin(d) / std::cosh(e)));
+        lon = lon0 + degrees(std::atan2(std::sinh(e), std::cos(d)));
+    }
+
+    double units(double metres) const {
+        return metres / unit;
+    }
+
+    /**
+     * Bounding box in the plane of a lat/lon rectangle. Parallels curve
+     * (northing is lowest at lon0), so the corners plus the point of each
+     * edge nearest lon0 are projected, widened by one unit of rounding.
+     */
+    void box(double lat1, double lon1, double lat2, double lon2,
+             double& x1, double& y1, double& x2, double& y2) const {
+        x1 = y1 = HUGE_VAL;
+        x2 = y2 = -HUGE_VAL;
+        double lats[] = {lat1, lat2};
+        double lons[] = {lon1, (lon1 + lon2) / 2, lon2};
+        if ((lon1 - lon0) * (lon2 - lon0) < 0) lons[1] = lon0;
+        for (double lat : lats) {
+            for (double lon : lons) {
+                double x, y;
+                forward(lat, lon, x, y);
+                x1 = std::min(x1, x - 1);
+                x2 = std::max(x2, x + 1);
+                y1 = std::min(y1, y - 1);
+                y2 = std::max(y2, y + 1);
+            }
+        }
+    }
+};
+
+/**
+ * A lat/lon rectangle as a KDTree::queryRegion region on a projected tree
+ *
+ * Its image in the plane has curved edges, so the padded bounding box
+ * (LocalProjection::box) only prunes; the rest is decided in lat/lon.
+ * Over a plane box, latitude and longitude are monotonic along each
+ * edge except that latitude peaks (or dips) where a horizontal edge
+ * crosses y = 0 and longitude where a vertical edge crosses the equator.
+ * So the box's exact lat/lon range comes from its corners plus those
+ * crossings, and "box inside the rectangle" is an exact test, which
+ * keeps covered nodes on the Fenwick path. Points are tested by inverse
+ * projection, so the count equals that of the same events in lat/lon
+ * (up to the centimetre rounding of the stored coordinates).
+ */
+class LatLonRegion {
+private:
+    const LocalProjection& projection;
+    double lat1, lon1, lat2, lon2;
+    double x1, y1, x2, y2;  // Padded bounding box in the plane
+    double equatorX;        // Northing of the equator
+
+public:
+    LatLonRegion(const LocalProjection& _projection, double _lat1, double _lon1,
+                 double _lat2, double _lon2)
+        : projection(_projection),
+          lat1(std::min(_lat1, _lat2)), lon1(std::min(_lon1, _lon2)),
+          lat2(std::max(_lat1, _lat2)), lon2(std::max(_lon1, _lon2)) {
+        projection.box(lat1, lon1, lat2, lon2, x1, y1, x2, y2);
+        equatorX = -LocalProjection::radians(projection.lat0) * LocalProjection::EARTH_RADIUS /
+                   projection.unit;
+    }
+
+    bool contains(double x, double y) const {
+        double lat, lon;
+        projection.inverse(x, y, lat, lon);
+        return lat >= lat1 && lat <= lat2 && lon >= lon1 && lon <= lon2;
+    }
+
+    Overlap overlap(double minX, double maxX, double minY, double maxY) const {
+        if (maxX < x1 || minX > x2 || maxY < y1 || minY > y2) return Overlap::Outside;
+
+        double latMin = HUGE_VAL, latMax = -HUGE_VAL, lonMin = HUGE_VAL, lonMax = -HUGE_VAL;
+        auto extend = [&](double x, double y) {
+            double lat, lon;
+            projection.inverse(x, y, lat, lon);
+            latMin = std::min(latMin, lat);
+            latMax = std::max(latMax, lat);
+            lonMin = std::min(lonMin, lon);
+            lonMax = std::max(lonMax, lon);
+        };
+        extend(minX, minY);
+        extend(minX, maxY);
+        extend(maxX, minY);
+        extend(maxX, maxY);
+        if (minY < 0 && maxY > 0) {
+            extend(minX, 0);
+            extend(maxX, 0);
+        }
+        if (minX < equatorX && maxX > equatorX) {
+            extend(equatorX, minY);
+            extend(equatorX, maxY);
+        }
+
+        if (latMax < lat1 || latMin > lat2 || lonMax < lon1 || lonMin > lon2) return Overlap::Outside;
+        if (latMin >= lat1 && latMax <= lat2 && lonMin >= lon1 && lonMax <= lon2) return Overlap::Inside;
+        return Overlap::Partial;
+    }
+};
+
+/**
+ * Count of events in a lat/lon rectangle and time range on a tree built
+ * from projected coordinates
+ */
+inline int queryLatLon(const KDTree& tree, const LocalProjection& projection,
+                       double lat1, double lon1, double lat2, double lon2,
+                       int t1, int t2, QueryStats* stats = nullptr) {
+    return tree.queryRegion(LatLonRegion(projection, lat1, lon1, lat2, lon2), t1, t2, stats);
+}
+
+#endif // PROJECTION_H
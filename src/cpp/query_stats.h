@@ -0,0 +1,157 @@
+#ifndef QUERY_STATS_H
+#define QUERY_STATS_H
+
+#include <algorithm>
+#include <sstream>
+#include <string>
+#include <vector>
+
+/**
+ * Counters collected along one KDTree query path
+ *
+ * Pass a QueryStats* to KDTree::query to fill it; with the default
+ * nullptr the query path only pays for a predictable null check.
+ *
+ *   visited      nodes entered (non-null)
+ *   pruned       nodes skipped because their bbox misses the query
+ *   covered      nodes fully inside the query (answered by Fenwick)
+ *   partial      partial overlaps that recursed into both children
+ *   pointHits    partial-overlap nodes whose own point matched
+ *   depthVisits  visited nodes per tree depth
+ */
+struct QueryStats {
+    long long visited = 0;
+    long long pruned = 0;
+    long long covered = 0;
+    long long partial = 0;
+    long long pointHits = 0;
+    std::vector<long long> depthVisits;
+
+    void reset() {
+        *this = QueryStats();
+    }
+
+    void visit(int depth) {
+        visited++;
+        if (depth >= static_cast<int>(depthVisits.size())) {
+            depthVisits.resize(depth + 1, 0);
+        }
+        depthVisits[depth]++;
+    }
+
+    /** Fenwick range sums issued (one per fully covered node) */
+    long long fenwickLookups() const {
+        return covered;
+    }
+
+    int maxDepth() const {
+        return static_cast<int>(depthVisits.size()) - 1;
+    }
+
+    void merge(const QueryStats& other) {
+        visited += other.visited;
+        pruned += other.pruned;
+        covered += other.covered;
+        partial += other.partial;
+        pointHits += other.pointHits;
+        if (other.depthVisits.size() > depthVisits.size()) {
+            depthVisits.resize(other.depthVisits.size(), 0);
+        }
+        for (size_t d = 0; d < other.depthVisits.size(); d++) {
+            depthVisits[d] += other.depthVisits[d];
+        }
+    }
+
+    std::string toJson() const {
+        std::stringstream ss;
+        ss << "{\"visited\":" << visited
+           << ",\"pruned\":" << pruned
+           << ",\"covered\":" << covered
+           << ",\"partial\":" << partial
+           << ",\"point_hits\":" << pointHits
+           << ",\"depth_visits\":[";
+        for (size_t d = 0; d < depthVisits.size(); d++) {
+            ss << (d ? "," : "") << depthVisits[d];
+        }
+        ss << "]}";
+        return ss.str();
+    }
+};
+
+/**
+ * Aggregates QueryStats over many queries
+ *
+ * Keeps the summed counters plus log2 histograms of nodes visited and
+ * fully covered nodes per query (bucket b holds values in [2^(b-1), 2^b),
+ * bucket 0 holds zero).
+ */
+class QueryStatsAggregator {
+public:
+    QueryStats total;
+    long long queries = 0;
+    std::vector<long long> visitedHistogram;
+    std::vector<long long> coveredHistogram;
+
+    void add(const QueryStats& stats) {
+        total.merge(stats);
+        queries++;
+        bump(visitedHistogram, stats.visited);
+        bump(coveredHistogram, stats.covered);
+    }
+
+    void merge(const QueryStatsAggregator& other) {
+        total.merge(other.total);
+        queries += other.queries;
+        mergeHistogram(visitedHistogram, other.visitedHistogram);
+        mergeHistogram(coveredHistogram, other.coveredHistogram);
+    }
+
+    double mean(long long value) const {
+        return queries ? static_cast<double>(value) / queries : 0.0;
+    }
+
+    std::string toJson() const {
+        std::stringstream ss;
+        ss << "{\"queries\":" << queries
+           << ",\"total\":" << total.toJson()
+           << ",\"visited_log2_histogram\":" << listJson(visitedHistogram)
+           << ",\"covered_log2_histogram\":" << listJson(coveredHistogram) << "}";
+        return ss.str();
+    }
+
+    static int bucket(long long value) {
+        int b = 0;
+        while (value > 0) {
+            value >>= 1;
+            b++;
+        }
+        return b;
+    }
+
+private:
+    static void bump(std::vector<long long>& histogram, long long value) {
+        int b = bucket(value);
+        if (b >= static_cast<int>(histogram.size())) {
+            histogram.resize(b + 1, 0);
+        }
+        histogram[b]++;
+    }
+
+    static void mergeHistogram(std::vector<long long>& into,
+                               const std::vector<long long>& from) {
+        if (from.size() > into.size()) into.resize(from.size(), 0);
+        for (size_t b = 0; b < from.size(); b++) into[b] += from[b];
+    }
+
+    static std::string listJson(const std::vector<long long>& values) {
+        std::stringstream ss;
+        ss << "[";
+        for (size_t i = 0; i < values.size(); i++) {
+            ss << (i ? "," : "") << values[i];
+        }
+        ss << "]";
+        return ss.str();
+    }
+};
+
+#endif // QUERY_STATS_H
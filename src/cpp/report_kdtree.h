@@ -0,0 +1,316 @@
+#ifndef REPORT_KDTREE_H
+#define REPORT_KDTREE_H
+
+#include <algorithm>
+#include <cstdint>
+#include <limits>
+#include <numeric>
+#include <vector>
+#include "kdtree.h"
+
+/**
+ * Matching event IDs of a reporting query
+ *
+ * Mostly zero-copy: every fully covered subtree contributes one slice
+ * pointing into the tree's time-sorted layers, and only events of
+ * partially covered leaves are copied. IDs are positions in the vector
+ * the tree was built from; order is by subtree, then by time within a
+ * slice. Valid as long as the tree is alive and not rebuilt.
+ */
+class ReportResult {
+public:
+    struct Slice {
+        const uint32_t* data;
+        size_t size;
+    };
+
+private:
+    std::vector<Slice> covered;
+    std::vector<uint32_t> loose;  // Hits of partially covered leaves
+    size_t total = 0;
+
+    friend class ReportingKDTree;
+
+public:
+    size_t size() const {
+        return total;
+    }
+
+    bool empty() const {
+        return total == 0;
+    }
+
+    /**
+     * Covered slices (without the loose hits), for zero-copy consumers
+     */
+    const std::vector<Slice>& slices() const {
+        return covered;
+    }
+
+    template <typename F>
+    void forEach(F f) const {
+        for (const Slice& s : covered) {
+            for (size_t i = 0; i < s.size; i++) f(s.data[i]);
+        }
+        for (uint32_t id : loose) f(id);
+    }
+
+    /**
+     * IDs [offset, offset + limit): whole slices before the page are
+     * skipped by size, so a page costs O(slices + limit)
+     */
+    std::vector<uint32_t> page(size_t offset, size_t limit) const {
+        std::vector<uint32_t> out;
+        if (offset >= total) return out;
+        out.reserve(std::min(limit, total - offset));
+
+        auto take = [&](const uint32_t* data, size_t size) {
+            if (offset >= size) {
+                offset -= size;
+                return;
+            }
+            size_t n = std::min(size - offset, limit - out.size());
+            out.insert(out.end(), data + offset, data + offset + n);
+            offset = 0;
+        };
+        for (const Slice& s : covered) {
+            if (out.size() == limit) return out;
+            take(s.data, s.size);
+        }
+        if (out.size() < limit) take(loose.data(), loose.size());
+        return out;
+    }
+
+    std::vector<uint32_t> ids() const {
+        return page(0, total);
+    }
+};
+
+/**
+ * KD-Tree that reports the matching events, not just their count
+ *
+ * KDTree::query returns a number; listing the matches needed a scan of
+ * all events. Here the events are reordered so that every subtree owns a
+ * contiguous range [lo, hi) of the array (balanced split at the median
+ * position, buckets of LEAF_SIZE events at the bottom), and every depth
+ * keeps a layer of n event IDs in which each node's range is sorted by
+ * time (a merge-sort tree: O(n log n) memory, 8 bytes per event per level).
+ *
+ * Query: a fully covered node binary-searches [t1, t2] in its layer range
+ * and emits the matching IDs as one slice; a partially covered leaf is
+ * filtered event by event. Output costs O(log n + k) beyond the usual
+ * KD-tree boundary nodes, and a limit stops the descent once enough IDs
+ * were found.
+ *
+ * Build only (no insert); queries are const and thread-safe.
+ */
+class ReportingKDTree {
+public:
+    static constexpr uint32_t LEAF_SIZE = 32;
+
+private:
+    struct Node {
+        double minX, maxX, minY, maxY;
+        uint32_t lo, hi;       // Range of the subtree in the reordered arrays
+        int32_t left, right;   // Child node indices (-1 for leaves)
+        int depth;
+    };
+
+    std::vector<Node> nodes;
+
+    // Events in subtree order
+    std::vector<double> xs, ys;
+    std::vector<int32_t> times;
+    std::vector<uint32_t> ids;
+
+    // layerIds[d][lo, hi) / layerTimes[d][lo, hi): IDs and times of a depth-d node, by time
+    std::vector<std::vector<uint32_t>> layerIds;
+    std::vector<std::vector<int32_t>> layerTimes;
+
+    int32_t buildNode(const std::vector<Event>& events, uint32_t lo, uint32_t hi, int depth) {
+        int32_t index = static_cast<int32_t>(nodes.size());
+        nodes.push_back(Node{0, 0, 0, 0, lo, hi, -1, -1, depth});
+
+        if (static_cast<int>(layerIds.size()) <= depth) {
+            layerIds.emplace_back(ids.size());
+            layerTimes.emplace_back(ids.size());
+        }
+
+        if (hi - lo > LEAF_SIZE) {
+            uint32_t mid = lo + (hi - lo) / 2;
+            bool splitByX = (depth % 2 == 0);
+            std::nth_element(ids.begin() + lo, ids.begin() + mid, ids.begin() + hi,
+                             [&](uint32_t a, uint32_t b) {
+                                 return splitByX ? events[a].x < events[b].x : events[a].y < events[b].y;
+                             });
+            int32_t left = buildNode(events, lo, mid, depth + 1);
+            int32_t right = buildNode(events, mid, hi, depth + 1);
+
+            Node& node = nodes[index];
+            node.left = left;
+            node.right = right;
+            node.minX = std::min(nodes[left].minX, nodes[right].minX);
+            node.maxX = std::max(nodes[left].maxX, nodes[right].maxX);
+            node.minY = std::min(nodes[left].minY, nodes[right].minY);
+            node.maxY = std::max(nodes[left].maxY, nodes[right].maxY);
+
+            // Merge the children's time-sorted ranges one layer down
+            const std::vector<uint32_t>& childIds = layerIds[depth + 1];
+            const std::vector<int32_t>& childTimes = layerTimes[depth + 1];
+            std::vector<uint32_t>& outIds = layerIds[depth];
+            std::vector<int32_t>& outTimes = layerTimes[depth];
+            uint32_t a = lo, b = mid, out = lo;
+            while (a < mid || b < hi) {
+                uint32_t from = (b >= hi || (a < mid && childTimes[a] <= childTimes[b])) ? a++ : b++;
+                outIds[out] = childIds[from];
+                outTimes[out++] = childTimes[from];
+            }
+            return index;
+        }
+
+        // Leaf: bounds and the time-sorted range directly from the events
+        Node& node = nodes[index];
+        node.minX = node.minY = std::numeric_limits<double>::max();
+        node.maxX = node.maxY = std::numeric_limits<double>::lowest();
+        for (uint32_t i = lo; i < hi; i++) {
+            const Event& e = events[ids[i]];
+            node.minX = std::min(node.minX, e.x);
+            node.maxX = std::max(node.maxX, e.x);
+            node.minY = std::min(node.minY, e.y);
+            node.maxY = std::max(node.maxY, e.y);
+        }
+        std::vector<uint32_t>& outIds = layerIds[depth];
+        std::copy(ids.begin() + lo, ids.begin() + hi, outIds.begin() + lo);
+        std::stable_sort(outIds.begin() + lo, outIds.begin() + hi,
+                         [&](uint32_t a, uint32_t b) { return events[a].time < events[b].time; });
+        for (uint32_t i = lo; i < hi; i++) layerTimes[depth][i] = events[outIds[i]].time;
+        return index;
+    }
+
+    void reportNode(int32_t index, double x1, double y1, double x2, double y2, int t1, int t2,
+                    size_t limit, ReportResult& result, QueryStats* stats) const {
+        if (index < 0 || result.total >= limit) return;
+        const Node& node = nodes[index];
+        if (stats) stats->visit(node.depth);
+
+        if (node.maxX < x1 || node.minX > x2 || node.maxY < y1 || node.minY > y2) {
+            if (stats) stats->pruned++;
+            return;
+        }
+
+        if (node.minX >= x1 && node.maxX <= x2 && node.minY >= y1 && node.maxY <= y2) {
+            if (stats) stats->covered++;
+            const std::vector<int32_t>& layer = layerTimes[node.depth];
+            auto a = std::lower_bound(layer.begin() + node.lo, layer.begin() + node.hi, t1);
+            auto b = std::upper_bound(a, layer.begin() + node.hi, t2);
+            size_t n = std::min(static_cast<size_t>(b - a), limit - result.total);
+            if (n > 0) {
+                result.covered.push_back({layerIds[node.depth].data() + (a - layer.begin()), n});
+                result.total += n;
+            }
+            return;
+        }
+
+        if (stats) stats->partial++;
+        if (node.left < 0) {
+            for (uint32_t i = node.lo; i < node.hi && result.total < limit; i++) {
+                if (xs[i] >= x1 && xs[i] <= x2 && ys[i] >= y1 && ys[i] <= y2 &&
+                    times[i] >= t1 && times[i] <= t2) {
+                    result.loose.push_back(ids[i]);
+                    result.total++;
+                    if (stats) stats->pointHits++;
+                }
+            }
+            return;
+        }
+        reportNode(node.left, x1, y1, x2, y2, t1, t2, limit, result, stats);
+        reportNode(node.right, x1, y1, x2, y2, t1, t2, limit, result, stats);
+    }
+
+public:
+    ReportingKDTree() {}
+
+    /**
+     * Build from events; IDs reported later are positions in `events`
+     * (which is not modified)
+     */
+    void build(const std::vector<Event>& events) {
+        nodes.clear();
+        layerIds.clear();
+        layerTimes.clear();
+        uint32_t n = static_cast<uint32_t>(events.size());
+        ids.resize(n);
+        std::iota(ids.begin(), ids.end(), 0u);
+        if (n == 0) {
+            xs.clear();
+            ys.clear();
+            times.clear();
+            return;
+        }
+
+        nodes.reserve(2 * (n / (LEAF_SIZE / 2) + 1));  // Leaves hold LEAF_SIZE / 2 .. LEAF_SIZE events
+        buildNode(events, 0, n, 0);
+
+        xs.resize(n);
+        ys.resize(n);
+        times.resize(n);
+        for (uint32_t i = 0; i < n; i++) {
+            const Event& e = events[ids[i]];
+            xs[i] = e.x;
+            ys[i] = e.y;
+            times[i] = e.time;
+        }
+    }
+
+    /**
+     * IDs of the events in the rectangle and time range [t1, t2] (inclusive),
+     * at most `limit` of them
+     */
+    ReportResult report(double x1, double y1, double x2, double y2, int t1, int t2,
+                        size_t limit = std::numeric_limits<size_t>::max(),
+                        QueryStats* stats = nullptr) const {
+        if (x1 > x2) std::swap(x1, x2);
+        if (y1 > y2) std::swap(y1, y2);
+        if (t1 > t2) std::swap(t1, t2);
+
+        ReportResult result;
+        if (!nodes.empty() && limit > 0) {
+            reportNode(0, x1, y1, x2, y2, t1, t2, limit, result, stats);
+        }
+        return result;
+    }
+
+    /**
+     * Number of matching events (unweighted), without copying any IDs
+     */
+    size_t count(double x1, double y1, double x2, double y2, int t1, int t2) const {
+        return report(x1, y1, x2, y2, t1, t2).size();
+    }
+
+    /**
+     * Event IDs in subtree order: every node owns a contiguous range of it
+     */
+    const std::vector<uint32_t>& order() const {
+        return ids;
+    }
+
+    size_t size() const {
+        return ids.size();
+    }
+
+    int depth() const {
+        return static_cast<int>(layerIds.size());
+    }
+
+    size_t memoryUsage() const {
+        size_t bytes = nodes.capacity() * sizeof(Node) +
+                       xs.capacity() * sizeof(double) + ys.capacity() * sizeof(double) +
+                       times.capacity() * sizeof(int32_t) + ids.capacity() * sizeof(uint32_t);
+        for (size_t d = 0; d < layerIds.size(); d++) {
+            bytes += layerIds[d].capacity() * sizeof(uint32_t) + layerTimes[d].capacity() * sizeof(int32_t);
+        }
+        return bytes;
+    }
+};
+
+#endif // REPORT_KDTREE_H
@@ -0,0 +1,237 @@
+#ifndef SHARDED_INDEX_H
+#define SHARDED_INDEX_H
+
+#include <algorithm>
+#include <atomic>
+#include <fstream>
+#include <memory>
+#include <sstream>
+#include <stdexcept>
+#include <string>
+#include <thread>
+#include <vector>
+#include "kdtree.h"
+#include "event_store.h"
+
+/**
+ * Summary of one shard from shards.json (written by src/python/shards.py)
+ */
+struct ShardInfo {
+    std::string name, region, path;
+    long long count = 0;
+    double minX = 0, minY = 0, maxX = 0, maxY = 0;
+    int minTime = 0, maxTime = 0;
+
+    bool overlaps(double x1, double y1, double x2, double y2, int t1, int t2) const {
+        return !(maxX < x1 || minX > x2 || maxY < y1 || minY > y2 ||
+                 maxTime < t1 || minTime > t2);
+    }
+};
+
+/**
+ * Spatially sharded index: one KDTree per shard
+ *
+ * Every shard keeps the bbox / time range of its events, and a query is
+ * only sent to the shards it overlaps, so a Chicago query never touches
+ * the trees of the Indian cities and vice versa. Shards are independent,
+ * so loading builds their trees on several threads.
+ *
+ * Usage:
+ *   ShardedIndex index;
+ *   index.load("data/processed/shards");
+ *   int count = index.query(41.8, -87.7, 41.9, -87.6, 0, 1439);
+ */
+class ShardedIndex {
+private:
+    struct Shard {
+        ShardInfo info;
+        KDTree tree;
+
+        Shard(const ShardInfo& _info, int maxTime) : info(_info), tree(maxTime) {}
+    };
+
+    std::vector<std::unique_ptr<Shard>> shards;
+    int maxTime;
+
+    static std::string stringField(const std::string& obj, const std::string& key) {
+        size_t pos = obj.find("\"" + key + "\":\"");
+        if (pos == std::string::npos) return "";
+        pos += key.size() + 4;
+        return obj.substr(pos, obj.find('"', pos) - pos);
+    }
+
+    static std::vector<double> numberList(const std::string& obj, const std::string& key) {
+        std::vector<double> values;
+        size_t pos = obj.find("\"" + key + "\":[");
+        if (pos == std::string::npos) return values;
+        pos += key.size() + 4;
+        std::stringstream ss(obj.substr(pos, obj.find(']', pos) - pos));
+        std::string item;
+        while (std::getline(ss, item, ',')) values.push_back(std::stod(item));
+        return values;
+    }
+
+public:
+    ShardedIndex(int _maxTime = 1440) : maxTime(_maxTime) {}
+
+    /**
+     * Parse <dir>/shards.json
+     * (compact JSON from our own writer: flat shard objects, no nesting)
+     */
+    static std::vector<ShardInfo> readIndex(const std::string& dir) {
+        std::ifstream file(dir + "/shards.json");
+        if (!file.is_open()) {
+            throw std::runtime_error("could not open " + dir + "/shards.json");
+        }
+        std::stringstream ss;
+        ss << file.rdbuf();
+        const std::string index = ss.str();
+
+        std::vector<ShardInfo> infos;
+        size_t pos = index.find("\"shards\":[");
+        if (pos == std::string::npos) return infos;
+
+        while ((pos = index.find('{', pos)) != std::string::npos) {
+            size_t end = index.find('}', pos);
+            const std::string obj = index.substr(pos, end - pos);
+            pos = end;
+
+            ShardInfo info;
+            info.name = stringField(obj, "name");
+            info.region = stringField(obj, "region");
+            info.path = stringField(obj, "path");
+            size_t countPos = obj.find("\"count\":");
+            if (countPos != std::string::npos) info.count = std::stoll(obj.substr(countPos + 8));
+
+            std::vector<double> bbox = numberList(obj, "bbox");
+            std::vector<double> time = numberList(obj, "time");
+            if (bbox.size() != 4 || time.size() != 2) {
+                throw std::runtime_error("malformed shard entry: " + info.name);
+            }
+            info.minX = bbox[0]; info.minY = bbox[1];
+            info.maxX = bbox[2]; info.maxY = bbox[3];
+            info.minTime = static_cast<int>(time[0]);
+            info.maxTime = static_cast<int>(time[1]);
+            infos.push_back(info);
+        }
+        return infos;
+    }
+
+    /**
+     * Load every shard of a directory and build its tree
+     * @param dir Shard directory (contains shards.json)
+     * @param threads Build threads (0 = hardware concurrency)
+     */
+    void load(const std::string& dir, unsigned threads = 0) {
+        std::vector<ShardInfo> infos = readIndex(dir);
+        shards.clear();
+        for (const ShardInfo& info : infos) {
+            shards.push_back(std::make_unique<Shard>(info, maxTime));
+        }
+
+        if (threads == 0) threads = std::max(1u, std::thread::hardware_concurrency());
+        threads = std::min<unsigned>(threads, std::max<size_t>(shards.size(), 1));
+
+        // Largest shards first so one big shard doesn't finish last
+        std::vector<size_t> order(shards.size());
+        for (size_t i = 0; i < order.size(); i++) order[i] = i;
+        std::sort(order.begin(), order.end(), [&](size_t a, size_t b) {
+            return shards[a]->info.count > shards[b]->info.count;
+        });
+
+        std::atomic<size_t> next{0};
+        std::vector<std::string> errors(threads);
+        auto work = [&](unsigned id) {
+            try {
+                for (size_t k; (k = next.fetch_add(1)) < order.size();) {
+                    Shard& shard = *shards[order[k]];
+                    std::vector<Event> events = event_store::loadEvents(dir + "/" + shard.info.path);
+                    shard.tree.build(events);
+                }
+            } catch (const std::exception& e) {
+                errors[id] = e.what();
+            }
+        };
+
+        std::vector<std::thread> pool;
+        for (unsigned i = 1; i < threads; i++) pool.emplace_back(work, i);
+        work(0);
+        for (std::thread& t : pool) t.join();
+
+        for (const std::string& error : errors) {
+            if (!error.empty()) throw std::runtime_error(error);
+        }
+    }
+
+    /**
+     * Add an in-memory shard (bbox and time range are computed from events)
+     */
+    void addShard(const std::string& name, std::vector<Event>& events) {
+        if (events.empty()) return;
+        ShardInfo info;
+        info.name = info.region = info.path = name;
+        info.count = static_cast<long long>(events.size());
+        info.minX = info.maxX = events[0].x;
+        info.minY = info.maxY = events[0].y;
+        info.minTime = info.maxTime = events[0].time;
+        for (const Event& e : events) {
+            info.minX = std::min(info.minX, e.x); info.maxX = std::max(info.maxX, e.x);
+            info.minY = std::min(info.minY, e.y); info.maxY = std::max(info.maxY, e.y);
+            info.minTime = std::min(info.minTime, e.time);
+            info.maxTime = std::max(info.maxTime, e.time);
+        }
+        shards.push_back(std::make_unique<Shard>(info, maxTime));
+        shards.back()->tree.build(events);
+    }
+
+    /**
+     * Indices of the shards a query overlaps
+     */
+    std::vector<size_t> route(double x1, double y1, double x2, double y2,
+                              int t1, int t2) const {
+        if (x1 > x2) std::swap(x1, x2);
+        if (y1 > y2) std::swap(y1, y2);
+        if (t1 > t2) std::swap(t1, t2);
+        std::vector<size_t> hits;
+        for (size_t i = 0; i < shards.size(); i++) {
+            if (shards[i]->info.overlaps(x1, y1, x2, y2, t1, t2)) hits.push_back(i);
+        }
+        return hits;
+    }
+
+    /**
+     * Count events in range over all overlapping shards
+     * @param perShard Optional: receives one count per shard (0 if not routed)
+     * @param stats Optional: query path counters summed over the routed trees
+     */
+    int query(double x1, double y1, double x2, double y2, int t1, int t2,
+              std::vector<int>* perShard = nullptr, QueryStats* stats = nullptr) const {
+        if (perShard) perShard->assign(shards.size(), 0);
+        int total = 0;
+        for (size_t i : route(x1, y1, x2, y2, t1, t2)) {
+            int count = shards[i]->tree.query(x1, y1, x2, y2, t1, t2, stats);
+            if (perShard) (*perShard)[i] = count;
+            total += count;
+        }
+        return total;
+    }
+
+    size_t shardCount() const {
+        return shards.size();
+    }
+
+    const ShardInfo& shard(size_t i) const {
+        return shards[i]->info;
+    }
+
+    /**
+     * Memory held by all shard trees
+     */
+    size_t memoryUsage() const {
+        size_t total = 0;
+        for (const auto& shard : shards) total += shard->tree.memoryUsage();
+        return total;
+    }
+};
+
+#endif // SHARDED_INDEX_H
@@ -0,0 +1,233 @@
+#ifndef TEMPORAL_KDTREE_H
+#define TEMPORAL_KDTREE_H
+
+#include <algorithm>
+#include <cmath>
+#include <cstdint>
+#include <memory>
+#include <vector>
+#include "kdtree.h"
+#include "time_domain.h"
+
+/**
+ * KD-Tree over absolute timestamps with a sparse temporal index per node
+ *
+ * KDTree gives every node a dense Fenwick over a fixed domain
+ * (1440 minutes), so its memory grows with the time range and a
+ * multi-year minute domain is out of reach. Here every node keeps the
+ * sorted timestamps of its subtree instead (plus prefix weights when
+ * events are weighted), so a node costs O(subtree size) whatever the
+ * range: O(n log n) in total, ~4 bytes per event per level.
+ *
+ * Event::time is read as minutes since 1970-01-01 (see time_domain.h).
+ * A query takes a TimeFilter; its matching minutes are expanded once
+ * into sorted intervals, and then
+ *   - covered nodes count them with binary searches over the node's
+ *     timestamps (or one merge pass when that is cheaper), restricted
+ *     to the intervals inside the node's own time span;
+ *   - partial-overlap nodes test their point with TimeFilter::matches.
+ *
+ * Build only (no insert); queries are const and thread-safe.
+ */
+class TemporalKDTree {
+private:
+    using Interval = TimeFilter::Interval;
+
+    struct Node {
+        double x, y;
+        int32_t time;
+        int weight;
+        double minX, maxX, minY, maxY;
+        bool splitByX;
+        std::vector<int32_t> times;   // Sorted timestamps of the subtree
+        std::vector<int64_t> prefix;  // prefix[i] = weight of times[0, i) (weighted trees only)
+        std::unique_ptr<Node> left, right;
+
+        long long weightBefore(size_t i) const {
+            return prefix.empty() ? static_cast<long long>(i) : prefix[i];
+        }
+
+        /**
+         * Weight of the timestamps inside any of the intervals
+         */
+        long long count(const std::vector<Interval>& intervals) const {
+            if (times.empty()) return 0;
+            // Only the intervals overlapping [times.front(), times.back()]
+            auto first = std::lower_bound(intervals.begin(), intervals.end(), times.front(),
+                                          [](const Interval& iv, int64_t t) { return iv.second < t; });
+            auto last = std::upper_bound(first, intervals.end(), times.back(),
+                                         [](int64_t t, const Interval& iv) { return t < iv.first; });
+            size_t k = last - first;
+            if (k == 0) return 0;
+
+            long long total = 0;
+            if (k * std::log2(static_cast<double>(times.size()) + 1) <= times.size()) {
+                for (auto it = first; it != last; ++it) {
+                    size_t a = std::lower_bound(times.begin(), times.end(), it->first) - times.begin();
+                    size_t b = std::upper_bound(times.begin() + a, times.end(), it->second) - times.begin();
+                    total += weightBefore(b) - weightBefore(a);
+                }
+            } else {
+                size_t i = 0;
+                for (auto it = first; it != last && i < times.size(); ++it) {
+                    while (i < times.size() && times[i] < it->first) i++;
+                    size_t a = i;
+                    while (i < times.size() && times[i] <= it->second) i++;
+                    total += weightBefore(i) - weightBefore(a);
+                }
+            }
+            return total;
+        }
+    };
+
+    std::unique_ptr<Node> root;
+    bool weighted = false;
+    int64_t minTime = 0, maxTime = -1;
+
+    std::unique_ptr<Node> buildTree(std::vector<Event>& points, int start, int end, int depth) {
+        if (start > end) return nullptr;
+
+        bool splitByX = (depth % 2 == 0);
+        int mid = start + (end - start) / 2;
+        std::nth_element(points.begin() + start, points.begin() + mid, points.begin() + end + 1,
+                         [splitByX](const Event& a, const Event& b) {
+                             return splitByX ? a.x < b.x : a.y < b.y;
+                         });
+
+        auto node = std::make_unique<Node>();
+        const Event& p = points[mid];
+        node->x = node->minX = node->maxX = p.x;
+        node->y = node->minY = node->maxY = p.y;
+        node->time = p.time;
+        node->weight = p.weight;
+        node->splitByX = splitByX;
+        node->left = buildTree(points, start, mid - 1, depth + 1);
+        node->right = buildTree(points, mid + 1, end, depth + 1);
+
+        // Merge the children's timestamps (and weights) with the node's own
+        std::vector<std::pair<int32_t, int>> merged;
+        merged.reserve(end - start + 1);
+        merged.emplace_back(p.time, p.weight);
+        for (const Node* child : {node->left.get(), node->right.get()}) {
+            if (!child) continue;
+            node->minX = std::min(node->minX, child->minX);
+            node->maxX = std::max(node->maxX, child->maxX);
+            node->minY = std::min(node->minY, child->minY);
+            node->maxY = std::max(node->maxY, child->maxY);
+            size_t middle = merged.size();
+            for (size_t i = 0; i < child->times.size(); i++) {
+                merged.emplace_back(child->times[i],
+                                    static_cast<int>(child->weightBefore(i + 1) - child->weightBefore(i)));
+            }
+            std::inplace_merge(merged.begin(), merged.begin() + middle, merged.end(),
+                               [](const std::pair<int32_t, int>& a, const std::pair<int32_t, int>& b) {
+                                   return a.first < b.first;
+                               });
+        }
+
+        node->times.resize(merged.size());
+        for (size_t i = 0; i < merged.size(); i++) node->times[i] = merged[i].first;
+        if (weighted) {
+            node->prefix.resize(merged.size() + 1);
+            node->prefix[0] = 0;
+            for (size_t i = 0; i < merged.size(); i++) node->prefix[i + 1] = node->prefix[i] + merged[i].second;
+        }
+        return node;
+    }
+
+    long long queryRange(const Node* node, double x1, double y1, double x2, double y2,
+                         const TimeFilter& filter, const std::vector<Interval>& intervals,
+                         QueryStats* stats, int depth) const {
+        if (!node) return 0;
+        if (stats) stats->visit(depth);
+
+        if (node->maxX < x1 || node->minX > x2 || node->maxY < y1 || node->minY > y2) {
+            if (stats) stats->pruned++;
+            return 0;
+        }
+
+        if (node->minX >= x1 && node->maxX <= x2 && node->minY >= y1 && node->maxY <= y2) {
+            if (stats) stats->covered++;
+            return node->count(intervals);
+        }
+
+        if (stats) stats->partial++;
+        long long result = 0;
+        if (node->x >= x1 && node->x <= x2 && node->y >= y1 && node->y <= y2 &&
+            filter.matches(node->time)) {
+            result += node->weight;
+            if (stats) stats->pointHits++;
+        }
+        result += queryRange(node->left.get(), x1, y1, x2, y2, filter, intervals, stats, depth + 1);
+        result += queryRange(node->right.get(), x1, y1, x2, y2, filter, intervals, stats, depth + 1);
+        return result;
+    }
+
+    size_t nodeMemory(const Node* node) const {
+        if (!node) return 0;
+        return sizeof(Node) + node->times.capacity() * sizeof(int32_t) +
+               node->prefix.capacity() * sizeof(int64_t) +
+               nodeMemory(node->left.get()) + nodeMemory(node->right.get());
+    }
+
+public:
+    TemporalKDTree() {}
+
+    /**
+     * Build from events (Event::time = minutes since 1970-01-01)
+     * @param events Vector of events (reordered by the build)
+     */
+    void build(std::vector<Event>& events) {
+        root.reset();
+        minTime = 0;
+        maxTime = -1;
+        if (events.empty()) return;
+
+        weighted = std::any_of(events.begin(), events.end(), [](const Event& e) { return e.weight != 1; });
+        auto range = std::minmax_element(events.begin(), events.end(),
+                                          [](const Event& a, const Event& b) { return a.time < b.time; });
+        minTime = range.first->time;
+        maxTime = range.second->time;
+        root = buildTree(events, 0, static_cast<int>(events.size()) - 1, 0);
+    }
+
+    /**
+     * Weighted count of events in the rectangle whose time matches the filter
+     */
+    long long query(double x1, double y1, double x2, double y2, const TimeFilter& filter,
+                    QueryStats* stats = nullptr) const {
+        if (x1 > x2) std::swap(x1, x2);
+        if (y1 > y2) std::swap(y1, y2);
+        if (!root) return 0;
+
+        // Expanded once per query, bounded by the data's own time span
+        std::vector<Interval> intervals = filter.intervals(minTime, maxTime);
+        if (intervals.empty()) return 0;
+        return queryRange(root.get(), x1, y1, x2, y2, filter, intervals, stats, 0);
+    }
+
+    /**
+     * Absolute time range [t1, t2] (inclusive minutes)
+     */
+    long long query(double x1, double y1, double x2, double y2, int64_t t1, int64_t t2,
+                    QueryStats* stats = nullptr) const {
+        return query(x1, y1, x2, y2, TimeFilter::between(t1, t2), stats);
+    }
+
+    /**
+     * Earliest / latest timestamp in the tree
+     */
+    std::pair<int64_t, int64_t> timeSpan() const {
+        return {minTime, maxTime};
+    }
+
+    size_t memoryUsage() const {
+        return nodeMemory(root.get());
+    }
+
+    bool empty() const {
+        return root == nullptr;
+    }
+};
+
+#endif // TEMPORAL_KDTREE_H
@@ -0,0 +1,212 @@
+#ifndef TIME_DOMAIN_H
+#define TIME_DOMAIN_H
+
+#include <algorithm>
+#include <climits>
+#include <cstdint>
+#include <utility>
+#include <vector>
+
+/**
+ * Absolute time for the temporal engines
+ *
+ * Timestamps are whole minutes since 1970-01-01 00:00 in local civil
+ * time (no time zone / DST handling), which fits an int32 for roughly
+ * +-4000 years. Minute-of-day data (0..1439) is simply day 0.
+ */
+namespace time_domain {
+
+constexpr int MINUTES_PER_DAY = 1440;
+
+enum Weekday { MONDAY, TUESDAY, WEDNESDAY, THURSDAY, FRIDAY, SATURDAY, SUNDAY };
+
+inline int64_t floorDiv(int64_t a, int64_t b) {
+    return a / b - ((a % b != 0) && ((a < 0) != (b < 0)));
+}
+
+/**
+ * Days since 1970-01-01 of a proleptic Gregorian date
+ * (H. Hinnant's days_from_civil)
+ */
+inline int64_t daysFromCivil(int year, int month, int day) {
+    int64_t y = year - (month <= 2);
+    int64_t era = floorDiv(y, 400);
+    int64_t yoe = y - era * 400;
+    int64_t doy = (153 * (month + (month > 2 ? -3 : 9)) + 2) / 5 + day - 1;
+    int64_t doe = yoe * 365 + yoe / 4 - yoe / 100 + doy;
+    return era * 146097 + doe - 719468;
+}
+
+struct CivilTime {
+    int year, month, day;  // month 1..12, day 1..31
+    int weekday;           // 0 = Monday .. 6 = Sunday
+    int minuteOfDay;       // 0..1439
+};
+
+inline int weekdayOfDay(int64_t days) {
+    return static_cast<int>(((days % 7) + 7 + 3) % 7);  // 1970-01-01 was a Thursday
+}
+
+inline CivilTime civil(int64_t minutes) {
+    int64_t days = floorDiv(minutes, MINUTES_PER_DAY);
+    int64_t z = days + 719468;
+    int64_t era = floorDiv(z, 146097);
+    int64_t doe = z - era * 146097;
+    int64_t yoe = (doe - doe / 1460 + doe / 36524 - doe / 146096) / 365;
+    int64_t doy = doe - (365 * yoe + yoe / 4 - yoe / 100);
+    int64_t mp = (5 * doy + 2) / 153;
+
+    CivilTime c;
+    c.day = static_cast<int>(doy - (153 * mp + 2) / 5 + 1);
+    c.month = static_cast<int>(mp < 10 ? mp + 3 : mp - 9);
+    c.year = static_cast<int>(yoe + era * 400 + (c.month <= 2));
+    c.weekday = weekdayOfDay(days);
+    c.minuteOfDay = static_cast<int>(minutes - days * MINUTES_PER_DAY);
+    return c;
+}
+
+inline int64_t toMinutes(int year, int month, int day, int hour = 0, int minute = 0) {
+    return daysFromCivil(year, month, day) * MINUTES_PER_DAY + hour * 60 + minute;
+}
+
+} // namespace time_domain
+
+/**
+ * Temporal predicate: an absolute range combined with calendar fields
+ *
+ *   TimeFilter::between(from, to)                     absolute minutes
+ *   TimeFilter().years(2023, 2023)
+ *               .weekdays(1 << time_domain::SATURDAY)  "Saturdays in 2023"
+ *   TimeFilter().months(0b111000000).timeOfDay(1320, 120)
+ *                                                     "Jul-Sep, 22:00-02:00"
+ *
+ * timeOfDay(a, b) with a > b wraps midnight; like every other field it
+ * is evaluated on the calendar day of the event.
+ *
+ * Engines evaluate a filter in two ways that always agree:
+ *   matches(t)          per event (partial-overlap nodes)
+ *   intervals(lo, hi)   the matching minutes of [lo, hi] as sorted,
+ *                       disjoint ranges, built from the coarsest level
+ *                       that is unconstrained (whole years, then
+ *                       months, then days, then the time-of-day window),
+ *                       so "2015-2024" is one range and "Saturdays in
+ *                       2023" is 52.
+ */
+struct TimeFilter {
+    using Interval = std::pair<int64_t, int64_t>;  // Inclusive minutes
+
+    static constexpr uint16_t ALL_MONTHS = 0xFFF;   // bit m - 1 = month m
+    static constexpr uint8_t ALL_WEEKDAYS = 0x7F;   // bit d = weekday d (0 = Monday)
+
+    int64_t from = INT32_MIN, to = INT32_MAX;
+    int yearFrom = INT_MIN, yearTo = INT_MAX;
+    uint16_t monthMask = ALL_MONTHS;
+    uint8_t weekdayMask = ALL_WEEKDAYS;
+    int dayFrom = 0, dayTo = time_domain::MINUTES_PER_DAY - 1;
+
+    static TimeFilter between(int64_t from, int64_t to) {
+        TimeFilter filter;
+        filter.from = std::min(from, to);
+        filter.to = std::max(from, to);
+        return filter;
+    }
+
+    TimeFilter& years(int first, int last) {
+        yearFrom = first;
+        yearTo = last;
+        return *this;
+    }
+
+    TimeFilter& months(uint16_t mask) {
+        monthMask = mask & ALL_MONTHS;
+        return *this;
+    }
+
+    TimeFilter& weekdays(uint8_t mask) {
+        weekdayMask = mask & ALL_WEEKDAYS;
+        return *this;
+    }
+
+    TimeFilter& timeOfDay(int first, int last) {
+        dayFrom = first;
+        dayTo = last;
+        return *this;
+    }
+
+    bool wholeDay() const {
+        return dayFrom == 0 && dayTo == time_domain::MINUTES_PER_DAY - 1;
+    }
+
+    bool inDayWindow(int minuteOfDay) const {
+        return dayFrom <= dayTo ? minuteOfDay >= dayFrom && minuteOfDay <= dayTo
+                                : minuteOfDay >= dayFrom || minuteOfDay <= dayTo;
+    }
+
+    bool matches(int64_t t) const {
+        if (t < from || t > to) return false;
+        time_domain::CivilTime c = time_domain::civil(t);
+        return c.year >= yearFrom && c.year <= yearTo &&
+               (monthMask >> (c.month - 1) & 1) && (weekdayMask >> c.weekday & 1) &&
+               inDayWindow(c.minuteOfDay);
+    }
+
+    /**
+     * Matching minutes of [lo, hi] as sorted, disjoint, non-adjacent ranges
+     */
+    std::vector<Interval> intervals(int64_t lo, int64_t hi) const {
+        using namespace time_domain;
+        std::vector<Interval> out;
+        lo = std::max(lo, from);
+        hi = std::min(hi, to);
+        if (lo > hi || monthMask == 0 || weekdayMask == 0) return out;
+
+        auto push = [&](int64_t a, int64_t b) {
+            a = std::max(a, lo);
+            b = std::min(b, hi);
+            if (a > b) return;
+            if (!out.empty() && out.back().second + 1 >= a) out.back().second = std::max(out.back().second, b);
+            else out.emplace_back(a, b);
+        };
+
+        bool allMonths = monthMask == ALL_MONTHS, allWeekdays = weekdayMask == ALL_WEEKDAYS;
+        int firstYear = std::max(civil(lo).year, yearFrom);
+        int lastYear = std::min(civil(hi).year, yearTo);
+        if (firstYear == civil(lo).year && lastYear == civil(hi).year && allMonths && allWeekdays && wholeDay()) {
+            push(lo, hi);
+            return out;
+        }
+
+        for (int year = firstYear; year <= lastYear; year++) {
+            if (allMonths && allWeekdays && wholeDay()) {
+                push(toMinutes(year, 1, 1), toMinutes(year + 1, 1, 1) - 1);
+                continue;
+            }
+            for (int month = 1; month <= 12; month++) {
+                if (!(monthMask >> (month - 1) & 1)) continue;
+                int64_t firstDay = daysFromCivil(year, month, 1);
+                int64_t endDay = month == 12 ? daysFromCivil(year + 1, 1, 1) : daysFromCivil(year, month + 1, 1);
+                if (endDay * MINUTES_PER_DAY <= lo || firstDay * MINUTES_PER_DAY > hi) continue;
+                if (allWeekdays && wholeDay()) {
+                    push(firstDay * MINUTES_PER_DAY, endDay * MINUTES_PER_DAY - 1);
+                    continue;
+                }
+
+                firstDay = std::max(firstDay, floorDiv(lo, MINUTES_PER_DAY));
+                endDay = std::min(endDay, floorDiv(hi, MINUTES_PER_DAY) + 1);
+                for (int64_t day = firstDay; day < endDay; day++) {
+                    if (!(weekdayMask >> weekdayOfDay(day) & 1)) continue;
+                    int64_t base = day * MINUTES_PER_DAY;
+                    if (dayFrom <= dayTo) {
+                        push(base + dayFrom, base + dayTo);
+                    } else {
+                        push(base, base + dayTo);
+                        push(base + dayFrom, base + MINUTES_PER_DAY - 1);
+                    }
+                }
+            }
+        }
+        return out;
+    }
+};
+
+#endif // TIME_DOMAIN_H
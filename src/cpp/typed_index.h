@@ -0,0 +1,162 @@
+#ifndef TYPED_INDEX_H
+#define TYPED_INDEX_H
+
+#include <algorithm>
+#include <cctype>
+#include <memory>
+#include <string>
+#include <unordered_map>
+#include <vector>
+#include "kdtree.h"
+
+/**
+ * Bitset over type codes (bit i set = type code i selected)
+ */
+using TypeMask = std::vector<bool>;
+
+/**
+ * Type code <-> name mapping, shared with the Python pipeline through
+ * the "types" list of the binary store manifest (see crime_types.py)
+ */
+class TypeDictionary {
+private:
+    std::vector<std::string> names;
+    std::unordered_map<std::string, int> codes;
+
+    static std::string upper(std::string s) {
+        std::transform(s.begin(), s.end(), s.begin(),
+                       [](unsigned char c) { return static_cast<char>(std::toupper(c)); });
+        return s;
+    }
+
+public:
+    TypeDictionary() {}
+
+    TypeDictionary(const std::vector<std::string>& _names) {
+        for (const std::string& name : _names) code(name);
+    }
+
+    /**
+     * Code of a name (added if new)
+     */
+    int code(const std::string& name) {
+        auto it = codes.find(name);
+        if (it != codes.end()) return it->second;
+        int c = static_cast<int>(names.size());
+        codes[name] = c;
+        names.push_back(name);
+        return c;
+    }
+
+    /**
+     * Code of a name, -1 if unknown
+     */
+    int find(const std::string& name) const {
+        auto it = codes.find(name);
+        return it == codes.end() ? -1 : it->second;
+    }
+
+    const std::string& name(int c) const {
+        return names[c];
+    }
+
+    size_t size() const {
+        return names.size();
+    }
+
+    /**
+     * Select every type whose name contains one of the terms
+     * (case-insensitive); evaluated once per dictionary entry
+     */
+    TypeMask mask(const std::vector<std::string>& terms) const {
+        TypeMask selected(names.size(), false);
+        for (size_t c = 0; c < names.size(); c++) {
+            std::string typeName = upper(names[c]);
+            for (const std::string& term : terms) {
+                if (!term.empty() && typeName.find(upper(term)) != std::string::npos) {
+                    selected[c] = true;
+                    break;
+                }
+            }
+        }
+        return selected;
+    }
+};
+
+/**
+ * One KDTree per type code
+ *
+ * A type filter picks the trees to query from a TypeMask, so filtered
+ * counts are still answered from the Fenwick trees instead of testing
+ * the type of every event. Memory is the same as one tree over all
+ * events (every event is in exactly one tree).
+ */
+class TypedIndex {
+private:
+    std::vector<std::unique_ptr<KDTree>> trees;  // Indexed by type code (null = no events)
+    int maxTime;
+
+public:
+    TypedIndex(int _maxTime = 1440) : maxTime(_maxTime) {}
+
+    /**
+     * Build from events; Event::type must be a valid code
+     * @param events Vector of events (reordered by the build)
+     * @param typeCount Size of the dictionary
+     */
+    void build(std::vector<Event>& events, size_t typeCount) {
+        std::vector<std::vector<Event>> byType(typeCount);
+        for (const Event& e : events) {
+            if (e.type >= 0 && e.type < static_cast<int>(typeCount)) byType[e.type].push_back(e);
+        }
+        trees.clear();
+        trees.resize(typeCount);
+        for (size_t c = 0; c < typeCount; c++) {
+            if (byType[c].empty()) continue;
+            trees[c] = std::make_unique<KDTree>(maxTime);
+            trees[c]->build(byType[c]);
+        }
+    }
+
+    /**
+     * Count events of the selected types in range
+     */
+    int query(double x1, double y1, double x2, double y2, int t1, int t2,
+              const TypeMask& mask, QueryStats* stats = nullptr) const {
+        int total = 0;
+        size_t n = std::min(mask.size(), trees.size());
+        for (size_t c = 0; c < n; c++) {
+            if (mask[c] && trees[c]) total += trees[c]->query(x1, y1, x2, y2, t1, t2, stats);
+        }
+        return total;
+    }
+
+    /**
+     * Count events of every type in range (no type filter)
+     */
+    int query(double x1, double y1, double x2, double y2, int t1, int t2) const {
+        return query(x1, y1, x2, y2, t1, t2, TypeMask(trees.size(), true));
+    }
+
+    /**
+     * Per-type counts in range (index = type code)
+     */
+    std::vector<int> countByType(double x1, double y1, double x2, double y2,
+                                 int t1, int t2) const {
+        std::vector<int> counts(trees.size(), 0);
+        for (size_t c = 0; c < trees.size(); c++) {
+            if (trees[c]) counts[c] = trees[c]->query(x1, y1, x2, y2, t1, t2);
+        }
+        return counts;
+    }
+
+    size_t memoryUsage() const {
+        size_t total = 0;
+        for (const auto& tree : trees) {
+            if (tree) total += tree->memoryUsage();
+        }
+        return total;
+    }
+};
+
+#endif // TYPED_INDEX_H
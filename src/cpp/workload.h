@@ -0,0 +1,76 @@
+#ifndef WORKLOAD_H
+#define WORKLOAD_H
+
+#include <algorithm>
+#include <cmath>
+#include <fstream>
+#include <sstream>
+#include <string>
+#include <vector>
+
+/**
+ * Query workload files and latency summaries shared by the batch mode of
+ * main.cpp and benchmarks/bench_engine.cpp
+ *
+ * Workload file: one query per line, "x1 y1 x2 y2 t1 t2 [class]";
+ * commas are accepted as separators and lines starting with '#' are
+ * skipped, so exported query logs can be replayed as they are.
+ */
+namespace workload {
+
+struct Query {
+    double x1, y1, x2, y2;
+    int t1, t2;
+    std::string label;
+};
+
+inline std::vector<Query> load(const std::string& filename) {
+    std::vector<Query> queries;
+    std::ifstream file(filename);
+    std::string line;
+    while (std::getline(file, line)) {
+        if (line.empty() || line[0] == '#') continue;
+        std::replace(line.begin(), line.end(), ',', ' ');
+        std::stringstream ss(line);
+        Query q;
+        if (ss >> q.x1 >> q.y1 >> q.x2 >> q.y2 >> q.t1 >> q.t2) {
+            if (!(ss >> q.label)) q.label = "all";
+            queries.push_back(q);
+        }
+    }
+    return queries;
+}
+
+/**
+ * Nearest-rank percentile (p in [0, 100]): the smallest value with at
+ * least p% of the values <= it, i.e. rank ceil(p / 100 * n)
+ */
+inline double percentile(std::vector<double> values, double p) {
+    if (values.empty()) return 0;
+    std::sort(values.begin(), values.end());
+    double rank = std::ceil(p / 100.0 * values.size());
+    size_t idx = rank < 1 ? 0 : static_cast<size_t>(rank) - 1;
+    return values[std::min(idx, values.size() - 1)];
+}
+
+/**
+ * {"count", "mean", "p50", "p95", "p99", "max"} of latencies in ms
+ */
+inline std::string latencyJson(const std::vector<double>& ms) {
+    double total = 0;
+    for (double v : ms) total += v;
+    std::stringstream ss;
+    ss.precision(6);
+    ss << std::fixed;
+    ss << "{\"count\":" << ms.size()
+       << ",\"mean\":" << (ms.empty() ? 0 : total / ms.size())
+       << ",\"p50\":" << percentile(ms, 50)
+       << ",\"p95\":" << percentile(ms, 95)
+       << ",\"p99\":" << percentile(ms, 99)
+       << ",\"max\":" << percentile(ms, 100) << "}";
+    return ss.str();
+}
+
+} // namespace workload
+
+#endif // WORKLOAD_H
@@ -0,0 +1,187 @@
+"""
+Compressed Bitmaps (roaring-style)
+
+Sets of event IDs for the inverted search index. IDs are split by their
+high 16 bits into containers; each container stores the low 16 bits
+either as a sorted uint16 array (sparse, <= 4096 entries) or as a
+65536-bit bitset (dense). Set operations work container by container,
+so intersecting a small posting with a large one only touches the
+containers the small one has.
+
+Serialized layout (little-endian, used by searchIndex.ts as well):
+    per container:  key uint16, kind uint16 (0 = array, 1 = bitset),
+                    cardinality uint32, payload
+    array payload:  cardinality x uint16, zero-padded to 4 bytes
+    bitset payload: 1024 x uint64
+"""
+
+import numpy as np
+
+ARRAY_MAX = 4096          # Larger containers become bitsets
+BITSET_WORDS = 1024       # 65536 bits
+ARRAY, BITSET = 0, 1
+
+
+def _popcount(words):
+    return int(np.unpackbits(words.view(np.uint8)).sum())
+
+
+def _to_bitset(low):
+    bits = np.zeros(1 << 16, dtype=bool)
+    bits[low] = True
+    return np.packbits(bits, bitorder='little').view('<u8')
+
+
+def _bitset_values(words):
+    bits = np.unpackbits(words.view(np.uint8), bitorder='little')
+    return np.flatnonzero(bits).astype(np.uint16)
+
+
+def _container(low):
+    """Best container for a sorted unique uint16 array"""
+    if len(low) > ARRAY_MAX:
+        return (BITSET, _to_bitset(low))
+    return (ARRAY, low.astype(np.uint16, copy=False))
+
+
+def _normalize(kind, data):
+    """Shrink a bitset back to an array when it gets sparse"""
+    if kind == BITSET and _popcount(data) <= ARRAY_MAX:
+        return (ARRAY, _bitset_values(data))
+    return (kind, data)
+
+
+def _contains(words, low):
+    low = low.astype(np.int64)
+    return ((words[low >> 6] >> (low & 63).astype(np.uint64)) & np.uint64(1)).astype(bool)
+
+
+class Bitmap:
+    def __init__(self, containers=None):
+        # key (high 16 bits) -> (kind, data); empty containers are never stored
+        self.containers = containers or {}
+
+    @classmethod
+    def from_ids(cls, ids):
+        """Build from event IDs (any order, duplicates allowed)"""
+        ids = np.unique(np.asarray(ids, dtype=np.uint32))
+        if len(ids) == 0:
+            return cls()
+        keys = ids >> 16
+        bounds = np.flatnonzero(np.diff(keys)) + 1
+        starts = np.concatenate([[0], bounds])
+        ends = np.concatenate([bounds, [len(ids)]])
+        return cls({int(keys[s]): _container((ids[s:e] & 0xFFFF).astype(np.uint16))
+                    for s, e in zip(starts, ends)})
+
+    @classmethod
+    def from_mask(cls, mask):
+        """Build from a boolean mask over event IDs"""
+        return cls.from_ids(np.flatnonzero(mask))
+
+    @classmethod
+    def union_all(cls, bitmaps):
+        result = cls()
+        for bitmap in bitmaps:
+            result = result | bitmap
+        return result
+
+    def __len__(self):
+        return sum(len(data) if kind == ARRAY else _popcount(data)
+                   for kind, data in self.containers.values())
+
+    def __bool__(self):
+        return bool(self.containers)
+
+    def to_array(self):
+        """Sorted uint32 event IDs"""
+        parts = []
+        for key in sorted(self.containers):
+            kind, data = self.containers[key]
+            low = data if kind == ARRAY else _bitset_values(data)
+            parts.append((np.uint32(key) << np.uint32(16)) | low.astype(np.uint32))
+        return np.concatenate(parts) if parts else np.empty(0, dtype=np.uint32)
+
+    def __and__(self, other):
+        result = {}
+        small, large = sorted((self, other), key=lambda b: len(b.containers))
+        for key, (kind_a, a) in small.containers.items():
+            if key not in large.containers:
+                continue
+            kind_b, b = large.containers[key]
+            if kind_a == ARRAY and kind_b == ARRAY:
+                merged = (ARRAY, np.intersect1d(a, b, assume_unique=True))
+            elif kind_a == BITSET and kind_b == BITSET:
+                merged = _normalize(BITSET, a & b)
+            else:
+                low, words = (a, b) if kind_a == ARRAY else (b, a)
+                merged = (ARRAY, low[_contains(words, low)])
+            if len(merged[1]) and (merged[0] == ARRAY or merged[1].any()):
+                result[key] = merged
+        return Bitmap(result)
+
+    def __or__(self, other):
+        result = dict(self.containers)
+        for key, (kind_b, b) in other.containers.items():
+            if key not in result:
+                result[key] = (kind_b, b)
+                continue
+            kind_a, a = result[key]
+            if kind_a == ARRAY and kind_b == ARRAY:
+                result[key] = _container(np.union1d(a, b).astype(np.uint16))
+            elif kind_a == BITSET and kind_b == BITSET:
+                result[key] = (BITSET, a | b)
+            else:
+                low, words = (a, b) if kind_a == ARRAY else (b, a)
+                words = words.copy()
+                low64 = low.astype(np.int64)
+                np.bitwise_or.at(words, low64 >> 6, np.uint64(1) << (low64 & 63).astype(np.uint64))
+                result[key] = (BITSET, words)
+        return Bitmap(result)
+
+    def __sub__(self, other):
+        result = {}
+        for key, (kind_a, a) in self.containers.items():
+            if key not in other.containers:
+                result[key] = (kind_a, a)
+                continue
+            kind_b, b = other.containers[key]
+            if kind_a == ARRAY:
+                keep = ~_contains(b, a) if kind_b == BITSET else ~np.isin(a, b, assume_unique=True)
+                merged = (ARRAY, a[keep])
+            elif kind_b == BITSET:
+                merged = _normalize(BITSET, a & ~b)
+            else:
+                merged = _normalize(BITSET, a & ~_to_bitset(b))
+            if len(merged[1]) and (merged[0] == ARRAY or merged[1].any()):
+                result[key] = merged
+        return Bitmap(result)
+
+    def to_bytes(self):
+        """Serialize (see module docstring); returns (bytes, container count)"""
+        out = bytearray()
+        for key in sorted(self.containers):
+            kind, data = self.containers[key]
+            card = len(data) if kind == ARRAY else _popcount(data)
+            out += np.array([key, kind], dtype='<u2').tobytes()
+            out += np.array([card], dtype='<u4').tobytes()
+            payload = data.astype('<u2' if kind == ARRAY else '<u8').tobytes()
+            out += payload + b'\0' * ((-len(payload)) % 4)
+        return bytes(out), len(self.containers)
+
+    @classmethod
+    def from_buffer(cls, buffer, offset, n_containers):
+        """Inverse of to_bytes for a bitmap stored at buffer[offset:]"""
+        containers = {}
+        for _ in range(n_containers):
+            key, kind = np.frombuffer(buffer, dtype='<u2', count=2, offset=offset)
+            card = int(np.frombuffer(buffer, dtype='<u4', count=1, offset=offset + 4)[0])
+            offset += 8
+            if kind == ARRAY:
+                data = np.frombuffer(buffer, dtype='<u2', count=card, offset=offset)
+                offset += 2 * card + (-(2 * card)) % 4
+            else:
+                data = np.frombuffer(buffer, dtype='<u8', count=BITSET_WORDS, offset=offset)
+                offset += 8 * BITSET_WORDS
+            containers[int(key)] = (int(kind), data)
+        return cls(containers)
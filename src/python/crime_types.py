@@ -0,0 +1,145 @@
+"""
+Crime Type Normalization and Dictionary Encoding
+
+Raw Primary Type values are normalized to a standard type once per
+distinct value (memoized), never once per row. Events then carry a small
+integer code into a TypeDictionary; the same dictionary is stored in the
+binary event store manifest ("types"), so the Python pipeline, the web
+dashboards and the C++ engine all agree on what code 3 means.
+
+Type filters are evaluated against the dictionary (a handful of entries)
+and produce a boolean mask over codes; filtering events is then a single
+mask[codes] lookup instead of a string comparison per event.
+"""
+
+import json
+import re
+from functools import lru_cache
+import numpy as np
+import pandas as pd
+
+# Standard type -> raw variations (checked in this order, first match wins)
+TYPE_MAPPINGS = {
+    'THEFT': ['THEFT', 'ROBBERY', 'BURGLARY', 'LARCENY', 'PICKPOCKET', 'PURSE SNATCHING'],
+    'ASSAULT': ['ASSAULT', 'BATTERY', 'AGGRAVATED ASSAULT', 'AGGRAVATED BATTERY'],
+    'NARCOTICS': ['NARCOTICS', 'DRUG', 'CONTROLLED SUBSTANCE'],
+    'MOTOR VEHICLE THEFT': ['MOTOR VEHICLE THEFT', 'VEHICULAR HIJACKING'],
+    'VANDALISM': ['VANDALISM', 'CRIMINAL DAMAGE', 'CRIMINAL TRESPASS'],
+    'WEAPONS': ['WEAPONS VIOLATION', 'CONCEALED CARRY LICENSE VIOLATION'],
+    'FRAUD': ['DECEPTIVE PRACTICE', 'FRAUD', 'FORGERY', 'IDENTITY THEFT'],
+}
+
+# One alternation per standard type, tried in mapping order
+_TYPE_PATTERNS = [
+    (standard, re.compile('|'.join(re.escape(v) for v in variations)))
+    for standard, variations in TYPE_MAPPINGS.items()
+]
+
+# Crime type similarity matrix (search expansion, exported to crimeSimilarity.ts)
+CRIME_SIMILARITY = {
+    'THEFT': ['ROBBERY', 'BURGLARY', 'MOTOR VEHICLE THEFT', 'FRAUD'],
+    'ROBBERY': ['THEFT', 'BURGLARY', 'ASSAULT'],
+    'BURGLARY': ['THEFT', 'ROBBERY', 'MOTOR VEHICLE THEFT', 'CRIMINAL TRESPASS'],
+    'ASSAULT': ['BATTERY', 'ROBBERY', 'WEAPONS'],
+    'BATTERY': ['ASSAULT', 'HOMICIDE'],
+    'NARCOTICS': ['OTHER NARCOTIC VIOLATION'],
+    'MOTOR VEHICLE THEFT': ['THEFT', 'BURGLARY'],
+    'VANDALISM': ['CRIMINAL DAMAGE', 'CRIMINAL TRESPASS'],
+    'FRAUD': ['THEFT', 'IDENTITY THEFT', 'DECEPTIVE PRACTICE'],
+    'WEAPONS': ['ASSAULT', 'HOMICIDE'],
+}
+
+# Codes 0..n-1 are fixed so they are the same in every export
+STANDARD_TYPES = list(TYPE_MAPPINGS) + ['OTHER']
+
+
+@lru_cache(maxsize=None)
+def normalize_crime_type(crime_type):
+    """Normalize crime type to a standard format"""
+    if not crime_type:
+        return "OTHER"
+
+    crime_type = crime_type.strip().upper()
+    if not crime_type:
+        return "OTHER"
+
+    for standard, pattern in _TYPE_PATTERNS:
+        if pattern.search(crime_type):
+            return standard
+
+    return crime_type
+
+
+class TypeDictionary:
+    """
+    Ordered list of type names; a type's code is its position.
+
+        types = TypeDictionary.standard()
+        codes = types.encode(df['Primary Type'])      # normalizes each distinct value once
+        mask = types.mask(['THEFT', 'FRAUD'])         # bool per code
+        selected = mask[codes]                        # bool per event
+    """
+
+    def __init__(self, names=()):
+        self.names = []
+        self.codes = {}
+        for name in names:
+            self.code(name)
+
+    @classmethod
+    def standard(cls):
+        """Dictionary pre-seeded with the standard types (stable codes)"""
+        return cls(STANDARD_TYPES)
+
+    def __len__(self):
+        return len(self.names)
+
+    def __iter__(self):
+        return iter(self.names)
+
+    def code(self, name):
+        """Code of an (already normalized) name, added if new"""
+        code = self.codes.get(name)
+        if code is None:
+            code = self.codes[name] = len(self.names)
+            self.names.append(name)
+        return code
+
+    def encode(self, values, normalize=True):
+        """
+        Raw values -> integer codes.
+        Each distinct value is normalized and looked up once.
+        """
+        uniques_codes, uniques = pd.factorize(pd.Series(values, dtype=object).fillna(''))
+        table = np.array([self.code(normalize_crime_type(v) if normalize
+                                    else (str(v).strip() or 'OTHER'))
+                          for v in uniques], dtype=np.int64)
+        return table[uniques_codes] if len(table) else np.zeros(len(uniques_codes), dtype=np.int64)
+
+    def decode(self, codes):
+        """Integer codes -> names"""
+        return np.asarray(self.names, dtype=object)[np.asarray(codes)]
+
+    def mask(self, terms, substring=True):
+        """
+        Bool array over codes: True for every type matching one of terms
+        (case-insensitive substring match by default, like CrimeSearch).
+        """
+        terms = [t.strip().upper() for t in terms if t and t.strip()]
+        if substring:
+            hits = [any(t in name.upper() for t in terms) for name in self.names]
+        else:
+            hits = [name.upper() in terms for name in self.names]
+        return np.array(hits, dtype=bool)
+
+    def to_list(self):
+        return list(self.names)
+
+    def save(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.names, f)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls(json.load(f))
@@ -0,0 +1,316 @@
+"""
+Space-Filling-Curve Sorted Event Index
+
+A flat alternative to the KD-tree for bulk analytical queries: the
+events are sorted by the Hilbert (or Morton / Z-order) key of their
+quantized position, with time as the secondary key, so the whole index
+is a handful of parallel arrays. Building it is one vectorized sort and
+persisting it is one .npz file.
+
+Layout:
+- keys, x, y, time, weight   events in (key, time) order
+- cumulative                 (blocks + 1) x (time_buckets + 1) table:
+                             cumulative[b, t] = weight of the events in
+                             blocks < b with time < t (blocks of
+                             block_size consecutive events)
+
+Query:
+1. The rectangle is decomposed into at most max_intervals key intervals
+   by descending the curve's quadtree: a quadrant is one contiguous key
+   range on both curves. Quadrants inside the rectangle become "full"
+   intervals; refinement stops at the budget and the remaining boundary
+   quadrants become "partial" intervals.
+2. Every interval is resolved to an event range with np.searchsorted.
+3. Whole blocks of full intervals are counted in O(1) from the
+   cumulative table; the ragged block edges and the partial intervals
+   are filtered event by event.
+
+count() and histogram() follow the engine API of the KD-tree and
+ShardedIndex (inclusive rectangle and minute range).
+"""
+
+import os
+import numpy as np
+
+DEFAULT_ORDER = 16         # Grid of 2^16 x 2^16 cells over the bbox
+DEFAULT_BLOCK_SIZE = 1024  # Events per cumulative histogram block
+DEFAULT_MAX_INTERVALS = 128
+TIME_BUCKETS = 1440        # Minute-of-day domain
+CURVES = ('hilbert', 'morton')
+
+
+def hilbert_keys(ix, iy, order):
+    """Hilbert index of integer cells (vectorized xy2d on a 2^order grid)"""
+    x = np.asarray(ix, dtype=np.uint64)
+    y = np.asarray(iy, dtype=np.uint64)
+    d = np.zeros(x.shape, dtype=np.uint64)
+    mask = np.uint64((1 << order) - 1)
+    for bit in range(order - 1, -1, -1):
+        s = np.uint64(1 << bit)
+        rx = (x & s) > 0
+        ry = (y & s) > 0
+        d += (s * s) * ((3 * rx.astype(np.uint64)) ^ ry.astype(np.uint64))
+        # Rotate the lower bits into the quadrant's orientation
+        flip = ~ry & rx
+        x = np.where(flip, mask - x, x)
+        y = np.where(flip, mask - y, y)
+        x, y = np.where(ry, x, y), np.where(ry, y, x)
+    return d
+
+
+def morton_keys(ix, iy, order):
+    """Morton (Z-order) index of integer cells: interleaved x/y bits"""
+    x = np.asarray(ix, dtype=np.uint64)
+    y = np.asarray(iy, dtype=np.uint64)
+    d = np.zeros(x.shape, dtype=np.uint64)
+    for bit in range(order):
+        b = np.uint64(bit)
+        d |= ((x >> b) & np.uint64(1)) << np.uint64(2 * bit + 1)
+        d |= ((y >> b) & np.uint64(1)) << np.uint64(2 * bit)
+    return d
+
+
+def _concat_ranges(starts, stops):
+    """Concatenation of arange(start, stop) for every pair, vectorized"""
+    lengths = np.maximum(stops - starts, 0)
+    total = int(lengths.sum())
+    if total == 0:
+        return np.empty(0, dtype=np.int64)
+    offsets = np.cumsum(lengths) - lengths
+    return np.repeat(starts - offsets, lengths) + np.arange(total, dtype=np.int64)
+
+
+class CurveIndex:
+    def __init__(self, x, y, time, weight=None, curve='hilbert', order=DEFAULT_ORDER,
+                 block_size=DEFAULT_BLOCK_SIZE, max_intervals=DEFAULT_MAX_INTERVALS,
+                 time_buckets=TIME_BUCKETS, bounds=None):
+        """
+        x, y, time, weight: event columns (time = minute of day)
+        bounds: (min_x, min_y, max_x, max_y) of the quantization grid,
+                defaults to the bbox of the events
+        """
+        if curve not in CURVES:
+            raise ValueError(f"unknown curve {curve!r}, expected one of {CURVES}")
+        if not 1 <= order <= 31:
+            raise ValueError("order must be between 1 and 31")
+
+        self.curve = curve
+        self.order = int(order)
+        self.block_size = int(block_size)
+        self.max_intervals = int(max_intervals)
+        self.time_buckets = int(time_buckets)
+
+        x = np.asarray(x, dtype=np.float64)
+        y = np.asarray(y, dtype=np.float64)
+        time = np.asarray(time, dtype=np.int64)
+        weight = (np.ones(len(x), dtype=np.int64) if weight is None
+                  else np.asarray(weight, dtype=np.int64))
+        if len(time) and (time.min() < 0 or time.max() >= self.time_buckets):
+            raise ValueError(f"time outside [0, {self.time_buckets})")
+
+        if bounds is None:
+            bounds = ((x.min(), y.min(), x.max(), y.max()) if len(x) else (0.0, 0.0, 1.0, 1.0))
+        self.bounds = tuple(float(b) for b in bounds)
+
+        keys = self._keys(*self._cells(x, y))
+        perm = np.lexsort((time, keys))
+        self.keys = keys[perm]
+        self.x = x[perm]
+        self.y = y[perm]
+        self.time = time[perm].astype(np.uint16)
+        self.weight = weight[perm].astype(np.int32)
+        self.cumulative = self._build_cumulative()
+
+    @classmethod
+    def from_columns(cls, columns, **kwargs):
+        """Build from event store columns (see event_store.read_event_store)"""
+        return cls(columns['x'], columns['y'], columns['time'], columns.get('weight'), **kwargs)
+
+    # ------------------------------------------------------------------
+    # Curve and grid
+    # ------------------------------------------------------------------
+
+    def _scale(self):
+        side = 1 << self.order
+        min_x, min_y, max_x, max_y = self.bounds
+        return side / max(max_x - min_x, 1e-12), side / max(max_y - min_y, 1e-12)
+
+    def _cells(self, x, y):
+        """Grid cells of coordinates (clamped to the grid)"""
+        side = 1 << self.order
+        scale_x, scale_y = self._scale()
+        ix = np.clip(np.floor((np.asarray(x) - self.bounds[0]) * scale_x), 0, side - 1)
+        iy = np.clip(np.floor((np.asarray(y) - self.bounds[1]) * scale_y), 0, side - 1)
+        return ix.astype(np.int64), iy.astype(np.int64)
+
+    def _keys(self, ix, iy):
+        fn = hilbert_keys if self.curve == 'hilbert' else morton_keys
+        return fn(ix, iy, self.order)
+
+    def _build_cumulative(self):
+        n, blocks = len(self.keys), -(-len(self.keys) // self.block_size)
+        block_of = np.arange(n) // self.block_size
+        table = np.zeros((blocks + 1, self.time_buckets + 1), dtype=np.int64)
+        np.add.at(table, (block_of + 1, self.time.astype(np.int64) + 1), self.weight)
+        return table.cumsum(axis=0).cumsum(axis=1)
+
+    def decompose(self, x1, y1, x2, y2):
+        """
+        Key intervals covering a rectangle.
+        Returns (lo, hi, full): inclusive key bounds sorted by lo, and
+        whether every event of the interval is inside the rectangle.
+        """
+        min_x, min_y, max_x, max_y = self.bounds
+        empty = (np.empty(0, dtype=np.uint64),) * 2 + (np.empty(0, dtype=bool),)
+        if x2 < min_x or x1 > max_x or y2 < min_y or y1 > max_y:
+            return empty
+
+        # Cells touched by the rectangle, and cells certainly inside it
+        (gx1, gx2), (gy1, gy2) = (v.tolist() for v in self._cells([x1, x2], [y1, y2]))
+        side = 1 << self.order
+        in_x = (0 if x1 <= min_x else gx1 + 1, side - 1 if x2 >= max_x else gx2 - 1)
+        in_y = (0 if y1 <= min_y else gy1 + 1, side - 1 if y2 >= max_y else gy2 - 1)
+
+        # Start at the smallest quadrant containing the whole rectangle
+        shift = max((gx1 ^ gx2).bit_length(), (gy1 ^ gy2).bit_length())
+        cx = np.array([gx1 >> shift], dtype=np.int64)
+        cy = np.array([gy1 >> shift], dtype=np.int64)
+        corners_x, corners_y, shifts, fulls = [], [], [], []
+        emitted = 0
+
+        def emit(sel, full):
+            corners_x.append(cx[sel] << shift)
+            corners_y.append(cy[sel] << shift)
+            shifts.append(np.full(len(corners_x[-1]), shift, dtype=np.uint64))
+            fulls.append(np.full(len(corners_x[-1]), full))
+            return len(corners_x[-1])
+
+        while len(cx):
+            c0x, c1x = cx << shift, ((cx + 1) << shift) - 1
+            c0y, c1y = cy << shift, ((cy + 1) << shift) - 1
+            touch = (c1x >= gx1) & (c0x <= gx2) & (c1y >= gy1) & (c0y <= gy2)
+            inside = touch & (c0x >= in_x[0]) & (c1x <= in_x[1]) & (c0y >= in_y[0]) & (c1y <= in_y[1])
+            partial = touch & ~inside
+
+            emitted += emit(inside, True)
+            if shift == 0 or emitted + 4 * int(partial.sum()) > self.max_intervals:
+                emit(partial, False)
+                break
+
+            px, py = cx[partial] * 2, cy[partial] * 2
+            cx = np.concatenate([px, px + 1, px, px + 1])
+            cy = np.concatenate([py, py, py + 1, py + 1])
+            shift -= 1
+
+        # A quadrant is the key range sharing the prefix of its corner's key
+        span = np.uint64(1) << (np.uint64(2) * np.concatenate(shifts))
+        lo = self._keys(np.concatenate(corners_x), np.concatenate(corners_y)) & ~(span - np.uint64(1))
+        hi = lo + (span - np.uint64(1))
+        full = np.concatenate(fulls)
+        perm = np.argsort(lo, kind='stable')
+        return lo[perm], hi[perm], full[perm]
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def _plan(self, x1, y1, x2, y2, t1, t2):
+        """
+        Event ranges of a query.
+        Returns (block_lo, block_hi, edges, t1, t2): whole-block ranges
+        answered from the cumulative table, and the event positions that
+        still need filtering (already filtered to the rectangle + time).
+        """
+        x1, x2 = min(x1, x2), max(x1, x2)
+        y1, y2 = min(y1, y2), max(y1, y2)
+        t1, t2 = max(min(t1, t2), 0), min(max(t1, t2), self.time_buckets - 1)
+
+        lo, hi, full = self.decompose(x1, y1, x2, y2)
+        starts = np.searchsorted(self.keys, lo, side='left').astype(np.int64)
+        stops = np.searchsorted(self.keys, hi, side='right').astype(np.int64)
+
+        b = self.block_size
+        block_lo = -(-starts[full] // b)
+        block_hi = stops[full] // b
+        whole = block_lo < block_hi
+        edge_starts = np.concatenate([
+            starts[full][whole], block_hi[whole] * b,   # Ragged block edges
+            starts[full][~whole],                       # Intervals inside one block
+        ])
+        edge_stops = np.concatenate([
+            block_lo[whole] * b, stops[full][whole],
+            stops[full][~whole],
+        ])
+        edges = _concat_ranges(edge_starts, edge_stops)
+        partial = _concat_ranges(starts[~full], stops[~full])
+
+        t = self.time[edges]
+        edges = edges[(t >= t1) & (t <= t2)]
+        px, py, pt = self.x[partial], self.y[partial], self.time[partial]
+        partial = partial[(px >= x1) & (px <= x2) & (py >= y1) & (py <= y2) & (pt >= t1) & (pt <= t2)]
+        return block_lo[whole], block_hi[whole], np.concatenate([edges, partial]), t1, t2
+
+    def count(self, x1, y1, x2, y2, t1, t2):
+        """Weighted number of events in the rectangle and minute range (inclusive)"""
+        if len(self.keys) == 0 or max(t1, t2) < 0 or min(t1, t2) >= self.time_buckets:
+            return 0
+        block_lo, block_hi, events, t1, t2 = self._plan(x1, y1, x2, y2, t1, t2)
+        c = self.cumulative
+        whole = (c[block_hi, t2 + 1] - c[block_hi, t1] - c[block_lo, t2 + 1] + c[block_lo, t1]).sum()
+        return int(whole) + int(self.weight[events].sum())
+
+    def histogram(self, x1, y1, x2, y2, t1=0, t2=TIME_BUCKETS - 1, bin_minutes=60):
+        """
+        Weighted counts per time bin (hourly by default) of the events in
+        the rectangle and minute range; bins cover the whole time domain.
+        """
+        bins = -(-self.time_buckets // bin_minutes)
+        result = np.zeros(bins, dtype=np.int64)
+        if len(self.keys) == 0 or max(t1, t2) < 0 or min(t1, t2) >= self.time_buckets:
+            return result
+        block_lo, block_hi, events, t1, t2 = self._plan(x1, y1, x2, y2, t1, t2)
+
+        c = self.cumulative
+        per_minute = np.diff(c[block_hi].sum(axis=0) - c[block_lo].sum(axis=0))
+        per_minute[:t1] = 0
+        per_minute[t2 + 1:] = 0
+        per_minute += np.bincount(self.time[events], weights=self.weight[events],
+                                  minlength=self.time_buckets).astype(np.int64)
+
+        padded = np.zeros(bins * bin_minutes, dtype=np.int64)
+        padded[:self.time_buckets] = per_minute
+        return padded.reshape(bins, bin_minutes).sum(axis=1)
+
+    def memory_bytes(self):
+        return sum(a.nbytes for a in (self.keys, self.x, self.y, self.time,
+                                      self.weight, self.cumulative))
+
+    def __len__(self):
+        return len(self.keys)
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def save(self, path):
+        """Save the sorted arrays and the cumulative table as one .npz file"""
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        np.savez(path,
+                 meta=np.array([CURVES.index(self.curve), self.order, self.block_size,
+                                self.max_intervals, self.time_buckets]),
+                 bounds=np.array(self.bounds), keys=self.keys, x=self.x, y=self.y,
+                 time=self.time, weight=self.weight, cumulative=self.cumulative)
+
+    @classmethod
+    def load(cls, path):
+        """Load an index saved with save() without re-sorting"""
+        with np.load(path) as data:
+            curve, order, block_size, max_intervals, time_buckets = (int(v) for v in data['meta'])
+            index = cls.__new__(cls)
+            index.curve = CURVES[curve]
+            index.order, index.block_size = order, block_size
+            index.max_intervals, index.time_buckets = max_intervals, time_buckets
+            index.bounds = tuple(float(b) for b in data['bounds'])
+            for name in ('keys', 'x', 'y', 'time', 'weight', 'cumulative'):
+                setattr(index, name, data[name])
+        return index
@@ -12,12 +12,23 @@ Supported datasets:
 
 import pandas as pd
 import numpy as np
-from datetime import datetime
 import os
 
+from generator import EventGenerator
+from event_table import EventTable
+from crime_types import TypeDictionary
+
+# Timestamp formats tried in order
+TIME_FORMATS = [
+    '%m/%d/%Y %I:%M:%S %p',  # 12/31/2023 11:59:59 PM
+    '%Y-%m-%d %H:%M:%S',      # 2023-12-31 23:59:59
+    '%m/%d/%Y %H:%M',         # 12/31/2023 23:59
+    '%Y-%m-%d',               # 2023-12-31
+]
+
 class EventDataLoader:
     def __init__(self):
-        self.events = []
+        self.events = EventTable.empty()
         
     def load_chicago_crimes(self, filepath):
         """
@@ -51,21 +62,16 @@ class EventDataLoader:
             # Remove rows with missing coordinates
             df = df.dropna(subset=['Latitude', 'Longitude', 'Date'])
             
-            # Convert to events
-            events = []
-            for _, row in df.iterrows():
-                x = float(row['Latitude'])
-                y = float(row['Longitude'])
-                
-                # Parse time
-                time_bucket = self._parse_time_to_bucket(row['Date'])
-                
-                events.append({
-                    'x': x,
-                    'y': y,
-                    'time': time_bucket,
-                    'weight': 1
-                })
+            # Convert to events (optional crime type -> category codes)
+            codes, categories = None, None
+            if 'Primary Type' in df.columns:
+                types = TypeDictionary.standard()
+                codes, categories = types.encode(df['Primary Type']), types.to_list()
+            
+            events = EventTable(df['Latitude'].to_numpy(dtype=np.float64),
+                                df['Longitude'].to_numpy(dtype=np.float64),
+                                self._parse_time_to_buckets(df['Date']),
+                                codes=codes, categories=categories)
             
             self.events = events
             print(f"✓ Loaded {len(events)} crime events")
@@ -73,7 +79,7 @@ class EventDataLoader:
             
         except Exception as e:
             print(f"❌ Error loading data: {e}")
-            return []
+            return EventTable.empty()
     
     def load_generic_csv(self, filepath, x_col='x', y_col='y', time_col='time'):
         """
@@ -87,25 +93,16 @@ class EventDataLoader:
             if x_col not in df.columns or y_col not in df.columns:
                 raise ValueError(f"Columns {x_col} or {y_col} not found")
             
-            events = []
-            for _, row in df.iterrows():
-                x = float(row[x_col])
-                y = float(row[y_col])
-                
-                if time_col in df.columns:
-                    if isinstance(row[time_col], (int, float)):
-                        time_bucket = int(row[time_col])
-                    else:
-                        time_bucket = self._parse_time_to_bucket(row[time_col])
+            if time_col in df.columns:
+                if pd.api.types.is_numeric_dtype(df[time_col]):
+                    times = df[time_col].to_numpy(dtype=np.int64)
                 else:
-                    time_bucket = np.random.randint(0, 1440)  # Random time
-                
-                events.append({
-                    'x': x,
-                    'y': y,
-                    'time': time_bucket,
-                    'weight': 1
-                })
+                    times = self._parse_time_to_buckets(df[time_col])
+            else:
+                times = np.random.randint(0, 1440, len(df))  # Random time
+            
+            events = EventTable(df[x_col].to_numpy(dtype=np.float64),
+                                df[y_col].to_numpy(dtype=np.float64), times)
             
             self.events = events
             print(f"✓ Loaded {len(events)} events")
@@ -113,122 +110,63 @@ class EventDataLoader:
             
         except Exception as e:
             print(f"❌ Error loading data: {e}")
-            return []
+            return EventTable.empty()
     
-    def _parse_time_to_bucket(self, time_str):
+    def _parse_time_to_buckets(self, values):
         """
-        Convert timestamp string to minute bucket (0-1439)
+        Convert timestamp strings to minute buckets (0-1439), one
+        vectorized parse per format; unparseable values get a random time
         """
-        try:
-            # Try multiple date formats
-            formats = [
-                '%m/%d/%Y %I:%M:%S %p',  # 12/31/2023 11:59:59 PM
-                '%Y-%m-%d %H:%M:%S',      # 2023-12-31 23:59:59
-                '%m/%d/%Y %H:%M',         # 12/31/2023 23:59
-                '%Y-%m-%d',               # 2023-12-31
-            ]
-            
-            dt = None
-            for fmt in formats:
-                try:
-                    dt = datetime.strptime(str(time_str), fmt)
-                    break
-                except:
-                    continue
-            
-            if dt is None:
-                # If all parsing fails, return random time
-                return np.random.randint(0, 1440)
-            
-            # Convert to minute of day (0-1439)
-            return dt.hour * 60 + dt.minute
-            
-        except:
-            return np.random.randint(0, 1440)
+        values = pd.Series(values).astype(str)
+        parsed = pd.Series(pd.NaT, index=values.index, dtype='datetime64[ns]')
+        for fmt in TIME_FORMATS:
+            missing = parsed.isna()
+            if not missing.any():
+                break
+            parsed[missing] = pd.to_datetime(values[missing], format=fmt, errors='coerce')
+        
+        minutes = (parsed.dt.hour * 60 + parsed.dt.minute).to_numpy(dtype=np.float64, copy=True)
+        failed = np.isnan(minutes)
+        minutes[failed] = np.random.randint(0, 1440, int(failed.sum()))
+        return minutes.astype(np.uint16)
     
     def normalize_coordinates(self, target_range=(0, 100)):
         """
         Normalize coordinates to a specific range
         Useful for visualization
         """
-        if not self.events:
+        if not len(self.events):
             return
         
-        xs = [e['x'] for e in self.events]
-        ys = [e['y'] for e in self.events]
-        
-        min_x, max_x = min(xs), max(xs)
-        min_y, max_y = min(ys), max(ys)
-        
-        for event in self.events:
-            event['x'] = self._normalize(event['x'], min_x, max_x, *target_range)
-            event['y'] = self._normalize(event['y'], min_y, max_y, *target_range)
-        
+        self.events.normalize(target_range)
         print(f"✓ Normalized coordinates to range {target_range}")
     
-    def _normalize(self, val, old_min, old_max, new_min, new_max):
-        """Normalize value from old range to new range"""
-        if old_max == old_min:
-            return (new_min + new_max) / 2
-        return ((val - old_min) / (old_max - old_min)) * (new_max - new_min) + new_min
-    
     def save_processed(self, output_path):
         """
         Save processed events to CSV
         Format: x,y,time,weight
         """
-        if not self.events:
+        if not len(self.events):
             print("❌ No events to save")
             return
         
-        os.makedirs(os.path.dirname(output_path), exist_ok=True)
-        
-        df = pd.DataFrame(self.events)
-        df.to_csv(output_path, index=False)
+        self.events.save_csv(output_path)
         print(f"✓ Saved {len(self.events)} events to {output_path}")
     
     def generate_sample_data(self, n_events=1000, 
                             lat_range=(41.75, 41.95),
-                            lon_range=(-87.75, -87.55)):
+                            lon_range=(-87.75, -87.55),
+                            seed=None):
         """
         Generate synthetic sample data for testing
         Simulates crime events in Chicago
         """
         print(f"🎲 Generating {n_events} synthetic events...")
         
-        events = []
-        
-        # Create some hotspots
-        hotspots = [
-            (41.88, -87.63),  # Downtown
-            (41.85, -87.65),  # South Loop
-            (41.91, -87.67),  # North Side
-        ]
-        
-        for i in range(n_events):
-            # 70% from hotspots, 30% random
-            if np.random.random() < 0.7:
-                hotspot = hotspots[np.random.randint(0, len(hotspots))]
-                x = np.random.normal(hotspot[0], 0.02)
-                y = np.random.normal(hotspot[1], 0.02)
-            else:
-                x = np.random.uniform(*lat_range)
-                y = np.random.uniform(*lon_range)
-            
-            # Time: More crime at night
-            if np.random.random() < 0.4:
-                # Night time (8 PM - 4 AM)
-                time_bucket = np.random.randint(1200, 1440) if np.random.random() < 0.5 else np.random.randint(0, 240)
-            else:
-                # Day time
-                time_bucket = np.random.randint(240, 1200)
-            
-            events.append({
-                'x': x,
-                'y': y,
-                'time': time_bucket,
-                'weight': 1
-            })
+        # 70% from hotspots, 30% random; more crime at night
+        generator = EventGenerator({'lat_range': lat_range, 'lon_range': lon_range},
+                                   seed=seed)
+        events = EventTable.from_chunks(generator.chunks(n_events))
         
         self.events = events
         print(f"✓ Generated {len(events)} synthetic events")
@@ -257,18 +195,17 @@ def main():
     loader.save_processed(output_path)
     
     # Print statistics
-    if loader.events:
-        xs = [e['x'] for e in loader.events]
-        ys = [e['y'] for e in loader.events]
-        ts = [e['time'] for e in loader.events]
+    if len(loader.events):
+        stats = loader.events.describe()
         
         print("\n" + "="*60)
         print("  DATASET STATISTICS")
         print("="*60)
-        print(f"  Total Events:    {len(loader.events)}")
-        print(f"  X Range:         {min(xs):.4f} to {max(xs):.4f}")
-        print(f"  Y Range:         {min(ys):.4f} to {max(ys):.4f}")
-        print(f"  Time Range:      {min(ts)} to {max(ts)} (minutes)")
+        print(f"  Total Events:    {stats['count']}")
+        print(f"  X Range:         {stats['x_range'][0]:.4f} to {stats['x_range'][1]:.4f}")
+        print(f"  Y Range:         {stats['y_range'][0]:.4f} to {stats['y_range'][1]:.4f}")
+        print(f"  Time Range:      {stats['time_range'][0]} to {stats['time_range'][1]} (minutes)")
+        print(f"  Memory:          {loader.events.nbytes / max(stats['count'], 1):.0f} bytes/event")
         print("="*60 + "\n")
         
         print("✅ Data processing complete!")
@@ -0,0 +1,294 @@
+"""
+Kernel Density Heatmaps
+
+Turns events into smooth density surfaces per time window, for maps
+where one dot per event stops being readable (or drawable).
+
+Per window:
+1. Weighted counts on a fixed rows x cols grid over the bounds. Events
+   are pre-binned into a cumulative (time bucket x cell) cube, so the
+   whole buckets of a window cost one grid subtraction; only the events
+   in the ragged minutes at both ends are binned (np.bincount) again.
+2. The count grid is convolved with a kernel through the FFT (zero
+   padded, so nothing wraps around the edges). Kernel spectra are
+   cached per (kernel, bandwidth, grid shape).
+
+Both steps scale with the grid size, not with the number of events, so
+a window can be recomputed while scrubbing the time slider. Densities
+are LRU-cached per (window, kernel, bandwidth) and can be exported as
+float32 arrays or colour-mapped RGBA PNGs.
+
+Grid orientation: grid[i, j] with i along x (latitude, south -> north)
+and j along y (longitude, west -> east). Images are drawn north-up.
+"""
+
+import os
+import struct
+import zlib
+from collections import OrderedDict
+import numpy as np
+
+DEFAULT_SHAPE = (256, 256)
+DEFAULT_BUCKET_MINUTES = 30
+TIME_BUCKETS = 1440
+KERNELS = ('gaussian', 'epanechnikov', 'quartic', 'uniform')
+ROUNDOFF = 1e-9       # Densities below this are FFT round-off, not events
+
+# Anchor colours of the heat colour map (dark purple -> yellow), 0..255
+HEAT_COLORS = np.array([
+    [0, 0, 4], [87, 16, 110], [188, 55, 84], [249, 142, 9], [252, 255, 164],
+], dtype=np.float64)
+
+
+def make_kernel(name='gaussian', bandwidth=2.0):
+    """
+    Normalized 2D kernel (sums to 1).
+    bandwidth is in grid cells: the standard deviation for 'gaussian'
+    (truncated at 3 sigma), the support radius for the others.
+    """
+    if name not in KERNELS:
+        raise ValueError(f"unknown kernel {name!r}, expected one of {KERNELS}")
+    if bandwidth <= 0:
+        raise ValueError("bandwidth must be positive")
+
+    radius = int(np.ceil(3 * bandwidth if name == 'gaussian' else bandwidth))
+    offsets = np.arange(-radius, radius + 1, dtype=np.float64)
+    d2 = (offsets[:, None] ** 2 + offsets[None, :] ** 2) / bandwidth ** 2
+
+    if name == 'gaussian':
+        k = np.exp(-0.5 * d2)
+    elif name == 'epanechnikov':
+        k = np.maximum(1 - d2, 0)
+    elif name == 'quartic':
+        k = np.maximum(1 - d2, 0) ** 2
+    else:
+        k = (d2 <= 1).astype(np.float64)
+    return k / k.sum()
+
+
+def bin_events(x, y, bounds, shape=DEFAULT_SHAPE, weights=None):
+    """
+    Weighted 2D histogram of events (vectorized, one np.bincount).
+    bounds: (min_x, max_x, min_y, max_y); events outside are dropped
+    """
+    return _bin_cells(*_cell_index(x, y, bounds, shape), shape, weights)
+
+
+def _cell_index(x, y, bounds, shape):
+    """Flat cell index per event and the mask of events inside the bounds"""
+    min_x, max_x, min_y, max_y = bounds
+    rows, cols = shape
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    inside = (x >= min_x) & (x <= max_x) & (y >= min_y) & (y <= max_y)
+    i = np.minimum(((x - min_x) * (rows / max(max_x - min_x, 1e-12))).astype(np.int64), rows - 1)
+    j = np.minimum(((y - min_y) * (cols / max(max_y - min_y, 1e-12))).astype(np.int64), cols - 1)
+    return np.where(inside, i * cols + j, 0), inside
+
+
+def _bin_cells(cells, inside, shape, weights=None):
+    w = inside.astype(np.float64) if weights is None else np.where(inside, weights, 0)
+    return np.bincount(cells, weights=w, minlength=shape[0] * shape[1]).reshape(shape)
+
+
+def _fast_length(n):
+    """Smallest 2^a 3^b 5^c >= n (FFT-friendly size)"""
+    best = 1 << int(np.ceil(np.log2(max(n, 1))))
+    f5 = 1
+    while f5 < best:
+        f35 = f5
+        while f35 < best:
+            f = f35
+            while f < n:
+                f *= 2
+            best = min(best, f)
+            f35 *= 3
+        f5 *= 5
+    return best
+
+
+def fft_convolve(grid, kernel, kernel_spectrum=None):
+    """
+    Linear 'same'-size convolution of a grid with an odd-sized kernel
+    via rfft2. kernel_spectrum may be passed in when it was computed
+    for the same padded shape (see DensityGrid._spectrum).
+    """
+    (rows, cols), (kr, kc) = grid.shape, kernel.shape
+    padded = (_fast_length(rows + kr - 1), _fast_length(cols + kc - 1))
+    if kernel_spectrum is None:
+        kernel_spectrum = np.fft.rfft2(kernel, padded)
+    full = np.fft.irfft2(np.fft.rfft2(grid, padded) * kernel_spectrum, padded)
+    r0, c0 = kr // 2, kc // 2
+    return full[r0:r0 + rows, c0:c0 + cols]
+
+
+def colorize(values, vmax=None, scale='linear'):
+    """
+    Map a density grid to RGBA uint8 (north-up). Zero density is fully
+    transparent; alpha ramps up with the normalized value.
+    scale: 'linear', 'sqrt' or 'log'
+    """
+    v = np.maximum(np.asarray(values, dtype=np.float64), 0)
+    vmax = float(v.max()) if vmax is None else float(vmax)
+    if vmax <= 0:
+        return np.zeros(v.shape + (4,), dtype=np.uint8)[::-1]
+
+    if scale == 'sqrt':
+        t = np.sqrt(v / vmax)
+    elif scale == 'log':
+        t = np.log1p(v) / np.log1p(vmax)
+    elif scale == 'linear':
+        t = v / vmax
+    else:
+        raise ValueError(f"unknown scale {scale!r}")
+    t = np.clip(t, 0, 1)
+
+    stops = np.linspace(0, 1, len(HEAT_COLORS))
+    rgba = np.empty(v.shape + (4,), dtype=np.uint8)
+    for c in range(3):
+        rgba[..., c] = np.interp(t, stops, HEAT_COLORS[:, c]).round()
+    rgba[..., 3] = np.where(v > 0, np.clip(64 + 191 * t, 0, 255), 0).round()
+    return rgba[::-1]
+
+
+def encode_png(rgba):
+    """Encode an RGBA uint8 image as PNG bytes (stdlib zlib only)"""
+    height, width = rgba.shape[:2]
+    raw = np.zeros((height, 1 + 4 * width), dtype=np.uint8)  # Filter byte 0 per row
+    raw[:, 1:] = np.ascontiguousarray(rgba, dtype=np.uint8).reshape(height, -1)
+
+    def chunk(kind, data):
+        body = kind + data
+        return struct.pack('>I', len(data)) + body + struct.pack('>I', zlib.crc32(body) & 0xFFFFFFFF)
+
+    return (b'\x89PNG\r\n\x1a\n' +
+            chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 6, 0, 0, 0)) +
+            chunk(b'IDAT', zlib.compress(raw.tobytes(), 6)) +
+            chunk(b'IEND', b''))
+
+
+class DensityGrid:
+    def __init__(self, x, y, time, weight=None, bounds=None, shape=DEFAULT_SHAPE,
+                 bucket_minutes=DEFAULT_BUCKET_MINUTES, cache_size=64):
+        """
+        x, y, time, weight: event columns (time = minute of day)
+        bounds: (min_x, max_x, min_y, max_y), defaults to the events' bbox
+        bucket_minutes: time resolution of the pre-binned cube; windows
+                        aligned to it need no per-event work at all
+        """
+        x = np.asarray(x, dtype=np.float64)
+        y = np.asarray(y, dtype=np.float64)
+        time = np.asarray(time, dtype=np.int64)
+        weight = (np.ones(len(x), dtype=np.float64) if weight is None
+                  else np.asarray(weight, dtype=np.float64))
+        if len(time) and (time.min() < 0 or time.max() >= TIME_BUCKETS):
+            raise ValueError(f"time outside [0, {TIME_BUCKETS})")
+        if TIME_BUCKETS % bucket_minutes:
+            raise ValueError(f"bucket_minutes must divide {TIME_BUCKETS}")
+
+        if bounds is None:
+            bounds = (x.min(), x.max(), y.min(), y.max()) if len(x) else (0.0, 1.0, 0.0, 1.0)
+        self.bounds = tuple(float(b) for b in bounds)
+        self.shape = (int(shape[0]), int(shape[1]))
+        self.bucket_minutes = int(bucket_minutes)
+        self.cache_size = int(cache_size)
+
+        cells, inside = _cell_index(x, y, self.bounds, self.shape)
+        order = np.argsort(time[inside], kind='stable')
+        self.cells = cells[inside][order]
+        self.time = time[inside][order]
+        self.weight = weight[inside][order]
+
+        # cube[b] = counts of the events in buckets < b
+        n_cells = self.shape[0] * self.shape[1]
+        buckets = TIME_BUCKETS // self.bucket_minutes
+        flat = np.bincount((self.time // self.bucket_minutes) * n_cells + self.cells,
+                           weights=self.weight, minlength=buckets * n_cells)
+        self.cube = np.zeros((buckets + 1, n_cells), dtype=np.float64)
+        np.cumsum(flat.reshape(buckets, n_cells), axis=0, out=self.cube[1:])
+
+        self._densities = OrderedDict()
+        self._spectra = {}
+
+    @classmethod
+    def from_table(cls, table, **kwargs):
+        """Build from an EventTable (see event_table.py)"""
+        return cls(table.x, table.y, table.time, table.weight, **kwargs)
+
+    def counts(self, t1=0, t2=TIME_BUCKETS - 1):
+        """Weighted counts per cell of the events with t1 <= time <= t2"""
+        t1, t2 = max(min(t1, t2), 0), min(max(t1, t2), TIME_BUCKETS - 1)
+        b = self.bucket_minutes
+        b1, b2 = -(-t1 // b), (t2 + 1) // b  # Whole buckets [b1, b2)
+
+        if b1 < b2:
+            grid = self.cube[b2] - self.cube[b1]
+            edges = [(t1, b1 * b - 1), (b2 * b, t2)]
+        else:
+            grid = np.zeros(self.shape[0] * self.shape[1])
+            edges = [(t1, t2)]
+
+        for lo, hi in edges:
+            start, stop = np.searchsorted(self.time, [lo, hi + 1])
+            if stop > start:
+                grid = grid + np.bincount(self.cells[start:stop], weights=self.weight[start:stop],
+                                          minlength=grid.size)
+        return grid.reshape(self.shape)
+
+    def _spectrum(self, kernel, bandwidth):
+        key = (kernel, float(bandwidth))
+        if key not in self._spectra:
+            k = make_kernel(kernel, bandwidth)
+            padded = (_fast_length(self.shape[0] + k.shape[0] - 1),
+                      _fast_length(self.shape[1] + k.shape[1] - 1))
+            self._spectra[key] = (k, np.fft.rfft2(k, padded))
+        return self._spectra[key]
+
+    def density(self, t1=0, t2=TIME_BUCKETS - 1, kernel='gaussian', bandwidth=2.0):
+        """
+        Smoothed event counts per cell (the kernel sums to 1, so the grid
+        keeps the window's total apart from mass spread past the bounds).
+        The returned array is cached; do not modify it.
+        """
+        key = (min(t1, t2), max(t1, t2), kernel, float(bandwidth))
+        if key in self._densities:
+            self._densities.move_to_end(key)
+            return self._densities[key]
+
+        k, spectrum = self._spectrum(kernel, bandwidth)
+        result = fft_convolve(self.counts(t1, t2), k, spectrum)
+        result[result < ROUNDOFF] = 0  # FFT noise where no kernel reaches
+        result.setflags(write=False)
+        self._densities[key] = result
+        if len(self._densities) > self.cache_size:
+            self._densities.popitem(last=False)
+        return result
+
+    def image(self, t1=0, t2=TIME_BUCKETS - 1, kernel='gaussian', bandwidth=2.0,
+              vmax=None, scale='sqrt'):
+        """PNG bytes of a window's density (pass vmax to keep frames comparable)"""
+        return encode_png(colorize(self.density(t1, t2, kernel, bandwidth), vmax, scale))
+
+    def export(self, out_dir, windows, kernel='gaussian', bandwidth=2.0, scale='sqrt'):
+        """
+        Write <t1>-<t2>.png and <t1>-<t2>.f32 (row-major float32, north-up
+        like the image) per window, colour-mapped on a shared vmax.
+        Returns the manifest entries.
+        """
+        os.makedirs(out_dir, exist_ok=True)
+        grids = [self.density(t1, t2, kernel, bandwidth) for t1, t2 in windows]
+        vmax = max((float(g.max()) for g in grids), default=0.0)
+
+        entries = []
+        for (t1, t2), grid in zip(windows, grids):
+            name = f"{t1:04d}-{t2:04d}"
+            with open(os.path.join(out_dir, name + '.png'), 'wb') as f:
+                f.write(encode_png(colorize(grid, vmax, scale)))
+            grid[::-1].astype('<f4').tofile(os.path.join(out_dir, name + '.f32'))
+            entries.append({'window': [int(t1), int(t2)], 'image': name + '.png',
+                            'array': name + '.f32', 'max': float(grid.max()),
+                            'total': float(grid.sum())})
+        return entries
+
+    def memory_bytes(self):
+        return self.cube.nbytes + self.cells.nbytes + self.time.nbytes + self.weight.nbytes
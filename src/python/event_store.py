@@ -0,0 +1,288 @@
+"""
+Columnar Binary Event Store
+
+Compact on-disk format shared by the exporters and the dashboards.
+Instead of one JSON object per event, every field is written as a
+contiguous little-endian array so it can be wrapped in a typed array
+(browser) or np.memmap (Python) without parsing.
+
+Files:
+- <name>.bin   column buffers, each aligned to 8 bytes
+- <name>.json  manifest: event count, column dtypes/offsets and the
+               dictionaries that map small integer codes back to strings
+
+Columns:
+- x, y         latitude / longitude (float32 or float64), or with a
+               projection: int32 northing / easting in fixed-point units
+               of manifest["projection"] (see projection.py)
+- time         minute of day (uint16)
+- timestamp    minutes since 1970-01-01 (int32, optional; multi-year data)
+- weight       event weight (smallest of uint8 / uint16 / uint32 that fits,
+               only written when not all 1)
+- type         crime type code -> manifest["types"] (see crime_types.py)
+- description  description code -> manifest["descriptions"]
+
+Code columns use the smallest unsigned type that fits the dictionary
+(uint8 for up to 256 entries, then uint16 / uint32).
+"""
+
+import json
+import os
+import numpy as np
+
+from projection import LocalProjection
+
+STORE_FORMAT = "spatiotemporal-columns"
+STORE_VERSION = 1
+ALIGNMENT = 8
+
+
+def encode_strings(values):
+    """
+    Dictionary-encode a sequence of strings.
+    Returns (codes, dictionary) with dictionary sorted alphabetically.
+    """
+    values = np.asarray(values, dtype=object)
+    dictionary, codes = np.unique(values.astype(str), return_inverse=True)
+    return codes, [str(v) for v in dictionary]
+
+
+def _code_dtype(n_values):
+    """Smallest unsigned dtype that can index a dictionary"""
+    if n_values <= 0xFF:
+        return np.uint8
+    if n_values <= 0xFFFF:
+        return np.uint16
+    return np.uint32
+
+
+def _weight_dtype(max_weight):
+    """Smallest unsigned dtype that holds every weight"""
+    if max_weight <= 0xFF:
+        return np.uint8
+    if max_weight <= 0xFFFF:
+        return np.uint16
+    return np.uint32
+
+
+def _checked(values, dtype, name):
+    """values as dtype, raising ValueError instead of wrapping out-of-range integers"""
+    values = np.asarray(values)
+    dtype = np.dtype(dtype)
+    if values.size and dtype.kind in 'iu':
+        info = np.iinfo(dtype)
+        low, high = values.min(), values.max()
+        if low < info.min or high > info.max:
+            raise ValueError(f"{name} values must be in [{info.min}, {info.max}] for {dtype.name}, "
+                             f"got [{low}, {high}]")
+    return values.astype(dtype, copy=False)
+
+
+def write_event_store(path, x, y, time, weight=None, types=None,
+                      descriptions=None, coord_dtype=np.float32, type_dictionary=None,
+                      timestamps=None, projection=None):
+    """
+    Write events as a columnar binary store.
+
+    path: output path without extension (writes path.bin and path.json)
+    types / descriptions: optional sequences of strings, dictionary-encoded
+    type_dictionary: optional list of type names (e.g. a crime_types.TypeDictionary);
+                     types are then integer codes into it and it is stored as is
+    timestamps: optional absolute times (minutes since 1970-01-01, or datetime64)
+    projection: optional LocalProjection; x / y (lat / lon) are then stored as
+                int32 projected coordinates and coord_dtype is ignored
+    """
+    if projection is not None:
+        x, y = projection.forward(x, y)
+    else:
+        x = np.asarray(x, dtype=coord_dtype)
+        y = np.asarray(y, dtype=coord_dtype)
+    count = len(x)
+
+    columns = [('x', x), ('y', y), ('time', _checked(time, np.uint16, 'time'))]
+    manifest = {
+        'format': STORE_FORMAT,
+        'version': STORE_VERSION,
+        'count': count,
+        'columns': {},
+    }
+    if projection is not None:
+        manifest['projection'] = projection.to_manifest()
+
+    if timestamps is not None:
+        timestamps = np.asarray(timestamps)
+        if np.issubdtype(timestamps.dtype, np.datetime64):
+            timestamps = timestamps.astype('datetime64[m]').astype(np.int64)
+        columns.append(('timestamp', _checked(timestamps, np.int32, 'timestamp')))
+
+    if weight is not None:
+        weight = np.asarray(weight)
+        if not np.all(weight == 1):
+            dtype = _weight_dtype(weight.max())
+            columns.append(('weight', _checked(weight, dtype, 'weight')))
+
+    if types is not None:
+        if type_dictionary is not None:
+            codes, manifest['types'] = np.asarray(types), [str(t) for t in type_dictionary]
+        else:
+            codes, manifest['types'] = encode_strings(types)
+        columns.append(('type', codes.astype(_code_dtype(len(manifest['types'])))))
+
+    if descriptions is not None:
+        codes, manifest['descriptions'] = encode_strings(descriptions)
+        columns.append(('description',
+                        codes.astype(_code_dtype(len(manifest['descriptions'])))))
+
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+
+    offset = 0
+    with open(path + '.bin', 'wb') as f:
+        for name, values in columns:
+            values = values.astype(values.dtype.newbyteorder('<'), copy=False)
+            manifest['columns'][name] = {
+                'dtype': values.dtype.name,
+                'offset': offset,
+            }
+            data = values.tobytes()
+            padding = (-len(data)) % ALIGNMENT
+            f.write(data)
+            f.write(b'\0' * padding)
+            offset += len(data) + padding
+
+    with open(path + '.json', 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, separators=(',', ':'))
+
+    return offset
+
+
+def read_event_store(path, mmap=True):
+    """
+    Read a store written by write_event_store.
+    Returns (columns, manifest) where columns maps name -> numpy array.
+    With mmap=True the arrays are read-only views over the file.
+    """
+    with open(path + '.json', 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+
+    if manifest.get('format') != STORE_FORMAT:
+        raise ValueError(f"{path}.json is not a {STORE_FORMAT} manifest")
+
+    count = manifest['count']
+    if mmap:
+        raw = np.memmap(path + '.bin', dtype=np.uint8, mode='r')
+    else:
+        raw = np.fromfile(path + '.bin', dtype=np.uint8)
+
+    columns = {}
+    for name, info in manifest['columns'].items():
+        dtype = np.dtype(info['dtype']).newbyteorder('<')
+        start = info['offset']
+        columns[name] = raw[start:start + count * dtype.itemsize].view(dtype)
+
+    if 'weight' not in columns:
+        columns['weight'] = np.ones(count, dtype=np.uint8)
+
+    return columns, manifest
+
+
+def decode_column(columns, manifest, name):
+    """Map a dictionary-encoded column back to strings"""
+    dictionary = np.asarray(manifest[name + 's'], dtype=object)
+    return dictionary[columns[name]]
+
+
+def store_projection(manifest):
+    """LocalProjection of a store with projected coordinates, else None"""
+    info = manifest.get('projection')
+    return LocalProjection.from_manifest(info) if info else None
+
+
+def decode_coordinates(columns, manifest):
+    """(lat, lon) as float64 arrays, for projected and plain stores alike"""
+    projection = store_projection(manifest)
+    if projection is not None:
+        return projection.inverse(columns['x'], columns['y'])
+    return columns['x'].astype(np.float64), columns['y'].astype(np.float64)
+
+
+class EventStoreWriter:
+    """
+    Streaming writer for datasets that don't fit in memory.
+
+    The event count and dictionaries must be known up front; the column
+    layout is then fixed, so each chunk is written straight to its slot
+    in every column. Produces the same files as write_event_store
+    (with a projection, chunks pass lat / lon and are stored projected).
+
+        writer = EventStoreWriter(path, count, types=['ASSAULT', 'THEFT'])
+        for chunk in chunks:
+            writer.write(x, y, time, type=codes)
+        writer.close()
+    """
+
+    def __init__(self, path, count, coord_dtype=np.float32, types=None,
+                 descriptions=None, with_weight=False, projection=None):
+        self.path = path
+        self.count = int(count)
+        self.written = 0
+        self.projection = projection
+        self.manifest = {
+            'format': STORE_FORMAT,
+            'version': STORE_VERSION,
+            'count': self.count,
+            'columns': {},
+        }
+        if projection is not None:
+            self.manifest['projection'] = projection.to_manifest()
+            coord_dtype = np.int32
+
+        layout = [('x', np.dtype(coord_dtype)), ('y', np.dtype(coord_dtype)),
+                  ('time', np.dtype(np.uint16))]
+        if with_weight:
+            layout.append(('weight', np.dtype(np.uint8)))
+        if types is not None:
+            self.manifest['types'] = [str(t) for t in types]
+            layout.append(('type', np.dtype(_code_dtype(len(types)))))
+        if descriptions is not None:
+            self.manifest['descriptions'] = [str(d) for d in descriptions]
+            layout.append(('description', np.dtype(_code_dtype(len(descriptions)))))
+
+        offset = 0
+        self.dtypes = {}
+        for name, dtype in layout:
+            dtype = dtype.newbyteorder('<')
+            self.dtypes[name] = dtype
+            self.manifest['columns'][name] = {'dtype': dtype.name, 'offset': offset}
+            size = self.count * dtype.itemsize
+            offset += size + (-size) % ALIGNMENT
+        self.size = offset
+
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self.file = open(path + '.bin', 'wb')
+        self.file.truncate(self.size)
+
+    def write(self, x, y, time, **extra):
+        """Append one chunk; extra keyword columns: weight, type, description"""
+        n = len(x)
+        if self.written + n > self.count:
+            raise ValueError("more events written than declared count")
+        if self.projection is not None:
+            x, y = self.projection.forward(x, y)
+
+        values = {'x': x, 'y': y, 'time': time, **extra}
+        for name, dtype in self.dtypes.items():
+            if name not in values:
+                raise ValueError(f"missing column '{name}' in chunk")
+            offset = self.manifest['columns'][name]['offset']
+            self.file.seek(offset + self.written * dtype.itemsize)
+            self.file.write(_checked(values[name], dtype, name).tobytes())
+
+        self.written += n
+
+    def close(self):
+        """Finish the .bin file and write the manifest"""
+        self.file.close()
+        if self.written != self.count:
+            raise ValueError(f"declared {self.count} events but wrote {self.written}")
+        with open(self.path + '.json', 'w', encoding='utf-8') as f:
+            json.dump(self.manifest, f, separators=(',', ':'))
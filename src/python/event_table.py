@@ -0,0 +1,224 @@
+"""
+Columnar Event Table
+
+Events as parallel NumPy arrays instead of a list of dicts:
+
+    column    dtype     bytes/event
+    x, y      float64   16
+    time      uint16     2   (minute of day)
+    weight    uint8      1
+    code      uint8      1   (optional category code -> categories[code])
+
+about 20 bytes per event versus 300+ for {'x','y','time','weight'} dicts.
+Transforms (normalize, filter, describe, save) are single vectorized
+operations over whole columns, and the engines get the arrays themselves
+(table.columns()) without any conversion. Row selections with a slice
+are views; boolean / index selections copy only the selected rows.
+"""
+
+import os
+import numpy as np
+import pandas as pd
+
+from event_store import write_event_store, read_event_store, decode_coordinates
+
+
+TIME_BUCKETS = 1440  # Minute-of-day domain
+
+
+def _code_dtype(n_categories):
+    return np.uint8 if n_categories <= 0xFF else np.uint16 if n_categories <= 0xFFFF else np.uint32
+
+
+class EventTable:
+    def __init__(self, x, y, time, weight=None, codes=None, categories=None):
+        self.x = np.asarray(x, dtype=np.float64)
+        self.y = np.asarray(y, dtype=np.float64)
+        # Range-check before narrowing: astype would wrap (-5 -> 65531, 300 -> 44)
+        time = np.asarray(time)
+        if len(time) and (time.min() < 0 or time.max() >= TIME_BUCKETS):
+            raise ValueError(f"time outside [0, {TIME_BUCKETS})")
+        self.time = time.astype(np.uint16)
+        n = len(self.x)
+        if len(self.y) != n or len(self.time) != n:
+            raise ValueError("x, y and time must have the same length")
+
+        if weight is None:
+            self.weight = np.ones(n, dtype=np.uint8)
+        else:
+            weight = np.asarray(weight)
+            if len(weight) and (weight.min() < 0 or weight.max() > 0xFF):
+                raise ValueError("weight outside [0, 255]")
+            self.weight = weight.astype(np.uint8)
+        self.categories = list(categories) if categories is not None else None
+        self.codes = None
+        if codes is not None:
+            if self.categories is None:
+                raise ValueError("category codes need a categories list")
+            self.codes = np.asarray(codes, dtype=_code_dtype(len(self.categories)))
+
+    # ------------------------------------------------------------------
+    # Construction
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def empty(cls):
+        return cls(np.empty(0), np.empty(0), np.empty(0, dtype=np.uint16))
+
+    @classmethod
+    def from_records(cls, events):
+        """From a list of {'x','y','time','weight'} dicts"""
+        if not events:
+            return cls.empty()
+        df = pd.DataFrame.from_records(events)
+        return cls(df['x'].to_numpy(), df['y'].to_numpy(), df['time'].to_numpy(),
+                   df['weight'].to_numpy() if 'weight' in df else None)
+
+    @classmethod
+    def from_chunks(cls, chunks, categories=None):
+        """Concatenate generator chunks (dicts of arrays, see generator.py)"""
+        chunks = list(chunks)
+        if not chunks:
+            return cls.empty()
+        has_codes = categories is not None and all('type' in c for c in chunks)
+        return cls(np.concatenate([c['x'] for c in chunks]),
+                   np.concatenate([c['y'] for c in chunks]),
+                   np.concatenate([c['time'] for c in chunks]),
+                   np.concatenate([c['weight'] for c in chunks]),
+                   np.concatenate([c['type'] for c in chunks]) if has_codes else None,
+                   categories if has_codes else None)
+
+    @classmethod
+    def from_store(cls, path, mmap=True):
+        """
+        From a binary event store (see event_store.py). Coordinates are
+        lat/lon as float64 (decoded for projected stores); time/weight/type
+        are used as stored.
+        """
+        columns, manifest = read_event_store(path, mmap=mmap)
+        codes = columns.get('type')
+        x, y = decode_coordinates(columns, manifest)
+        return cls(x, y, columns['time'], columns['weight'],
+                   codes, manifest.get('types') if codes is not None else None)
+
+    # ------------------------------------------------------------------
+    # Access
+    # ------------------------------------------------------------------
+
+    def __len__(self):
+        return len(self.x)
+
+    def __getitem__(self, rows):
+        """Rows by slice (views), boolean mask or index array"""
+        return EventTable(self.x[rows], self.y[rows], self.time[rows], self.weight[rows],
+                          self.codes[rows] if self.codes is not None else None,
+                          self.categories)
+
+    @property
+    def nbytes(self):
+        return sum(column.nbytes for column in self.columns().values())
+
+    def columns(self):
+        """The column arrays themselves (no copies), keyed like the event store"""
+        columns = {'x': self.x, 'y': self.y, 'time': self.time, 'weight': self.weight}
+        if self.codes is not None:
+            columns['type'] = self.codes
+        return columns
+
+    def category_names(self):
+        """Category name per event (object array), None without categories"""
+        if self.codes is None:
+            return None
+        return np.asarray(self.categories, dtype=object)[self.codes]
+
+    def to_records(self):
+        """List of {'x','y','time','weight'} dicts (for small tables / old callers)"""
+        return [{'x': float(x), 'y': float(y), 'time': int(t), 'weight': int(w)}
+                for x, y, t, w in zip(self.x, self.y, self.time, self.weight)]
+
+    # ------------------------------------------------------------------
+    # Transforms
+    # ------------------------------------------------------------------
+
+    def normalize(self, target_range=(0, 100)):
+        """Rescale x and y (each over its own min/max) into target_range, in place"""
+        if len(self) == 0:
+            return self
+        lo, hi = target_range
+        for name in ('x', 'y'):
+            values = getattr(self, name)
+            vmin, vmax = values.min(), values.max()
+            if vmax == vmin:
+                scaled = np.full(len(values), (lo + hi) / 2)
+            else:
+                scaled = (values - vmin) * ((hi - lo) / (vmax - vmin)) + lo
+            setattr(self, name, scaled)
+        return self
+
+    def mask(self, x1=None, y1=None, x2=None, y2=None, t1=None, t2=None, codes=None):
+        """
+        Boolean mask of events inside a query box / time window and, if
+        given, with a category code in codes (iterable of codes or a bool
+        array over categories, e.g. TypeDictionary.mask()). None = unbounded.
+        """
+        keep = np.ones(len(self), dtype=bool)
+        for values, a, b in ((self.x, x1, x2), (self.y, y1, y2), (self.time, t1, t2)):
+            if a is None and b is None:
+                continue
+            if a is None or b is None:
+                bound = a if a is not None else b
+                keep &= (values >= bound) if a is not None else (values <= bound)
+                continue
+            keep &= (values >= min(a, b)) & (values <= max(a, b))
+        if codes is not None:
+            if self.codes is None:
+                raise ValueError("table has no category codes")
+            selected = np.asarray(codes)
+            if selected.dtype != bool:
+                selected = np.isin(np.arange(len(self.categories)), selected)
+            keep &= selected[self.codes]
+        return keep
+
+    def filter(self, *args, **kwargs):
+        """Events matching mask(...) as a new table"""
+        return self[self.mask(*args, **kwargs)]
+
+    def count(self, *args, **kwargs):
+        """Weighted count of events matching mask(...)"""
+        return int(self.weight[self.mask(*args, **kwargs)].sum(dtype=np.int64))
+
+    def describe(self):
+        """Summary statistics (one reduction per column)"""
+        if len(self) == 0:
+            return {'count': 0}
+        summary = {
+            'count': len(self),
+            'total_weight': int(self.weight.sum(dtype=np.int64)),
+            'x_range': (float(self.x.min()), float(self.x.max())),
+            'y_range': (float(self.y.min()), float(self.y.max())),
+            'time_range': (int(self.time.min()), int(self.time.max())),
+            'hourly': np.bincount(self.time // 60, minlength=24).tolist(),
+        }
+        if self.codes is not None:
+            counts = np.bincount(self.codes, minlength=len(self.categories))
+            summary['categories'] = {self.categories[c]: int(counts[c])
+                                     for c in np.argsort(-counts, kind='stable') if counts[c]}
+        return summary
+
+    # ------------------------------------------------------------------
+    # Output
+    # ------------------------------------------------------------------
+
+    def save_csv(self, path, include_categories=False, float_format=None):
+        """Write x,y,time,weight[,type] CSV"""
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        df = pd.DataFrame({'x': self.x, 'y': self.y, 'time': self.time, 'weight': self.weight})
+        if include_categories and self.codes is not None:
+            df['type'] = self.category_names()
+        df.to_csv(path, index=False, float_format=float_format)
+
+    def save_store(self, path, coord_dtype=np.float32):
+        """Write a binary event store; returns the column bytes written"""
+        return write_event_store(path, self.x, self.y, self.time, weight=self.weight,
+                                 types=self.codes, type_dictionary=self.categories,
+                                 coord_dtype=coord_dtype)
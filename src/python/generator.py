@@ -0,0 +1,224 @@
+"""
+Vectorized Synthetic Event Generator
+
+Produces hotspot-style crime events in NumPy chunks, so stress datasets
+of 100M+ events can be written with bounded memory.
+
+Everything is configurable:
+- hotspots     mixture of Gaussian clusters + uniform background
+- profile      relative event rate per hour of day
+- types        crime type distribution (optional)
+- seed         every chunk gets its own child seed, so a given
+               (seed, chunk_size) always produces the same dataset
+
+Outputs stream to CSV (x,y,time,weight[,type]) or to the columnar
+binary event store (see event_store.py).
+"""
+
+import json
+import os
+import time as timer
+import numpy as np
+import pandas as pd
+
+from event_store import EventStoreWriter
+
+# Defaults reproduce generate_data.py / EventDataLoader.generate_sample_data
+DEFAULT_CONFIG = {
+    'lat_range': (41.75, 41.95),
+    'lon_range': (-87.75, -87.55),
+    'background': 0.3,  # Share of uniformly distributed events
+    'hotspots': [
+        # (lat, lon, sigma, relative weight)
+        (41.88, -87.63, 0.02, 1.0),  # Downtown
+        (41.85, -87.65, 0.02, 1.0),  # South Loop
+        (41.91, -87.67, 0.02, 1.0),  # North Side
+    ],
+    'profile': 'night',
+    'types': None,
+}
+
+# Hourly rate profiles (24 relative weights)
+PROFILES = {
+    # 40% of events between 8 PM and 4 AM, 60% during the day
+    'night': [0.05] * 4 + [0.0375] * 16 + [0.05] * 4,
+    'uniform': [1.0] * 24,
+    # Morning and evening commute peaks
+    'commute': [0.3, 0.2, 0.2, 0.2, 0.3, 0.6, 1.2, 2.0, 2.2, 1.4, 1.0, 1.0,
+                1.1, 1.0, 1.0, 1.2, 1.8, 2.2, 2.0, 1.4, 1.0, 0.8, 0.6, 0.4],
+}
+
+# Approximate Chicago type mix, used with --types
+CHICAGO_TYPES = {
+    'THEFT': 0.24,
+    'ASSAULT': 0.20,
+    'VANDALISM': 0.12,
+    'FRAUD': 0.08,
+    'MOTOR VEHICLE THEFT': 0.08,
+    'NARCOTICS': 0.05,
+    'WEAPONS': 0.04,
+    'OTHER': 0.19,
+}
+
+
+def _extend_summary(summary, chunk):
+    """Fold one chunk's count and column ranges into a running summary"""
+    if len(chunk['x']) == 0:
+        return
+    summary['count'] += len(chunk['x'])
+    for key, column, cast in (('x_range', 'x', float), ('y_range', 'y', float),
+                              ('time_range', 'time', int)):
+        lo, hi = cast(chunk[column].min()), cast(chunk[column].max())
+        if key in summary:
+            lo, hi = min(lo, summary[key][0]), max(hi, summary[key][1])
+        summary[key] = (lo, hi)
+
+
+class EventGenerator:
+    def __init__(self, config=None, seed=42):
+        cfg = dict(DEFAULT_CONFIG)
+        cfg.update(config or {})
+        self.config = cfg
+        self.seed = seed
+
+        hotspots = np.asarray(cfg['hotspots'], dtype=np.float64).reshape(-1, 4)
+        self.centers = hotspots[:, :2]
+        self.sigmas = hotspots[:, 2]
+        self.hotspot_p = hotspots[:, 3] / hotspots[:, 3].sum() if len(hotspots) else None
+
+        profile = cfg['profile']
+        hourly = np.asarray(PROFILES[profile] if isinstance(profile, str) else profile,
+                            dtype=np.float64)
+        if len(hourly) != 24:
+            raise ValueError("temporal profile needs 24 hourly weights")
+        self.hour_p = hourly / hourly.sum()
+
+        types = cfg['types']
+        if types:
+            # Sorted so codes match the dictionary order of write_event_store
+            self.type_names = sorted(types)
+            weights = np.array([types[t] for t in self.type_names], dtype=np.float64)
+            self.type_p = weights / weights.sum()
+        else:
+            self.type_names = None
+            self.type_p = None
+
+    def generate(self, n, rng):
+        """Generate one chunk of n events as a dict of arrays"""
+        lat_min, lat_max = self.config['lat_range']
+        lon_min, lon_max = self.config['lon_range']
+
+        x = rng.uniform(lat_min, lat_max, n)
+        y = rng.uniform(lon_min, lon_max, n)
+
+        if self.hotspot_p is not None:
+            clustered = rng.random(n) >= self.config['background']
+            k = int(clustered.sum())
+            which = rng.choice(len(self.hotspot_p), size=k, p=self.hotspot_p)
+            noise = rng.standard_normal((k, 2)) * self.sigmas[which, None]
+            x[clustered] = self.centers[which, 0] + noise[:, 0]
+            y[clustered] = self.centers[which, 1] + noise[:, 1]
+
+        hour = rng.choice(24, size=n, p=self.hour_p)
+        minute = hour * 60 + rng.integers(0, 60, n)
+
+        chunk = {
+            'x': x,
+            'y': y,
+            'time': minute.astype(np.uint16),
+            'weight': np.ones(n, dtype=np.uint8),
+        }
+        if self.type_p is not None:
+            chunk['type'] = rng.choice(len(self.type_p), size=n, p=self.type_p).astype(np.uint8)
+        return chunk
+
+    def chunks(self, n, chunk_size=1_000_000):
+        """Yield chunks until n events have been produced"""
+        n_chunks = (n + chunk_size - 1) // chunk_size
+        seeds = np.random.SeedSequence(self.seed).spawn(max(n_chunks, 1))
+        for i in range(n_chunks):
+            size = min(chunk_size, n - i * chunk_size)
+            yield self.generate(size, np.random.default_rng(seeds[i]))
+
+    def to_events(self, n):
+        """Small datasets as list of {'x','y','time','weight'} dicts"""
+        events = []
+        for chunk in self.chunks(n):
+            for x, y, t in zip(chunk['x'], chunk['y'], chunk['time']):
+                events.append({'x': float(x), 'y': float(y), 'time': int(t), 'weight': 1})
+        return events
+
+    def write_csv(self, path, n, chunk_size=1_000_000):
+        """
+        Stream events to CSV (x,y,time,weight[,type]); returns the count and
+        x/y/time ranges of what was written (EventTable.describe keys)
+        """
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        header = True
+        summary = {'count': 0}
+        with open(path, 'w', newline='') as f:
+            for chunk in self.chunks(n, chunk_size):
+                _extend_summary(summary, chunk)
+                df = pd.DataFrame({k: chunk[k] for k in ('x', 'y', 'time', 'weight')})
+                if self.type_names is not None:
+                    df['type'] = np.asarray(self.type_names, dtype=object)[chunk['type']]
+                df.to_csv(f, index=False, header=header, float_format='%.6f')
+                header = False
+        return summary
+
+    def write_store(self, path, n, chunk_size=1_000_000, coord_dtype=np.float32):
+        """Stream events to the columnar binary store"""
+        writer = EventStoreWriter(path, n, coord_dtype=coord_dtype, types=self.type_names)
+        for chunk in self.chunks(n, chunk_size):
+            extra = {'type': chunk['type']} if self.type_names is not None else {}
+            writer.write(chunk['x'], chunk['y'], chunk['time'], **extra)
+        writer.close()
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Vectorized synthetic event generator")
+    parser.add_argument('--n', type=int, default=5000, help="Number of events")
+    parser.add_argument('--output', default="../../data/processed/events.csv",
+                        help="Output path (.csv, otherwise binary store base path)")
+    parser.add_argument('--format', choices=['csv', 'bin'], default=None,
+                        help="Defaults to csv for *.csv paths, bin otherwise")
+    parser.add_argument('--chunk-size', type=int, default=1_000_000)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--profile', choices=sorted(PROFILES), default='night')
+    parser.add_argument('--types', action='store_true',
+                        help="Add a crime type column (Chicago mix)")
+    parser.add_argument('--config', default=None,
+                        help="JSON file overriding hotspots/profile/types/ranges")
+    args = parser.parse_args()
+
+    config = {'profile': args.profile}
+    if args.types:
+        config['types'] = CHICAGO_TYPES
+    if args.config:
+        with open(args.config) as f:
+            config.update(json.load(f))
+
+    fmt = args.format or ('csv' if args.output.endswith('.csv') else 'bin')
+
+    print("\n" + "="*60)
+    print("  SYNTHETIC DATA GENERATOR")
+    print("="*60 + "\n")
+    print(f"🎲 Generating {args.n:,} events in chunks of {args.chunk_size:,} ({fmt})...")
+
+    generator = EventGenerator(config, seed=args.seed)
+    start = timer.perf_counter()
+    if fmt == 'csv':
+        generator.write_csv(args.output, args.n, args.chunk_size)
+    else:
+        generator.write_store(args.output, args.n, args.chunk_size)
+    elapsed = timer.perf_counter() - start
+
+    print(f"✓ Generated {args.n:,} events in {elapsed:.2f} s "
+          f"({args.n / max(elapsed, 1e-9):,.0f} events/s)")
+    print(f"📁 Saved to: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,237 @@
+"""
+Emerging Hot-Spot Detection
+
+Finds the grid cells that are heating up (or cooling down) between time
+windows, e.g. this month versus last month, without one range query per
+cell and window.
+
+1. One pass over the events: every event gets its cell once and each
+   window's counts come from a single np.bincount over
+   (window, cell) pairs, so all windows cost about as much as one.
+2. Getis-Ord Gi* per window as whole-array operations: neighbourhood
+   sums over a (2r+1) x (2r+1) square (self included) come from a
+   summed-area table, with binary weights trimmed at the grid edges.
+3. The Gi* trend over the windows (least-squares slope; the difference
+   for two windows) ranks the cells. Cells that are significant hot
+   spots in the latest window and trending up are "emerging" ("new"
+   when they were not hot in any earlier window); cells that were hot
+   earlier and are trending down are "cooling".
+
+Windows are (start, end) pairs, inclusive, in the units of the time
+column: minutes of day, or absolute minutes since 1970 (the store's
+"timestamp" column, see month_windows).
+
+Usage:
+    python hotspots.py --store ../../data/processed/.pipeline/events --period week --windows 3
+"""
+
+import numpy as np
+
+from density import _cell_index
+
+DEFAULT_SHAPE = (128, 128)
+Z_CRITICAL = 1.96  # Two-sided 95% confidence
+
+
+def window_counts(cells, inside, time, windows, shape, weight=None):
+    """
+    Per-cell weighted counts for every window in one bincount.
+    cells/inside: flat cell index per event and its validity (see density._cell_index)
+    Returns an array of shape (len(windows),) + shape.
+    """
+    time = np.asarray(time, dtype=np.int64)
+    windows = np.asarray(windows, dtype=np.int64).reshape(-1, 2)
+    n_cells = shape[0] * shape[1]
+
+    order = np.argsort(windows[:, 0], kind='stable')
+    starts, ends = windows[order, 0], windows[order, 1]
+    if np.all(starts[1:] > ends[:-1]):
+        # Disjoint windows: each event falls in at most one, found by binary search
+        slot = np.searchsorted(starts, time, side='right') - 1
+        keep = inside & (slot >= 0) & (time <= ends[np.maximum(slot, 0)])
+        which, event = order[slot[keep]], np.flatnonzero(keep)
+    else:
+        # Overlapping windows: an event is counted once per window containing it
+        member = (time[None, :] >= windows[:, :1]) & (time[None, :] <= windows[:, 1:]) & inside[None, :]
+        which, event = np.nonzero(member)
+
+    w = None if weight is None else np.asarray(weight, dtype=np.float64)[event]
+    flat = np.bincount(which * n_cells + cells[event], weights=w, minlength=len(windows) * n_cells)
+    if weight is not None and np.issubdtype(np.asarray(weight).dtype, np.integer):
+        flat = flat.round().astype(np.int64)
+    return flat.reshape((len(windows),) + tuple(shape))
+
+
+def _box_sum(grids, radius):
+    """Sum over the (2r+1)^2 neighbourhood of every cell (last two axes, zero padded)"""
+    rows, cols = grids.shape[-2:]
+    table = np.zeros(grids.shape[:-2] + (rows + 1, cols + 1))
+    table[..., 1:, 1:] = grids.cumsum(axis=-2).cumsum(axis=-1)
+    r0 = np.clip(np.arange(rows) - radius, 0, rows)
+    r1 = np.clip(np.arange(rows) + radius + 1, 0, rows)
+    c0 = np.clip(np.arange(cols) - radius, 0, cols)
+    c1 = np.clip(np.arange(cols) + radius + 1, 0, cols)
+    return (table[..., r1[:, None], c1[None, :]] - table[..., r0[:, None], c1[None, :]] -
+            table[..., r1[:, None], c0[None, :]] + table[..., r0[:, None], c0[None, :]])
+
+
+def gi_star(counts, radius=1):
+    """
+    Getis-Ord Gi* z-scores of count grids (..., rows, cols) with binary
+    weights over the (2r+1)^2 neighbourhood including the cell itself.
+    Grids without variance get z = 0.
+    """
+    counts = np.asarray(counts, dtype=np.float64)
+    n = counts.shape[-2] * counts.shape[-1]
+    mean = counts.mean(axis=(-2, -1), keepdims=True)
+    std = np.sqrt(np.maximum((counts ** 2).mean(axis=(-2, -1), keepdims=True) - mean ** 2, 0))
+
+    local = _box_sum(counts, radius)
+    weights = _box_sum(np.ones(counts.shape[-2:]), radius)  # Sum of w_ij (= sum of w_ij^2)
+    denom = std * np.sqrt((n * weights - weights ** 2) / (n - 1))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        z = (local - mean * weights) / denom
+    return np.where(denom > 0, z, 0.0)
+
+
+def trend(values):
+    """Least-squares slope along the first axis (per window step)"""
+    k = values.shape[0]
+    if k < 2:
+        return np.zeros(values.shape[1:])
+    steps = np.arange(k, dtype=np.float64) - (k - 1) / 2
+    return np.tensordot(steps, values, axes=1) / (steps ** 2).sum()
+
+
+def month_windows(timestamps, months=2):
+    """
+    The last `months` calendar months covered by absolute timestamps
+    (minutes since 1970) as inclusive minute windows, oldest first.
+    """
+    return _calendar_windows(timestamps, 'M', months)
+
+
+def week_windows(timestamps, weeks=2):
+    """The last `weeks` 7-day periods ending at the latest timestamp, oldest first"""
+    last = int(np.max(timestamps))
+    week = 7 * 24 * 60
+    return [(last - (k + 1) * week + 1, last - k * week) for k in range(weeks - 1, -1, -1)]
+
+
+def _calendar_windows(timestamps, unit, count):
+    last = np.datetime64(int(np.max(timestamps)), 'm').astype(f'datetime64[{unit}]')
+    starts = [last - k for k in range(count - 1, -1, -1)]
+    return [(int(s.astype('datetime64[m]').astype(np.int64)),
+             int((s + 1).astype('datetime64[m]').astype(np.int64)) - 1) for s in starts]
+
+
+def detect(x, y, time, windows, weight=None, bounds=None, shape=DEFAULT_SHAPE,
+           radius=1, z_critical=Z_CRITICAL, top=20):
+    """
+    Emerging / cooling hot spots across two or more windows.
+
+    Returns a dict with the per-window 'counts' and 'gi' grids, the
+    'trend' grid and ranked 'emerging' / 'cooling' lists of
+    {'cell', 'center', 'category', 'counts', 'gi', 'trend'}.
+    """
+    if len(windows) < 2:
+        raise ValueError("need at least two windows to compare")
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    if bounds is None:
+        bounds = (x.min(), x.max(), y.min(), y.max())
+    bounds = tuple(float(b) for b in bounds)
+    shape = (int(shape[0]), int(shape[1]))
+
+    cells, inside = _cell_index(x, y, bounds, shape)
+    counts = window_counts(cells, inside, time, windows, shape, weight)
+    gi = gi_star(counts, radius)
+    slope = trend(gi)
+
+    hot = gi > z_critical
+    hot_now, hot_before = hot[-1], hot[:-1].any(axis=0)
+    emerging = hot_now & (slope > 0)
+    cooling = hot_before & (slope < 0) & ~emerging
+
+    cell_x = (bounds[1] - bounds[0]) / shape[0]
+    cell_y = (bounds[3] - bounds[2]) / shape[1]
+
+    def describe(mask, descending):
+        idx = np.flatnonzero(mask.ravel())
+        idx = idx[np.argsort(slope.ravel()[idx])]
+        if descending:
+            idx = idx[::-1]
+        ranked = []
+        for flat in idx[:top]:
+            i, j = divmod(int(flat), shape[1])
+            if descending:
+                category = 'new' if not hot_before[i, j] else 'intensifying'
+            else:
+                category = 'fading' if not hot_now[i, j] else 'cooling'
+            ranked.append({
+                'cell': (i, j),
+                'center': (bounds[0] + (i + 0.5) * cell_x, bounds[2] + (j + 0.5) * cell_y),
+                'category': category,
+                'counts': counts[:, i, j].tolist(),
+                'gi': gi[:, i, j].round(3).tolist(),
+                'trend': round(float(slope[i, j]), 3),
+            })
+        return ranked
+
+    return {
+        'windows': [tuple(int(v) for v in w) for w in windows],
+        'bounds': bounds,
+        'shape': shape,
+        'counts': counts,
+        'gi': gi,
+        'trend': slope,
+        'emerging': describe(emerging, True),
+        'cooling': describe(cooling, False),
+    }
+
+
+def main():
+    """Rank emerging / cooling cells of an event store over recent periods"""
+    import argparse
+    import time as timer
+    from event_store import read_event_store, decode_coordinates
+
+    parser = argparse.ArgumentParser(description="Emerging hot-spot detection")
+    parser.add_argument('--store', default="../../data/processed/.pipeline/events",
+                        help="Event store with a 'timestamp' column (written by pipeline.py)")
+    parser.add_argument('--period', choices=['week', 'month'], default='week')
+    parser.add_argument('--windows', type=int, default=2, help="Number of periods compared")
+    parser.add_argument('--shape', type=int, nargs=2, default=DEFAULT_SHAPE)
+    parser.add_argument('--radius', type=int, default=1, help="Neighbourhood radius in cells")
+    parser.add_argument('--top', type=int, default=10)
+    args = parser.parse_args()
+
+    columns, manifest = read_event_store(args.store)
+    if 'timestamp' not in columns:
+        raise SystemExit(f"{args.store} has no timestamp column; re-run pipeline.py")
+    timestamps = columns['timestamp']
+    windows = (week_windows if args.period == 'week' else month_windows)(timestamps, args.windows)
+
+    start = timer.perf_counter()
+    lat, lon = decode_coordinates(columns, manifest)
+    result = detect(lat, lon, timestamps, windows, weight=columns['weight'],
+                    shape=args.shape, radius=args.radius, top=args.top)
+    elapsed = (timer.perf_counter() - start) * 1000
+
+    print("\n" + "="*60)
+    print("  EMERGING HOT SPOTS")
+    print("="*60)
+    for t1, t2 in result['windows']:
+        print(f"  window {np.datetime64(t1, 'm')} .. {np.datetime64(t2, 'm')}")
+    print(f"  {len(timestamps):,} events, {args.shape[0]}x{args.shape[1]} grid, {elapsed:.0f} ms\n")
+    for title in ('emerging', 'cooling'):
+        print(f"  {title.upper()}")
+        for cell in result[title]:
+            lat, lon = cell['center']
+            print(f"    {cell['category']:12s} ({lat:.4f}, {lon:.4f})  counts {cell['counts']}  "
+                  f"Gi* {cell['gi']}  trend {cell['trend']:+.2f}")
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,206 @@
+"""
+Inverted Search Index over Events
+
+Built once at ingest time (pipeline.py) so that crime
+search no longer scans every event. Each field maps tokens to
+compressed bitmaps of event IDs (positions in the exported dataset):
+
+- type    exact normalized crime type  ('THEFT', 'MOTOR VEHICLE THEFT')
+- desc    words of the description     ('RETAIL', 'FROM', 'BUILDING')
+- status  case status                  ('closed', 'open')  - India data
+- city    city name                    ('Delhi', ...)      - India data
+
+A search turns every filter into a bitmap and intersects them; the
+result is then checked against the spatial/temporal range, so the cost
+follows the number of matching events rather than the dataset size.
+Type terms match by substring like CrimeSearch.tsx, but the substring
+test runs over the (small) type vocabulary, not over events.
+
+Files (read by next-level-design-main/src/utils/searchIndex.ts):
+- <name>.bin   serialized bitmaps (see bitmap.py)
+- <name>.json  manifest: count and per field token -> [offset, containers, cardinality]
+"""
+
+import json
+import os
+import re
+from collections import defaultdict
+import numpy as np
+import pandas as pd
+
+from bitmap import Bitmap
+from crime_types import CRIME_SIMILARITY
+
+INDEX_FORMAT = "spatiotemporal-search-index"
+INDEX_VERSION = 1
+FIELDS = ('type', 'desc', 'status', 'city')
+
+TOKEN_PATTERN = re.compile(r"[A-Z0-9]+")
+
+
+def tokenize(text):
+    """Upper-cased alphanumeric words of a description"""
+    return set(TOKEN_PATTERN.findall(str(text).upper()))
+
+
+def _groups(values):
+    """Yield (distinct value, positions) for a column, one pass per distinct value"""
+    codes, uniques = pd.factorize(pd.Series(values, dtype=object))
+    order = np.argsort(codes, kind='stable')
+    bounds = np.searchsorted(codes[order], np.arange(len(uniques) + 1))
+    for k, value in enumerate(uniques):
+        yield value, order[bounds[k]:bounds[k + 1]]
+
+
+class InvertedIndexBuilder:
+    """
+    Accumulates postings chunk by chunk; event IDs continue across chunks.
+
+        builder = InvertedIndexBuilder()
+        builder.add_chunk(types=[...], descriptions=[...])
+        index = builder.finish()
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.postings = {field: defaultdict(list) for field in FIELDS}
+
+    def add_chunk(self, types=None, descriptions=None, case_closed=None, cities=None):
+        lengths = {len(v) for v in (types, descriptions, case_closed, cities) if v is not None}
+        if len(lengths) > 1:
+            raise ValueError("all chunk columns must have the same length")
+        n = lengths.pop() if lengths else 0
+
+        if types is not None:
+            for value, ids in _groups(types):
+                if value:
+                    self.postings['type'][str(value)].append(ids + self.count)
+        if descriptions is not None:
+            # Tokenize each distinct description once
+            for value, ids in _groups(descriptions):
+                for token in tokenize(value):
+                    self.postings['desc'][token].append(ids + self.count)
+        if case_closed is not None:
+            closed = np.asarray(case_closed, dtype=bool)
+            self.postings['status']['closed'].append(np.flatnonzero(closed) + self.count)
+            self.postings['status']['open'].append(np.flatnonzero(~closed) + self.count)
+        if cities is not None:
+            for value, ids in _groups(cities):
+                if value:
+                    self.postings['city'][str(value)].append(ids + self.count)
+
+        self.count += n
+
+    def finish(self):
+        fields = {}
+        for field, tokens in self.postings.items():
+            fields[field] = {token: Bitmap.from_ids(np.concatenate(parts))
+                             for token, parts in tokens.items()}
+        return InvertedIndex(self.count, fields)
+
+
+class InvertedIndex:
+    def __init__(self, count, fields):
+        self.count = count
+        self.fields = fields  # field -> token -> Bitmap
+
+    @classmethod
+    def build(cls, types=None, descriptions=None, case_closed=None, cities=None):
+        builder = InvertedIndexBuilder()
+        builder.add_chunk(types, descriptions, case_closed, cities)
+        return builder.finish()
+
+    def lookup(self, field, token):
+        return self.fields.get(field, {}).get(token, Bitmap())
+
+    def vocabulary(self, field):
+        return sorted(self.fields.get(field, {}))
+
+    def match_types(self, terms):
+        """Union of every type whose name contains one of the terms"""
+        terms = [t.strip().upper() for t in terms if t and t.strip()]
+        names = [name for name in self.fields.get('type', {})
+                 if any(term in name.upper() for term in terms)]
+        return Bitmap.union_all(self.fields['type'][name] for name in names)
+
+    def match_description(self, text):
+        """Events whose description contains every word of text"""
+        tokens = sorted(tokenize(text), key=lambda t: len(self.lookup('desc', t)))
+        if not tokens:
+            return Bitmap()
+        result = self.lookup('desc', tokens[0])
+        for token in tokens[1:]:
+            if not result:
+                break
+            result = result & self.lookup('desc', token)
+        return result
+
+    def search(self, query, similar=True, descriptions=False, case_status=None, city=None):
+        """
+        Bitmap of events matching a crime search.
+
+        query:        type search term (expanded with CRIME_SIMILARITY if similar)
+        descriptions: also match events whose description contains all query words
+        case_status:  None / 'open' / 'closed'
+        city:         None or exact city name
+        """
+        term = query.strip().upper()
+        terms = [term] + (CRIME_SIMILARITY.get(term, []) if similar else [])
+        result = self.match_types(terms)
+        if descriptions:
+            result = result | self.match_description(term)
+
+        for field, token in (('status', case_status), ('city', city)):
+            if token is not None and result:
+                result = result & self.lookup(field, token)
+        return result
+
+    @staticmethod
+    def filter_range(bitmap, columns, x1, y1, x2, y2, t1, t2):
+        """
+        IDs of a bitmap whose event lies in the query range.
+        Only the matching events are read from the columns.
+        """
+        ids = bitmap.to_array()
+        x, y, t = columns['x'][ids], columns['y'][ids], columns['time'][ids]
+        inside = ((x >= min(x1, x2)) & (x <= max(x1, x2)) &
+                  (y >= min(y1, y2)) & (y <= max(y1, y2)) &
+                  (t >= min(t1, t2)) & (t <= max(t1, t2)))
+        return ids[inside]
+
+    def save(self, path):
+        """Write path.bin + path.json"""
+        manifest = {
+            'format': INDEX_FORMAT,
+            'version': INDEX_VERSION,
+            'count': self.count,
+            'fields': {},
+        }
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        offset = 0
+        with open(path + '.bin', 'wb') as f:
+            for field, tokens in self.fields.items():
+                if not tokens:
+                    continue
+                entries = manifest['fields'][field] = {}
+                for token in sorted(tokens):
+                    data, n_containers = tokens[token].to_bytes()
+                    entries[token] = [offset, n_containers, len(tokens[token])]
+                    f.write(data)
+                    offset += len(data)
+        with open(path + '.json', 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, separators=(',', ':'))
+        return offset
+
+    @classmethod
+    def load(cls, path):
+        with open(path + '.json', 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        if manifest.get('format') != INDEX_FORMAT:
+            raise ValueError(f"{path}.json is not a {INDEX_FORMAT} manifest")
+        with open(path + '.bin', 'rb') as f:
+            buffer = f.read()
+        fields = {field: {token: Bitmap.from_buffer(buffer, offset, n)
+                          for token, (offset, n, _) in tokens.items()}
+                  for field, tokens in manifest['fields'].items()}
+        return cls(manifest['count'], fields)
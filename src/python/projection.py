@@ -0,0 +1,156 @@
+"""
+Projected Fixed-Point Coordinates
+
+Latitude / longitude in degrees are awkward for the engine: a degree of
+longitude is shorter than a degree of latitude (about 0.74x in Chicago),
+so "within 500 m" is an ellipse in degree space, and every export prints
+the doubles with '%.6f' and parses them back. Normalizing to 0-100 per
+dataset (EventTable.normalize) fixes neither, and makes two loads of the
+same city incomparable.
+
+LocalProjection maps lat/lon to a local metric plane (spherical
+transverse Mercator around a fixed origin) and stores the result as
+int32 counts of a unit, 1 cm by default:
+
+    x   northing in units (follows latitude, like x = lat elsewhere)
+    y   easting in units  (follows longitude, like y = lon elsewhere)
+
+so coordinates take 4 bytes instead of 8, compare as exact integers, and
+Euclidean distance in units is distance on the ground (scale error below
+0.01% within 100 km of the origin). The origin comes from REGION_ORIGINS
+or origin_for(), which snaps the data's center to a whole-degree grid, so
+every load of a region gets the same origin and the same coordinates.
+
+The projection is stored in the event store manifest ("projection": see
+to_manifest), and src/cpp/projection.h plus the dashboards' store loaders
+decode the same parameters.
+
+    proj = LocalProjection.for_region('chicago')
+    x, y = proj.forward(lat, lon)        # int32 cm
+    lat, lon = proj.inverse(x, y)
+    proj.units(500)                      # 500 m radius in coordinate units
+"""
+
+import numpy as np
+
+EARTH_RADIUS = 6371008.8   # Mean Earth radius in metres (IUGG)
+DEFAULT_UNIT = 0.01        # Metres per coordinate unit (cm)
+
+# Fixed origins (lat, lon) of the regions the repo ships data for
+REGION_ORIGINS = {
+    'chicago': (41.85, -87.65),
+    'india': (22.0, 79.0),
+}
+
+INT32_MIN, INT32_MAX = np.iinfo(np.int32).min, np.iinfo(np.int32).max
+
+
+def origin_for(lat, lon, step=1.0):
+    """
+    Stable origin for a dataset: the median lat/lon rounded to a `step`
+    degree grid, so loads of the same region agree on it
+    """
+    lat = np.asarray(lat, dtype=np.float64)
+    lon = np.asarray(lon, dtype=np.float64)
+    if len(lat) == 0:
+        raise ValueError("cannot choose a projection origin for no events")
+    return (float(np.round(np.median(lat) / step) * step),
+            float(np.round(np.median(lon) / step) * step))
+
+
+class LocalProjection:
+    def __init__(self, lat0, lon0, unit=DEFAULT_UNIT):
+        """
+        lat0, lon0: origin in degrees (maps to x = y = 0)
+        unit: metres per integer coordinate step
+        """
+        self.lat0 = float(lat0)
+        self.lon0 = float(lon0)
+        self.unit = float(unit)
+        self._phi0 = np.radians(self.lat0)
+
+    @classmethod
+    def for_region(cls, name, unit=DEFAULT_UNIT):
+        """Projection around one of REGION_ORIGINS"""
+        if name not in REGION_ORIGINS:
+            raise ValueError(f"unknown region '{name}' (known: {', '.join(REGION_ORIGINS)})")
+        return cls(*REGION_ORIGINS[name], unit=unit)
+
+    @classmethod
+    def for_data(cls, lat, lon, unit=DEFAULT_UNIT):
+        """Projection around the grid-snapped center of the data (origin_for)"""
+        return cls(*origin_for(lat, lon), unit=unit)
+
+    @classmethod
+    def resolve(cls, spec, lat=None, lon=None):
+        """
+        Projection from a config value: None, a LocalProjection, a region
+        name, 'auto' (origin_for the given lat/lon) or a manifest dict
+        """
+        if spec is None or isinstance(spec, LocalProjection):
+            return spec
+        if isinstance(spec, dict):
+            return cls.from_manifest(spec)
+        if spec == 'auto':
+            return cls.for_data(lat, lon)
+        return cls.for_region(spec)
+
+    # ------------------------------------------------------------------
+    # Conversion
+    # ------------------------------------------------------------------
+
+    def forward_metres(self, lat, lon):
+        """(northing, easting) in metres as float64 arrays"""
+        phi = np.radians(np.asarray(lat, dtype=np.float64))
+        dlam = np.radians(np.asarray(lon, dtype=np.float64) - self.lon0)
+        b = np.cos(phi) * np.sin(dlam)
+        easting = EARTH_RADIUS * np.arctanh(b)
+        northing = EARTH_RADIUS * (np.arctan2(np.tan(phi), np.cos(dlam)) - self._phi0)
+        return northing, easting
+
+    def forward(self, lat, lon):
+        """(x, y) int32 fixed-point coordinates (northing, easting in units)"""
+        northing, easting = self.forward_metres(lat, lon)
+        x = np.rint(northing / self.unit)
+        y = np.rint(easting / self.unit)
+        if np.size(x) and (np.abs(x).max() > INT32_MAX or np.abs(y).max() > INT32_MAX):
+            raise ValueError("coordinates too far from the projection origin for int32 units")
+        return x.astype(np.int32), y.astype(np.int32)
+
+    def inverse(self, x, y):
+        """(lat, lon) in degrees as float64 arrays"""
+        northing = np.asarray(x, dtype=np.float64) * self.unit
+        easting = np.asarray(y, dtype=np.float64) * self.unit
+        d = northing / EARTH_RADIUS + self._phi0
+        e = easting / EARTH_RADIUS
+        lat = np.degrees(np.arcsin(np.sin(d) / np.cosh(e)))
+        lon = self.lon0 + np.degrees(np.arctan2(np.sinh(e), np.cos(d)))
+        return lat, lon
+
+    def units(self, metres):
+        """A distance in metres as coordinate units (for radius queries)"""
+        return metres / self.unit
+
+    def metres(self, units):
+        return units * self.unit
+
+    # ------------------------------------------------------------------
+    # Manifest
+    # ------------------------------------------------------------------
+
+    def to_manifest(self):
+        return {'kind': 'tmerc-sphere', 'lat0': self.lat0, 'lon0': self.lon0,
+                'unit': self.unit, 'radius': EARTH_RADIUS}
+
+    @classmethod
+    def from_manifest(cls, info):
+        if info.get('kind') != 'tmerc-sphere':
+            raise ValueError(f"unsupported projection kind: {info.get('kind')}")
+        return cls(info['lat0'], info['lon0'], info['unit'])
+
+    def __eq__(self, other):
+        return isinstance(other, LocalProjection) and \
+            (self.lat0, self.lon0, self.unit) == (other.lat0, other.lon0, other.unit)
+
+    def __repr__(self):
+        return f"LocalProjection(lat0={self.lat0}, lon0={self.lon0}, unit={self.unit})"
@@ -0,0 +1,244 @@
+"""
+Result-Reporting KD-Tree
+
+Returns the matching events of a range query, not only their count, in
+time proportional to the output: O(log n + k) on top of the KD-tree's
+boundary nodes, instead of a mask over every event.
+
+Layout (the same as ReportingKDTree in src/cpp/report_kdtree.h):
+- perm                 event IDs in subtree order: the tree splits at the
+                       median position, so every node owns a contiguous
+                       range [lo, hi) of it (leaves hold <= LEAF_SIZE events)
+- layer_ids[d]         for every depth d, the IDs of each depth-d node's
+- layer_times[d]       range sorted by time (a merge-sort tree, built with
+                       one np.lexsort per level)
+- node arrays          lo, hi, depth, children and bounding box per node
+
+Query: a fully covered node binary-searches [t1, t2] in its layer range
+and contributes that slice as a NumPy view (no copy); partially covered
+leaves are filtered with a mask. Report.page() skips whole slices by
+length, so a page of results costs O(slices + page size).
+
+IDs are row positions in the columns the index was built from, e.g.
+    report = index.report(41.85, -87.70, 41.90, -87.60, 1200, 1439)
+    rows = report.page(0, 50)             # First 50 matching row IDs
+    columns['type'][rows]
+"""
+
+import os
+import numpy as np
+
+LEAF_SIZE = 32
+
+
+class Report:
+    """
+    Matching event IDs: views into the index's layers for covered
+    subtrees plus one array for the hits of partially covered leaves.
+    Ordered by subtree, then by time within a slice.
+    """
+
+    def __init__(self, slices, loose):
+        self.slices = slices
+        self.loose = loose
+        self.size = sum(len(s) for s in slices) + len(loose)
+
+    def __len__(self):
+        return self.size
+
+    def page(self, offset=0, limit=None):
+        """IDs [offset, offset + limit), copying only the requested ones"""
+        limit = self.size if limit is None else limit
+        out = []
+        for part in self.slices + [self.loose]:
+            if limit <= 0:
+                break
+            if offset >= len(part):
+                offset -= len(part)
+                continue
+            take = part[offset:offset + limit]
+            out.append(take)
+            limit -= len(take)
+            offset = 0
+        return np.concatenate(out) if out else np.zeros(0, dtype=np.uint32)
+
+    def ids(self):
+        return self.page()
+
+
+class ReportIndex:
+    def __init__(self, x, y, time, weight=None, leaf_size=LEAF_SIZE):
+        """
+        x, y, time, weight: event columns (time in any integer minute
+        domain: minute of day or absolute minutes)
+        """
+        self.x = np.asarray(x, dtype=np.float64)
+        self.y = np.asarray(y, dtype=np.float64)
+        self.time = np.asarray(time, dtype=np.int64)
+        self.weight = (np.ones(len(self.x), dtype=np.int64) if weight is None
+                       else np.asarray(weight, dtype=np.int64))
+        self.leaf_size = int(leaf_size)
+        self._build()
+
+    @classmethod
+    def from_columns(cls, columns, **kwargs):
+        """Build from event store columns (see event_store.read_event_store)"""
+        return cls(columns['x'], columns['y'], columns['time'], columns.get('weight'), **kwargs)
+
+    def _build(self):
+        n = len(self.x)
+        perm = np.arange(n, dtype=np.uint32)
+        capacity = 2 * (n // max(self.leaf_size // 2, 1) + 1) + 1  # Leaves hold > leaf_size / 2 events
+        lo = np.zeros(capacity, dtype=np.int64)
+        hi = np.zeros(capacity, dtype=np.int64)
+        depth = np.zeros(capacity, dtype=np.int64)
+        children = np.full((capacity, 2), -1, dtype=np.int64)
+        box = np.zeros((capacity, 4))
+        layer_ids, layer_times = [], []
+
+        # Partition of [0, n) into the ranges of the current level (+ leaves carried down)
+        starts = np.zeros(min(n, 1), dtype=np.int64)
+        stops = np.full(len(starts), n, dtype=np.int64)
+        owner = np.zeros(len(starts), dtype=np.int64)
+        nodes = len(starts)
+        if n:
+            hi[0] = n
+            box[0] = (self.x.min(), self.x.max(), self.y.min(), self.y.max())
+
+        # Sort keys as dense ranks, so (range, key) pairs combine into one int64
+        span = int(self.time.max() - self.time.min()) + 1 if n else 1
+        time_dtype = np.int32 if np.iinfo(np.int32).min <= self.time.min(initial=0) and \
+            self.time.max(initial=0) <= np.iinfo(np.int32).max else np.int64
+        time_rank = self.time - self.time.min(initial=0)
+        coord_rank = [np.empty(n, dtype=np.int64) for _ in range(2)]
+        for rank, values in zip(coord_rank, (self.x, self.y)):
+            rank[np.argsort(values, kind='stable')] = np.arange(n)
+
+        level = 0
+        while len(starts):
+            label = np.repeat(np.arange(len(starts), dtype=np.int64), stops - starts)
+            order = np.argsort(label * span + time_rank[perm])
+            layer_ids.append(perm[order])
+            layer_times.append(self.time[layer_ids[-1]].astype(time_dtype))
+
+            split = (stops - starts) > self.leaf_size
+            if not split.any():
+                break
+
+            # Sort every range by this level's coordinate; the median position splits it
+            perm = perm[np.argsort(label * n + coord_rank[level % 2][perm])]
+
+            s, e = starts[split], stops[split]
+            m = s + (e - s) // 2
+            k = len(s)
+            ids = nodes + np.arange(2 * k)
+            children[owner[split]] = ids.reshape(k, 2)
+            child_starts = np.column_stack([s, m]).ravel()
+            child_stops = np.column_stack([m, e]).ravel()
+            lo[ids], hi[ids], depth[ids] = child_starts, child_stops, level + 1
+
+            # Children's bounding boxes: ranges are consecutive, so one reduceat each
+            edges = np.column_stack([child_starts, child_stops]).ravel()
+            for col, values, reduce in ((0, self.x, np.minimum), (1, self.x, np.maximum),
+                                        (2, self.y, np.minimum), (3, self.y, np.maximum)):
+                padded = np.append(values[perm], 0.0)
+                box[ids, col] = reduce.reduceat(padded, edges)[::2]
+            nodes += 2 * k
+
+            keep = ~split
+            starts = np.concatenate([child_starts, starts[keep]])
+            stops = np.concatenate([child_stops, stops[keep]])
+            owner = np.concatenate([ids, owner[keep]])
+            order = np.argsort(starts, kind='stable')
+            starts, stops, owner = starts[order], stops[order], owner[order]
+            level += 1
+
+        self.perm = perm
+        self.layer_ids = layer_ids
+        self.layer_times = layer_times
+        self.node_lo, self.node_hi, self.node_depth = lo[:nodes], hi[:nodes], depth[:nodes]
+        self.node_children, self.node_box = children[:nodes], box[:nodes]
+        self._prepare()
+
+    def _prepare(self):
+        """Leaf scan columns in subtree order and the node table as Python tuples"""
+        self.sx, self.sy, self.st = self.x[self.perm], self.y[self.perm], self.time[self.perm]
+        self._nodes = list(zip(self.node_lo.tolist(), self.node_hi.tolist(), self.node_depth.tolist(),
+                               self.node_children[:, 0].tolist(), self.node_children[:, 1].tolist(),
+                               *self.node_box.T.tolist()))
+
+    def report(self, x1, y1, x2, y2, t1, t2, limit=None):
+        """IDs of the events in the rectangle and time range (inclusive), at most `limit`"""
+        x1, x2 = min(x1, x2), max(x1, x2)
+        y1, y2 = min(y1, y2), max(y1, y2)
+        t1, t2 = min(t1, t2), max(t1, t2)
+        remaining = len(self.perm) if limit is None else int(limit)
+
+        slices, loose = [], []
+        stack = [0] if self._nodes and remaining > 0 else []
+        while stack and remaining > 0:
+            lo, hi, depth, left, right, min_x, max_x, min_y, max_y = self._nodes[stack.pop()]
+            if max_x < x1 or min_x > x2 or max_y < y1 or min_y > y2:
+                continue
+
+            if min_x >= x1 and max_x <= x2 and min_y >= y1 and max_y <= y2:
+                times = self.layer_times[depth][lo:hi]
+                a = int(np.searchsorted(times, t1, side='left'))
+                b = min(int(np.searchsorted(times, t2, side='right')), a + remaining)
+                if b > a:
+                    slices.append(self.layer_ids[depth][lo + a:lo + b])
+                    remaining -= b - a
+            elif left < 0:
+                sx, sy, st = self.sx[lo:hi], self.sy[lo:hi], self.st[lo:hi]
+                mask = (sx >= x1) & (sx <= x2) & (sy >= y1) & (sy <= y2) & (st >= t1) & (st <= t2)
+                hits = self.perm[lo:hi][mask][:remaining]
+                if len(hits):
+                    loose.append(hits)
+                    remaining -= len(hits)
+            else:
+                stack.append(right)
+                stack.append(left)
+
+        return Report(slices, np.concatenate(loose) if loose else np.zeros(0, dtype=np.uint32))
+
+    def count(self, x1, y1, x2, y2, t1, t2):
+        """Weighted number of events in the rectangle and time range (inclusive)"""
+        report = self.report(x1, y1, x2, y2, t1, t2)
+        return int(sum(int(self.weight[part].sum()) for part in report.slices + [report.loose]))
+
+    def memory_bytes(self):
+        arrays = [self.perm, self.sx, self.sy, self.st, self.node_lo, self.node_hi,
+                  self.node_depth, self.node_children, self.node_box] + self.layer_ids + self.layer_times
+        return sum(a.nbytes for a in arrays)
+
+    def __len__(self):
+        return len(self.perm)
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def save(self, path):
+        """Save the columns, subtree order, layers and node table as one .npz file"""
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        # An empty index has no layers (and reshape(-1, 0) cannot infer a row count)
+        layer_ids = np.array(self.layer_ids) if self.layer_ids else np.zeros((0, 0), dtype=np.uint32)
+        layer_times = np.array(self.layer_times) if self.layer_times else np.zeros((0, 0), dtype=np.int32)
+        np.savez(path, leaf_size=np.array(self.leaf_size), x=self.x, y=self.y, time=self.time,
+                 weight=self.weight, perm=self.perm, layer_ids=layer_ids, layer_times=layer_times,
+                 node_lo=self.node_lo, node_hi=self.node_hi, node_depth=self.node_depth,
+                 node_children=self.node_children, node_box=self.node_box)
+
+    @classmethod
+    def load(cls, path):
+        """Load an index saved with save() without rebuilding it"""
+        with np.load(path) as data:
+            index = cls.__new__(cls)
+            index.leaf_size = int(data['leaf_size'])
+            for name in ('x', 'y', 'time', 'weight', 'perm', 'node_lo', 'node_hi',
+                         'node_depth', 'node_children', 'node_box'):
+                setattr(index, name, data[name])
+            index.layer_ids = list(data['layer_ids'])
+            index.layer_times = list(data['layer_times'])
+        index._prepare()
+        return index
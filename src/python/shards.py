@@ -0,0 +1,346 @@
+"""
+Spatially Sharded Event Index
+
+Splits events from several regions (e.g. the Chicago dataset and the
+Indian multi-city dataset) into independently stored shards, so a query
+only touches the shards whose bounding box it overlaps instead of one
+index stretched over thousands of kilometres of empty space.
+
+Layout of a shard directory:
+- shards.json            index: one entry per shard with its region,
+                         event count, bbox and time range
+- <shard>.bin/.json      the shard's events as a columnar event store
+                         (see event_store.py), readable by the C++
+                         engine (sharded_index.h) as well
+
+Partitioning:
+- region   one shard per input (e.g. 'chicago', 'india')
+- grid     each region is further split into cells of --cell-deg
+           degrees; empty cells produce no shard
+
+Shards are written in parallel worker processes. Rebuilding one region
+replaces only that region's shards, the others are left untouched.
+"""
+
+import json
+import os
+import time as timer
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+
+from event_store import write_event_store, read_event_store, decode_column, decode_coordinates
+
+INDEX_FORMAT = "spatiotemporal-shards"
+INDEX_VERSION = 1
+INDEX_FILE = "shards.json"
+
+
+def load_region(path):
+    """
+    Load one input as a dict of arrays (x, y, time, weight[, type]).
+    Accepts a CSV with x,y,time[,weight][,type] columns or the base
+    path / .json manifest of a binary event store. Projected stores are
+    decoded to lat/lon: shard bboxes, grid cells and routing are in degrees.
+    """
+    if path.endswith('.csv'):
+        df = pd.read_csv(path)
+        events = {
+            'x': df['x'].to_numpy(np.float64),
+            'y': df['y'].to_numpy(np.float64),
+            'time': df['time'].to_numpy(np.int64),
+            'weight': (df['weight'].to_numpy(np.int64) if 'weight' in df
+                       else np.ones(len(df), dtype=np.int64)),
+        }
+        if 'type' in df:
+            events['type'] = df['type'].fillna('UNKNOWN').astype(str).to_numpy(object)
+        return events
+
+    base = path[:-5] if path.endswith('.json') else path
+    columns, manifest = read_event_store(base)
+    lat, lon = decode_coordinates(columns, manifest)
+    events = {
+        'x': lat,
+        'y': lon,
+        'time': np.asarray(columns['time'], dtype=np.int64),
+        'weight': np.asarray(columns['weight'], dtype=np.int64),
+    }
+    if 'type' in columns:
+        events['type'] = decode_column(columns, manifest, 'type')
+    return events
+
+
+def partition(events, region, split='region', cell_deg=1.0):
+    """
+    Group one region's events into shards.
+    Returns a list of (shard_name, index_array).
+    """
+    n = len(events['x'])
+    if split == 'region' or n == 0:
+        return [(region, np.arange(n))]
+    if split != 'grid':
+        raise ValueError(f"unknown split '{split}'")
+
+    gx = np.floor(events['x'] / cell_deg).astype(np.int64)
+    gy = np.floor(events['y'] / cell_deg).astype(np.int64)
+    cells, inverse = np.unique(np.stack([gx, gy], axis=1), axis=0, return_inverse=True)
+    inverse = inverse.ravel()
+
+    order = np.argsort(inverse, kind='stable')
+    bounds = np.searchsorted(inverse[order], np.arange(len(cells) + 1))
+    return [(f"{region}_{cx}_{cy}", order[bounds[i]:bounds[i + 1]])
+            for i, (cx, cy) in enumerate(cells)]
+
+
+def summarize(name, region, events):
+    """Index entry for one shard: count, weight, bbox and time range"""
+    x, y, t = events['x'], events['y'], events['time']
+    return {
+        'name': name,
+        'region': region,
+        'path': name,
+        'count': int(len(x)),
+        'weight': int(events['weight'].sum()),
+        'bbox': [float(x.min()), float(y.min()), float(x.max()), float(y.max())],
+        'time': [int(t.min()), int(t.max())],
+    }
+
+
+def _write_shard(job):
+    """Worker process: write one shard store and return its summary"""
+    out_dir, name, region, events, coord_dtype = job
+    write_event_store(os.path.join(out_dir, name), events['x'], events['y'],
+                      events['time'], weight=events['weight'],
+                      types=events.get('type'), coord_dtype=coord_dtype)
+    return summarize(name, region, events)
+
+
+def read_index(out_dir):
+    """Read shards.json (empty index if the directory has none yet)"""
+    path = os.path.join(out_dir, INDEX_FILE)
+    if not os.path.exists(path):
+        return {'format': INDEX_FORMAT, 'version': INDEX_VERSION, 'shards': []}
+    with open(path, 'r', encoding='utf-8') as f:
+        index = json.load(f)
+    if index.get('format') != INDEX_FORMAT:
+        raise ValueError(f"{path} is not a {INDEX_FORMAT} index")
+    return index
+
+
+def build_shards(inputs, out_dir, split='region', cell_deg=1.0, workers=None,
+                 coord_dtype=np.float64):
+    """
+    Build shards for the given regions and update the shard index.
+
+    inputs: {region: events dict} (see load_region)
+    Shards of regions not in inputs are kept as they are.
+    Returns the updated index.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    index = read_index(out_dir)
+
+    # Drop the previous shards of every region being rebuilt
+    kept = []
+    for entry in index['shards']:
+        if entry['region'] in inputs:
+            for ext in ('.bin', '.json'):
+                stale = os.path.join(out_dir, entry['path'] + ext)
+                if os.path.exists(stale):
+                    os.remove(stale)
+        else:
+            kept.append(entry)
+
+    jobs = []
+    for region, events in inputs.items():
+        for name, idx in partition(events, region, split, cell_deg):
+            if len(idx) == 0:
+                continue
+            subset = {k: v[idx] for k, v in events.items()}
+            jobs.append((out_dir, name, region, subset, coord_dtype))
+
+    if workers == 1 or len(jobs) <= 1:
+        summaries = [_write_shard(job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            summaries = list(pool.map(_write_shard, jobs))
+
+    index['shards'] = sorted(kept + summaries, key=lambda s: s['name'])
+    with open(os.path.join(out_dir, INDEX_FILE), 'w', encoding='utf-8') as f:
+        json.dump(index, f, separators=(',', ':'))
+    return index
+
+
+class ShardedIndex:
+    """
+    Query router over a shard directory.
+
+    Shard stores are memory-mapped on first use, so only shards that a
+    query actually overlaps are ever read from disk.
+    """
+
+    def __init__(self, out_dir):
+        self.out_dir = out_dir
+        self.index = read_index(out_dir)
+        self.shards = self.index['shards']
+        self._columns = {}
+
+        boxes = np.array([s['bbox'] for s in self.shards], dtype=np.float64).reshape(-1, 4)
+        times = np.array([s['time'] for s in self.shards], dtype=np.int64).reshape(-1, 2)
+        self.min_x, self.min_y, self.max_x, self.max_y = boxes.T
+        self.min_t, self.max_t = times.T
+
+    def route(self, x1, y1, x2, y2, t1, t2):
+        """Positions of the shards whose bbox and time range overlap the query"""
+        x1, x2 = min(x1, x2), max(x1, x2)
+        y1, y2 = min(y1, y2), max(y1, y2)
+        t1, t2 = min(t1, t2), max(t1, t2)
+        hit = ((self.max_x >= x1) & (self.min_x <= x2) &
+               (self.max_y >= y1) & (self.min_y <= y2) &
+               (self.max_t >= t1) & (self.min_t <= t2))
+        return np.flatnonzero(hit)
+
+    def columns(self, i):
+        """Memory-mapped columns (and manifest) of shard i"""
+        if i not in self._columns:
+            self._columns[i] = read_event_store(
+                os.path.join(self.out_dir, self.shards[i]['path']))
+        return self._columns[i]
+
+    def _shard_mask(self, i, x1, y1, x2, y2, t1, t2):
+        columns, _ = self.columns(i)
+        s = self.shards[i]
+        # Skip the per-event test in dimensions the shard lies fully inside
+        mask = np.ones(s['count'], dtype=bool)
+        if not (x1 <= s['bbox'][0] and s['bbox'][2] <= x2):
+            mask &= (columns['x'] >= x1) & (columns['x'] <= x2)
+        if not (y1 <= s['bbox'][1] and s['bbox'][3] <= y2):
+            mask &= (columns['y'] >= y1) & (columns['y'] <= y2)
+        if not (t1 <= s['time'][0] and s['time'][1] <= t2):
+            mask &= (columns['time'] >= t1) & (columns['time'] <= t2)
+        return mask
+
+    def count(self, x1, y1, x2, y2, t1, t2):
+        """Weighted event count over all overlapping shards"""
+        return self.aggregate(x1, y1, x2, y2, t1, t2, hourly=False)['count']
+
+    def aggregate(self, x1, y1, x2, y2, t1, t2, hourly=True):
+        """
+        Merged aggregates of a range query.
+        Returns {'count', 'by_shard', 'by_region'[, 'hourly'][, 'by_type']}
+        """
+        x1, x2 = min(x1, x2), max(x1, x2)
+        y1, y2 = min(y1, y2), max(y1, y2)
+        t1, t2 = min(t1, t2), max(t1, t2)
+
+        result = {'count': 0, 'by_shard': {}, 'by_region': {}}
+        if hourly:
+            result['hourly'] = np.zeros(24, dtype=np.int64)
+        by_type = {}
+
+        for i in self.route(x1, y1, x2, y2, t1, t2):
+            shard = self.shards[i]
+            columns, manifest = self.columns(i)
+            mask = self._shard_mask(i, x1, y1, x2, y2, t1, t2)
+            weights = columns['weight'][mask].astype(np.int64)
+            count = int(weights.sum())
+            if count == 0:
+                continue
+
+            result['count'] += count
+            result['by_shard'][shard['name']] = count
+            result['by_region'][shard['region']] = result['by_region'].get(shard['region'], 0) + count
+            if hourly:
+                hours = columns['time'][mask] // 60
+                result['hourly'] += np.bincount(hours, weights=weights, minlength=24).astype(np.int64)
+            if 'type' in columns:
+                totals = np.bincount(columns['type'][mask], weights=weights,
+                                     minlength=len(manifest['types']))
+                for code in np.flatnonzero(totals):
+                    name = manifest['types'][code]
+                    by_type[name] = by_type.get(name, 0) + int(totals[code])
+
+        if by_type:
+            result['by_type'] = by_type
+        return result
+
+
+def parse_inputs(specs):
+    """['chicago=events.csv', ...] -> {region: path}"""
+    inputs = {}
+    for spec in specs:
+        region, sep, path = spec.partition('=')
+        if not sep:
+            region = os.path.splitext(os.path.basename(spec))[0]
+            path = spec
+        inputs[region] = path
+    return inputs
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Build and query a sharded event index")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    build = sub.add_parser('build', help="Build (or rebuild) shards for some regions")
+    build.add_argument('--input', action='append', required=True,
+                       metavar='REGION=PATH',
+                       help="Events CSV or binary store for one region (repeatable)")
+    build.add_argument('--out', default="../../data/processed/shards")
+    build.add_argument('--split', choices=['region', 'grid'], default='grid')
+    build.add_argument('--cell-deg', type=float, default=1.0,
+                       help="Grid cell size in degrees for --split grid")
+    build.add_argument('--workers', type=int, default=None,
+                       help="Worker processes (default: all cores)")
+
+    info = sub.add_parser('info', help="List shards")
+    info.add_argument('--out', default="../../data/processed/shards")
+
+    query = sub.add_parser('query', help="Run one range query")
+    query.add_argument('--out', default="../../data/processed/shards")
+    query.add_argument('bounds', type=float, nargs=4, metavar=('X1', 'Y1', 'X2', 'Y2'))
+    query.add_argument('times', type=int, nargs=2, metavar=('T1', 'T2'))
+
+    args = parser.parse_args()
+
+    print("\n" + "="*60)
+    print("  SHARDED EVENT INDEX")
+    print("="*60 + "\n")
+
+    if args.command == 'build':
+        inputs = {}
+        for region, path in parse_inputs(args.input).items():
+            inputs[region] = load_region(path)
+            print(f"📂 {region}: {len(inputs[region]['x']):,} events from {path}")
+
+        start = timer.perf_counter()
+        index = build_shards(inputs, args.out, split=args.split,
+                             cell_deg=args.cell_deg, workers=args.workers)
+        elapsed = timer.perf_counter() - start
+        print(f"✓ Wrote {len(index['shards'])} shards to {args.out} in {elapsed:.2f} s")
+
+    elif args.command == 'info':
+        index = read_index(args.out)
+        print(f"  {'shard':24s} {'region':10s} {'events':>10s}   bbox")
+        for s in index['shards']:
+            bbox = ', '.join(f"{v:.3f}" for v in s['bbox'])
+            print(f"  {s['name']:24s} {s['region']:10s} {s['count']:>10,}   [{bbox}]")
+
+    else:
+        index = ShardedIndex(args.out)
+        x1, y1, x2, y2 = args.bounds
+        t1, t2 = args.times
+        routed = index.route(x1, y1, x2, y2, t1, t2)
+        start = timer.perf_counter()
+        result = index.aggregate(x1, y1, x2, y2, t1, t2)
+        elapsed = (timer.perf_counter() - start) * 1000
+        print(f"  Shards routed: {len(routed)} of {len(index.shards)}")
+        print(f"  Count:         {result['count']:,}  ({elapsed:.2f} ms)")
+        for region, count in sorted(result['by_region'].items()):
+            print(f"    {region:12s} {count:,}")
+
+    print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,338 @@
+"""
+Multi-resolution Density Tile Pyramid
+
+Pre-aggregates event counts into a quadtree of map tiles so the
+dashboards can draw density from a fixed number of cells per screen
+instead of one dot per event.
+
+Layout:
+- Zoom level z splits the dataset bounds into 2^z x 2^z tiles
+- Every tile holds a TILE_SIZE x TILE_SIZE grid of cells
+- Every cell keeps one count per hour bucket (24 by default)
+
+Only non-empty (cell, hour) pairs are stored. Each level is a pair of
+sorted arrays (keys, counts) where the key orders entries by tile first,
+so a single tile is one contiguous slice found with np.searchsorted.
+Coarser levels are built from the finest one by merging 2x2 cells, and
+new events are merged into an existing pyramid without a rebuild.
+"""
+
+import json
+import numpy as np
+import os
+import struct
+
+TILE_SIZE = 64        # Cells per tile side (power of two)
+HOUR_BUCKETS = 24     # One bucket per hour of day
+TILE_MAGIC = b'STT1'  # Header of exported per-tile files
+
+
+class TilePyramid:
+    def __init__(self, bounds, max_zoom=6, tile_size=TILE_SIZE,
+                 hour_buckets=HOUR_BUCKETS):
+        """
+        bounds: (min_lat, max_lat, min_lon, max_lon) - fixed for the lifetime
+        of the pyramid so incremental updates land in the same cells;
+        closed on both sides, so events on the max edges are counted
+        """
+        if tile_size & (tile_size - 1):
+            raise ValueError("tile_size must be a power of two")
+
+        self.bounds = tuple(float(b) for b in bounds)
+        min_lat, max_lat, min_lon, max_lon = self.bounds
+        if not (max_lat > min_lat and max_lon > min_lon):
+            raise ValueError(f"bounds must have max_lat > min_lat and max_lon > min_lon, got {bounds}")
+        self.max_zoom = int(max_zoom)
+        self.tile_size = int(tile_size)
+        self.hour_buckets = int(hour_buckets)
+
+        # Per level: sorted int64 keys and uint32 counts
+        self.keys = [np.empty(0, dtype=np.int64) for _ in range(self.max_zoom + 1)]
+        self.counts = [np.empty(0, dtype=np.uint32) for _ in range(self.max_zoom + 1)]
+
+    # ------------------------------------------------------------------
+    # Key encoding
+    # ------------------------------------------------------------------
+
+    def _tile_span(self):
+        """Number of keys reserved for one tile"""
+        return self.tile_size * self.tile_size * self.hour_buckets
+
+    def _encode(self, zoom, cx, cy, hour):
+        """Encode global cell coords + hour into a tile-major key"""
+        r = self.tile_size
+        tiles = 1 << zoom
+        tile_id = (cy // r) * tiles + (cx // r)
+        local = (cy % r) * r + (cx % r)
+        return (tile_id * (r * r) + local) * self.hour_buckets + hour
+
+    def _decode(self, zoom, keys):
+        """Inverse of _encode -> (cx, cy, hour)"""
+        r = self.tile_size
+        tiles = 1 << zoom
+        hour = keys % self.hour_buckets
+        rest = keys // self.hour_buckets
+        local = rest % (r * r)
+        tile_id = rest // (r * r)
+        cx = (tile_id % tiles) * r + local % r
+        cy = (tile_id // tiles) * r + local // r
+        return cx, cy, hour
+
+    def _cells(self, lats, lons):
+        """Map coordinates to cells at max zoom (row 0 is the northern edge)"""
+        min_lat, max_lat, min_lon, max_lon = self.bounds
+        grid = (1 << self.max_zoom) * self.tile_size
+
+        cx = np.floor((lons - min_lon) / (max_lon - min_lon) * grid).astype(np.int64)
+        cy = np.floor((max_lat - lats) / (max_lat - min_lat) * grid).astype(np.int64)
+        # Points on the closed upper edges (lon == max_lon, lat == min_lat) go to the last cell
+        cx[(cx == grid) & (lons <= max_lon)] = grid - 1
+        cy[(cy == grid) & (lats >= min_lat)] = grid - 1
+        inside = (cx >= 0) & (cx < grid) & (cy >= 0) & (cy < grid)
+        return cx, cy, inside
+
+    # ------------------------------------------------------------------
+    # Build / update
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _merge(keys, counts):
+        """Sum counts of duplicate keys, returning sorted unique keys"""
+        if len(keys) == 0:
+            return keys.astype(np.int64), counts.astype(np.uint32)
+        unique, inverse = np.unique(keys, return_inverse=True)
+        summed = np.bincount(inverse, weights=counts, minlength=len(unique))
+        return unique, summed.astype(np.uint32)
+
+    def _aggregate_events(self, lats, lons, minutes, weights=None):
+        """Sparse (keys, counts) for a batch of events at max zoom"""
+        lats = np.asarray(lats, dtype=np.float64)
+        lons = np.asarray(lons, dtype=np.float64)
+        minutes = np.asarray(minutes, dtype=np.int64)
+        if weights is None:
+            weights = np.ones(len(lats), dtype=np.uint32)
+        else:
+            weights = np.asarray(weights, dtype=np.uint32)
+
+        cx, cy, inside = self._cells(lats, lons)
+        hour = (minutes % 1440) * self.hour_buckets // 1440
+
+        keys = self._encode(self.max_zoom, cx[inside], cy[inside], hour[inside])
+        return self._merge(keys, weights[inside])
+
+    def _downsample(self, zoom, keys, counts):
+        """Collapse level `zoom` into level `zoom - 1` (2x2 cells -> 1)"""
+        cx, cy, hour = self._decode(zoom, keys)
+        parent = self._encode(zoom - 1, cx >> 1, cy >> 1, hour)
+        return self._merge(parent, counts)
+
+    def add_events(self, lats, lons, minutes, weights=None):
+        """
+        Add a batch of events to every level.
+        Works for the initial build and for incremental ingest alike:
+        only the new batch is aggregated, then merged level by level.
+        """
+        keys, counts = self._aggregate_events(lats, lons, minutes, weights)
+
+        for zoom in range(self.max_zoom, -1, -1):
+            if zoom < self.max_zoom:
+                keys, counts = self._downsample(zoom + 1, keys, counts)
+
+            self.keys[zoom], self.counts[zoom] = self._merge(
+                np.concatenate([self.keys[zoom], keys]),
+                np.concatenate([self.counts[zoom], counts])
+            )
+
+        return len(lats)
+
+    @classmethod
+    def build(cls, lats, lons, minutes, weights=None, bounds=None, max_zoom=6, **kwargs):
+        """Build a pyramid from scratch (bounds default to the data extent)"""
+        if bounds is None:
+            bounds = (float(np.min(lats)), float(np.max(lats)),
+                      float(np.min(lons)), float(np.max(lons)))
+        pyramid = cls(bounds, max_zoom=max_zoom, **kwargs)
+        pyramid.add_events(lats, lons, minutes, weights)
+        return pyramid
+
+    # ------------------------------------------------------------------
+    # Lookup
+    # ------------------------------------------------------------------
+
+    def tile_slice(self, zoom, tx, ty):
+        """Index range of a tile's entries within level `zoom`"""
+        tile_id = ty * (1 << zoom) + tx
+        span = self._tile_span()
+        lo, hi = np.searchsorted(self.keys[zoom], [tile_id * span, (tile_id + 1) * span])
+        return int(lo), int(hi)
+
+    def tile(self, zoom, tx, ty, hours=None):
+        """
+        Dense TILE_SIZE x TILE_SIZE count grid for one tile.
+        hours: optional (h1, h2) inclusive bucket range, wraps past midnight
+        """
+        r = self.tile_size
+        lo, hi = self.tile_slice(zoom, tx, ty)
+        keys = self.keys[zoom][lo:hi]
+        counts = self.counts[zoom][lo:hi]
+
+        hour = keys % self.hour_buckets
+        if hours is not None:
+            h1, h2 = hours
+            if h1 <= h2:
+                mask = (hour >= h1) & (hour <= h2)
+            else:
+                mask = (hour >= h1) | (hour <= h2)
+            keys, counts = keys[mask], counts[mask]
+
+        local = (keys // self.hour_buckets) % (r * r)
+        grid = np.bincount(local, weights=counts, minlength=r * r)
+        return grid.astype(np.uint32).reshape(r, r)
+
+    def tiles_at(self, zoom):
+        """List of (tx, ty) tiles that contain at least one event"""
+        tiles = 1 << zoom
+        tile_ids = np.unique(self.keys[zoom] // self._tile_span())
+        return [(int(t % tiles), int(t // tiles)) for t in tile_ids]
+
+    def total(self, zoom=0):
+        """Total event count stored at a level (identical for every level)"""
+        return int(self.counts[zoom].sum(dtype=np.uint64))
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def save(self, path):
+        """Save the whole pyramid as one compressed .npz file"""
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        arrays = {
+            'meta': np.array([self.max_zoom, self.tile_size, self.hour_buckets]),
+            'bounds': np.array(self.bounds),
+        }
+        for zoom in range(self.max_zoom + 1):
+            arrays[f'keys_{zoom}'] = self.keys[zoom]
+            arrays[f'counts_{zoom}'] = self.counts[zoom]
+        np.savez_compressed(path, **arrays)
+
+    @classmethod
+    def load(cls, path):
+        """Load a pyramid saved with save()"""
+        with np.load(path) as data:
+            max_zoom, tile_size, hour_buckets = (int(v) for v in data['meta'])
+            pyramid = cls(tuple(data['bounds']), max_zoom=max_zoom,
+                          tile_size=tile_size, hour_buckets=hour_buckets)
+            for zoom in range(max_zoom + 1):
+                pyramid.keys[zoom] = data[f'keys_{zoom}']
+                pyramid.counts[zoom] = data[f'counts_{zoom}']
+        return pyramid
+
+    def export_tiles(self, out_dir):
+        """
+        Write one sparse binary file per non-empty tile: out_dir/z/x/y.bin
+        Format (little-endian): magic, uint32 entry count, then
+        uint32 local keys ((row * TILE_SIZE + col) * HOURS + hour)
+        followed by uint32 counts.
+        out_dir/tiles.json records the layout and lists the non-empty
+        tiles per zoom, so readers never request a tile that is not there.
+        """
+        written = 0
+        span = self._tile_span()
+        listing = {}
+        for zoom in range(self.max_zoom + 1):
+            listing[str(zoom)] = self.tiles_at(zoom)
+            for tx, ty in listing[str(zoom)]:
+                lo, hi = self.tile_slice(zoom, tx, ty)
+                local = (self.keys[zoom][lo:hi] % span).astype('<u4')
+                counts = self.counts[zoom][lo:hi].astype('<u4')
+
+                tile_dir = os.path.join(out_dir, str(zoom), str(tx))
+                os.makedirs(tile_dir, exist_ok=True)
+                with open(os.path.join(tile_dir, f"{ty}.bin"), 'wb') as f:
+                    f.write(TILE_MAGIC)
+                    f.write(struct.pack('<I', hi - lo))
+                    f.write(local.tobytes())
+                    f.write(counts.tobytes())
+                written += 1
+
+        os.makedirs(out_dir, exist_ok=True)
+        manifest = {
+            'format': 'density-tiles',
+            'version': 1,
+            'bounds': list(self.bounds),
+            'max_zoom': self.max_zoom,
+            'tile_size': self.tile_size,
+            'hour_buckets': self.hour_buckets,
+            'tiles': listing,
+        }
+        with open(os.path.join(out_dir, 'tiles.json'), 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, separators=(',', ':'))
+        return written
+
+
+def load_events_csv(path):
+    """
+    Read x,y,time[,weight] columns of a processed events CSV
+    (weights are None when the file has no weight column)
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        header = f.readline().strip().split(',')
+    weighted = len(header) > 3 and header[3] == 'weight'
+    data = np.genfromtxt(path, delimiter=',', skip_header=1,
+                         usecols=(0, 1, 2, 3) if weighted else (0, 1, 2))
+    data = np.atleast_2d(data)
+    weights = data[:, 3].astype(np.int64) if weighted else None
+    return data[:, 0], data[:, 1], data[:, 2].astype(np.int64), weights
+
+
+def main():
+    """Build (or incrementally update) the tile pyramid for events.csv"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Build density tile pyramid")
+    parser.add_argument('--input', default="../../data/processed/events.csv")
+    parser.add_argument('--output', default="../../data/processed/tiles/pyramid.npz")
+    parser.add_argument('--max-zoom', type=int, default=6)
+    parser.add_argument('--bounds', type=float, nargs=4,
+                        metavar=('MIN_LAT', 'MAX_LAT', 'MIN_LON', 'MAX_LON'),
+                        default=(41.6, 42.1, -87.95, -87.5))
+    parser.add_argument('--update', action='store_true',
+                        help="Merge input into an existing pyramid instead of rebuilding")
+    parser.add_argument('--export-dir', default=None,
+                        help="Also write per-tile .bin files for the web dashboards")
+    args = parser.parse_args()
+
+    print("\n" + "="*60)
+    print("  DENSITY TILE PYRAMID BUILDER")
+    print("="*60 + "\n")
+
+    lats, lons, minutes, weights = load_events_csv(args.input)
+    print(f"📂 Loaded {len(lats):,} events from {args.input}")
+
+    if args.update and os.path.exists(args.output):
+        pyramid = TilePyramid.load(args.output)
+        pyramid.add_events(lats, lons, minutes, weights)
+        print(f"✓ Merged {len(lats):,} new events into existing pyramid")
+    else:
+        pyramid = TilePyramid.build(lats, lons, minutes, weights, bounds=args.bounds,
+                                    max_zoom=args.max_zoom)
+        print(f"✓ Built pyramid with zoom levels 0-{args.max_zoom}")
+
+    pyramid.save(args.output)
+    print(f"✓ Saved tile pyramid (z0-z{pyramid.max_zoom}) to {args.output}")
+    if args.export_dir:
+        written = pyramid.export_tiles(args.export_dir)
+        print(f"✓ Exported {written} tiles to {args.export_dir}")
+
+    print("\n" + "="*60)
+    print("  PYRAMID STATISTICS")
+    print("="*60)
+    for zoom in range(pyramid.max_zoom + 1):
+        print(f"  z{zoom}: {len(pyramid.tiles_at(zoom)):6d} tiles, "
+              f"{len(pyramid.keys[zoom]):9,} stored cells")
+    print(f"  Events indexed:  {pyramid.total():,}")
+    print("="*60 + "\n")
+
+
+if __name__ == "__main__":
+    main()
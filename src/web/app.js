@@ -13,6 +13,8 @@ let totalQueryTime = 0;
 let isDragging = false;
 let dragStart = null;
 let dragCurrent = null;
+let liveCounter = null;      // Incremental drag count (deltacount.js)
+let liveCountFrame = null;   // Pending animation frame for the live count
 
 // Map bounds
 const mapBounds = {
@@ -47,16 +49,41 @@ function initializeCanvases() {
 function loadSampleData() {
     console.log('📂 Loading REAL Chicago crime data...');
 
-    // Check if real data is available
-    if (typeof realCrimeData !== 'undefined' && realCrimeData.length > 0) {
-        events = realCrimeData;
-        console.log(`✓ Loaded ${events.length.toLocaleString()} REAL crime events from Chicago PD dataset`);
-    } else {
+    // Prefer the compact binary columns; fall back to realdata.js (e.g. when opened via file://)
+    loadBinaryEvents('realdata')
+        .then(columns => {
+            events = columnsToEvents(columns);
+            console.log(`✓ Loaded ${events.length.toLocaleString()} REAL crime events from binary store`);
+            onDataLoaded();
+        })
+        .catch(() => loadLegacyData());
+}
+
+// Load realdata.js on demand (object-per-event fallback)
+function loadLegacyData() {
+    const script = document.createElement('script');
+    script.src = 'realdata.js';
+    script.onload = () => {
+        if (typeof realCrimeData !== 'undefined' && realCrimeData.length > 0) {
+            events = realCrimeData;
+            console.log(`✓ Loaded ${events.length.toLocaleString()} REAL crime events from Chicago PD dataset`);
+        } else {
+            console.log('⚠️ Real data not found, generating synthetic fallback...');
+            generateSyntheticData();
+        }
+        onDataLoaded();
+    };
+    script.onerror = () => {
         // Fallback to synthetic if real data not found
         console.log('⚠️ Real data not found, generating synthetic fallback...');
         generateSyntheticData();
-    }
+        onDataLoaded();
+    };
+    document.body.appendChild(script);
+}
 
+// Refresh the UI once a dataset is in place
+function onDataLoaded() {
     document.getElementById('totalEvents').textContent = events.length.toLocaleString();
 
     renderMap();
@@ -313,6 +340,12 @@ function setupEventListeners() {
 
         // Hide overlay during drag
         document.getElementById('mapOverlay').style.opacity = '0';
+
+        // (Re)build the live counter for the current dataset
+        if (!liveCounter || liveCounter.events !== events) {
+            liveCounter = createLiveCounter(events);
+        }
+        liveCounter.reset();
     });
 
     canvas.addEventListener('mousemove', (e) => {
@@ -327,9 +360,12 @@ function setupEventListeners() {
         document.getElementById('mapCoords').textContent =
             `(${x.toFixed(4)}, ${y.toFixed(4)})`;
 
-        // Update drag position if dragging
+        // Update drag position if dragging; the live count runs at most once per frame
         if (isDragging) {
             dragCurrent = { x: px, y: py };
+            if (liveCountFrame === null) {
+                liveCountFrame = requestAnimationFrame(updateLiveCount);
+            }
         }
     });
 
@@ -352,6 +388,7 @@ function setupEventListeners() {
         document.getElementById('y2').value = coords.y2.toFixed(4);
 
         // Reset drag state
+        cancelLiveCount();
         isDragging = false;
         dragStart = null;
         dragCurrent = null;
@@ -368,6 +405,7 @@ function setupEventListeners() {
     canvas.addEventListener('mouseleave', () => {
         if (isDragging) {
             // Cancel drag if mouse leaves canvas
+            cancelLiveCount();
             isDragging = false;
             dragStart = null;
             dragCurrent = null;
@@ -378,6 +416,26 @@ function setupEventListeners() {
     setInterval(renderMap, 50);
 }
 
+// Show the match count of the rectangle being dragged
+function updateLiveCount() {
+    liveCountFrame = null;
+    if (!isDragging || !dragStart || !dragCurrent || !liveCounter) return;
+
+    const coords = pixelToCoords(dragStart, dragCurrent);
+    const t1 = parseInt(document.getElementById('t1').value);
+    const t2 = parseInt(document.getElementById('t2').value);
+    const count = liveCounter.update(coords, t1, t2);
+
+    document.getElementById('mapCoords').textContent += ` · ${count.toLocaleString()} matches`;
+}
+
+function cancelLiveCount() {
+    if (liveCountFrame !== null) {
+        cancelAnimationFrame(liveCountFrame);
+        liveCountFrame = null;
+    }
+}
+
 // Convert minutes to time string
 function minutesToTime(minutes) {
     const hours = Math.floor(minutes / 60);
@@ -0,0 +1,81 @@
+// Spatio-Temporal Event Analytics - Binary Column Loader
+// Reads the columnar store written by convert_to_binary.py (name.json + name.bin)
+
+const COLUMN_ARRAY_TYPES = {
+    float32: Float32Array,
+    float64: Float64Array,
+    int32: Int32Array,
+    uint8: Uint8Array,
+    uint16: Uint16Array,
+    uint32: Uint32Array
+};
+
+// Projected int32 x / y (northing / easting in projection.unit metres, see
+// src/python/projection.py) -> lat / lon, spherical transverse Mercator inverse
+function unprojectColumns(projection, x, y) {
+    const phi0 = projection.lat0 * Math.PI / 180;
+    const lat = new Float64Array(x.length);
+    const lon = new Float64Array(x.length);
+    for (let i = 0; i < x.length; i++) {
+        const d = x[i] * projection.unit / projection.radius + phi0;
+        const e = y[i] * projection.unit / projection.radius;
+        lat[i] = Math.asin(Math.sin(d) / Math.cosh(e)) * 180 / Math.PI;
+        lon[i] = projection.lon0 + Math.atan2(Math.sinh(e), Math.cos(d)) * 180 / Math.PI;
+    }
+    return { lat, lon };
+}
+
+// Fetch manifest + buffer and wrap every column in a typed array view (no copy);
+// projected stores get x / y decoded to lat / lon, the raw columns kept in columns.projected
+async function loadBinaryEvents(basePath) {
+    const manifestResponse = await fetch(`${basePath}.json`);
+    if (!manifestResponse.ok) {
+        throw new Error(`Manifest not found: ${basePath}.json`);
+    }
+    const manifest = await manifestResponse.json();
+
+    const bufferResponse = await fetch(`${basePath}.bin`);
+    if (!bufferResponse.ok) {
+        throw new Error(`Column buffer not found: ${basePath}.bin`);
+    }
+    const buffer = await bufferResponse.arrayBuffer();
+
+    const columns = {
+        count: manifest.count,
+        types: manifest.types || [],
+        descriptions: manifest.descriptions || []
+    };
+
+    Object.entries(manifest.columns).forEach(([name, info]) => {
+        const ArrayType = COLUMN_ARRAY_TYPES[info.dtype];
+        columns[name] = new ArrayType(buffer, info.offset, manifest.count);
+    });
+
+    if (manifest.projection) {
+        columns.projected = { x: columns.x, y: columns.y, projection: manifest.projection };
+        const { lat, lon } = unprojectColumns(manifest.projection, columns.x, columns.y);
+        columns.x = lat;
+        columns.y = lon;
+    }
+
+    return columns;
+}
+
+// Expand columns into the { x, y, time, weight, type, description } objects app.js uses
+function columnsToEvents(columns) {
+    const events = new Array(columns.count);
+
+    for (let i = 0; i < columns.count; i++) {
+        const event = {
+            x: columns.x[i],
+            y: columns.y[i],
+            time: columns.time[i],
+            weight: columns.weight ? columns.weight[i] : 1
+        };
+        if (columns.type) event.type = columns.types[columns.type[i]];
+        if (columns.description) event.description = columns.descriptions[columns.description[i]];
+        events[i] = event;
+    }
+
+    return events;
+}
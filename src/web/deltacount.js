@@ -0,0 +1,110 @@
+// Spatio-Temporal Event Analytics - Live Drag Counts
+// Incremental match count of the selection rectangle while it is dragged:
+// only the strips that entered or left the rectangle since the last
+// update are counted (same scheme as src/cpp/delta_query.h)
+
+// Events sorted by one coordinate, with the other coordinate and time alongside
+function buildSlab(events, key, other) {
+    const order = Array.from(events.keys()).sort((a, b) => events[a][key] - events[b][key]);
+    const slab = {
+        key: new Float64Array(events.length),
+        other: new Float64Array(events.length),
+        time: new Uint16Array(events.length)
+    };
+    order.forEach((id, i) => {
+        slab.key[i] = events[id][key];
+        slab.other[i] = events[id][other];
+        slab.time[i] = events[id].time;
+    });
+    return slab;
+}
+
+// First index with keys[i] > value (after) or keys[i] >= value
+function searchSorted(keys, value, after) {
+    let lo = 0, hi = keys.length;
+    while (lo < hi) {
+        const mid = (lo + hi) >>> 1;
+        if (keys[mid] < value || (after && keys[mid] === value)) lo = mid + 1; else hi = mid;
+    }
+    return lo;
+}
+
+// One ulp below / above v, so strips exclude the edge of the subtracted box
+const ulpFloat = new Float64Array(1);
+const ulpInt = new BigInt64Array(ulpFloat.buffer);
+function nextDown(v) {
+    if (v === 0) return -Number.MIN_VALUE;
+    ulpFloat[0] = v;
+    ulpInt[0] += v > 0 ? -1n : 1n;
+    return ulpFloat[0];
+}
+function nextUp(v) {
+    return -nextDown(-v);
+}
+
+// a \ b as up to four disjoint closed strips (normalized boxes)
+function subtractBox(a, b) {
+    if (a.x1 > b.x2 || b.x1 > a.x2 || a.y1 > b.y2 || b.y1 > a.y2) return [a];
+    const ix1 = Math.max(a.x1, b.x1), ix2 = Math.min(a.x2, b.x2);
+    const iy1 = Math.max(a.y1, b.y1), iy2 = Math.min(a.y2, b.y2);
+    const strips = [];
+    if (a.x1 < ix1) strips.push({ x1: a.x1, y1: a.y1, x2: nextDown(ix1), y2: a.y2 });
+    if (ix2 < a.x2) strips.push({ x1: nextUp(ix2), y1: a.y1, x2: a.x2, y2: a.y2 });
+    if (a.y1 < iy1) strips.push({ x1: ix1, y1: a.y1, x2: ix2, y2: nextDown(iy1) });
+    if (iy2 < a.y2) strips.push({ x1: ix1, y1: nextUp(iy2), x2: ix2, y2: a.y2 });
+    return strips;
+}
+
+function createLiveCounter(events) {
+    const byX = buildSlab(events, 'x', 'y');
+    const byY = buildSlab(events, 'y', 'x');
+    let prev = null, prevT1 = 0, prevT2 = 0, current = 0;
+
+    // Count in a box: scan the thinner of the two binary-searched slabs
+    function count(b, t1, t2) {
+        const xLo = searchSorted(byX.key, b.x1, false), xHi = searchSorted(byX.key, b.x2, true);
+        const yLo = searchSorted(byY.key, b.y1, false), yHi = searchSorted(byY.key, b.y2, true);
+        const [slab, from, to, lo, hi] = xHi - xLo <= yHi - yLo
+            ? [byX, xLo, xHi, b.y1, b.y2]
+            : [byY, yLo, yHi, b.x1, b.x2];
+
+        let n = 0;
+        for (let i = from; i < to; i++) {
+            const t = slab.time[i];
+            // Wraps around midnight when t1 > t2
+            const inTime = t1 <= t2 ? (t >= t1 && t <= t2) : (t >= t1 || t <= t2);
+            if (inTime && slab.other[i] >= lo && slab.other[i] <= hi) n++;
+        }
+        return n;
+    }
+
+    return {
+        events,
+        update(box, t1, t2) {
+            const next = {
+                x1: Math.min(box.x1, box.x2), y1: Math.min(box.y1, box.y2),
+                x2: Math.max(box.x1, box.x2), y2: Math.max(box.y1, box.y2)
+            };
+            const area = b => (b.x2 - b.x1) * (b.y2 - b.y1);
+            let overlap = 0;
+            if (prev && t1 === prevT1 && t2 === prevT2) {
+                overlap = Math.max(0, Math.min(next.x2, prev.x2) - Math.max(next.x1, prev.x1)) *
+                    Math.max(0, Math.min(next.y2, prev.y2) - Math.max(next.y1, prev.y1));
+            }
+
+            if (prev && overlap > 0 && overlap >= 0.5 * area(next)) {
+                subtractBox(next, prev).forEach(s => { current += count(s, t1, t2); });
+                subtractBox(prev, next).forEach(s => { current -= count(s, t1, t2); });
+            } else {
+                current = count(next, t1, t2);
+            }
+            prev = next;
+            prevT1 = t1;
+            prevT2 = t2;
+            return current;
+        },
+        reset() {
+            prev = null;
+        }
+    };
+}
@@ -0,0 +1,113 @@
+"""
+Brute-force checks for src/python/bitmap.py
+
+Run from the repository root: python tests/test_bitmap.py
+"""
+
+import os
+import sys
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src', 'python'))
+from bitmap import Bitmap, ARRAY_MAX
+
+
+def random_ids(rng):
+    """IDs over a few 65536-wide containers, some dense enough to become bitsets"""
+    parts = []
+    for key in rng.choice(6, size=rng.integers(0, 5), replace=False):
+        size = int(rng.choice([1, 50, ARRAY_MAX, ARRAY_MAX + 1, 20000]))
+        parts.append(key * 65536 + rng.integers(0, 65536, size))
+    return np.concatenate(parts).astype(np.uint32) if parts else np.zeros(0, dtype=np.uint32)
+
+
+def check(bitmap, expected):
+    expected = np.unique(np.asarray(expected, dtype=np.uint32))
+    assert np.array_equal(bitmap.to_array(), expected)
+    assert len(bitmap) == len(expected)
+    assert bool(bitmap) == (len(expected) > 0)
+
+
+def test_set_operations():
+    print("Testing and / or / andnot against numpy set operations...")
+
+    rng = np.random.default_rng(3)
+    for _ in range(200):
+        a_ids, b_ids = random_ids(rng), random_ids(rng)
+        if rng.random() < 0.3:
+            b_ids = np.concatenate([b_ids, a_ids[:len(a_ids) // 2]])  # Force overlap
+        a, b = Bitmap.from_ids(a_ids), Bitmap.from_ids(b_ids)
+
+        check(a, a_ids)
+        check(a & b, np.intersect1d(a_ids, b_ids))
+        check(b & a, np.intersect1d(a_ids, b_ids))
+        check(a | b, np.union1d(a_ids, b_ids))
+        check(a - b, np.setdiff1d(a_ids, b_ids))
+        check(b - a, np.setdiff1d(b_ids, a_ids))
+        check(a - a, [])
+        check(a & Bitmap(), [])
+        check(a | Bitmap(), a_ids)
+
+    print("✓ Set operations passed")
+
+
+def test_construction():
+    print("Testing from_mask / union_all / container boundaries...")
+
+    rng = np.random.default_rng(8)
+    mask = rng.random(200000) < 0.05
+    check(Bitmap.from_mask(mask), np.flatnonzero(mask))
+
+    groups = [random_ids(rng) for _ in range(6)]
+    check(Bitmap.union_all(Bitmap.from_ids(g) for g in groups), np.concatenate(groups))
+    check(Bitmap.union_all([]), [])
+
+    # Exactly ARRAY_MAX values stays an array, one more becomes a bitset
+    edge = np.arange(ARRAY_MAX + 1, dtype=np.uint32) * 3
+    check(Bitmap.from_ids(edge[:ARRAY_MAX]), edge[:ARRAY_MAX])
+    check(Bitmap.from_ids(edge), edge)
+    check(Bitmap.from_ids([65535, 65536, 0xFFFFFFFF]), [65535, 65536, 0xFFFFFFFF])
+
+    print("✓ Construction passed")
+
+
+def test_serialize():
+    print("Testing to_bytes / from_buffer round trip...")
+
+    rng = np.random.default_rng(21)
+    for _ in range(50):
+        bitmaps = [Bitmap.from_ids(random_ids(rng)) for _ in range(3)]
+
+        # Several bitmaps back to back in one buffer, as the search index stores them
+        buffer, entries = b'', []
+        for bitmap in bitmaps:
+            data, n = bitmap.to_bytes()
+            assert len(data) % 4 == 0
+            entries.append((len(buffer), n))
+            buffer += data
+        for bitmap, (offset, n) in zip(bitmaps, entries):
+            check(Bitmap.from_buffer(buffer, offset, n), bitmap.to_array())
+
+    print("✓ Serialize passed")
+
+
+def run_all_tests():
+    print()
+    print("╔═══════════════════════════════════════╗")
+    print("║   BITMAP TESTS                        ║")
+    print("╚═══════════════════════════════════════╝")
+    print()
+
+    test_set_operations()
+    test_construction()
+    test_serialize()
+
+    print()
+    print("╔═══════════════════════════════════════╗")
+    print("║   ✅ ALL TESTS PASSED                 ║")
+    print("╚═══════════════════════════════════════╝")
+    print()
+
+
+if __name__ == "__main__":
+    run_all_tests()
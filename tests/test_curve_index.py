@@ -0,0 +1,140 @@
+"""
+Brute-force checks for src/python/curve_index.py
+
+Run from the repository root: python tests/test_curve_index.py
+"""
+
+import os
+import sys
+import tempfile
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src', 'python'))
+from curve_index import CurveIndex, CURVES
+
+
+def random_rect(rng):
+    """Rectangle over [0, 1]^2, sometimes reaching past the bounds"""
+    x = np.sort(rng.uniform(-0.2, 1.2, 2))
+    y = np.sort(rng.uniform(-0.2, 1.2, 2))
+    return x[0], y[0], x[1], y[1]
+
+
+def brute_force(x, y, t, x1, y1, x2, y2, t1, t2):
+    x1, x2 = min(x1, x2), max(x1, x2)
+    y1, y2 = min(y1, y2), max(y1, y2)
+    t1, t2 = min(t1, t2), max(t1, t2)
+    return (x >= x1) & (x <= x2) & (y >= y1) & (y <= y2) & (t >= t1) & (t <= t2)
+
+
+def test_decompose():
+    print("Testing rectangle decomposition into key intervals...")
+
+    rng = np.random.default_rng(7)
+    n = 500
+    x, y = rng.random(n), rng.random(n)
+    t = rng.integers(0, 1440, n)
+
+    for curve in CURVES:
+        for order in range(1, 17):
+            for budget in (1, 2, 4, 7, 32):
+                index = CurveIndex(x, y, t, curve=curve, order=order, max_intervals=budget,
+                                   bounds=(0.0, 0.0, 1.0, 1.0))
+                for _ in range(20):
+                    x1, y1, x2, y2 = random_rect(rng)
+                    lo, hi, full = index.decompose(x1, y1, x2, y2)
+
+                    assert len(lo) <= budget
+                    assert np.all(lo <= hi)
+                    assert np.all(lo[1:] > hi[:-1])  # Sorted and disjoint
+
+                    # Every event in the rectangle lies in an interval, and
+                    # every event in a full interval lies in the rectangle
+                    inside = (index.x >= x1) & (index.x <= x2) & (index.y >= y1) & (index.y <= y2)
+                    if len(lo) == 0:
+                        assert not inside.any()
+                        continue
+                    slot = np.searchsorted(lo, index.keys, side='right') - 1
+                    covered = (slot >= 0) & (index.keys <= hi[np.maximum(slot, 0)])
+                    assert np.all(covered[inside])
+                    in_full = covered & full[np.maximum(slot, 0)]
+                    assert np.all(inside[in_full])
+
+    print("✓ Decomposition passed")
+
+
+def test_count_and_histogram():
+    print("Testing count / histogram against brute force...")
+
+    rng = np.random.default_rng(11)
+    n = 2000
+    x, y = rng.random(n), rng.random(n)
+    t = rng.integers(0, 1440, n)
+    w = rng.integers(1, 6, n)
+
+    for curve in CURVES:
+        for order in (1, 2, 3, 5, 8, 16):
+            for block_size, budget in ((1, 1), (7, 4), (64, 128)):
+                index = CurveIndex(x, y, t, w, curve=curve, order=order,
+                                   block_size=block_size, max_intervals=budget)
+                for _ in range(30):
+                    x1, y1, x2, y2 = random_rect(rng)
+                    t1, t2 = (int(v) for v in rng.integers(-60, 1500, 2))
+                    mask = brute_force(x, y, t, x1, y1, x2, y2, t1, t2)
+                    # Reversed corners and times select the same events
+                    assert index.count(x2, y2, x1, y1, t2, t1) == int(w[mask].sum())
+
+                    for bin_minutes in (60, 7):
+                        expected = np.bincount(t[mask] // bin_minutes, weights=w[mask],
+                                               minlength=-(-1440 // bin_minutes))
+                        assert np.array_equal(index.histogram(x1, y1, x2, y2, t1, t2, bin_minutes),
+                                              expected.astype(np.int64))
+
+    # Empty index and time ranges outside the day
+    empty = CurveIndex([], [], [])
+    assert empty.count(0, 0, 1, 1, 0, 1439) == 0
+    assert empty.histogram(0, 0, 1, 1).sum() == 0
+    index = CurveIndex(x, y, t, w)
+    assert index.count(0, 0, 1, 1, 1440, 2000) == 0
+    assert index.count(0, 0, 1, 1, -10, -1) == 0
+
+    print("✓ Count / histogram passed")
+
+
+def test_save_load():
+    print("Testing save / load...")
+
+    rng = np.random.default_rng(5)
+    x, y, t = rng.random(1000), rng.random(1000), rng.integers(0, 1440, 1000)
+    index = CurveIndex(x, y, t, curve='morton', order=10, block_size=32)
+    with tempfile.TemporaryDirectory() as tmp:
+        index.save(os.path.join(tmp, 'curve.npz'))
+        loaded = CurveIndex.load(os.path.join(tmp, 'curve.npz'))
+
+    for _ in range(50):
+        x1, y1, x2, y2 = random_rect(rng)
+        assert loaded.count(x1, y1, x2, y2, 300, 1200) == index.count(x1, y1, x2, y2, 300, 1200)
+
+    print("✓ Save / load passed")
+
+
+def run_all_tests():
+    print()
+    print("╔═══════════════════════════════════════╗")
+    print("║   CURVE INDEX TESTS                   ║")
+    print("╚═══════════════════════════════════════╝")
+    print()
+
+    test_decompose()
+    test_count_and_histogram()
+    test_save_load()
+
+    print()
+    print("╔═══════════════════════════════════════╗")
+    print("║   ✅ ALL TESTS PASSED                 ║")
+    print("╚═══════════════════════════════════════╝")
+    print()
+
+
+if __name__ == "__main__":
+    run_all_tests()
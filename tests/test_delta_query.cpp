@@ -0,0 +1,130 @@
+#include <iostream>
+#include <cassert>
+#include <random>
+#include <vector>
+#include "../src/cpp/delta_query.h"
+
+using namespace std;
+
+long long scan(const vector<Event>& events, const Box& b, int t1, int t2) {
+    if (t1 > t2) swap(t1, t2);
+    long long total = 0;
+    for (const Event& e : events) {
+        if (e.x >= b.x1 && e.x <= b.x2 && e.y >= b.y1 && e.y <= b.y2 &&
+            e.time >= t1 && e.time <= t2) {
+            total += e.weight;
+        }
+    }
+    return total;
+}
+
+void testSubtract() {
+    cout << "Testing box subtraction..." << endl;
+
+    // Points on a coarse lattice land exactly on strip and box edges
+    vector<pair<double, double>> points;
+    for (int i = 0; i <= 20; i++)
+        for (int j = 0; j <= 20; j++) points.emplace_back(i * 0.05, j * 0.05);
+
+    mt19937 rng(3);
+    uniform_int_distribution<int> lattice(0, 20);
+    for (int q = 0; q < 500; q++) {
+        Box a(lattice(rng) * 0.05, lattice(rng) * 0.05, lattice(rng) * 0.05, lattice(rng) * 0.05);
+        Box b(lattice(rng) * 0.05, lattice(rng) * 0.05, lattice(rng) * 0.05, lattice(rng) * 0.05);
+        vector<Box> strips = subtractBox(a, b);
+        assert(strips.size() <= 4);
+
+        for (const auto& p : points) {
+            auto in = [&](const Box& r) {
+                return p.first >= r.x1 && p.first <= r.x2 && p.second >= r.y1 && p.second <= r.y2;
+            };
+            int covered = 0;
+            for (const Box& s : strips) covered += in(s);
+            assert(covered == (in(a) && !in(b) ? 1 : 0));
+        }
+    }
+
+    Box a(0, 0, 1, 1);
+    assert(subtractBox(a, Box(0.2, 0.2, 0.8, 0.8)).size() == 4);
+    assert(subtractBox(a, Box(-1, -1, 2, 2)).empty());
+    assert(subtractBox(a, Box(2, 2, 3, 3)).size() == 1);
+
+    cout << "✓ Box subtraction passed" << endl;
+}
+
+void testDragMatchesScan() {
+    cout << "Testing delta counts along drag paths..." << endl;
+
+    mt19937 rng(11);
+    uniform_real_distribution<double> coord(0, 1);
+    vector<Event> events;
+    for (int i = 0; i < 20000; i++) {
+        // Snap some coordinates to a grid so events sit on strip edges
+        double x = i % 4 ? coord(rng) : (rng() % 100) / 100.0;
+        double y = i % 4 ? coord(rng) : (rng() % 100) / 100.0;
+        events.emplace_back(x, y, rng() % 1440, 1 + rng() % 3);
+    }
+    vector<Event> original = events;
+    KDTree tree;
+    tree.build(events);
+
+    DeltaCounter live([&](const Box& b, int t1, int t2) {
+        return static_cast<long long>(tree.query(b.x1, b.y1, b.x2, b.y2, t1, t2));
+    });
+
+    normal_distribution<double> step(0, 0.01);
+    for (int drag = 0; drag < 20; drag++) {
+        double sx = coord(rng), sy = coord(rng), cx = sx + 0.1, cy = sy + 0.1;
+        int t1 = rng() % 1440, t2 = rng() % 1440;
+        for (int move = 0; move < 100; move++) {
+            cx += step(rng);
+            cy += step(rng);
+            if (move % 10 == 0) { cx = round(cx * 100) / 100; cy = round(cy * 100) / 100; }
+            Box box(sx, sy, cx, cy);
+            assert(live.update(box, t1, t2) == scan(original, box, t1, t2));
+        }
+        if (drag % 5 == 4) {
+            // Time window change and a jump force full counts
+            Box box(0.1, 0.1, 0.4, 0.4);
+            assert(live.update(box, 0, 719) == scan(original, box, 0, 719));
+            box = Box(0.6, 0.6, 0.9, 0.9);
+            assert(live.update(box, 0, 719) == scan(original, box, 0, 719));
+        }
+    }
+
+    const DeltaCounter::Stats& stats = live.getStats();
+    assert(stats.updates == 2008);
+    assert(stats.fullCounts < stats.updates / 10);  // Mostly incremental
+    assert(stats.stripQueries > 0);
+
+    live.reset();
+    Box box(0.3, 0.3, 0.5, 0.5);
+    long long before = stats.fullCounts;
+    assert(live.update(box, 100, 900) == scan(original, box, 100, 900));
+    assert(stats.fullCounts == before + 1);
+    assert(live.update(box, 100, 900) == live.count());  // Unchanged box: no query
+
+    cout << "✓ Delta counts passed" << endl;
+}
+
+void runAllTests() {
+    cout << "\n";
+    cout << "╔═══════════════════════════════════════╗" << endl;
+    cout << "║   DELTA QUERY UNIT TESTS              ║" << endl;
+    cout << "╚═══════════════════════════════════════╝" << endl;
+    cout << "\n";
+
+    testSubtract();
+    testDragMatchesScan();
+
+    cout << "\n";
+    cout << "╔═══════════════════════════════════════╗" << endl;
+    cout << "║   ✅ ALL TESTS PASSED                 ║" << endl;
+    cout << "╚═══════════════════════════════════════╝" << endl;
+    cout << "\n";
+}
+
+int main() {
+    runAllTests();
+    return 0;
+}
@@ -0,0 +1,91 @@
+"""
+Brute-force checks for src/python/density.py
+
+Run from the repository root: python tests/test_density.py
+"""
+
+import os
+import sys
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src', 'python'))
+from density import DensityGrid, bin_events, fft_convolve, make_kernel
+
+
+def brute_counts(x, y, time, weight, bounds, shape, t1, t2):
+    rows, cols = shape
+    out = np.zeros(shape)
+    for xi, yi, ti, wi in zip(x, y, time, weight):
+        if bounds[0] <= xi <= bounds[1] and bounds[2] <= yi <= bounds[3] and t1 <= ti <= t2:
+            i = min(int((xi - bounds[0]) * rows / (bounds[1] - bounds[0])), rows - 1)
+            j = min(int((yi - bounds[2]) * cols / (bounds[3] - bounds[2])), cols - 1)
+            out[i, j] += wi
+    return out
+
+
+def test_counts():
+    print("Testing DensityGrid.counts against brute force...")
+
+    rng = np.random.default_rng(37)
+    n = 1500
+    x, y = rng.uniform(-0.1, 1.1, n), rng.uniform(-0.1, 1.1, n)
+    time = rng.integers(0, 1440, n)
+    weight = rng.integers(1, 4, n)
+    bounds, shape = (0.0, 1.0, 0.0, 1.0), (8, 5)
+
+    for bucket_minutes in (1, 30, 60, 1440):
+        grid = DensityGrid(x, y, time, weight, bounds=bounds, shape=shape,
+                           bucket_minutes=bucket_minutes)
+        windows = [(0, 1439), (0, 0), (1439, 1439), (30, 89), (31, 88), (7, 20),
+                   (600, 300), (-50, 100), (1400, 2000)]
+        windows += [tuple(int(v) for v in rng.integers(0, 1440, 2)) for _ in range(20)]
+        for t1, t2 in windows:
+            lo, hi = min(t1, t2), max(t1, t2)
+            assert np.allclose(grid.counts(t1, t2),
+                               brute_counts(x, y, time, weight, bounds, shape, lo, hi))
+
+    assert np.allclose(bin_events(x, y, bounds, shape, weight),
+                       brute_counts(x, y, time, weight, bounds, shape, 0, 1439))
+
+    print("✓ Counts passed")
+
+
+def test_convolve():
+    print("Testing fft_convolve against direct convolution...")
+
+    rng = np.random.default_rng(41)
+    grid = rng.poisson(2, (12, 9)).astype(np.float64)
+    kernel = make_kernel('epanechnikov', 2.0)
+    kr, kc = kernel.shape[0] // 2, kernel.shape[1] // 2
+
+    expected = np.zeros(grid.shape)
+    for i in range(grid.shape[0]):
+        for j in range(grid.shape[1]):
+            for di in range(-kr, kr + 1):
+                for dj in range(-kc, kc + 1):
+                    if 0 <= i - di < grid.shape[0] and 0 <= j - dj < grid.shape[1]:
+                        expected[i, j] += kernel[di + kr, dj + kc] * grid[i - di, j - dj]
+    assert np.allclose(fft_convolve(grid, kernel), expected)
+
+    print("✓ Convolve passed")
+
+
+def run_all_tests():
+    print()
+    print("╔═══════════════════════════════════════╗")
+    print("║   DENSITY TESTS                       ║")
+    print("╚═══════════════════════════════════════╝")
+    print()
+
+    test_counts()
+    test_convolve()
+
+    print()
+    print("╔═══════════════════════════════════════╗")
+    print("║   ✅ ALL TESTS PASSED                 ║")
+    print("╚═══════════════════════════════════════╝")
+    print()
+
+
+if __name__ == "__main__":
+    run_all_tests()
@@ -0,0 +1,204 @@
+#include <iostream>
+#include <cassert>
+#include <cstdio>
+#include <fstream>
+#include <random>
+#include <vector>
+#include "../src/cpp/disk_index.h"
+
+using namespace std;
+
+const string STORE = "/tmp/test_disk_index_store";
+const string INDEX = "/tmp/test_disk_index";
+
+/**
+ * Minimal event store writer (float64 x/y, uint16 time, uint8 weight)
+ */
+void writeStore(const string& path, const vector<Event>& events) {
+    size_t n = events.size();
+    auto aligned = [](size_t bytes) { return (bytes + 7) / 8 * 8; };
+    size_t offX = 0, offY = aligned(8 * n), offT = offY + aligned(8 * n), offW = offT + aligned(2 * n);
+
+    vector<char> bin(offW + aligned(n), 0);
+    for (size_t i = 0; i < n; i++) {
+        uint16_t t = static_cast<uint16_t>(events[i].time);
+        uint8_t w = static_cast<uint8_t>(events[i].weight);
+        memcpy(&bin[offX + 8 * i], &events[i].x, 8);
+        memcpy(&bin[offY + 8 * i], &events[i].y, 8);
+        memcpy(&bin[offT + 2 * i], &t, 2);
+        memcpy(&bin[offW + i], &w, 1);
+    }
+    ofstream(path + ".bin", ios::binary).write(bin.data(), bin.size());
+    ofstream(path + ".json") << "{\"format\":\"spatiotemporal-columns\",\"version\":1,\"count\":" << n
+        << ",\"columns\":{\"x\":{\"dtype\":\"float64\",\"offset\":" << offX
+        << "},\"y\":{\"dtype\":\"float64\",\"offset\":" << offY
+        << "},\"time\":{\"dtype\":\"uint16\",\"offset\":" << offT
+        << "},\"weight\":{\"dtype\":\"uint8\",\"offset\":" << offW << "}}}";
+}
+
+void removeFiles() {
+    for (const char* ext : {".bin", ".json"}) remove((STORE + ext).c_str());
+    for (const char* ext : {".idx", ".blk", ".sum"}) remove((INDEX + ext).c_str());
+}
+
+vector<Event> clusteredEvents(mt19937& rng, int n) {
+    normal_distribution<double> noise(0, 0.02);
+    uniform_real_distribution<double> uniform(0, 1);
+    vector<Event> events;
+    for (int i = 0; i < n; i++) {
+        double x = uniform(rng) < 0.7 ? 0.3 + noise(rng) : uniform(rng);
+        double y = uniform(rng) < 0.7 ? 0.6 + noise(rng) : uniform(rng);
+        events.emplace_back(x, y, rng() % 1440, 1 + rng() % 3);
+    }
+    return events;
+}
+
+long long scan(const vector<Event>& events, double x1, double y1, double x2, double y2, int t1, int t2) {
+    if (x1 > x2) swap(x1, x2);
+    if (y1 > y2) swap(y1, y2);
+    if (t1 > t2) swap(t1, t2);
+    long long total = 0;
+    for (const Event& e : events) {
+        if (e.x >= x1 && e.x <= x2 && e.y >= y1 && e.y <= y2 && e.time >= t1 && e.time <= t2) {
+            total += e.weight;
+        }
+    }
+    return total;
+}
+
+void testHilbertKey() {
+    cout << "Testing Hilbert keys..." << endl;
+
+    // On a 16 x 16 grid the keys are 0..255 and consecutive keys are neighbours
+    vector<pair<uint64_t, pair<int, int>>> cells;
+    for (int x = 0; x < 16; x++) {
+        for (int y = 0; y < 16; y++) cells.push_back({hilbertKey(x, y), {x, y}});
+    }
+    sort(cells.begin(), cells.end());
+    for (size_t i = 0; i < cells.size(); i++) {
+        assert(cells[i].first == i);
+        if (i) {
+            int dx = abs(cells[i].second.first - cells[i - 1].second.first);
+            int dy = abs(cells[i].second.second - cells[i - 1].second.second);
+            assert(dx + dy == 1);
+        }
+    }
+
+    cout << "✓ Hilbert keys passed" << endl;
+}
+
+void testMatchesScan() {
+    cout << "Testing disk index counts against a scan..." << endl;
+
+    mt19937 rng(11);
+    vector<Event> events = clusteredEvents(rng, 20000);
+    writeStore(STORE, events);
+
+    // Small blocks and runs: several levels and a 7-way merge
+    DiskIndexOptions options;
+    options.blockEvents = 64;
+    options.fanout = 4;
+    options.runEvents = 3000;
+    DiskIndexBuildReport report = DiskIndex::build(STORE, INDEX, options);
+    assert(report.events == 20000 && report.skipped == 0);
+    assert(report.runs == 7);
+    assert(report.blocks == (20000 + 63) / 64);
+
+    DiskIndex index;
+    index.open(INDEX);
+    assert(index.size() == 20000);
+    assert(index.height() > 3);
+
+    uniform_real_distribution<double> coord(-0.1, 1.1);
+    for (int q = 0; q < 500; q++) {
+        double x1 = coord(rng), x2 = coord(rng), y1 = coord(rng), y2 = coord(rng);
+        int t1 = rng() % 1440, t2 = rng() % 1440;
+        if (q % 3 == 0) {  // Hour-aligned windows use the in-memory summaries
+            t1 = (t1 / 60) * 60;
+            t2 = (t2 / 60) * 60 + 59;
+        }
+        assert(index.query(x1, y1, x2, y2, t1, t2) == scan(events, x1, y1, x2, y2, t1, t2));
+    }
+    assert(index.query(0.25, 0.55, 0.35, 0.65, -100, 5000) == scan(events, 0.25, 0.55, 0.35, 0.65, 0, 1439));
+
+    // A single in-memory run gives the same answers
+    options.runEvents = 1 << 20;
+    assert(DiskIndex::build(STORE, INDEX, options).runs == 1);
+    DiskIndex single;
+    single.open(INDEX);
+    for (int q = 0; q < 100; q++) {
+        double x1 = coord(rng), x2 = coord(rng), y1 = coord(rng), y2 = coord(rng);
+        int t1 = rng() % 1440, t2 = rng() % 1440;
+        assert(single.query(x1, y1, x2, y2, t1, t2) == scan(events, x1, y1, x2, y2, t1, t2));
+    }
+
+    removeFiles();
+    cout << "✓ Disk index counts passed" << endl;
+}
+
+void testIOStats() {
+    cout << "Testing disk index I/O accounting..." << endl;
+
+    mt19937 rng(13);
+    vector<Event> events = clusteredEvents(rng, 10000);
+    events.emplace_back(0.5, 0.5, 5000);  // Outside the time domain: skipped
+    writeStore(STORE, events);
+
+    DiskIndexOptions options;
+    options.blockEvents = 128;
+    assert(DiskIndex::build(STORE, INDEX, options).skipped == 1);
+    DiskIndex index;
+    index.open(INDEX);
+    assert(index.size() == 10000);
+
+    // Whole domain: answered from the root in memory
+    DiskIOStats io;
+    QueryStats stats;
+    index.query(-1, -1, 2, 2, 0, 1439, &stats, &io);
+    assert(stats.visited == 1 && io.pagesTouched == 0);
+
+    // Far away: pruned at the root
+    io = DiskIOStats();
+    assert(index.query(5, 5, 6, 6, 0, 1439, nullptr, &io) == 0);
+    assert(io.pagesTouched == 0);
+
+    // Covered + hour-aligned needs no summary reads, unaligned does
+    io = DiskIOStats();
+    index.query(-1, -1, 2, 2, 60, 119, nullptr, &io);
+    assert(io.summaryReads == 0 && io.blocksRead == 0);
+    io = DiskIOStats();
+    index.query(-1, -1, 2, 2, 61, 119, nullptr, &io);
+    assert(io.summaryReads == 1 && io.pagesTouched >= 1);
+
+    // A small box only reads the blocks it overlaps
+    io = DiskIOStats();
+    assert(index.query(0.29, 0.59, 0.31, 0.61, 0, 1439, nullptr, &io) ==
+           scan(events, 0.29, 0.59, 0.31, 0.61, 0, 1439));
+    assert(io.blocksRead > 0 && io.blocksRead < static_cast<long long>(index.nodeCount()) / 4);
+
+    removeFiles();
+    cout << "✓ I/O accounting passed" << endl;
+}
+
+void runAllTests() {
+    cout << "\n";
+    cout << "╔═══════════════════════════════════════╗" << endl;
+    cout << "║   DISK INDEX UNIT TESTS               ║" << endl;
+    cout << "╚═══════════════════════════════════════╝" << endl;
+    cout << "\n";
+
+    testHilbertKey();
+    testMatchesScan();
+    testIOStats();
+
+    cout << "\n";
+    cout << "╔═══════════════════════════════════════╗" << endl;
+    cout << "║   ✅ ALL TESTS PASSED                 ║" << endl;
+    cout << "╚═══════════════════════════════════════╝" << endl;
+    cout << "\n";
+}
+
+int main() {
+    runAllTests();
+    return 0;
+}
@@ -1,6 +1,6 @@
 #include <iostream>
 #include <cassert>
-#include "../cpp/fenwick.h"
+#include "../src/cpp/fenwick.h"
 
 using namespace std;
 
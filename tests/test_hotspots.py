@@ -0,0 +1,148 @@
+"""
+Brute-force checks for src/python/hotspots.py
+
+Run from the repository root: python tests/test_hotspots.py
+"""
+
+import os
+import sys
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src', 'python'))
+from density import _cell_index
+from hotspots import window_counts, gi_star, trend, detect, week_windows
+
+
+def brute_window_counts(x, y, time, windows, bounds, shape, weight):
+    """One loop per window and event"""
+    rows, cols = shape
+    out = np.zeros((len(windows),) + shape)
+    for k, (start, end) in enumerate(windows):
+        for xi, yi, ti, wi in zip(x, y, time, weight):
+            if not (bounds[0] <= xi <= bounds[1] and bounds[2] <= yi <= bounds[3]):
+                continue
+            if start <= ti <= end:
+                i = min(int((xi - bounds[0]) * rows / (bounds[1] - bounds[0])), rows - 1)
+                j = min(int((yi - bounds[2]) * cols / (bounds[3] - bounds[2])), cols - 1)
+                out[k, i, j] += wi
+    return out
+
+
+def brute_gi_star(grid, radius):
+    """Textbook Getis-Ord Gi* with binary weights, one cell at a time"""
+    values = grid.ravel().astype(np.float64)
+    n = len(values)
+    mean = values.mean()
+    s = np.sqrt((values ** 2).mean() - mean ** 2)
+    rows, cols = grid.shape
+    z = np.zeros(grid.shape)
+    for i in range(rows):
+        for j in range(cols):
+            w = np.zeros(grid.shape)
+            w[max(i - radius, 0):i + radius + 1, max(j - radius, 0):j + radius + 1] = 1
+            w = w.ravel()
+            denom = s * np.sqrt((n * (w ** 2).sum() - w.sum() ** 2) / (n - 1))
+            z[i, j] = (w @ values - mean * w.sum()) / denom if denom > 0 else 0.0
+    return z
+
+
+def test_window_counts():
+    print("Testing window_counts against brute force...")
+
+    rng = np.random.default_rng(23)
+    n = 600
+    x, y = rng.uniform(-0.1, 1.1, n), rng.uniform(-0.1, 1.1, n)
+    time = rng.integers(0, 1000, n)
+    weight = rng.integers(1, 4, n)
+    bounds, shape = (0.0, 1.0, 0.0, 1.0), (6, 9)
+    cells, inside = _cell_index(x, y, bounds, shape)
+
+    cases = [
+        [(0, 99), (100, 199), (200, 999)],     # Disjoint, adjacent
+        [(500, 600), (0, 50), (700, 700)],     # Disjoint, unsorted with gaps
+        [(0, 500), (250, 750), (500, 999)],    # Overlapping
+        [(100, 200), (100, 200)],              # Identical
+        [(0, 999)],
+    ]
+    for windows in cases:
+        expected = brute_window_counts(x, y, time, windows, bounds, shape, weight)
+        got = window_counts(cells, inside, time, windows, shape, weight)
+        assert got.dtype == np.int64
+        assert np.array_equal(got, expected)
+        unweighted = window_counts(cells, inside, time, windows, shape)
+        assert np.allclose(unweighted, brute_window_counts(x, y, time, windows, bounds, shape,
+                                                            np.ones(n)))
+
+    print("✓ Window counts passed")
+
+
+def test_gi_star():
+    print("Testing gi_star against the textbook formula...")
+
+    rng = np.random.default_rng(29)
+    for shape, radius in (((5, 5), 1), ((7, 4), 2), ((3, 8), 0), ((6, 6), 5)):
+        grids = rng.poisson(3, (3,) + shape).astype(np.float64)
+        grids[1, 2, 1] += 40  # A hot spot
+        z = gi_star(grids, radius)
+        for k in range(len(grids)):
+            assert np.allclose(z[k], brute_gi_star(grids[k], radius))
+
+    # Constant grids have no variance
+    assert np.array_equal(gi_star(np.full((4, 4), 7.0)), np.zeros((4, 4)))
+
+    print("✓ Gi* passed")
+
+
+def test_trend_and_detect():
+    print("Testing trend and detect...")
+
+    rng = np.random.default_rng(31)
+    values = rng.normal(size=(5, 3, 4))
+    for i in range(3):
+        for j in range(4):
+            slope = np.polyfit(np.arange(5), values[:, i, j], 1)[0]
+            assert np.isclose(trend(values)[i, j], slope)
+    assert np.allclose(trend(values[:2]), values[1] - values[0])
+    assert np.array_equal(trend(values[:1]), np.zeros((3, 4)))
+
+    # Background noise in both weeks plus a cluster that appears in the last one
+    week = 7 * 24 * 60
+    n = 4000
+    x, y = rng.random(n), rng.random(n)
+    time = rng.integers(0, 2 * week, n)
+    cluster = 300
+    x = np.concatenate([x, 0.55 + 0.02 * rng.random(cluster)])
+    y = np.concatenate([y, 0.25 + 0.02 * rng.random(cluster)])
+    time = np.concatenate([time, rng.integers(week, 2 * week, cluster)])
+
+    windows = week_windows(time, weeks=2)
+    result = detect(x, y, time, windows, bounds=(0, 1, 0, 1), shape=(20, 20))
+    assert result['counts'].sum() == len(x)
+    # The cluster cell is a new hot spot, and only its neighbourhood emerges with it
+    emerging = {spot['cell']: spot['category'] for spot in result['emerging']}
+    assert emerging.get((11, 5)) == 'new'
+    assert all(abs(i - 11) <= 1 and abs(j - 5) <= 1 for i, j in emerging)
+
+    print("✓ Trend / detect passed")
+
+
+def run_all_tests():
+    print()
+    print("╔═══════════════════════════════════════╗")
+    print("║   HOT SPOT TESTS                      ║")
+    print("╚═══════════════════════════════════════╝")
+    print()
+
+    test_window_counts()
+    test_gi_star()
+    test_trend_and_detect()
+
+    print()
+    print("╔═══════════════════════════════════════╗")
+    print("║   ✅ ALL TESTS PASSED                 ║")
+    print("╚═══════════════════════════════════════╝")
+    print()
+
+
+if __name__ == "__main__":
+    run_all_tests()
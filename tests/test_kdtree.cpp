@@ -0,0 +1,214 @@
+#include <iostream>
+#include <cassert>
+#include <random>
+#include <vector>
+#include "../src/cpp/kdtree.h"
+#include "../src/cpp/parallel_query.h"
+
+using namespace std;
+
+// Reference count by linear scan
+int bruteForce(const vector<Event>& events, double x1, double y1, double x2, double y2,
+               int t1, int t2) {
+    int count = 0;
+    for (const Event& e : events) {
+        if (e.x >= x1 && e.x <= x2 && e.y >= y1 && e.y <= y2 &&
+            e.time >= t1 && e.time <= t2) {
+            count += e.weight;
+        }
+    }
+    return count;
+}
+
+void testBuildPopulatesIndex() {
+    cout << "Testing that build indexes every event..." << endl;
+
+    vector<Event> events = {
+        Event(1, 1, 10), Event(2, 2, 20), Event(3, 3, 30), Event(4, 4, 40)
+    };
+    KDTree tree(1440);
+    tree.build(events);
+
+    assert(tree.query(0, 0, 5, 5, 0, 1439) == 4);
+    assert(tree.query(0, 0, 5, 5, 15, 35) == 2);
+    assert(tree.query(1.5, 1.5, 3.5, 3.5, 0, 1439) == 2);
+
+    cout << "✓ Build indexing passed" << endl;
+}
+
+void testMinuteZero() {
+    cout << "Testing events at minute 0 and 1439..." << endl;
+
+    vector<Event> events = { Event(1, 1, 0), Event(2, 2, 1439), Event(3, 3, 0) };
+    KDTree tree(1440);
+    tree.build(events);
+
+    assert(tree.query(0, 0, 5, 5, 0, 0) == 2);
+    assert(tree.query(0, 0, 5, 5, 1439, 1439) == 1);
+    assert(tree.query(0.5, 0.5, 1.5, 1.5, 0, 0) == 1);
+
+    cout << "✓ Minute boundaries passed" << endl;
+}
+
+void testRandomAgainstBruteForce() {
+    cout << "Testing random queries against brute force..." << endl;
+
+    mt19937 rng(7);
+    uniform_real_distribution<double> coord(0, 100);
+    vector<Event> events;
+    for (int i = 0; i < 2000; i++) {
+        events.emplace_back(coord(rng), coord(rng), rng() % 1440, 1 + rng() % 3);
+    }
+    vector<Event> copy = events;
+    KDTree tree(1440);
+    tree.build(copy);
+
+    for (int q = 0; q < 500; q++) {
+        double x1 = coord(rng), x2 = coord(rng), y1 = coord(rng), y2 = coord(rng);
+        int t1 = rng() % 1440, t2 = rng() % 1440;
+        if (x1 > x2) swap(x1, x2);
+        if (y1 > y2) swap(y1, y2);
+        if (t1 > t2) swap(t1, t2);
+        assert(tree.query(x1, y1, x2, y2, t1, t2) == bruteForce(events, x1, y1, x2, y2, t1, t2));
+    }
+
+    cout << "✓ Random queries passed" << endl;
+}
+
+void testInsertAgainstBruteForce() {
+    cout << "Testing inserts against brute force..." << endl;
+
+    mt19937 rng(21);
+    uniform_real_distribution<double> coord(0, 100);
+    vector<Event> events;
+    for (int i = 0; i < 2000; i++) {
+        events.emplace_back(coord(rng), coord(rng), rng() % 1440, 1 + rng() % 3);
+    }
+    vector<Event> copy = events;
+    KDTree tree(1440);
+    tree.build(copy);
+
+    for (int i = 0; i < 500; i++) {
+        Event e(coord(rng), coord(rng), rng() % 1440, 1 + rng() % 3);
+        tree.insert(e);
+        events.push_back(e);
+    }
+
+    for (int q = 0; q < 200; q++) {
+        double x1 = coord(rng), x2 = coord(rng), y1 = coord(rng), y2 = coord(rng);
+        int t1 = rng() % 1440, t2 = rng() % 1440;
+        if (x1 > x2) swap(x1, x2);
+        if (y1 > y2) swap(y1, y2);
+        if (t1 > t2) swap(t1, t2);
+        assert(tree.query(x1, y1, x2, y2, t1, t2) == bruteForce(events, x1, y1, x2, y2, t1, t2));
+    }
+
+    // Inserting into an empty tree creates the root
+    KDTree empty(1440);
+    empty.insert(Event(5, 5, 100));
+    empty.insert(Event(6, 4, 200));
+    assert(empty.query(0, 0, 10, 10, 0, 1439) == 2);
+    assert(empty.query(5.5, 3.5, 6.5, 4.5, 0, 1439) == 1);
+
+    cout << "✓ Inserts passed" << endl;
+}
+
+void testQueryStats() {
+    cout << "Testing query path statistics..." << endl;
+
+    vector<Event> events;
+    for (int i = 0; i < 64; i++) {
+        events.emplace_back(i, i, i * 10);
+    }
+    KDTree tree(1440);
+    tree.build(events);
+
+    QueryStats stats;
+    int count = tree.query(-1, -1, 100, 100, 0, 1439, &stats);
+    assert(count == 64);
+    assert(stats.visited == 1 && stats.covered == 1 && stats.pruned == 0);
+
+    stats.reset();
+    assert(tree.query(10.5, 10.5, 20.5, 20.5, 0, 1439, &stats) == 10);
+    assert(stats.visited == stats.pruned + stats.covered + stats.partial);
+    assert(stats.partial > 0);
+
+    long long depthTotal = 0;
+    for (long long v : stats.depthVisits) depthTotal += v;
+    assert(depthTotal == stats.visited);
+
+    QueryStatsAggregator aggregate;
+    aggregate.add(stats);
+    aggregate.add(QueryStats());
+    assert(aggregate.queries == 2 && aggregate.visitedHistogram[0] == 1);
+    assert(QueryStatsAggregator::bucket(0) == 0 && QueryStatsAggregator::bucket(5) == 3);
+
+    cout << "✓ Query statistics passed" << endl;
+}
+
+void testParallelBatch() {
+    cout << "Testing parallel batch execution..." << endl;
+
+    mt19937 rng(11);
+    uniform_real_distribution<double> coord(0, 100);
+    vector<Event> events;
+    for (int i = 0; i < 5000; i++) {
+        events.emplace_back(coord(rng), coord(rng), rng() % 1440);
+    }
+    KDTree tree(1440);
+    tree.build(events);
+
+    vector<RangeQuery> batch;
+    for (int q = 0; q < 1000; q++) {
+        int t1 = rng() % 1440;
+        batch.emplace_back(coord(rng), coord(rng), coord(rng), coord(rng), t1, t1 + rng() % 300);
+    }
+
+    ParallelQueryExecutor pool(tree, 4, 16);
+    QueryStatsAggregator aggregate;
+    vector<int> counts = pool.run(batch, &aggregate);
+    assert(counts.size() == batch.size());
+    for (size_t i = 0; i < batch.size(); i++) {
+        const RangeQuery& q = batch[i];
+        assert(counts[i] == tree.query(q.x1, q.y1, q.x2, q.y2, q.t1, q.t2));
+    }
+    assert(aggregate.queries == static_cast<long long>(batch.size()));
+
+    // The pool is reusable across batches
+    assert(pool.run(batch) == counts);
+
+    // Per-query latencies land in the slots of their queries
+    vector<double> latencies;
+    assert(pool.run(batch, nullptr, &latencies) == counts);
+    assert(latencies.size() == batch.size());
+    for (double ms : latencies) assert(ms >= 0);
+    assert(pool.run(vector<RangeQuery>()).empty());
+
+    cout << "✓ Parallel batch passed" << endl;
+}
+
+void runAllTests() {
+    cout << "\n";
+    cout << "╔═══════════════════════════════════════╗" << endl;
+    cout << "║   KD-TREE UNIT TESTS                  ║" << endl;
+    cout << "╚═══════════════════════════════════════╝" << endl;
+    cout << "\n";
+
+    testBuildPopulatesIndex();
+    testMinuteZero();
+    testRandomAgainstBruteForce();
+    testInsertAgainstBruteForce();
+    testQueryStats();
+    testParallelBatch();
+
+    cout << "\n";
+    cout << "╔═══════════════════════════════════════╗" << endl;
+    cout << "║   ✅ ALL TESTS PASSED                 ║" << endl;
+    cout << "╚═══════════════════════════════════════╝" << endl;
+    cout << "\n";
+}
+
+int main() {
+    runAllTests();
+    return 0;
+}
@@ -0,0 +1,93 @@
+"""
+Checks for the content-hash stage cache in pipeline.py
+
+Run from the repository root: python tests/test_pipeline_cache.py
+"""
+
+import os
+import sys
+import tempfile
+
+ROOT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT_DIR)
+from pipeline import Cache, STAGES, DEFAULT_CONFIG
+
+
+def write(file, text):
+    with open(file, 'w', encoding='utf-8') as f:
+        f.write(text)
+
+
+def test_stage_key():
+    print("Testing stage keys and freshness...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        source, output = os.path.join(tmp, 'source.py'), os.path.join(tmp, 'out.bin')
+        write(source, 'A = 1\n')
+        write(output, 'result')
+
+        cache = Cache(os.path.join(tmp, 'state.json'))
+        key = cache.stage_key('stage', [source], {'k': 1})
+        assert key == cache.stage_key('stage', [source], {'k': 1})
+        assert key != cache.stage_key('stage', [source], {'k': 2})
+        assert key != cache.stage_key('other', [source], {'k': 1})
+
+        cache.record('stage', key, [output])
+        cache.save()
+        cache = Cache(os.path.join(tmp, 'state.json'))
+        assert cache.is_fresh('stage', key, [output])
+
+        # Editing an input (e.g. an imported module) changes the key
+        write(source, 'A = 2\n')
+        os.utime(source, ns=(0, 12345))
+        assert cache.stage_key('stage', [source], {'k': 1}) != key
+
+        # So does deleting it; a modified or missing output is not fresh
+        os.remove(source)
+        assert cache.stage_key('stage', [source], {'k': 1}) != key
+        write(output, 'edited by hand')
+        assert not cache.is_fresh('stage', key, [output])
+        os.remove(output)
+        assert not cache.is_fresh('stage', key, [output])
+
+    print("✓ Stage keys passed")
+
+
+def test_stage_inputs():
+    print("Testing that stages list the src/python modules they import...")
+
+    for name, (func, inputs, keys, outputs) in STAGES.items():
+        assert all(k in DEFAULT_CONFIG for k in keys), name
+        for rel in inputs:
+            rel = rel.format(**DEFAULT_CONFIG)
+            if rel.startswith('src/python/'):
+                assert os.path.exists(os.path.join(ROOT_DIR, rel)), f"{name}: {rel}"
+
+    # Every src/python module pipeline.py imports is an input of some stage
+    listed = {rel for _, inputs, _, _ in STAGES.values() for rel in inputs}
+    for module in ('event_store', 'projection', 'crime_types', 'inverted_index', 'density',
+                   'tile_pyramid'):
+        assert module in sys.modules and f'src/python/{module}.py' in listed, module
+
+    print("✓ Stage inputs passed")
+
+
+def run_all_tests():
+    print()
+    print("╔═══════════════════════════════════════╗")
+    print("║   PIPELINE CACHE TESTS                ║")
+    print("╚═══════════════════════════════════════╝")
+    print()
+
+    test_stage_key()
+    test_stage_inputs()
+
+    print()
+    print("╔═══════════════════════════════════════╗")
+    print("║   ✅ ALL TESTS PASSED                 ║")
+    print("╚═══════════════════════════════════════╝")
+    print()
+
+
+if __name__ == "__main__":
+    run_all_tests()
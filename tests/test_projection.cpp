@@ -0,0 +1,191 @@
+#include <iostream>
+#include <cassert>
+#include <cmath>
+#include <random>
+#include <vector>
+#include "../src/cpp/event_store.h"
+#include "../src/cpp/parallel_query.h"
+
+using namespace std;
+
+void testForwardInverse() {
+    cout << "Testing projection round trip..." << endl;
+
+    LocalProjection proj(41.85, -87.65);
+    assert(proj.valid);
+
+    // Same integers as src/python/projection.py for the Chicago origin
+    double x, y;
+    proj.forward(41.8781, -87.6298, x, y);
+    assert(x == 312478 && y == 167240);
+    proj.forward(42.0, -87.9, x, y);
+    assert(x == 1670942 && y == -2065852);
+    proj.forward(41.85, -87.65, x, y);
+    assert(x == 0 && y == 0);
+
+    mt19937 rng(5);
+    uniform_real_distribution<double> lat(41.6, 42.1), lon(-87.95, -87.5);
+    for (int i = 0; i < 1000; i++) {
+        double a = lat(rng), b = lon(rng), la, lo;
+        proj.forward(a, b, x, y);
+        proj.inverse(x, y, la, lo);
+        assert(fabs(la - a) < 1e-7 && fabs(lo - b) < 1e-7);  // Within a centimetre
+    }
+
+    // 1 km due north along the central meridian is 100000 cm
+    double dLat = LocalProjection::degrees(1000.0 / LocalProjection::EARTH_RADIUS);
+    proj.forward(41.85 + dLat, -87.65, x, y);
+    assert(x == 100000 && y == 0);
+
+    cout << "✓ Projection round trip passed" << endl;
+}
+
+void testBox() {
+    cout << "Testing lat/lon rectangle bounds..." << endl;
+
+    LocalProjection proj(41.85, -87.65);
+    double x1, y1, x2, y2;
+    proj.box(41.80, -87.70, 41.92, -87.60, x1, y1, x2, y2);
+
+    // Every point of the rectangle lands inside the plane box
+    for (int i = 0; i <= 40; i++) {
+        for (int j = 0; j <= 40; j++) {
+            double x, y;
+            proj.forward(41.80 + i * 0.003, -87.70 + j * 0.0025, x, y);
+            assert(x >= x1 && x <= x2 && y >= y1 && y <= y2);
+        }
+    }
+
+    cout << "✓ Rectangle bounds passed" << endl;
+}
+
+void testManifest() {
+    cout << "Testing projection manifest parsing..." << endl;
+
+    string manifest = "{\"format\":\"spatiotemporal-columns\",\"version\":1,\"count\":0,"
+                      "\"columns\":{},\"projection\":{\"kind\":\"tmerc-sphere\",\"lat0\":41.85,"
+                      "\"lon0\":-87.65,\"unit\":0.01,\"radius\":6371008.8}}";
+    LocalProjection proj = event_store::findProjection(manifest);
+    assert(proj.valid && proj.lat0 == 41.85 && proj.lon0 == -87.65 && proj.unit == 0.01);
+
+    assert(!event_store::findProjection("{\"count\":0,\"columns\":{}}").valid);
+
+    cout << "✓ Manifest parsing passed" << endl;
+}
+
+void testRadiusQuery() {
+    cout << "Testing radius queries..." << endl;
+
+    // Integer centimetre coordinates, as decoded from a projected store
+    mt19937 rng(17);
+    uniform_int_distribution<int> coord(-2000000, 2000000), minute(0, 1439);
+    vector<Event> events;
+    for (int i = 0; i < 5000; i++) events.emplace_back(coord(rng), coord(rng), minute(rng));
+    vector<Event> original = events;
+
+    KDTree tree(1440);
+    tree.build(events);
+
+    uniform_int_distribution<int> radius(0, 800000);
+    for (int q = 0; q < 200; q++) {
+        double cx = coord(rng), cy = coord(rng), r = radius(rng);
+        int t1 = minute(rng), t2 = minute(rng);
+        if (t1 > t2) swap(t1, t2);
+
+        int expected = 0;
+        for (const Event& e : original) {
+            double dx = e.x - cx, dy = e.y - cy;
+            if (dx * dx + dy * dy <= r * r && e.time >= t1 && e.time <= t2) expected += e.weight;
+        }
+        assert(tree.queryRadius(cx, cy, r, t1, t2) == expected);
+    }
+
+    // Points exactly on the circle count (3-4-5 triangle)
+    KDTree small(1440);
+    vector<Event> ring = {Event(300, 400, 10), Event(301, 400, 10), Event(0, 0, 10)};
+    small.build(ring);
+    assert(small.queryRadius(0, 0, 500, 0, 1439) == 2);
+    assert(small.queryRadius(0, 0, 499, 0, 1439) == 1);
+
+    QueryStats stats;
+    tree.queryRadius(0, 0, 100000, 0, 1439, &stats);
+    assert(stats.pruned > 0);
+
+    cout << "✓ Radius queries passed" << endl;
+}
+
+void testLatLonQuery() {
+    cout << "Testing exact lat/lon queries on projected events..." << endl;
+
+    LocalProjection proj(41.85, -87.65);
+    mt19937 rng(23);
+    uniform_real_distribution<double> lat(41.6, 42.1), lon(-87.95, -87.5);
+    uniform_int_distribution<int> minute(0, 1439);
+
+    // Projected events, and the lat/lon they decode to (what a plain store would hold)
+    vector<Event> events, decoded;
+    for (int i = 0; i < 20000; i++) {
+        double x, y, la, lo;
+        proj.forward(lat(rng), lon(rng), x, y);
+        proj.inverse(x, y, la, lo);
+        int t = minute(rng);
+        events.emplace_back(x, y, t);
+        decoded.emplace_back(la, lo, t);
+    }
+    KDTree tree(1440);
+    tree.build(events);
+
+    vector<RangeQuery> queries;
+    vector<int> expected;
+    for (int q = 0; q < 300; q++) {
+        double a = lat(rng), b = lat(rng), c = lon(rng), d = lon(rng);
+        int t1 = minute(rng), t2 = minute(rng);
+        if (t1 > t2) swap(t1, t2);
+        int count = 0;
+        for (const Event& e : decoded) {
+            if (e.x >= min(a, b) && e.x <= max(a, b) && e.y >= min(c, d) && e.y <= max(c, d) &&
+                e.time >= t1 && e.time <= t2) count++;
+        }
+        assert(queryLatLon(tree, proj, a, c, b, d, t1, t2) == count);
+        queries.emplace_back(a, c, b, d, t1, t2);
+        expected.push_back(count);
+    }
+
+    // Covered nodes still answer from their Fenwick trees
+    QueryStats stats;
+    queryLatLon(tree, proj, 41.7, -87.9, 42.0, -87.55, 0, 1439, &stats);
+    assert(stats.covered > 0 && stats.pruned > 0);
+
+    // The same queries through a parallel executor with a custom query function
+    ParallelQueryExecutor pool(tree, 4, 16, [&](const RangeQuery& q, QueryStats* s) {
+        return queryLatLon(tree, proj, q.x1, q.y1, q.x2, q.y2, q.t1, q.t2, s);
+    });
+    assert(pool.run(queries) == expected);
+
+    cout << "✓ Lat/lon queries passed" << endl;
+}
+
+void runAllTests() {
+    cout << "\n";
+    cout << "╔═══════════════════════════════════════╗" << endl;
+    cout << "║   PROJECTION UNIT TESTS               ║" << endl;
+    cout << "╚═══════════════════════════════════════╝" << endl;
+    cout << "\n";
+
+    testForwardInverse();
+    testBox();
+    testManifest();
+    testRadiusQuery();
+    testLatLonQuery();
+
+    cout << "\n";
+    cout << "╔═══════════════════════════════════════╗" << endl;
+    cout << "║   ✅ ALL TESTS PASSED                 ║" << endl;
+    cout << "╚═══════════════════════════════════════╝" << endl;
+    cout << "\n";
+}
+
+int main() {
+    runAllTests();
+    return 0;
+}
@@ -0,0 +1,122 @@
+"""
+Brute-force checks for src/python/report_index.py
+
+Run from the repository root: python tests/test_report_index.py
+"""
+
+import os
+import sys
+import tempfile
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src', 'python'))
+from report_index import ReportIndex
+
+
+def random_query(rng):
+    x = np.sort(rng.uniform(-0.1, 1.1, 2))
+    y = np.sort(rng.uniform(-0.1, 1.1, 2))
+    t = np.sort(rng.integers(-30, 1470, 2))
+    return x[0], y[0], x[1], y[1], int(t[0]), int(t[1])
+
+
+def brute_force(x, y, t, x1, y1, x2, y2, t1, t2):
+    return np.flatnonzero((x >= x1) & (x <= x2) & (y >= y1) & (y <= y2) & (t >= t1) & (t <= t2))
+
+
+def make_events(rng, n):
+    x, y = rng.random(n), rng.random(n)
+    x[:n // 10] = 0.5  # Duplicate coordinates split across leaves
+    return x, y, rng.integers(0, 1440, n), rng.integers(1, 5, n)
+
+
+def test_report():
+    print("Testing report / count against brute force...")
+
+    rng = np.random.default_rng(13)
+    for n, leaf_size in ((1, 1), (7, 2), (1000, 1), (3000, 32), (3000, 100)):
+        x, y, t, w = make_events(rng, n)
+        index = ReportIndex(x, y, t, w, leaf_size=leaf_size)
+        assert len(index) == n
+        for _ in range(100):
+            x1, y1, x2, y2, t1, t2 = random_query(rng)
+            expected = brute_force(x, y, t, x1, y1, x2, y2, t1, t2)
+            report = index.report(x1, y1, x2, y2, t1, t2)
+            ids = report.ids()
+            assert len(report) == len(ids) == len(expected)
+            assert np.array_equal(np.sort(ids), expected)
+            # Reversed corners and times select the same events
+            assert index.count(x2, y2, x1, y1, t2, t1) == int(w[expected].sum())
+
+    print("✓ Report / count passed")
+
+
+def test_paging():
+    print("Testing page() and limit against the full report...")
+
+    rng = np.random.default_rng(17)
+    x, y, t, w = make_events(rng, 5000)
+    index = ReportIndex(x, y, t, w, leaf_size=16)
+    for _ in range(100):
+        query = random_query(rng)
+        report = index.report(*query)
+        ids = report.ids()
+        for offset, limit in ((0, 0), (0, 1), (0, 50), (3, 7), (len(ids) - 1, 5),
+                              (len(ids), 5), (len(ids) + 10, 5), (5, None)):
+            assert np.array_equal(report.page(max(offset, 0), limit),
+                                  ids[max(offset, 0):None if limit is None else max(offset, 0) + limit])
+
+        # Walking the pages returns every ID exactly once
+        pages = [report.page(o, 37) for o in range(0, len(ids), 37)]
+        walked = np.concatenate(pages) if pages else np.zeros(0, dtype=np.uint32)
+        assert np.array_equal(walked, ids)
+
+        # A limited report holds min(limit, total) of the matching events
+        for limit in (0, 1, 10, 1000):
+            limited = index.report(*query, limit=limit).ids()
+            assert len(limited) == min(limit, len(ids))
+            assert len(np.unique(limited)) == len(limited)
+            assert np.isin(limited, ids).all()
+
+    print("✓ Paging passed")
+
+
+def test_save_load():
+    print("Testing save / load (including an empty index)...")
+
+    rng = np.random.default_rng(19)
+    x, y, t, w = make_events(rng, 2000)
+    with tempfile.TemporaryDirectory() as tmp:
+        for index in (ReportIndex(x, y, t, w), ReportIndex([], [], [])):
+            path = os.path.join(tmp, 'report.npz')
+            index.save(path)
+            loaded = ReportIndex.load(path)
+            assert len(loaded) == len(index)
+            for _ in range(30):
+                query = random_query(rng)
+                assert np.array_equal(loaded.report(*query).ids(), index.report(*query).ids())
+                assert loaded.count(*query) == index.count(*query)
+
+    print("✓ Save / load passed")
+
+
+def run_all_tests():
+    print()
+    print("╔═══════════════════════════════════════╗")
+    print("║   REPORT INDEX TESTS                  ║")
+    print("╚═══════════════════════════════════════╝")
+    print()
+
+    test_report()
+    test_paging()
+    test_save_load()
+
+    print()
+    print("╔═══════════════════════════════════════╗")
+    print("║   ✅ ALL TESTS PASSED                 ║")
+    print("╚═══════════════════════════════════════╝")
+    print()
+
+
+if __name__ == "__main__":
+    run_all_tests()
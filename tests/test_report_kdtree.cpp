@@ -0,0 +1,151 @@
+#include <iostream>
+#include <cassert>
+#include <random>
+#include <vector>
+#include "../src/cpp/report_kdtree.h"
+
+using namespace std;
+
+vector<uint32_t> scan(const vector<Event>& events, double x1, double y1, double x2, double y2,
+                      int t1, int t2) {
+    if (x1 > x2) swap(x1, x2);
+    if (y1 > y2) swap(y1, y2);
+    if (t1 > t2) swap(t1, t2);
+    vector<uint32_t> ids;
+    for (uint32_t i = 0; i < events.size(); i++) {
+        const Event& e = events[i];
+        if (e.x >= x1 && e.x <= x2 && e.y >= y1 && e.y <= y2 && e.time >= t1 && e.time <= t2) {
+            ids.push_back(i);
+        }
+    }
+    return ids;
+}
+
+vector<Event> randomEvents(int n, unsigned seed) {
+    mt19937 rng(seed);
+    uniform_real_distribution<double> coord(0, 1);
+    vector<Event> events;
+    for (int i = 0; i < n; i++) {
+        // Some duplicate coordinates and times to exercise ties
+        double x = i % 5 ? coord(rng) : (rng() % 50) / 50.0;
+        double y = i % 5 ? coord(rng) : (rng() % 50) / 50.0;
+        events.emplace_back(x, y, rng() % 1440);
+    }
+    return events;
+}
+
+void testMatchesScan() {
+    cout << "Testing reported IDs against brute force..." << endl;
+
+    vector<Event> events = randomEvents(20000, 7);
+    ReportingKDTree tree;
+    tree.build(events);
+    assert(tree.size() == events.size());
+
+    mt19937 rng(13);
+    uniform_real_distribution<double> box(-0.1, 1.1);
+    for (int q = 0; q < 300; q++) {
+        double x1 = box(rng), x2 = box(rng), y1 = box(rng), y2 = box(rng);
+        int t1 = rng() % 1440, t2 = rng() % 1440;
+
+        ReportResult result = tree.report(x1, y1, x2, y2, t1, t2);
+        vector<uint32_t> ids = result.ids();
+        vector<uint32_t> expected = scan(events, x1, y1, x2, y2, t1, t2);
+        assert(result.size() == expected.size() && ids.size() == expected.size());
+        sort(ids.begin(), ids.end());
+        assert(ids == expected);
+        assert(tree.count(x1, y1, x2, y2, t1, t2) == expected.size());
+    }
+
+    // The whole domain is one covered slice: the root's time-sorted layer
+    ReportResult all = tree.report(-1, -1, 2, 2, 0, 1439);
+    assert(all.size() == events.size() && all.slices().size() == 1);
+    assert(tree.report(2, 2, 3, 3, 0, 1439).empty());
+
+    // Subtree order is a permutation of the input
+    vector<uint32_t> order = tree.order();
+    sort(order.begin(), order.end());
+    for (uint32_t i = 0; i < order.size(); i++) assert(order[i] == i);
+
+    cout << "✓ Reported IDs passed" << endl;
+}
+
+void testPaginationAndLimit() {
+    cout << "Testing pagination and limits..." << endl;
+
+    vector<Event> events = randomEvents(10000, 21);
+    ReportingKDTree tree;
+    tree.build(events);
+
+    ReportResult result = tree.report(0.1, 0.1, 0.7, 0.8, 300, 1100);
+    vector<uint32_t> all = result.ids();
+    assert(all.size() > 1000 && result.slices().size() > 1);
+
+    // Pages concatenate to the full result, in the same order
+    vector<uint32_t> paged;
+    for (size_t offset = 0; offset < result.size(); offset += 97) {
+        vector<uint32_t> page = result.page(offset, 97);
+        assert(page.size() == min<size_t>(97, result.size() - offset));
+        paged.insert(paged.end(), page.begin(), page.end());
+    }
+    assert(paged == all);
+    assert(result.page(result.size(), 10).empty());
+
+    size_t visited = 0;
+    result.forEach([&](uint32_t id) { assert(id == all[visited++]); });
+    assert(visited == all.size());
+
+    // A limit stops the descent early and keeps a prefix of valid matches
+    QueryStats full, limited;
+    tree.report(0.1, 0.1, 0.7, 0.8, 300, 1100, numeric_limits<size_t>::max(), &full);
+    ReportResult first = tree.report(0.1, 0.1, 0.7, 0.8, 300, 1100, 50, &limited);
+    assert(first.size() == 50);
+    assert(limited.visited < full.visited);
+    vector<uint32_t> expected = scan(events, 0.1, 0.1, 0.7, 0.8, 300, 1100);
+    first.forEach([&](uint32_t id) { assert(binary_search(expected.begin(), expected.end(), id)); });
+    assert(tree.report(0.1, 0.1, 0.7, 0.8, 300, 1100, 0).empty());
+
+    cout << "✓ Pagination passed" << endl;
+}
+
+void testSmallTrees() {
+    cout << "Testing small and empty trees..." << endl;
+
+    ReportingKDTree empty;
+    empty.build({});
+    assert(empty.report(0, 0, 1, 1, 0, 1439).empty());
+
+    vector<Event> few = {Event(0.5, 0.5, 100), Event(0.2, 0.9, 700), Event(0.5, 0.5, 100)};
+    ReportingKDTree tree;
+    tree.build(few);
+    assert(tree.depth() == 1);  // A single leaf
+    vector<uint32_t> ids = tree.report(0.5, 0.5, 0.5, 0.5, 100, 100).ids();
+    sort(ids.begin(), ids.end());
+    assert((ids == vector<uint32_t>{0, 2}));
+    assert(tree.report(0, 0, 1, 1, 800, 600).size() == 1);  // Swapped time range
+
+    cout << "✓ Small trees passed" << endl;
+}
+
+void runAllTests() {
+    cout << "\n";
+    cout << "╔═══════════════════════════════════════╗" << endl;
+    cout << "║   REPORTING KD-TREE UNIT TESTS        ║" << endl;
+    cout << "╚═══════════════════════════════════════╝" << endl;
+    cout << "\n";
+
+    testMatchesScan();
+    testPaginationAndLimit();
+    testSmallTrees();
+
+    cout << "\n";
+    cout << "╔═══════════════════════════════════════╗" << endl;
+    cout << "║   ✅ ALL TESTS PASSED                 ║" << endl;
+    cout << "╚═══════════════════════════════════════╝" << endl;
+    cout << "\n";
+}
+
+int main() {
+    runAllTests();
+    return 0;
+}
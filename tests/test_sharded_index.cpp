@@ -0,0 +1,88 @@
+#include <iostream>
+#include <cassert>
+#include <random>
+#include <vector>
+#include "../src/cpp/sharded_index.h"
+
+using namespace std;
+
+vector<Event> cluster(mt19937& rng, double cx, double cy, double spread, int n) {
+    uniform_real_distribution<double> offset(-spread, spread);
+    vector<Event> events;
+    for (int i = 0; i < n; i++) {
+        events.emplace_back(cx + offset(rng), cy + offset(rng), rng() % 1440);
+    }
+    return events;
+}
+
+void testRouting() {
+    cout << "Testing query routing..." << endl;
+
+    mt19937 rng(3);
+    vector<Event> chicago = cluster(rng, 41.85, -87.65, 0.1, 1000);
+    vector<Event> delhi = cluster(rng, 28.61, 77.21, 0.1, 500);
+    vector<Event> mumbai = cluster(rng, 19.07, 72.87, 0.1, 500);
+
+    ShardedIndex index(1440);
+    index.addShard("chicago", chicago);
+    index.addShard("delhi", delhi);
+    index.addShard("mumbai", mumbai);
+    assert(index.shardCount() == 3);
+
+    assert(index.route(41.0, -88.0, 42.0, -87.0, 0, 1439).size() == 1);
+    assert(index.route(18.0, 72.0, 30.0, 78.0, 0, 1439).size() == 2);
+    assert(index.route(0.0, 0.0, 1.0, 1.0, 0, 1439).empty());
+
+    vector<int> perShard;
+    assert(index.query(-90, -180, 90, 180, 0, 1439, &perShard) == 2000);
+    assert(perShard[0] == 1000 && perShard[1] == 500 && perShard[2] == 500);
+
+    cout << "✓ Routing passed" << endl;
+}
+
+void testMatchesSingleTree() {
+    cout << "Testing sharded counts against one tree..." << endl;
+
+    mt19937 rng(5);
+    vector<Event> a = cluster(rng, 10, 10, 5, 800);
+    vector<Event> b = cluster(rng, 40, 40, 5, 800);
+    vector<Event> all = a;
+    all.insert(all.end(), b.begin(), b.end());
+
+    ShardedIndex index(1440);
+    index.addShard("a", a);
+    index.addShard("b", b);
+    KDTree tree(1440);
+    tree.build(all);
+
+    uniform_real_distribution<double> coord(0, 50);
+    for (int q = 0; q < 300; q++) {
+        double x1 = coord(rng), x2 = coord(rng), y1 = coord(rng), y2 = coord(rng);
+        int t1 = rng() % 1440, t2 = rng() % 1440;
+        assert(index.query(x1, y1, x2, y2, t1, t2) == tree.query(x1, y1, x2, y2, t1, t2));
+    }
+
+    cout << "✓ Sharded counts passed" << endl;
+}
+
+void runAllTests() {
+    cout << "\n";
+    cout << "╔═══════════════════════════════════════╗" << endl;
+    cout << "║   SHARDED INDEX UNIT TESTS            ║" << endl;
+    cout << "╚═══════════════════════════════════════╝" << endl;
+    cout << "\n";
+
+    testRouting();
+    testMatchesSingleTree();
+
+    cout << "\n";
+    cout << "╔═══════════════════════════════════════╗" << endl;
+    cout << "║   ✅ ALL TESTS PASSED                 ║" << endl;
+    cout << "╚═══════════════════════════════════════╝" << endl;
+    cout << "\n";
+}
+
+int main() {
+    runAllTests();
+    return 0;
+}
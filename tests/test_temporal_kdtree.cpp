@@ -0,0 +1,180 @@
+#include <iostream>
+#include <cassert>
+#include <random>
+#include <vector>
+#include "../src/cpp/temporal_kdtree.h"
+
+using namespace std;
+using namespace time_domain;
+
+long long scan(const vector<Event>& events, double x1, double y1, double x2, double y2,
+               const TimeFilter& filter) {
+    if (x1 > x2) swap(x1, x2);
+    if (y1 > y2) swap(y1, y2);
+    long long total = 0;
+    for (const Event& e : events) {
+        if (e.x >= x1 && e.x <= x2 && e.y >= y1 && e.y <= y2 && filter.matches(e.time)) {
+            total += e.weight;
+        }
+    }
+    return total;
+}
+
+vector<TimeFilter> sampleFilters() {
+    vector<TimeFilter> filters;
+    filters.push_back(TimeFilter());
+    filters.push_back(TimeFilter::between(toMinutes(2021, 3, 14, 9, 30), toMinutes(2022, 11, 2, 17, 0)));
+    filters.push_back(TimeFilter().years(2023, 2023).weekdays(1 << SATURDAY));
+    filters.push_back(TimeFilter().months(0b000111000000));                 // Jul-Sep
+    filters.push_back(TimeFilter().timeOfDay(22 * 60, 2 * 60 - 1));         // 22:00-02:00
+    filters.push_back(TimeFilter().years(2020, 2022).timeOfDay(480, 1019)); // Office hours
+    filters.push_back(TimeFilter().weekdays(1 << SATURDAY | 1 << SUNDAY).months(0b100000000001));
+    filters.push_back(TimeFilter::between(toMinutes(2019, 6, 1), toMinutes(2024, 6, 1))
+                          .years(2021, 2030).weekdays(1 << FRIDAY).timeOfDay(1380, 59));
+    filters.push_back(TimeFilter().years(2030, 2031));                      // No data
+    filters.push_back(TimeFilter().months(0));                              // Nothing
+    return filters;
+}
+
+void testCalendar() {
+    cout << "Testing calendar arithmetic..." << endl;
+
+    assert(toMinutes(1970, 1, 1) == 0);
+    assert(toMinutes(1970, 1, 2, 1, 5) == MINUTES_PER_DAY + 65);
+    assert(toMinutes(1969, 12, 31) == -MINUTES_PER_DAY);
+
+    CivilTime c = civil(toMinutes(2023, 7, 15, 13, 45));
+    assert(c.year == 2023 && c.month == 7 && c.day == 15);
+    assert(c.weekday == SATURDAY && c.minuteOfDay == 13 * 60 + 45);
+    assert(civil(0).weekday == THURSDAY);
+    assert(civil(-1).year == 1969 && civil(-1).minuteOfDay == 1439);
+
+    // Leap years, including the century rules
+    assert(civil(toMinutes(2000, 2, 29)).day == 29);
+    assert(civil(toMinutes(1900, 2, 29)).month == 3);
+    assert(toMinutes(2024, 3, 1) - toMinutes(2024, 2, 28) == 2 * MINUTES_PER_DAY);
+
+    // Every day of 2019-2024 round-trips
+    for (int64_t t = toMinutes(2019, 1, 1); t < toMinutes(2025, 1, 1); t += MINUTES_PER_DAY + 7) {
+        CivilTime d = civil(t);
+        assert(toMinutes(d.year, d.month, d.day, d.minuteOfDay / 60, d.minuteOfDay % 60) == t);
+    }
+
+    cout << "✓ Calendar arithmetic passed" << endl;
+}
+
+void testIntervals() {
+    cout << "Testing filter intervals..." << endl;
+
+    int64_t lo = toMinutes(2019, 1, 1), hi = toMinutes(2025, 1, 1) - 1;
+    mt19937 rng(5);
+    uniform_int_distribution<int64_t> minute(lo - 1000, hi + 1000);
+
+    for (const TimeFilter& filter : sampleFilters()) {
+        vector<TimeFilter::Interval> intervals = filter.intervals(lo, hi);
+        for (size_t i = 1; i < intervals.size(); i++) {
+            assert(intervals[i - 1].second + 1 < intervals[i].first);  // Sorted, disjoint, merged
+        }
+        for (int q = 0; q < 20000; q++) {
+            int64_t t = minute(rng);
+            bool inside = false;
+            for (const auto& iv : intervals) inside |= (t >= iv.first && t <= iv.second);
+            assert(inside == (filter.matches(t) && t >= lo && t <= hi));
+        }
+    }
+
+    // Unconstrained levels collapse into whole ranges
+    assert(TimeFilter().intervals(lo, hi).size() == 1);
+    assert(TimeFilter().years(2020, 2021).intervals(lo, hi).size() == 1);
+    assert(TimeFilter().years(2023, 2023).weekdays(1 << SATURDAY).intervals(lo, hi).size() == 52);
+
+    cout << "✓ Filter intervals passed" << endl;
+}
+
+void testMatchesScan() {
+    cout << "Testing temporal tree against brute force..." << endl;
+
+    mt19937 rng(17);
+    uniform_real_distribution<double> coord(0, 1);
+    uniform_int_distribution<int64_t> minute(toMinutes(2019, 1, 1), toMinutes(2025, 1, 1) - 1);
+    vector<Event> events;
+    for (int i = 0; i < 20000; i++) {
+        events.emplace_back(coord(rng), coord(rng), static_cast<int>(minute(rng)), 1 + rng() % 3);
+    }
+    vector<Event> original = events;
+
+    TemporalKDTree tree;
+    tree.build(events);
+    assert(tree.timeSpan().first >= toMinutes(2019, 1, 1));
+
+    uniform_real_distribution<double> box(-0.1, 1.1);
+    for (const TimeFilter& filter : sampleFilters()) {
+        for (int q = 0; q < 60; q++) {
+            double x1 = box(rng), x2 = box(rng), y1 = box(rng), y2 = box(rng);
+            assert(tree.query(x1, y1, x2, y2, filter) == scan(original, x1, y1, x2, y2, filter));
+        }
+        assert(tree.query(-1, -1, 2, 2, filter) == scan(original, -1, -1, 2, 2, filter));
+    }
+
+    // Absolute range overload
+    int64_t t1 = toMinutes(2022, 1, 1), t2 = toMinutes(2022, 12, 31, 23, 59);
+    assert(tree.query(0.2, 0.2, 0.8, 0.8, t2, t1) ==
+           scan(original, 0.2, 0.2, 0.8, 0.8, TimeFilter::between(t1, t2)));
+
+    cout << "✓ Temporal tree queries passed" << endl;
+}
+
+void testUnweightedAndMinuteOfDay() {
+    cout << "Testing minute-of-day data and memory..." << endl;
+
+    // Day-0 data behaves like the plain KDTree
+    mt19937 rng(23);
+    vector<Event> events;
+    for (int i = 0; i < 5000; i++) {
+        events.emplace_back((rng() % 1000) / 1000.0, (rng() % 1000) / 1000.0, rng() % 1440);
+    }
+    vector<Event> copy = events;
+    KDTree plain;
+    plain.build(copy);
+    TemporalKDTree tree;
+    tree.build(events);
+
+    for (int q = 0; q < 200; q++) {
+        double x1 = (rng() % 1000) / 1000.0, x2 = (rng() % 1000) / 1000.0;
+        double y1 = (rng() % 1000) / 1000.0, y2 = (rng() % 1000) / 1000.0;
+        int a = rng() % 1440, b = rng() % 1440;
+        assert(tree.query(x1, y1, x2, y2, a, b) == plain.query(x1, y1, x2, y2, a, b));
+    }
+
+    // Sparse per-node index: far below a dense 1440-bucket Fenwick per node
+    assert(tree.memoryUsage() < plain.memoryUsage());
+
+    TemporalKDTree empty;
+    assert(empty.empty() && empty.query(0, 0, 1, 1, TimeFilter()) == 0);
+
+    cout << "✓ Minute-of-day data passed" << endl;
+}
+
+void runAllTests() {
+    cout << "\n";
+    cout << "╔═══════════════════════════════════════╗" << endl;
+    cout << "║   TEMPORAL KD-TREE UNIT TESTS         ║" << endl;
+    cout << "╚═══════════════════════════════════════╝" << endl;
+    cout << "\n";
+
+    testCalendar();
+    testIntervals();
+    testMatchesScan();
+    testUnweightedAndMinuteOfDay();
+
+    cout << "\n";
+    cout << "╔═══════════════════════════════════════╗" << endl;
+    cout << "║   ✅ ALL TESTS PASSED                 ║" << endl;
+    cout << "╚═══════════════════════════════════════╝" << endl;
+    cout << "\n";
+}
+
+int main() {
+    runAllTests();
+    return 0;
+}
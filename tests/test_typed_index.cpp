@@ -0,0 +1,102 @@
+#include <iostream>
+#include <cassert>
+#include <random>
+#include <vector>
+#include "../src/cpp/typed_index.h"
+#include "../src/cpp/event_store.h"
+
+using namespace std;
+
+void testDictionaryMask() {
+    cout << "Testing type dictionary masks..." << endl;
+
+    TypeDictionary types({"THEFT", "ASSAULT", "MOTOR VEHICLE THEFT", "FRAUD"});
+    assert(types.size() == 4);
+    assert(types.find("FRAUD") == 3 && types.find("ARSON") == -1);
+    assert(types.code("ARSON") == 4);
+
+    TypeMask theft = types.mask({"theft"});
+    assert(theft[0] && !theft[1] && theft[2] && !theft[3] && !theft[4]);
+
+    TypeMask none = types.mask({});
+    assert(none.size() == 5 && !none[0]);
+
+    cout << "✓ Dictionary masks passed" << endl;
+}
+
+void testFilteredCounts() {
+    cout << "Testing type-filtered counts against brute force..." << endl;
+
+    mt19937 rng(9);
+    uniform_real_distribution<double> coord(0, 100);
+    vector<Event> events;
+    for (int i = 0; i < 3000; i++) {
+        events.emplace_back(coord(rng), coord(rng), rng() % 1440, 1, rng() % 5);
+    }
+    vector<Event> copy = events;
+    TypedIndex index(1440);
+    index.build(copy, 5);
+
+    for (int q = 0; q < 200; q++) {
+        double x1 = coord(rng), x2 = coord(rng), y1 = coord(rng), y2 = coord(rng);
+        int t1 = rng() % 1440, t2 = rng() % 1440;
+        if (x1 > x2) swap(x1, x2);
+        if (y1 > y2) swap(y1, y2);
+        if (t1 > t2) swap(t1, t2);
+
+        TypeMask mask(5, false);
+        mask[q % 5] = true;
+        mask[(q + 2) % 5] = true;
+
+        int expected = 0, all = 0;
+        for (const Event& e : events) {
+            bool inRange = e.x >= x1 && e.x <= x2 && e.y >= y1 && e.y <= y2 &&
+                           e.time >= t1 && e.time <= t2;
+            if (inRange) all++;
+            if (inRange && mask[e.type]) expected++;
+        }
+        assert(index.query(x1, y1, x2, y2, t1, t2, mask) == expected);
+        assert(index.query(x1, y1, x2, y2, t1, t2) == all);
+
+        vector<int> byType = index.countByType(x1, y1, x2, y2, t1, t2);
+        int sum = 0;
+        for (int c : byType) sum += c;
+        assert(sum == all);
+    }
+
+    cout << "✓ Filtered counts passed" << endl;
+}
+
+void testStoreTypes() {
+    cout << "Testing type codes from the binary store..." << endl;
+
+    vector<string> names = event_store::findStrings(
+        "{\"count\":2,\"types\":[\"THEFT\",\"SAY \\\"HI\\\"\"],\"columns\":{}}", "types");
+    assert(names.size() == 2 && names[0] == "THEFT" && names[1] == "SAY \"HI\"");
+    assert(event_store::findStrings("{\"count\":0}", "types").empty());
+
+    cout << "✓ Store types passed" << endl;
+}
+
+void runAllTests() {
+    cout << "\n";
+    cout << "╔═══════════════════════════════════════╗" << endl;
+    cout << "║   TYPED INDEX UNIT TESTS              ║" << endl;
+    cout << "╚═══════════════════════════════════════╝" << endl;
+    cout << "\n";
+
+    testDictionaryMask();
+    testFilteredCounts();
+    testStoreTypes();
+
+    cout << "\n";
+    cout << "╔═══════════════════════════════════════╗" << endl;
+    cout << "║   ✅ ALL TESTS PASSED                 ║" << endl;
+    cout << "╚═══════════════════════════════════════╝" << endl;
+    cout << "\n";
+}
+
+int main() {
+    runAllTests();
+    return 0;
+}